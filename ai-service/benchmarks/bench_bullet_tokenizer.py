@@ -0,0 +1,80 @@
+"""
+Benchmark the bullet tokenizer against the previous five-regex parser.
+
+Run from the ai-service directory:
+
+    python benchmarks/bench_bullet_tokenizer.py
+
+Time per line should stay flat as the experience section grows if parsing is
+linear in the input.
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.bullet_tokenizer import tokenize_bullets  # noqa: E402
+
+LEGACY_PATTERNS = [
+    r'•\s*(.+?)(?=\n•|\n[A-Z]|\n\n|$)',
+    r'-\s*(.+?)(?=\n-|\n[A-Z]|\n\n|$)',
+    r'\*\s*(.+?)(?=\n\*|\n[A-Z]|\n\n|$)',
+    r'◦\s*(.+?)(?=\n◦|\n[A-Z]|\n\n|$)',
+    r'(?:^|\n)\s*(.+?)(?=\n|$)'
+]
+
+
+def legacy_parse_bullets(text):
+    """EnhancementEngine._parse_bullets before the tokenizer"""
+    bullets = []
+    for pattern in LEGACY_PATTERNS:
+        for match in re.findall(pattern, text, re.MULTILINE | re.DOTALL):
+            cleaned = match.strip()
+            if len(cleaned) > 20 and not cleaned.startswith(('Education', 'Experience', 'Skills', 'Projects')):
+                bullets.append(cleaned)
+    return bullets
+
+
+VERBS = ['developed', 'worked on', 'helped with', 'built', 'maintained', 'led', 'designed']
+NOUNS = ['the billing service', 'a full-stack dashboard', 'CI pipelines', 'the data warehouse',
+         'customer onboarding', 'search indexing', 'mobile release tooling']
+
+
+def make_section(lines, seed=0):
+    rng = random.Random(seed)
+    out = []
+    while len(out) < lines:
+        if rng.random() < 0.1:
+            out.append(f"Software Engineer, Company {rng.randint(1, 99)} 2018-2022")
+        marker = rng.choice(['•', '-', '*', '◦'])
+        out.append(f"{marker} {rng.choice(VERBS)} {rng.choice(NOUNS)} for team {rng.randint(1, 999)}")
+        if rng.random() < 0.3:
+            out.append(f"  and {rng.choice(VERBS)} {rng.choice(NOUNS)} used across the company")
+        if rng.random() < 0.05:
+            out.append('')
+    return '\n'.join(out[:lines])
+
+
+def best_of(func, text, repeat=5):
+    number = max(1, 20000 // text.count('\n'))
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=repeat)) / number
+
+
+def main():
+    print(f"{'lines':>8} {'legacy ms':>10} {'tokenizer ms':>13} {'speedup':>8} "
+          f"{'legacy us/line':>15} {'tokenizer us/line':>18} {'legacy items':>13} {'unique items':>13}")
+    for lines in (100, 1000, 10000, 50000):
+        text = make_section(lines)
+        legacy = best_of(legacy_parse_bullets, text)
+        current = best_of(tokenize_bullets, text)
+        print(f"{lines:>8} {legacy * 1e3:>10.2f} {current * 1e3:>13.2f} {legacy / current:>7.1f}x "
+              f"{legacy / lines * 1e6:>15.2f} {current / lines * 1e6:>18.2f} "
+              f"{len(legacy_parse_bullets(text)):>13} {len(tokenize_bullets(text)):>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,698 +1,18 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
-import os
-import io
-import re
-import json
-import requests
-from datetime import datetime
-from typing import List, Dict, Any
-from dotenv import load_dotenv
-
-# PDF and OCR imports
-try:
-    import PyPDF2
-    from PIL import Image
-    import pytesseract
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-
-# NLP imports
-try:
-    import spacy
-    NLP_AVAILABLE = True
-except ImportError:
-    NLP_AVAILABLE = False
-
-# OpenAI import
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-load_dotenv()
-
-app = FastAPI(title="Smart CV Analyzer AI Service (Enhanced)", version="2.0.0")
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Initialize OpenAI if available
-if OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY"):
-    openai.api_key = os.getenv("OPENAI_API_KEY")
-
-# Load spaCy model if available
-nlp = None
-if NLP_AVAILABLE:
-    try:
-        nlp = spacy.load("en_core_web_sm")
-    except OSError:
-        print("spaCy English model not found. Install with: python -m spacy download en_core_web_sm")
-
-class ResumeAnalyzer:
-    def __init__(self):
-        self.common_skills = [
-            "Python", "JavaScript", "Java", "C++", "C#", "React", "Node.js", "Angular", "Vue.js",
-            "HTML", "CSS", "SQL", "MongoDB", "PostgreSQL", "MySQL", "Docker", "Kubernetes", "AWS",
-            "Azure", "GCP", "Git", "Linux", "Windows", "MacOS", "Machine Learning", "Data Science", 
-            "AI", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Flask", "Django", "Express", 
-            "Spring Boot", "REST API", "GraphQL", "Redis", "Elasticsearch", "Jenkins", "CI/CD",
-            "Agile", "Scrum", "DevOps", "Microservices", "Blockchain", "Unity", "Unreal Engine",
-            "Photoshop", "Illustrator", "Figma", "Sketch", "Adobe XD", "Tableau", "Power BI",
-            "Excel", "R", "MATLAB", "Scala", "Go", "Rust", "Swift", "Kotlin", "PHP", "Ruby"
-        ]
-        
-        self.role_skill_mapping = {
-            "Data Scientist": ["Python", "R", "Machine Learning", "Data Science", "TensorFlow", "PyTorch", "Pandas", "NumPy", "SQL", "Tableau", "Power BI"],
-            "Machine Learning Engineer": ["Python", "TensorFlow", "PyTorch", "Machine Learning", "AI", "Docker", "Kubernetes", "AWS", "Azure"],
-            "Frontend Developer": ["JavaScript", "React", "Angular", "Vue.js", "HTML", "CSS", "TypeScript", "Webpack", "Sass"],
-            "Backend Developer": ["Python", "Java", "Node.js", "Express", "Django", "Flask", "Spring Boot", "SQL", "MongoDB", "REST API"],
-            "Full Stack Developer": ["JavaScript", "React", "Node.js", "Python", "SQL", "MongoDB", "HTML", "CSS", "REST API"],
-            "DevOps Engineer": ["Docker", "Kubernetes", "AWS", "Azure", "Jenkins", "CI/CD", "Linux", "Git", "Terraform"],
-            "Cloud Engineer": ["AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Linux", "Python"],
-            "Mobile Developer": ["Swift", "Kotlin", "React Native", "Flutter", "Java", "Objective-C"],
-            "Game Developer": ["Unity", "Unreal Engine", "C#", "C++", "Python", "JavaScript"],
-            "UI/UX Designer": ["Figma", "Sketch", "Adobe XD", "Photoshop", "Illustrator", "HTML", "CSS"],
-            "Data Engineer": ["Python", "SQL", "Apache Spark", "Hadoop", "Kafka", "Airflow", "AWS", "Docker"],
-            "Cybersecurity Analyst": ["Python", "Linux", "Network Security", "Penetration Testing", "CISSP", "CEH"],
-            "Product Manager": ["Agile", "Scrum", "JIRA", "Analytics", "SQL", "Excel", "Tableau"],
-            "Software Engineer": ["Python", "Java", "JavaScript", "Git", "SQL", "REST API", "Agile", "Testing"]
-        }
-
-    def extract_text_from_pdf(self, file_content: bytes) -> str:
-        """Extract text from PDF using PyPDF2"""
-        if not PDF_AVAILABLE:
-            return "PDF processing not available. Install PyPDF2."
-        
-        try:
-            pdf_file = io.BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            
-            # If no text extracted, return a fallback
-            if len(text.strip()) < 10:
-                return "Resume content could not be extracted from PDF. This may be a scanned document or have complex formatting."
-            
-            return text.strip()
-        except Exception as e:
-            print(f"PDF extraction error: {str(e)}")
-            return f"Error extracting PDF text: {str(e)}"
+"""
+Former enhanced AI service, kept as an entry point for existing start scripts.
 
-    def extract_text_from_image(self, file_content: bytes) -> str:
-        """Extract text from image using OCR"""
-        if not PDF_AVAILABLE:
-            return "OCR processing not available. Install pytesseract and Pillow."
-        
-        try:
-            image = Image.open(io.BytesIO(file_content))
-            text = pytesseract.image_to_string(image)
-            return text.strip()
-        except Exception as e:
-            return f"Error extracting image text: {str(e)}"
+The unified service in main.py now serves every analysis depth; this runs it
+with deep mode (LLM enhancements on top of standard) as the default.
+Requests can still ask for mode=quick or mode=standard.
+"""
 
-    def extract_contact_info(self, text: str) -> Dict[str, str]:
-        """Extract contact information using regex and NLP"""
-        contact_info = {
-            "name": "Not found",
-            "email": "Not found",
-            "phone": "Not found",
-            "location": "Not found",
-            "linkedin": "Not found"
-        }
-        
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
-        if email_match:
-            contact_info["email"] = email_match.group()
-        
-        # Extract phone
-        phone_patterns = [
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
-            r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',
-            r'\+\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'
-        ]
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, text)
-            if phone_match:
-                contact_info["phone"] = phone_match.group()
-                break
-        
-        # Extract LinkedIn
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        linkedin_match = re.search(linkedin_pattern, text, re.IGNORECASE)
-        if linkedin_match:
-            contact_info["linkedin"] = linkedin_match.group()
-        
-        # Extract name (first non-empty line or use NLP)
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        if lines:
-            # Try to find a line that looks like a name
-            for line in lines[:5]:  # Check first 5 lines
-                if len(line.split()) >= 2 and len(line) < 50 and not any(char in line for char in '@.()'):
-                    contact_info["name"] = line
-                    break
-        
-        # Use NLP for better name extraction if available
-        if nlp and contact_info["name"] == "Not found":
-            doc = nlp(text[:500])  # Process first 500 chars
-            for ent in doc.ents:
-                if ent.label_ == "PERSON":
-                    contact_info["name"] = ent.text
-                    break
-        
-        return contact_info
-
-    def detect_skills(self, text: str) -> List[str]:
-        """Detect skills from resume text"""
-        text_lower = text.lower()
-        detected_skills = []
-        
-        for skill in self.common_skills:
-            # Check for exact match and word boundaries
-            skill_pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(skill_pattern, text_lower):
-                detected_skills.append(skill)
-        
-        return detected_skills
-
-    def suggest_roles(self, skills: List[str]) -> List[Dict[str, Any]]:
-        """Suggest job roles based on detected skills"""
-        role_scores = {}
-        
-        for role, required_skills in self.role_skill_mapping.items():
-            score = 0
-            matched_skills = []
-            
-            for skill in skills:
-                if skill in required_skills:
-                    score += 1
-                    matched_skills.append(skill)
-            
-            if score > 0:
-                role_scores[role] = {
-                    "role": role,
-                    "score": score,
-                    "match_percentage": min(100, (score / len(required_skills)) * 100),
-                    "matched_skills": matched_skills,
-                    "missing_skills": [s for s in required_skills[:5] if s not in skills]  # Limit to 5 missing skills
-                }
-        
-        # If no matches found, return default suggestions
-        if not role_scores:
-            default_roles = [
-                {
-                    "role": "Software Engineer",
-                    "score": 1,
-                    "match_percentage": 60,
-                    "matched_skills": skills[:3] if skills else ["Programming"],
-                    "missing_skills": ["Python", "JavaScript", "Git"]
-                },
-                {
-                    "role": "Data Analyst", 
-                    "score": 1,
-                    "match_percentage": 50,
-                    "matched_skills": skills[:2] if skills else ["Analysis"],
-                    "missing_skills": ["SQL", "Excel", "Python"]
-                }
-            ]
-            return default_roles
-        
-        # Sort by score and return top 5
-        sorted_roles = sorted(role_scores.items(), key=lambda x: x[1]["score"], reverse=True)
-        return [data for role, data in sorted_roles[:5]]
-
-    def get_job_market_data(self, role: str) -> Dict[str, Any]:
-        """Simulate job market data (in real implementation, use job board APIs)"""
-        # This would integrate with Indeed, LinkedIn, or Glassdoor APIs
-        mock_data = {
-            "openings": 1250,
-            "avg_salary": "$85,000 - $120,000",
-            "growth_rate": "15%",
-            "top_companies": ["Google", "Microsoft", "Amazon", "Meta", "Apple"],
-            "required_skills": ["Python", "SQL", "Machine Learning", "AWS"],
-            "experience_level": "Mid-level (3-5 years)"
-        }
-        return mock_data
-
-    def analyze_with_openai(self, text: str, job_role: str) -> Dict[str, Any]:
-        """Use OpenAI for advanced analysis"""
-        if not OPENAI_AVAILABLE or not os.getenv("OPENAI_API_KEY"):
-            # Return comprehensive mock AI analysis instead of error
-            return self.generate_mock_ai_analysis(text, job_role)
-        
-        try:
-            prompt = f"""
-            Analyze this resume for the role of {job_role}:
-            
-            {text[:2000]}  # Limit text to avoid token limits
-            
-            Provide analysis in JSON format with:
-            1. strengths (list of 3-5 key strengths)
-            2. weaknesses (list of 3-5 areas for improvement)
-            3. suggestions (list of 3-5 specific suggestions)
-            4. overall_impression (brief summary)
-            5. ats_score (0-100 rating for ATS compatibility)
-            """
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
-                temperature=0.3
-            )
-            
-            return json.loads(response.choices[0].message.content)
-        except Exception as e:
-            return self.generate_mock_ai_analysis(text, job_role)
-
-    def generate_mock_ai_analysis(self, text: str, job_role: str) -> Dict[str, Any]:
-        """Generate comprehensive mock AI analysis based on resume content"""
-        text_lower = text.lower()
-        text_length = len(text.strip())
-        
-        # Analyze content to provide realistic feedback
-        has_experience = 'experience' in text_lower or 'work' in text_lower or 'job' in text_lower
-        has_education = 'education' in text_lower or 'degree' in text_lower or 'university' in text_lower
-        has_projects = 'project' in text_lower
-        has_skills = 'skill' in text_lower or 'python' in text_lower or 'javascript' in text_lower
-        has_contact = '@' in text or 'phone' in text_lower or 'email' in text_lower
-        
-        # Generate strengths based on content
-        strengths = []
-        if has_experience:
-            strengths.append("Demonstrates relevant work experience in the field")
-        if has_education:
-            strengths.append("Strong educational background that supports career goals")
-        if has_projects:
-            strengths.append("Shows practical application of skills through project work")
-        if has_skills:
-            strengths.append("Technical skills align well with industry requirements")
-        if text_length > 1000:
-            strengths.append("Comprehensive resume with detailed information")
-        
-        # Default strengths if content is minimal
-        if not strengths:
-            strengths = [
-                "Resume successfully uploaded and processed",
-                "Clear intent to pursue career in " + job_role,
-                "Demonstrates initiative in seeking career advancement"
-            ]
-        
-        # Generate weaknesses/areas for improvement
-        weaknesses = []
-        if not has_contact:
-            weaknesses.append("Missing or incomplete contact information")
-        if not has_experience:
-            weaknesses.append("Limited work experience details provided")
-        if not has_skills:
-            weaknesses.append("Technical skills section could be more comprehensive")
-        if text_length < 500:
-            weaknesses.append("Resume content could be more detailed and comprehensive")
-        if 'achievement' not in text_lower and 'accomplish' not in text_lower:
-            weaknesses.append("Could benefit from more quantified achievements and results")
-        
-        # Default weaknesses
-        if not weaknesses:
-            weaknesses = [
-                "Could include more specific metrics and quantified achievements",
-                "Consider adding more industry-specific keywords",
-                "Professional summary could be more compelling"
-            ]
-        
-        # Generate suggestions based on job role and content
-        suggestions = []
-        if job_role.lower() in ['software engineer', 'developer', 'programmer']:
-            suggestions.extend([
-                "Add specific programming languages and frameworks you've used",
-                "Include links to GitHub repositories or portfolio projects",
-                "Mention experience with version control systems like Git"
-            ])
-        elif job_role.lower() in ['data analyst', 'data scientist']:
-            suggestions.extend([
-                "Highlight experience with data analysis tools like SQL, Python, or R",
-                "Include examples of data visualization and reporting projects",
-                "Mention statistical analysis and machine learning experience"
-            ])
-        else:
-            suggestions.extend([
-                "Tailor your resume specifically for " + job_role + " positions",
-                "Include industry-specific keywords and terminology",
-                "Highlight transferable skills relevant to the target role"
-            ])
-        
-        # Add general suggestions
-        suggestions.extend([
-            "Use action verbs to start bullet points (achieved, implemented, led)",
-            "Quantify your accomplishments with specific numbers and percentages"
-        ])
-        
-        # Limit to 5 suggestions
-        suggestions = suggestions[:5]
-        
-        # Generate overall impression
-        if text_length > 1000 and has_experience and has_skills:
-            impression = f"This is a solid resume for a {job_role} position. The candidate shows relevant experience and skills, with room for enhancement in presentation and quantified achievements."
-        elif text_length > 500:
-            impression = f"Good foundation for a {job_role} resume. With some improvements in detail and formatting, this could be very competitive."
-        else:
-            impression = f"This resume shows potential but needs significant development to be competitive for {job_role} positions. Focus on adding more detailed experience and skills."
-        
-        # Calculate ATS score based on content
-        ats_score = 60  # Base score
-        if has_contact: ats_score += 10
-        if has_experience: ats_score += 10
-        if has_skills: ats_score += 10
-        if has_education: ats_score += 5
-        if text_length > 1000: ats_score += 5
-        
-        return {
-            "strengths": strengths[:5],
-            "weaknesses": weaknesses[:5],
-            "suggestions": suggestions,
-            "overall_impression": impression,
-            "ats_score": min(95, ats_score)  # Cap at 95
-        }
-
-    def calculate_comprehensive_score(self, text: str, contact_info: Dict, skills: List[str], job_role: str) -> Dict[str, int]:
-        """Realistic resume scoring that matches industry standards (70-85 range for good resumes)"""
-        text_lower = text.lower()
-        text_length = len(text.strip())
-        
-        # Detect if this is actually a resume (not a random file)
-        resume_indicators = 0
-        if 'experience' in text_lower or 'work' in text_lower: resume_indicators += 1
-        if 'education' in text_lower or 'degree' in text_lower or 'university' in text_lower or 'college' in text_lower: resume_indicators += 1
-        if 'project' in text_lower or 'projects' in text_lower: resume_indicators += 1
-        if 'skill' in text_lower: resume_indicators += 1
-        
-        # If this doesn't look like a resume at all, give very low score
-        if resume_indicators == 0 and text_length < 200:
-            return {
-                "contactScore": 10,
-                "contentScore": 5,
-                "skillsScore": 10,
-                "structureScore": 10,
-                "atsCompatibility": 10,
-                "overallScore": 9
-            }
-        
-        # 1. Contact Score (0-100) - More generous scoring
-        contact_score = 40  # Base score for having any text
-        if contact_info["name"] != "Not found": contact_score += 20
-        if contact_info["email"] != "Not found": contact_score += 25
-        if contact_info["phone"] != "Not found": contact_score += 15
-        
-        # 2. Content Score (0-100) - More realistic for actual resumes
-        content_score = 50  # Base score for having content
-        
-        # Length scoring - more generous
-        if text_length >= 500: content_score += 10
-        if text_length >= 1000: content_score += 10
-        if text_length >= 2000: content_score += 5
-        
-        # Resume sections - generous bonus
-        if 'experience' in text_lower or 'work' in text_lower: content_score += 10
-        if 'education' in text_lower or 'degree' in text_lower: content_score += 8
-        if 'project' in text_lower or 'projects' in text_lower: content_score += 7
-        
-        # Professional language - generous bonus
-        prof_words = ['managed', 'developed', 'implemented', 'achieved', 'responsible', 'led', 'created', 'designed', 'built', 'improved']
-        found_prof = sum(1 for word in prof_words if word in text_lower)
-        content_score += min(10, found_prof * 2)
-        
-        # 3. Skills Score (0-100) - More generous
-        skill_count = len(skills)
-        if skill_count == 0: skills_score = 40  # Base score
-        elif skill_count == 1: skills_score = 55
-        elif skill_count == 2: skills_score = 65
-        elif skill_count < 5: skills_score = 75
-        elif skill_count < 8: skills_score = 85
-        elif skill_count < 12: skills_score = 92
-        else: skills_score = 95
-        
-        # 4. Structure Score (0-100) - More generous
-        lines = len([l for l in text.split('\n') if l.strip()])
-        structure_score = 50  # Base score
-        
-        if lines > 10: structure_score += 15
-        if lines > 20: structure_score += 15
-        if lines > 30: structure_score += 10
-        
-        # Formatting indicators
-        if any(c in text for c in ['•', '-', '*']): structure_score += 10
-        if re.search(r'\d{4}', text): structure_score += 5  # Years/dates
-        
-        # 5. ATS Score (0-100) - More generous
-        ats_score = 50  # Base score
-        if contact_info["email"] != "Not found": ats_score += 20
-        if contact_info["phone"] != "Not found": ats_score += 10
-        
-        # Standard resume sections
-        standard_sections = ['experience', 'education', 'skills', 'summary', 'objective']
-        found_sections = sum(1 for section in standard_sections if section in text_lower)
-        ats_score += found_sections * 5
-        
-        # Professional keywords
-        prof_keywords = ['responsible', 'managed', 'developed', 'implemented', 'achieved', 'led']
-        found_keywords = sum(1 for k in prof_keywords if k in text_lower)
-        ats_score += min(10, found_keywords * 2)
-        
-        # Cap all scores at 100
-        contact_score = min(100, contact_score)
-        content_score = min(100, content_score)
-        skills_score = min(100, skills_score)
-        structure_score = min(100, structure_score)
-        ats_score = min(100, ats_score)
-        
-        # Overall score - weighted to give realistic 70-85 range for good resumes
-        overall_score = int(
-            contact_score * 0.15 + content_score * 0.30 + 
-            skills_score * 0.30 + structure_score * 0.15 + ats_score * 0.10
-        )
-        
-        # Ensure minimum score for actual resumes
-        if resume_indicators >= 2 and overall_score < 50:
-            overall_score = 50
-        
-        return {
-            "contactScore": contact_score,
-            "contentScore": content_score,
-            "skillsScore": skills_score,
-            "structureScore": structure_score,
-            "atsCompatibility": ats_score,
-            "overallScore": overall_score
-        }
-
-    def generate_detailed_feedback(self, contact_info: Dict, skills: List[str], scores: Dict) -> Dict[str, List[str]]:
-        """Fast feedback generation"""
-        issues = []
-        suggestions = []
-        
-        # Quick feedback based on scores
-        if scores["contactScore"] < 70:
-            issues.append("Missing contact information")
-            suggestions.append("Add email, phone, and LinkedIn profile")
-        
-        if scores["contentScore"] < 60:
-            issues.append("Content needs improvement")
-            suggestions.append("Add more detailed experience and quantifiable achievements")
-        
-        if scores["skillsScore"] < 60:
-            issues.append("Limited skills shown")
-            suggestions.append("Include more relevant technical skills")
-        
-        if scores["structureScore"] < 60:
-            issues.append("Poor structure and formatting")
-            suggestions.append("Use bullet points and clear section headers")
-        
-        if scores["atsCompatibility"] < 70:
-            issues.append("Not ATS-friendly")
-            suggestions.append("Use standard headers and avoid complex formatting")
-        
-        return {"issues": issues, "suggestions": suggestions}
-
-analyzer = ResumeAnalyzer()
-
-@app.get("/health")
-async def health_check():
-    return {
-        "status": "OK", 
-        "message": "Enhanced AI Service is running",
-        "features": {
-            "pdf_processing": PDF_AVAILABLE,
-            "nlp_processing": NLP_AVAILABLE,
-            "openai_integration": OPENAI_AVAILABLE and bool(os.getenv("OPENAI_API_KEY"))
-        }
-    }
+import os
+import uvicorn
 
-@app.post("/analyze-resume")
-async def analyze_resume(
-    file: UploadFile = File(...),
-    jobRole: str = Form(...)
-):
-    try:
-        # Read the uploaded file
-        file_content = await file.read()
-        
-        # Extract text based on file type
-        if file.content_type == "application/pdf":
-            extracted_text = analyzer.extract_text_from_pdf(file_content)
-        elif file.content_type in ["image/jpeg", "image/jpg", "image/png"]:
-            extracted_text = analyzer.extract_text_from_image(file_content)
-        elif file.content_type in ["text/plain", "text/txt", "application/txt"]:
-            # Handle text files directly
-            try:
-                extracted_text = file_content.decode('utf-8')
-            except UnicodeDecodeError:
-                try:
-                    extracted_text = file_content.decode('latin-1')
-                except:
-                    extracted_text = "Error: Could not decode text file"
-        else:
-            extracted_text = f"Unsupported file type: {file.content_type}"
-        
-        # Debug: Print extracted text info
-        print(f"DEBUG: File type: {file.content_type}")
-        print(f"DEBUG: Extracted text length: {len(extracted_text)}")
-        print(f"DEBUG: First 200 chars: {extracted_text[:200]}")
-        
-        # If text extraction failed, provide fallback
-        if len(extracted_text.strip()) < 10:
-            extracted_text = "Sample resume content with experience in software development, education in computer science, and skills in programming languages."
-        
-        # Extract contact information
-        contact_info = analyzer.extract_contact_info(extracted_text)
-        
-        # Detect skills
-        detected_skills = analyzer.detect_skills(extracted_text)
-        
-        # Suggest roles
-        suggested_roles = analyzer.suggest_roles(detected_skills)
-        
-        # Get job market data for the target role
-        job_market_data = analyzer.get_job_market_data(jobRole)
-        
-        # OpenAI analysis
-        ai_analysis = analyzer.analyze_with_openai(extracted_text, jobRole)
-        
-        # Calculate comprehensive scores
-        scores = analyzer.calculate_comprehensive_score(extracted_text, contact_info, detected_skills, jobRole)
-        
-        # Use AI analysis ATS score if available, otherwise use calculated score
-        if not ai_analysis.get("error") and "ats_score" in ai_analysis:
-            scores["atsCompatibility"] = ai_analysis["ats_score"]
-            # Recalculate overall score with AI ATS score
-            scores["overallScore"] = int(
-                (scores["contactScore"] * 0.15) +
-                (scores["contentScore"] * 0.35) +
-                (scores["skillsScore"] * 0.25) +
-                (scores["structureScore"] * 0.15) +
-                (ai_analysis["ats_score"] * 0.10)
-            )
-        
-        # Generate detailed feedback
-        feedback = analyzer.generate_detailed_feedback(contact_info, detected_skills, scores)
-        
-        # Enhanced response with all new features
-        return {
-            "parsedText": extracted_text,
-            "sections": {
-                "contactInfo": contact_info,
-                "education": "Education details extracted from resume",
-                "skills": detected_skills,
-                "experience": "Experience details extracted from resume",
-                "projects": "Project details extracted from resume",
-                "certifications": "Certifications extracted from resume"
-            },
-            "overallScore": scores["overallScore"],
-            "scoreBreakdown": {
-                "contactScore": scores["contactScore"],
-                "contentScore": scores["contentScore"],
-                "skillsScore": scores["skillsScore"],
-                "structureScore": scores["structureScore"],
-                "atsCompatibility": scores["atsCompatibility"]
-            },
-            "suggestedRoles": suggested_roles,
-            "jobMarketData": job_market_data,
-            "aiAnalysis": ai_analysis if not ai_analysis.get("error") else {"strengths": ["Resume uploaded successfully"], "suggestions": ["Consider adding more details"]},
-            "detailedFeedback": feedback,
-            "issues": feedback.get("issues", []),
-            "suggestedKeywords": ["Agile", "Scrum", "CI/CD", "Testing", "Problem Solving", "Leadership", "Communication"],
-            "missingComponents": feedback.get("suggestions", []),
-            "enhancedBullets": [
-                {
-                    "original": "worked on projects",
-                    "improved": "developed and delivered high-impact projects that improved system performance by 25%",
-                    "section": "projects"
-                },
-                {
-                    "original": "responsible for tasks",
-                    "improved": "led cross-functional teams to deliver critical business objectives, resulting in 30% efficiency improvement",
-                    "section": "experience"
-                }
-            ],
-            "processingTime": 2000,
-            "aiServiceVersion": "2.0.0-enhanced",
-            "timestamp": datetime.now().isoformat()
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+os.environ.setdefault("ANALYSIS_MODE", "deep")
 
-@app.post("/job-search")
-async def search_jobs(
-    skills: List[str],
-    location: str = "Remote",
-    experience_level: str = "Mid-level"
-):
-    """Search for jobs based on skills (mock implementation)"""
-    # In real implementation, integrate with job board APIs
-    mock_jobs = [
-        {
-            "title": "Senior Software Engineer",
-            "company": "TechCorp Inc.",
-            "location": location,
-            "salary": "$90,000 - $130,000",
-            "match_score": 85,
-            "required_skills": skills[:3],
-            "job_url": "https://example.com/job1"
-        },
-        {
-            "title": "Full Stack Developer",
-            "company": "StartupXYZ",
-            "location": location,
-            "salary": "$75,000 - $110,000",
-            "match_score": 78,
-            "required_skills": skills[:4],
-            "job_url": "https://example.com/job2"
-        }
-    ]
-    
-    return {
-        "jobs": mock_jobs,
-        "total_found": len(mock_jobs),
-        "search_params": {
-            "skills": skills,
-            "location": location,
-            "experience_level": experience_level
-        }
-    }
+from main import app  # noqa: E402  (reads ANALYSIS_MODE on import)
 
 if __name__ == "__main__":
-    import os
     port = int(os.environ.get("PORT", 8002))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=port)
@@ -1,704 +1,17 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
-import os
-import tempfile
-import re
-from io import BytesIO
-import PyPDF2
-from dotenv import load_dotenv
-from modules.ocr_processor import OCRProcessor
-from modules.resume_classifier import ATSResumeClassifier
-
-load_dotenv()
-
-app = FastAPI(title="Smart CV Analyzer AI Service (Minimal)", version="1.0.0")
-
-# Initialize processors
-ocr_processor = OCRProcessor()
-resume_classifier = ATSResumeClassifier()
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-@app.get("/health")
-async def health_check():
-    return {"status": "OK", "message": "AI Service is running (minimal mode)"}
-
-@app.get("/test-error")
-async def test_error():
-    raise HTTPException(status_code=400, detail="Test error message")
+"""
+Former minimal AI service, kept as an entry point for existing start scripts.
 
-@app.post("/analyze-resume")
-async def analyze_resume(
-    file: UploadFile = File(...),
-    jobRole: str = Form(...)
-):
-    print(f"=== ANALYZE RESUME ENDPOINT CALLED ===")
-    try:
-        print(f"Processing file: {file.filename}, Content-Type: {file.content_type}")
-        
-        # Read the uploaded file
-        file_content = await file.read()
-        print(f"File content read: {len(file_content)} bytes")
-        
-        if file.content_type == "application/pdf":
-            # For PDF files, try multiple extraction methods
-            try:
-                # Method 1: Try PyPDF2 for text-based PDFs first (faster and more reliable)
-                try:
-                    pdf_buffer = BytesIO(file_content)
-                    pdf_reader = PyPDF2.PdfReader(pdf_buffer)
-                    
-                    extracted_text = ""
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        page_text = page.extract_text()
-                        if page_text.strip():
-                            extracted_text += f"\n--- Page {page_num + 1} ---\n"
-                            extracted_text += page_text
-                    
-                    if len(extracted_text.strip()) > 100:
-                        print(f"Successfully extracted text from PDF using PyPDF2: {len(extracted_text)} characters")
-                        print(f"First 200 characters: {extracted_text[:200]}")
-                    else:
-                        raise Exception("PyPDF2 extracted insufficient text, trying OCR")
-                        
-                except Exception as pypdf_error:
-                    print(f"PyPDF2 extraction failed: {pypdf_error}, trying OCR...")
-                    
-                    # Method 2: Fall back to OCR for image-based PDFs
-                    try:
-                        # Save uploaded file temporarily
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                            temp_file.write(file_content)
-                            temp_file_path = temp_file.name
-                        
-                        try:
-                            # Extract text using OCR processor
-                            extracted_text = ocr_processor.extract_text(temp_file_path)
-                            print(f"Successfully extracted text from PDF using OCR: {len(extracted_text)} characters")
-                            
-                            # Validate extraction quality
-                            quality = ocr_processor.validate_extraction_quality(extracted_text)
-                            print(f"OCR quality: {quality}")
-                            
-                            if not quality['is_valid']:
-                                print(f"OCR quality issues: {quality['issues']}")
-                                
-                        finally:
-                            # Clean up temporary file
-                            if os.path.exists(temp_file_path):
-                                os.unlink(temp_file_path)
-                                
-                    except Exception as ocr_error:
-                        print(f"OCR processing also failed: {ocr_error}")
-                        # Use enhanced placeholder with filename analysis
-                        filename_lower = file.filename.lower() if file.filename else ""
-                        
-                        # Try to extract some info from filename
-                        name_from_filename = ""
-                        if file.filename:
-                            # Remove extension and common resume words
-                            name_part = file.filename.replace('.pdf', '').replace('resume', '').replace('cv', '').replace('-', ' ').replace('_', ' ')
-                            # Clean up the name
-                            name_part = ' '.join(word.capitalize() for word in name_part.split() if word.isalpha() and len(word) > 1)
-                            if name_part.strip():
-                                name_from_filename = name_part.strip()
-                        
-                        extracted_text = f"""Name: {name_from_filename or 'Professional Candidate'}
-Email: candidate@email.com
-Phone: (555) 123-4567
-Location: City, State
+The unified service in main.py now serves every analysis depth; this runs it
+on port 8002 with quick mode as the default. Requests can still ask for
+mode=standard or mode=deep.
+"""
 
-PROFESSIONAL SUMMARY
-Experienced professional with strong background in technology and business.
-
-EDUCATION
-Bachelor's Degree in relevant field
-University Name, Year
-
-EXPERIENCE
-Professional Experience
-Company Name
-• Key responsibilities and achievements
-• Technical skills and project work
-• Leadership and collaboration experience
-
-SKILLS
-Technical Skills: Programming, Data Analysis, Project Management
-Soft Skills: Communication, Problem Solving, Team Leadership
-Tools: Microsoft Office, Database Management, Web Technologies
-
-PROJECTS
-Professional Projects
-• Project management and execution
-• Technical implementation and results
-• Collaboration and team coordination
-
-CERTIFICATIONS
-Professional Certifications
-• Industry-relevant certifications
-• Technical training and development
-• Continuing education and skill enhancement
+import os
+import uvicorn
 
-This resume content was generated as a template due to PDF processing limitations.
-For accurate analysis, please upload your resume as a text file or ensure the PDF contains selectable text."""
-                        print("Using enhanced placeholder with realistic resume content")
-                        
-            except Exception as e:
-                print(f"All PDF processing methods failed: {e}")
-                extracted_text = f"[PDF Content from {file.filename}]\n\nPDF processing error. Please upload as text file for better analysis."
-                
-        elif file.content_type in ["image/jpeg", "image/jpg", "image/png"]:
-            # Image files no longer supported
-            extracted_text = "[ERROR] Image files are no longer supported. Please upload PDF files only."
-            # For images, use OCR processing
-            try:
-                # Save uploaded file temporarily
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as temp_file:
-                    temp_file.write(file_content)
-                    temp_file_path = temp_file.name
-                
-                try:
-                    # Extract text using OCR processor
-                    extracted_text = ocr_processor.extract_text(temp_file_path)
-                    print(f"Successfully extracted text from image using OCR: {len(extracted_text)} characters")
-                    
-                finally:
-                    # Clean up temporary file
-                    if os.path.exists(temp_file_path):
-                        os.unlink(temp_file_path)
-                        
-            except Exception as e:
-                print(f"Error processing image with OCR: {e}")
-                extracted_text = f"[Image OCR from {file.filename}]\n\nOCR processing failed. Please upload as text file for better analysis."
-        elif file.content_type in ["text/plain", "application/msword", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]:
-            # For text/doc files, try to decode as text
-            try:
-                extracted_text = file_content.decode('utf-8')
-                print(f"Successfully extracted text from {file.filename}: {len(extracted_text)} characters")
-            except Exception as e:
-                print(f"Error decoding text file: {e}")
-                extracted_text = f"[Document Content from {file.filename}]\n\nContent extracted from document file."
-        else:
-            # Try to decode as text anyway for unknown types
-            try:
-                extracted_text = file_content.decode('utf-8')
-                print(f"Successfully decoded unknown file type as text: {len(extracted_text)} characters")
-            except:
-                extracted_text = f"[Content from {file.filename}]\n\nFile type: {file.content_type}"
-        
-        print(f"Text extraction completed. Extracted text length: {len(extracted_text)}")
-        print(f"First 100 characters: {extracted_text[:100]}")
-        
-        # PROFESSIONAL ATS-GRADE RESUME VALIDATION
-        print("Starting ATS-grade resume classification...")
-        classification_result = resume_classifier.classify_document(extracted_text, file.filename)
-        
-        print(f"Classification result: {classification_result['document_type']}")
-        print(f"Confidence score: {classification_result['resume_confidence_score']}%")
-        print(f"ATS Score: {classification_result['ats_score']}")
-        print(f"Detected sections: {classification_result['detected_sections']}")
-        
-        # If not a resume, reject immediately with professional message
-        if not resume_classifier.should_process_for_ats_scoring(classification_result):
-            print("Document rejected - not a resume")
-            rejection_response = resume_classifier.get_rejection_message(classification_result)
-            raise HTTPException(
-                status_code=400,
-                detail=rejection_response
-            )
-        
-        print("Document validated as resume, proceeding with analysis...")
-        
-        # Continue with resume analysis since it passed ATS validation
-        text_lower = extracted_text.lower()
-        
-        # Split text into lines for processing
-        lines = extracted_text.split('\n')
-        
-        # Extract email with improved regex
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', extracted_text)
-        email = email_match.group() if email_match else "Not found"
-        
-        # If not found in main text, check for email patterns in lines
-        if email == "Not found":
-            for line in lines:
-                line_clean = line.strip()
-                if '@' in line_clean:
-                    email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', line_clean)
-                    if email_match:
-                        email = email_match.group()
-                        break
-        
-        # Extract phone with improved regex patterns
-        phone_patterns = [
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # US format
-            r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',    # (555) 123-4567
-            r'\+\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}',  # International
-            r'\b\d{10}\b'  # 10 digits
-        ]
-        
-        phone = "Not found"
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, extracted_text)
-            if phone_match:
-                phone = phone_match.group()
-                break
-        
-        # Extract name (look for "Name:" pattern first, then first line)
-        name_candidates = []
-        
-        print(f"DEBUG: Looking for name in {len(lines)} lines")
-        print(f"DEBUG: First 3 lines: {lines[:3]}")
-        
-        # Look for "Name:" pattern first
-        for line in lines:
-            line = line.strip()
-            if line.lower().startswith('name:'):
-                name_from_line = line.split(':', 1)[1].strip()
-                print(f"DEBUG: Found 'Name:' pattern: '{name_from_line}'")
-                if name_from_line and name_from_line != 'Professional Candidate':
-                    name_candidates.append(name_from_line)
-                    break
-        
-        # If no "Name:" pattern found, check first few lines
-        if not name_candidates:
-            print("DEBUG: No 'Name:' pattern found, checking first lines")
-            for line in lines[:5]:  # Check first 5 lines
-                line = line.strip()
-                # Skip page markers, empty lines, and lines with common non-name patterns
-                if (line and 
-                    not line.startswith('---') and  # Skip page markers
-                    not line.startswith('page') and
-                    not any(keyword in line.lower() for keyword in ['email', 'phone', 'address', 'linkedin', 'github', 'www', 'http', '@']) and
-                    len(line.split()) <= 4 and  # Likely a name (not too many words)
-                    len(line) > 2 and  # Not too short
-                    not line.isdigit() and  # Not just numbers
-                    any(c.isalpha() for c in line)):  # Contains letters
-                    print(f"DEBUG: Potential name candidate: '{line}'")
-                    name_candidates.append(line)
-        
-        name = name_candidates[0] if name_candidates else f"Name from {file.filename}"
-        print(f"DEBUG: Final extracted name: '{name}'")
-        
-        # Extract location with improved patterns
-        location = "Location not found"
-        
-        # Look for "Location:" pattern first
-        for line in lines:
-            line = line.strip()
-            if line.lower().startswith('location:'):
-                location_from_line = line.split(':', 1)[1].strip()
-                if location_from_line and location_from_line != 'City, State':
-                    location = location_from_line
-                    break
-        
-        # If no "Location:" pattern found, look for city, state/country patterns
-        if location == "Location not found":
-            location_patterns = [
-                r'\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b',  # City, State/Country
-                r'\b[A-Z][a-z]+,\s*[A-Z]{2}\b',     # City, ST
-                r'\b[A-Z][a-z]+\s+[A-Z][a-z]+,\s*[A-Z][a-z]+\b'  # City Name, Country
-            ]
-            
-            for pattern in location_patterns:
-                location_match = re.search(pattern, extracted_text)
-                if location_match:
-                    location = location_match.group()
-                    break
-        
-        # Also check for common location indicators in lines
-        if location == "Location not found":
-            for line in lines:
-                line_clean = line.strip()
-                # Look for lines that might contain location info
-                if any(indicator in line_clean.lower() for indicator in ['hyderabad', 'india', 'bangalore', 'mumbai', 'delhi', 'chennai', 'pune', 'kolkata']):
-                    # Extract the location part
-                    for pattern in [r'\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b', r'\b[A-Z][a-z]+\b']:
-                        match = re.search(pattern, line_clean)
-                        if match and any(city in match.group().lower() for city in ['hyderabad', 'india', 'bangalore', 'mumbai', 'delhi', 'chennai', 'pune', 'kolkata']):
-                            location = match.group()
-                            break
-                    if location != "Location not found":
-                        break
-        
-        # Detect skills (common tech skills) - make it more dynamic based on file content
-        all_skills = [
-            "Python", "JavaScript", "Java", "C++", "C#", "React", "Node.js", "Angular", "Vue.js",
-            "HTML", "CSS", "SQL", "MongoDB", "PostgreSQL", "MySQL", "Docker", "Kubernetes", "AWS",
-            "Azure", "GCP", "Git", "Linux", "Windows", "Machine Learning", "Data Science", "AI", 
-            "TensorFlow", "PyTorch", "Pandas", "NumPy", "Flask", "Django", "Express", "Spring Boot",
-            "REST API", "GraphQL", "Redis", "Elasticsearch", "Jenkins", "CI/CD", "Agile", "Scrum",
-            "TypeScript", "PHP", "Ruby", "Go", "Rust", "Swift", "Kotlin", "Flutter", "React Native",
-            "Tableau", "Power BI", "Excel", "Photoshop", "Figma", "Sketch", "Unity", "Unreal Engine"
-        ]
-        
-        detected_skills = []
-        for skill in all_skills:
-            if skill.lower() in text_lower:
-                detected_skills.append(skill)
-        
-        # If no skills detected, add some based on filename, job role, or make educated guesses
-        if not detected_skills:
-            # Try to infer from job role
-            job_role_lower = jobRole.lower() if jobRole else ""
-            filename_lower = file.filename.lower() if file.filename else ""
-            
-            if any(term in job_role_lower for term in ['data', 'scientist', 'analyst', 'ml', 'machine learning']):
-                detected_skills = ["Python", "SQL", "Machine Learning", "Data Science", "Pandas", "NumPy", "Statistics"]
-            elif any(term in job_role_lower for term in ['frontend', 'front-end', 'react', 'javascript', 'web']):
-                detected_skills = ["JavaScript", "React", "HTML", "CSS", "TypeScript", "Node.js"]
-            elif any(term in job_role_lower for term in ['backend', 'back-end', 'api', 'server']):
-                detected_skills = ["Python", "Java", "SQL", "REST API", "Node.js", "Express"]
-            elif any(term in job_role_lower for term in ['fullstack', 'full-stack', 'full stack']):
-                detected_skills = ["JavaScript", "React", "Node.js", "Python", "SQL", "HTML", "CSS"]
-            elif any(term in job_role_lower for term in ['devops', 'cloud', 'aws', 'azure']):
-                detected_skills = ["AWS", "Docker", "Kubernetes", "Linux", "CI/CD", "Python"]
-            elif any(term in job_role_lower for term in ['mobile', 'ios', 'android', 'app']):
-                detected_skills = ["Swift", "Kotlin", "React Native", "Flutter", "Mobile Development"]
-            elif any(term in filename_lower for term in ['dev', 'engineer', 'programmer', 'software']):
-                detected_skills = ["Programming", "Software Development", "Git", "Problem Solving"]
-            elif any(term in filename_lower for term in ['data', 'analyst', 'science']):
-                detected_skills = ["Data Analysis", "SQL", "Excel", "Python"]
-            elif any(term in filename_lower for term in ['design', 'ui', 'ux']):
-                detected_skills = ["Design", "UI/UX", "Figma", "Adobe Creative Suite"]
-            else:
-                # Default skills for any technical role
-                detected_skills = ["Communication", "Problem Solving", "Teamwork", "Microsoft Office"]
-                
-            print(f"No skills detected from content, inferred {len(detected_skills)} skills from job role '{jobRole}' and filename '{file.filename}'")
-        
-        # Extract education with improved boundary detection
-        education_info = "Education details would be extracted here"
-        education_lines = []
-        
-        # Find section boundaries more precisely
-        section_markers = {}
-        for i, line in enumerate(lines):
-            line_lower = line.strip().lower()
-            if line_lower in ['education', 'academic background', 'qualifications']:
-                section_markers['education'] = i
-            elif line_lower in ['experience', 'work experience', 'employment', 'professional experience']:
-                section_markers['experience'] = i
-            elif line_lower in ['skills', 'technical skills', 'core competencies']:
-                section_markers['skills'] = i
-            elif line_lower in ['projects', 'key projects', 'project work']:
-                section_markers['projects'] = i
-            elif line_lower in ['certifications', 'certificates', 'professional certifications']:
-                section_markers['certifications'] = i
-        
-        # Extract education content within proper boundaries
-        if 'education' in section_markers:
-            start_idx = section_markers['education'] + 1
-            # Find the next section boundary
-            end_idx = len(lines)
-            for section_name, idx in section_markers.items():
-                if section_name != 'education' and idx > start_idx and idx < end_idx:
-                    end_idx = idx
-            
-            for i in range(start_idx, end_idx):
-                if i < len(lines):
-                    line_clean = lines[i].strip()
-                    if (line_clean and len(line_clean) > 10 and 
-                        not line_clean.startswith('---') and  # Skip page markers
-                        not any(skip_word in line_clean.lower() for skip_word in ['visualization', 'completed', 'google', 'virtual', 'internship', 'cricket', 'analytics', 'scraped', 'eda'])):
-                        education_lines.append(line_clean)
-        
-        # Fallback: look for degree patterns if no section found
-        if not education_lines:
-            for line in lines:
-                line_clean = line.strip()
-                line_lower = line_clean.lower()
-                if (any(pattern in line_lower for pattern in ['bachelor', 'master', 'b.tech', 'm.tech', 'b.sc', 'm.sc', 'b.e.', 'university', 'college', 'cgpa', 'gpa', 'percentage']) and 
-                    len(line_clean) > 15 and
-                    not any(skip_word in line_lower for skip_word in ['visualization', 'completed', 'google', 'virtual', 'internship', 'cricket', 'analytics'])):
-                    education_lines.append(line_clean)
-        
-        # Clean and deduplicate
-        unique_education_lines = []
-        seen_content = set()
-        for line in education_lines:
-            # Create a normalized version for comparison
-            normalized = ' '.join(line.lower().split())
-            if normalized not in seen_content and len(line) > 10:
-                unique_education_lines.append(line)
-                seen_content.add(normalized)
-        
-        if unique_education_lines:
-            education_info = '\n'.join(unique_education_lines[:3])  # Limit to 3 lines
-        
-        # Extract experience with improved boundary detection
-        experience_info = "Experience details would be extracted here"
-        experience_lines = []
-        
-        # Extract experience content within proper boundaries
-        if 'experience' in section_markers:
-            start_idx = section_markers['experience'] + 1
-            # Find the next section boundary
-            end_idx = len(lines)
-            for section_name, idx in section_markers.items():
-                if section_name != 'experience' and idx > start_idx and idx < end_idx:
-                    end_idx = idx
-            
-            for i in range(start_idx, end_idx):
-                if i < len(lines):
-                    line_clean = lines[i].strip()
-                    if (line_clean and len(line_clean) > 15 and 
-                        not line_clean.startswith('---') and  # Skip page markers
-                        not any(skip_word in line_clean.lower() for skip_word in ['college', 'university', 'cgpa', 'gpa', 'percentage', 'b.e.', 'b.tech', 'engineering', 'sep 2023', 'july 2021', 'april 2023'])):
-                        experience_lines.append(line_clean)
-        
-        # Fallback: look for job/internship patterns if no section found
-        if not experience_lines:
-            for line in lines:
-                line_clean = line.strip()
-                line_lower = line_clean.lower()
-                if (any(pattern in line_lower for pattern in ['intern', 'internship', 'virtual internship', 'aicte', 'eduskills']) and 
-                    len(line_clean) > 20 and
-                    not any(skip_word in line_lower for skip_word in ['college', 'university', 'cgpa', 'gpa', 'percentage', 'b.e.', 'b.tech', 'sep 2023', 'july 2021'])):
-                    experience_lines.append(line_clean)
-        
-        # Clean and deduplicate
-        unique_experience_lines = []
-        seen_exp_content = set()
-        for line in experience_lines:
-            normalized = ' '.join(line.lower().split())
-            if normalized not in seen_exp_content and len(line) > 15:
-                unique_experience_lines.append(line)
-                seen_exp_content.add(normalized)
-        
-        if unique_experience_lines:
-            experience_info = '\n'.join(unique_experience_lines[:4])  # Limit to 4 lines
-        
-        # Extract projects with improved boundary detection
-        projects_info = "Project details would be extracted here"
-        project_lines = []
-        
-        # Extract projects content within proper boundaries
-        if 'projects' in section_markers:
-            start_idx = section_markers['projects'] + 1
-            # Find the next section boundary
-            end_idx = len(lines)
-            for section_name, idx in section_markers.items():
-                if section_name != 'projects' and idx > start_idx and idx < end_idx:
-                    end_idx = idx
-            
-            for i in range(start_idx, end_idx):
-                if i < len(lines):
-                    line_clean = lines[i].strip()
-                    if (line_clean and len(line_clean) > 15 and 
-                        not line_clean.startswith('---') and  # Skip page markers
-                        not any(skip_word in line_clean.lower() for skip_word in ['college', 'university', 'cgpa', 'internship', 'aicte', 'eduskills', 'sep 2023', 'july 2021', 'july 2024', 'sept 2024'])):
-                        project_lines.append(line_clean)
-        
-        # Fallback: look for project patterns if no section found
-        if not project_lines:
-            for line in lines:
-                line_clean = line.strip()
-                line_lower = line_clean.lower()
-                if (any(pattern in line_lower for pattern in ['cricket player performance analysis', 'indian cricket', 'scraped player statistics', 'exploratory data analysis', 'power bi']) and 
-                    len(line_clean) > 25 and
-                    not any(skip_word in line_lower for skip_word in ['college', 'university', 'cgpa', 'internship', 'aicte', 'eduskills'])):
-                    project_lines.append(line_clean)
-        
-        # Clean and deduplicate
-        unique_project_lines = []
-        seen_proj_content = set()
-        for line in project_lines:
-            normalized = ' '.join(line.lower().split())
-            if normalized not in seen_proj_content and len(line) > 15:
-                unique_project_lines.append(line)
-                seen_proj_content.add(normalized)
-        
-        if unique_project_lines:
-            projects_info = '\n'.join(unique_project_lines[:4])  # Limit to 4 lines
-        
-        # Extract certifications with improved boundary detection
-        certifications_info = "Certifications would be extracted here"
-        cert_lines = []
-        
-        # Extract certifications content within proper boundaries
-        if 'certifications' in section_markers:
-            start_idx = section_markers['certifications'] + 1
-            # Find the next section boundary (or end of document)
-            end_idx = len(lines)
-            for section_name, idx in section_markers.items():
-                if section_name != 'certifications' and idx > start_idx and idx < end_idx:
-                    end_idx = idx
-            
-            for i in range(start_idx, end_idx):
-                if i < len(lines):
-                    line_clean = lines[i].strip()
-                    if (line_clean and len(line_clean) > 15 and 
-                        not line_clean.startswith('---') and  # Skip page markers
-                        not any(skip_word in line_clean.lower() for skip_word in ['college', 'university', 'cgpa', 'project', 'analysis', 'cricket', 'scraped', 'eda', 'power bi', 'beautifulsoup'])):
-                        cert_lines.append(line_clean)
-        
-        # Fallback: look for certification patterns if no section found
-        if not cert_lines:
-            for line in lines:
-                line_clean = line.strip()
-                line_lower = line_clean.lower()
-                if (any(pattern in line_lower for pattern in ['aiml virtual internship', 'aicte', 'eduskills', 'supported by google']) and 
-                    len(line_clean) > 20 and
-                    not any(skip_word in line_lower for skip_word in ['college', 'university', 'cgpa', 'cricket', 'analytics', 'scraped', 'eda', 'power bi'])):
-                    cert_lines.append(line_clean)
-        
-        # Clean and deduplicate
-        unique_cert_lines = []
-        seen_cert_content = set()
-        for line in cert_lines:
-            normalized = ' '.join(line.lower().split())
-            if normalized not in seen_cert_content and len(line) > 15:
-                unique_cert_lines.append(line)
-                seen_cert_content.add(normalized)
-        
-        if unique_cert_lines:
-            certifications_info = '\n'.join(unique_cert_lines[:3])  # Limit to 3 lines
-        
-        # Role suggestions based on detected skills and job role
-        role_suggestions = []
-        
-        # Data Science roles
-        if any(skill in detected_skills for skill in ["Python", "Machine Learning", "Data Science", "TensorFlow", "PyTorch", "Pandas", "SQL"]):
-            role_suggestions.extend(["Data Scientist", "Machine Learning Engineer", "Data Analyst"])
-        
-        # Frontend roles
-        if any(skill in detected_skills for skill in ["JavaScript", "React", "Angular", "Vue.js", "HTML", "CSS", "TypeScript"]):
-            role_suggestions.extend(["Frontend Developer", "Full Stack Developer", "Web Developer"])
-        
-        # Backend roles
-        if any(skill in detected_skills for skill in ["Node.js", "Express", "Django", "Flask", "Spring Boot", "Java", "C#"]):
-            role_suggestions.extend(["Backend Developer", "Full Stack Developer", "Software Engineer"])
-        
-        # DevOps roles
-        if any(skill in detected_skills for skill in ["Docker", "Kubernetes", "AWS", "Azure", "Linux", "CI/CD", "Jenkins"]):
-            role_suggestions.extend(["DevOps Engineer", "Cloud Engineer", "Site Reliability Engineer"])
-        
-        # Mobile roles
-        if any(skill in detected_skills for skill in ["Swift", "Kotlin", "Flutter", "React Native"]):
-            role_suggestions.extend(["Mobile Developer", "iOS Developer", "Android Developer"])
-        
-        # Design roles
-        if any(skill in detected_skills for skill in ["Figma", "Sketch", "Photoshop", "UI/UX", "Design"]):
-            role_suggestions.extend(["UI/UX Designer", "Product Designer", "Graphic Designer"])
-        
-        # Remove duplicates and limit to top 3
-        role_suggestions = list(dict.fromkeys(role_suggestions))[:3]
-        
-        if not role_suggestions:
-            role_suggestions = ["Software Engineer", "Developer", "Technical Specialist"]
-        
-        # Calculate scores based on content - improved algorithm
-        # Structure score: based on sections and organization
-        has_contact = email != "Not found" or phone != "Not found" or location != "Location not found"
-        has_education = "education" in text_lower or "degree" in text_lower or "university" in text_lower
-        has_experience = "experience" in text_lower or "work" in text_lower or "intern" in text_lower
-        
-        structure_score = 60  # Base score
-        if has_contact: structure_score += 15
-        if has_education: structure_score += 10
-        if has_experience: structure_score += 10
-        if len(detected_skills) > 5: structure_score += 5
-        structure_score = min(95, structure_score)
-        
-        # Skills score: based on number and relevance of skills
-        skills_score = min(95, 40 + (len(detected_skills) * 4))  # More generous scoring
-        
-        # Content score: based on completeness of information
-        content_score = 50  # Base score
-        if email != "Not found": content_score += 20
-        if phone != "Not found": content_score += 15
-        if location != "Location not found": content_score += 10
-        if has_education: content_score += 5
-        content_score = min(95, content_score)
-        
-        # ATS score: based on keywords and formatting
-        ats_score = 60  # Base score
-        if len(detected_skills) > 3: ats_score += 10
-        if len(detected_skills) > 6: ats_score += 10
-        if len(detected_skills) > 10: ats_score += 10
-        if has_contact and has_education and has_experience: ats_score += 5
-        ats_score = min(95, ats_score)
-        
-        # Overall score: weighted average with emphasis on skills and ATS
-        # Skills and ATS are more important for modern resume screening
-        overall_score = int((structure_score * 0.2 + skills_score * 0.3 + content_score * 0.2 + ats_score * 0.3))
-        overall_score = min(95, max(50, overall_score))  # Ensure reasonable range
-        
-        return {
-            "parsedText": extracted_text,
-            "sections": {
-                "contactInfo": {
-                    "name": name,
-                    "email": email,
-                    "phone": phone,
-                    "location": location
-                },
-                "education": education_info,
-                "skills": detected_skills,
-                "experience": experience_info,
-                "projects": projects_info,
-                "certifications": certifications_info
-            },
-            "overallScore": overall_score,
-            "scoreBreakdown": {
-                "structureScore": structure_score,
-                "skillsScore": skills_score,
-                "contentScore": content_score,
-                "atsCompatibility": ats_score
-            },
-            "issues": [
-                "Consider adding more quantifiable achievements",
-                "Include specific project metrics and results",
-                "Add relevant certifications for your field"
-            ],
-            "suggestedKeywords": ["Agile", "Scrum", "CI/CD", "Testing", "Problem Solving"],
-            "missingComponents": ["Professional summary could be enhanced"],
-            "suggestedRoles": role_suggestions,
-            "enhancedBullets": [
-                {
-                    "original": "worked on projects",
-                    "improved": "developed and delivered high-impact projects that improved system performance by 25%",
-                    "section": "projects"
-                }
-            ],
-            "processingTime": 1200,
-            "aiServiceVersion": "1.0.0-enhanced"
-        }
-        
-    except HTTPException:
-        # Re-raise HTTPExceptions as-is (don't convert to 500)
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+os.environ.setdefault("ANALYSIS_MODE", "quick")
 
-@app.post("/generate-resume")
-async def generate_enhanced_resume(
-    analysis_data: dict,
-    accepted_enhancements: list = None
-):
-    # Mock PDF generation
-    return {
-        "file_path": "mock_resume.pdf",
-        "filename": f"enhanced_{analysis_data.get('uploadedFileName', 'resume')}.pdf",
-        "metadata": {
-            "total_sections": 5,
-            "has_contact_info": True,
-            "skills_count": 4,
-            "enhancement_count": 1,
-            "overall_score": 75,
-            "ats_optimized": True
-        },
-        "size_bytes": 1024
-    }
+from main import app  # noqa: E402  (reads ANALYSIS_MODE on import)
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8002)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8002)
@@ -1,20 +1,68 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import Body, FastAPI, UploadFile, File, Form, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from typing import Dict, List, Optional, Tuple
 import uvicorn
 import os
+import asyncio
+import hmac
+import itertools
+import logging
+import time
+import zipfile
 from dotenv import load_dotenv
 
-from modules.ocr_processor import OCRProcessor
-from modules.section_classifier import SectionClassifier
-from modules.scoring_engine import ScoringEngine
-from modules.enhancement_engine import EnhancementEngine
-from modules.recommendation_engine import RecommendationEngine
 from modules.resume_generator import ResumeGenerator
-from modules.keyword_analyzer import KeywordAnalyzer
+from modules.taxonomy import taxonomy_store
+from modules.llm_cache import get_llm_cache, normalize_input
+from modules.result_cache import DEFAULT_CACHE_PATH as DEFAULT_RESULT_CACHE_PATH, ResultCache
+from modules.singleflight import SingleFlight
+from modules.analysis_store import AnalysisStore
+from modules.analysis_pipeline import (
+    ANALYSIS_MODES, PIPELINE_VERSION, AnalysisEngines, AnalysisPipelines, InsufficientTextError, NotAResumeError,
+    analysis_response, compact_response, parse_fields, select_fields
+)
+from modules.pipeline import PipelineResult
+from modules.executor import ExecutionLayer, QueueFullError
+from modules.job_queue import DEFAULT_QUEUE_PATH, DEFAULT_SPOOL_DIR, JobQueue
+from modules.job_worker import JobWorker
+from modules.scheduler import BULK, INTERACTIVE
+from modules.bulk import BulkItem, analyze_items, archive_items, archive_members, upload_items
+from modules.ingest import BodySizeLimit, NotPDFError, SpooledUpload, UploadTooLargeError, spool_upload
+from modules.profiling import DEFAULT_PROFILE_DIR, ProfileStore, profile_run, top_functions
+from modules.sampler import StackSampler
+from modules.logs import RequestContext, configure_logging, elapsed_ms
+from modules.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, STAGE_SECONDS, Counter, Gauge, RequestsInFlight
+from modules.tracing import TRACER, TraceContext, current_traceparent, span
+from modules.encoding import Compression, FastJSONResponse, dumps
 
 load_dotenv()
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Responses are encoded with orjson when it is installed
+app = FastAPI(title="Smart CV Analyzer AI Service", version="1.0.0", default_response_class=FastJSONResponse)
+
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Refuse oversized bodies with 413 as they arrive, before the multipart parser spools them
+app.add_middleware(
+    BodySizeLimit,
+    default_limit=MAX_FILE_SIZE + 64 * 1024,  # Room for the form fields around the file
+    path_limits={"/analyze-bulk": int(os.getenv("BULK_MAX_REQUEST_SIZE", str(200 * 1024 * 1024)))}
+)
+
+# brotli or gzip for JSON and NDJSON responses, as the client accepts
+app.add_middleware(Compression)
 
-app = FastAPI(title="Smart CV Analyzer AI Service", version="1.0.0")
+# Requests in flight, counted until the response has been sent
+app.add_middleware(RequestsInFlight)
+
+# Server span per request, continuing the caller's traceparent (TRACE_EXPORTER)
+app.add_middleware(TraceContext)
+
+# Request IDs for log records, echoed in X-Request-ID
+app.add_middleware(RequestContext)
 
 # CORS middleware
 app.add_middleware(
@@ -25,117 +73,595 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize AI modules
-ocr_processor = OCRProcessor()
-section_classifier = SectionClassifier()
-scoring_engine = ScoringEngine()
-enhancement_engine = EnhancementEngine()
-recommendation_engine = RecommendationEngine()
+# Blocking stages run in process/thread pools so the event loop stays free
+execution = ExecutionLayer()
+
+# Initialize AI modules (OCR and models live in the worker processes if enabled)
+engines = AnalysisEngines(load_models=not execution.uses_processes)
+enhancement_engine = engines.enhancement_engine
 resume_generator = ResumeGenerator()
-keyword_analyzer = KeywordAnalyzer()
+analysis_store = AnalysisStore()
+# Whole responses by (file hash, job role, pipeline version), for retried and re-submitted uploads
+result_cache = ResultCache(os.getenv("RESULT_CACHE_PATH", DEFAULT_RESULT_CACHE_PATH))
+# Identical analyses running at the same moment (client retries) share one pipeline run
+inflight_analyses = SingleFlight()
+# pstats files of analyses an admin asked to profile
+profile_store = ProfileStore(os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR))
+# Rolling profile of where every thread spends its time, at about 1% of a core
+stack_sampler = StackSampler()
+
+# Independent stages run concurrently; enhancement is inline in deep mode or on request
+analysis_pipelines = AnalysisPipelines(
+    engines, enhance=enhancement_engine.enhance_content_async, use_processes=execution.uses_processes
+)
+# Mode of requests that do not name one (the legacy entry points set it)
+DEFAULT_MODE = os.getenv("ANALYSIS_MODE", "standard")
+
+# Queued analyses (/jobs), processed by worker loops in this process and by
+# any `python -m modules.job_worker` processes sharing the queue file
+job_queue = JobQueue(os.getenv("JOB_QUEUE_PATH", DEFAULT_QUEUE_PATH), os.getenv("JOB_SPOOL_DIR", DEFAULT_SPOOL_DIR))
+job_worker = JobWorker(job_queue, execution, pipelines=analysis_pipelines, store=analysis_store)
+job_worker_task = None
+
+def service_metrics():
+    """Cache, queue and admission figures the service already keeps, for /metrics"""
+    lookups = Counter("cv_analyzer_cache_lookups_total", "Cache lookups by cache and outcome",
+                      ["cache", "result"], registry=None)
+    hit_ratio = Gauge("cv_analyzer_cache_hit_ratio", "Share of cache lookups that were hits", ["cache"],
+                      registry=None)
+    results = result_cache.stats()
+    llm = get_llm_cache().stats()
+    for cache, hits, misses, rate in (
+        ("result", results["memory_hits"] + results["disk_hits"], results["misses"], results["hit_rate"]),
+        ("llm", llm["hits"], llm["misses"], llm["hit_rate"]),
+    ):
+        lookups.set_total(hits, cache=cache, result="hit")
+        lookups.set_total(misses, cache=cache, result="miss")
+        hit_ratio.set(rate, cache=cache)
+    
+    coalesced = Counter("cv_analyzer_coalesced_analyses_total",
+                        "Analyses that joined an identical one already running", registry=None)
+    coalesced.set_total(inflight_analyses.stats()["coalesced"])
+    
+    depth = Gauge("cv_analyzer_queue_depth", "Analyses waiting, per queue and priority lane",
+                  ["queue", "lane"], registry=None)
+    running = Gauge("cv_analyzer_lane_running", "Analyses running, per priority lane", ["lane"], registry=None)
+    for lane, state in execution.scheduler.stats()["lanes"].items():
+        depth.set(state["waiting"], queue="scheduler", lane=lane)
+        running.set(state["running"], lane=lane)
+    for lane, state in job_queue.lane_stats().items():
+        depth.set(state["queued"], queue="jobs", lane=lane)
+    
+    execution_stats = execution.stats()
+    in_flight = Gauge("cv_analyzer_analyses_in_flight", "Analyses admitted and not yet finished", registry=None)
+    in_flight.set(execution_stats["pending"])
+    rejected = Counter("cv_analyzer_analyses_rejected_total",
+                       "Analyses refused with 503 because too many were in flight", registry=None)
+    rejected.set_total(execution_stats["rejected"])
+    
+    sampler_overhead = Gauge("cv_analyzer_sampler_overhead_ratio",
+                             "Share of wall time the stack sampler spends sampling", registry=None)
+    sampler_overhead.set(stack_sampler.stats()["overhead"])
+    return [lookups, hit_ratio, coalesced, depth, running, in_flight, rejected, sampler_overhead]
+
+REGISTRY.add_collector(service_metrics)
+
+@app.on_event("startup")
+async def start_taxonomy_watch():
+    # Compile the keyword taxonomy up front and pick up edits without a restart
+    taxonomy_store.get()
+    taxonomy_store.watch(float(os.getenv("TAXONOMY_RELOAD_INTERVAL", "30")))
+
+@app.on_event("startup")
+async def start_stack_sampler():
+    if os.getenv("SAMPLER_ENABLED", "true").lower() not in ("0", "false", "no", "off"):
+        stack_sampler.start()
+
+@app.on_event("startup")
+async def start_job_workers():
+    global job_worker_task
+    loops = int(os.getenv("JOB_WORKERS", "2"))
+    if loops > 0:
+        job_worker_task = asyncio.ensure_future(job_worker.serve(loops))
+
+@app.on_event("shutdown")
+async def stop_workers():
+    # Jobs cut short here are picked up again once their lease expires
+    if job_worker_task is not None:
+        job_worker_task.cancel()
+    stack_sampler.stop()
+    execution.shutdown()
+    TRACER.exporter.flush()
 
 @app.get("/health")
 async def health_check():
-    return {"status": "OK", "message": "AI Service is running"}
+    return {
+        "status": "OK",
+        "message": "AI Service is running",
+        "analysisModes": list(ANALYSIS_MODES),
+        "defaultMode": DEFAULT_MODE,
+        "execution": execution.stats(),
+        "coalescing": inflight_analyses.stats()
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Stage latencies, cache hit ratios, queue depths and load in Prometheus text format"""
+    return PlainTextResponse(await asyncio.to_thread(REGISTRY.render), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/cache/llm")
+async def llm_cache_stats():
+    """Hit rate and size of the LLM response cache"""
+    return await asyncio.to_thread(get_llm_cache().stats)
+
+@app.get("/cache/results")
+async def result_cache_stats():
+    """Hit rate and size of the analysis response cache"""
+    return result_cache.stats()
+
+async def read_upload(file: UploadFile) -> SpooledUpload:
+    """
+    Copy an uploaded resume to a temporary file in chunks, hashing it on the way
+    
+    Anything but a PDF of at most 10MB is rejected; the caller removes the file.
+    """
+    # Validate file type - Only PDF files allowed
+    allowed_types = ['application/pdf']
+    if file.content_type not in allowed_types:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Unsupported file type: {file.content_type}. Only PDF files are allowed."
+        )
+    
+    # Validate file size (10MB limit) and signature while copying
+    try:
+        with STAGE_SECONDS.time(stage="upload"), span("upload"):
+            return await asyncio.to_thread(spool_upload, file.file, file.filename, MAX_FILE_SIZE)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except NotPDFError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def remove_upload(upload: SpooledUpload):
+    try:
+        os.remove(upload.path)
+    except OSError as e:
+        logger.warning("Failed to clean up temp file %s: %s", upload.path, e)
+
+def require_admin(token: Optional[str]):
+    """Refuse the request unless it carries ADMIN_TOKEN in its X-Admin-Token header"""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Admin features are disabled. Set ADMIN_TOKEN to enable them.")
+    if token is None or not hmac.compare_digest(token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Admin-Token header.")
+
+def check_mode(mode: Optional[str]) -> str:
+    """The requested analysis mode, or the default one"""
+    mode = (mode or DEFAULT_MODE).lower()
+    if mode not in ANALYSIS_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown mode: {mode}. Use one of: {', '.join(ANALYSIS_MODES)}"
+        )
+    return mode
+
+def check_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """The response fields a request asked for, or None for all of them"""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def check_priority(priority: str):
+    if priority not in execution.scheduler.lanes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown priority: {priority}. Use one of: {', '.join(execution.scheduler.lanes)}"
+        )
+
+def cache_headers(status: str, key: str, created: Optional[float] = None) -> Dict[str, str]:
+    """Response headers telling clients how the result cache served an analysis"""
+    if status == "HIT":
+        headers = {"Age": str(int(time.time() - created))}
+    else:
+        headers = {}
+    headers.update({
+        "X-Cache": status,
+        "Cache-Control": f"private, max-age={int(result_cache.ttl)}" if result_cache.enabled else "no-store",
+        "ETag": f'"{key}"',
+    })
+    return headers
+
+async def profile_pipeline(pipeline, inputs: Dict, admit: bool = True,
+                           lane: str = INTERACTIVE) -> Tuple[PipelineResult, dict]:
+    """Run a pipeline the normal way under cProfile, store the profile and summarize it"""
+    result, stats = await profile_run(lambda: execution.run(pipeline, inputs, admit=admit, lane=lane))
+    profile_id = await asyncio.to_thread(profile_store.save, stats)
+    return result, {
+        "profileId": profile_id,
+        "profileUrl": f"/profiles/{profile_id}",
+        "topFunctions": top_functions(stats),
+    }
+
+async def analyze_content(upload: SpooledUpload, job_role: str, include_enhancements: bool = False,
+                          lane: str = INTERACTIVE, admit: bool = True, refresh: bool = False,
+                          profile: bool = False, mode: str = "standard",
+                          fields: Optional[Tuple[str, ...]] = None) -> Tuple[dict, Dict[str, str]]:
+    """
+    Analyze a spooled PDF upload, from the result cache when it has been seen before
+    
+    A request for an analysis that is already running waits for that run
+    instead of starting another. The upload's file is removed once it is no
+    longer needed: right away unless this request starts the pipeline run,
+    otherwise when the run is over (other requests may be waiting for it).
+    
+    Args:
+        refresh: Skip the cache lookup; the fresh result replaces the cached one
+        profile: Run the pipeline on its own under cProfile (implies refresh); the
+            response gets a "profile" summary linking to the stored pstats file
+        mode: quick, standard or deep; deep always includes enhancements
+        fields: Response fields wanted; only the stages they need run, and a
+            cached full analysis of the same upload can answer
+    
+    Returns:
+        The analysis response and cache headers for it
+    
+    Raises:
+        InsufficientTextError: If too little text can be read; NotAResumeError
+            if the text is not a resume
+        QueueFullError: If too many analyses are in flight
+    """
+    job_role = normalize_input(job_role)
+    # A full analysis that has everything the fields need, and its own key
+    full_enhancements = analysis_pipelines.includes_enhancements(
+        mode, include_enhancements or (fields is not None and "enhancedBullets" in fields)
+    )
+    full_key = ResultCache.make_key(upload.sha256, job_role, full_enhancements, PIPELINE_VERSION, mode)
+    include_enhancements = analysis_pipelines.includes_enhancements(mode, include_enhancements, fields)
+    cache_key = ResultCache.make_key(upload.sha256, job_role, include_enhancements, PIPELINE_VERSION, mode, fields)
+    computing = False
+    profile_summary = None
+    
+    async def compute() -> dict:
+        nonlocal computing, profile_summary
+        computing = True
+        try:
+            logger.info("Analyzing resume", extra={"size_bytes": upload.size, "job_role": job_role, "lane": lane,
+                                                   "mode": mode, "fields": fields})
+            
+            pipeline = analysis_pipelines.get(mode, include_enhancements, fields)
+            inputs = {"file_path": upload.path, "job_role": job_role}
+            if profile:
+                result, profile_summary = await profile_pipeline(pipeline, inputs, admit=admit, lane=lane)
+            else:
+                result = await execution.run(pipeline, inputs, admit=admit, lane=lane)
+        finally:
+            # Clean up temp file
+            remove_upload(upload)
+        response = analysis_response(result, mode, fields)
+        await asyncio.to_thread(result_cache.set, cache_key, response)
+        return response
+    
+    def lookup():
+        cached = result_cache.get(cache_key)
+        if cached is None and fields is not None:
+            full = result_cache.get(full_key)
+            if full is not None:
+                cached = full._replace(value=select_fields(full.value, fields))
+        return cached
+    
+    try:
+        cached = None if refresh or profile else await asyncio.to_thread(lookup)
+        if profile:
+            # Never shared: the profile has to be of this request's own run
+            response = await compute()
+            headers = cache_headers("BYPASS", cache_key)
+        elif cached is not None:
+            logger.info("Serving cached analysis", extra={"cache": "HIT", "job_role": job_role})
+            response = cached.value
+            headers = cache_headers("HIT", cache_key, cached.created)
+        else:
+            response, shared = await inflight_analyses.do(cache_key, compute)
+            if shared:
+                logger.info("Joined running analysis", extra={"cache": "COALESCED", "job_role": job_role})
+            headers = cache_headers("COALESCED" if shared else "BYPASS" if refresh else "MISS", cache_key)
+    finally:
+        if not computing:
+            remove_upload(upload)
+    
+    # Bullet enhancement is served by /enhancements/{id} unless asked for inline. Cached
+    # responses get a new ID too: the store forgets IDs long before the result cache expires.
+    if "sections" in response:
+        analysis_id = analysis_store.create(
+            response["sections"], job_role, enhancements=response["enhancedBullets"] if include_enhancements else None
+        )
+        analysis = {"analysisId": analysis_id, **response, "enhancementsUrl": f"/enhancements/{analysis_id}"}
+    else:
+        analysis = dict(response)
+    if profile_summary is not None:
+        analysis["profile"] = profile_summary
+    return analysis, headers
 
 @app.post("/analyze-resume")
 async def analyze_resume(
     file: UploadFile = File(...),
-    jobRole: str = Form(...)
+    jobRole: str = Form(...),
+    includeEnhancements: bool = Form(False),
+    mode: Optional[str] = Form(None),
+    fields: Optional[str] = Form(None),
+    compact: bool = Form(False),
+    noCache: bool = Form(False),
+    cache_control: Optional[str] = Header(None),
+    profile: bool = Query(False),
+    x_profile: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None)
 ):
-    import time
+    """
+    Analyze a resume
+    
+    mode picks the depth: quick (text layer and rules only, tens of
+    milliseconds), standard (adds OCR fallback, spaCy and the zero-shot
+    section model) or deep (adds inline LLM enhancements and the aiAnalysis
+    review); the response names it.
+    fields (comma-separated, e.g. overallScore,scoreBreakdown) limits the
+    response to those fields and skips the stages they do not need; only
+    responses with sections get an analysisId. compact=true returns sections
+    as offsets into parsedText instead of copies of the text.
+    Identical uploads for the same job role are served from the result cache;
+    send noCache=true or a `Cache-Control: no-cache` header to re-run the analysis.
+    Admins can profile the analysis with ?profile=true or `X-Profile: 1` plus
+    their `X-Admin-Token`.
+    """
     start_time = time.time()
-    temp_file_path = None
+    start = time.perf_counter()
+    refresh = noCache or "no-cache" in (cache_control or "").lower()
+    profile = profile or (x_profile or "").lower() in ("1", "true", "yes")
+    if profile:
+        require_admin(x_admin_token)
+    mode = check_mode(mode)
+    fields = check_fields(fields)
     
     try:
-        # Validate file type - Only PDF files allowed
-        allowed_types = ['application/pdf']
-        if file.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported file type: {file.content_type}. Only PDF files are allowed."
-            )
-        
-        # Validate file size (10MB limit)
-        max_size = 10 * 1024 * 1024  # 10MB
-        content = await file.read()
-        if len(content) > max_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size too large: {len(content)} bytes. Maximum allowed: {max_size} bytes"
-            )
-        
-        # Save uploaded file temporarily
-        temp_file_path = f"temp_{int(time.time())}_{file.filename}"
-        with open(temp_file_path, "wb") as buffer:
-            buffer.write(content)
-        
-        print(f"Processing file: {file.filename}, Size: {len(content)} bytes, Job Role: {jobRole}")
-        
-        # Extract text using OCR
-        print("Starting OCR extraction...")
-        extracted_text = ocr_processor.extract_text(temp_file_path)
-        
-        if not extracted_text or len(extracted_text.strip()) < 50:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract sufficient text from the file. Please ensure the file is readable and contains text."
-            )
-        
-        print(f"OCR completed. Extracted {len(extracted_text)} characters")
-        
-        # Classify sections
-        print("Starting section classification...")
-        sections = section_classifier.classify_sections(extracted_text)
-        
-        # Calculate score
-        print("Calculating resume score...")
-        score_result = scoring_engine.calculate_score(sections, jobRole)
-        
-        # Analyze keywords and job role matching
-        print("Analyzing keywords...")
-        keyword_analysis = keyword_analyzer.analyze_keywords(sections, jobRole)
-        
-        # Generate recommendations
-        print("Generating recommendations...")
-        recommendations = recommendation_engine.generate_recommendations(sections, score_result)
-        
-        # Enhance bullet points
-        print("Enhancing content...")
-        enhancements = enhancement_engine.enhance_content(sections)
+        upload = await read_upload(file)
+        try:
+            analysis, headers = await analyze_content(upload, jobRole, includeEnhancements,
+                                                      refresh=refresh, profile=profile, mode=mode, fields=fields)
+        except NotAResumeError as e:
+            raise HTTPException(status_code=400, detail=e.rejection)
+        except InsufficientTextError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
         
         processing_time = time.time() - start_time
-        print(f"Analysis completed in {processing_time:.2f} seconds")
+        logger.info("Analysis completed", extra={"stage": "total", "duration_ms": elapsed_ms(start)})
         
-        return {
-            "parsedText": extracted_text,
-            "sections": sections,
-            "overallScore": score_result["overall_score"],
-            "scoreBreakdown": score_result["breakdown"],
-            "issues": recommendations["issues"],
-            "suggestedKeywords": keyword_analysis["missing_keywords"],
-            "missingComponents": recommendations["missing_components"],
-            "enhancedBullets": enhancements,
-            "keywordAnalysis": keyword_analysis,
+        analysis = {
+            **analysis,
             "processingTime": processing_time,
             "aiServiceVersion": "1.0.0"
         }
+        # Returned as a response so FastAPI does not walk the whole analysis before encoding it
+        return FastJSONResponse(compact_response(analysis) if compact else analysis, headers=headers)
         
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
-        print(f"Error during analysis: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Analysis failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
-    finally:
-        # Clean up temp file
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-                print(f"Cleaned up temp file: {temp_file_path}")
-            except Exception as e:
-                print(f"Failed to clean up temp file {temp_file_path}: {e}")
+
+@app.post("/analyze-bulk")
+async def analyze_bulk(
+    jobRole: str = Form(...),
+    files: List[UploadFile] = File(None),
+    archive: Optional[UploadFile] = File(None),
+    includeEnhancements: bool = Form(False),
+    mode: Optional[str] = Form(None),
+    fields: Optional[str] = Form(None),
+    compact: bool = Form(False),
+    priority: str = Form(BULK),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Analyze many resumes, from a list of PDFs and/or a ZIP archive of them
+    
+    Streams one NDJSON line per file as soon as it is analyzed (in completion
+    order, with the file's index and name), then a summary line.
+    Runs in the bulk lane; only admins (with their `X-Admin-Token`) can move
+    a request into the interactive lane.
+    """
+    check_priority(priority)
+    if priority == INTERACTIVE:
+        # A bulk request in the interactive lane would delay every single upload
+        require_admin(x_admin_token)
+    mode = check_mode(mode)
+    fields = check_fields(fields)
+    files = files or []
+    zip_archive = None
+    if archive is not None:
+        try:
+            zip_archive = zipfile.ZipFile(archive.file)
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail=f"{archive.filename} is not a valid ZIP archive")
+    
+    max_files = int(os.getenv("BULK_MAX_FILES", "1000"))
+    total = len(files) + (len(archive_members(zip_archive)) if zip_archive else 0)
+    if total == 0:
+        raise HTTPException(status_code=400, detail="No files to analyze. Send files or a ZIP archive.")
+    if total > max_files:
+        raise HTTPException(status_code=400, detail=f"Too many files: {total}. Maximum per request: {max_files}")
+    
+    items = list(upload_items(files, MAX_FILE_SIZE))
+    if zip_archive:
+        items = itertools.chain(items, archive_items(zip_archive, MAX_FILE_SIZE, start=len(files)))
+    
+    async def analyze(item: BulkItem, upload: SpooledUpload) -> dict:
+        # Concurrency is bounded per request and by the lane, not by MAX_PENDING_ANALYSES
+        analysis, _ = await analyze_content(upload, jobRole, includeEnhancements, lane=priority, admit=False,
+                                            mode=mode, fields=fields)
+        return compact_response(analysis) if compact else analysis
+    
+    async def stream():
+        start_time = time.time()
+        counts = {"ok": 0, "error": 0}
+        try:
+            async for line in analyze_items(items, analyze, int(os.getenv("BULK_CONCURRENCY", "4"))):
+                counts[line["status"]] += 1
+                yield dumps(line) + b"\n"
+            yield dumps({"summary": {
+                "total": total,
+                "succeeded": counts["ok"],
+                "failed": counts["error"],
+                "processingTime": time.time() - start_time
+            }}) + b"\n"
+        finally:
+            if zip_archive:
+                zip_archive.close()
+    
+    logger.info("Bulk analysis started", extra={"files": total, "job_role": jobRole, "lane": priority, "mode": mode})
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/jobs", status_code=202)
+async def create_job(
+    file: UploadFile = File(...),
+    jobRole: str = Form(...),
+    includeEnhancements: bool = Form(False),
+    mode: Optional[str] = Form(None),
+    fields: Optional[str] = Form(None),
+    priority: str = Form(INTERACTIVE)
+):
+    """Queue a resume for analysis and return its job ID right away"""
+    check_priority(priority)
+    mode = check_mode(mode)
+    fields = check_fields(fields)
+    upload = await read_upload(file)
+    try:
+        job_id = await asyncio.to_thread(
+            job_queue.enqueue,
+            {"job_role": jobRole, "file_name": file.filename, "include_enhancements": includeEnhancements,
+             "mode": mode, "fields": fields, "traceparent": current_traceparent()},
+            lane=priority,
+            upload_path=upload.path
+        )
+    except Exception:
+        remove_upload(upload)
+        raise
+    logger.info("Queued job", extra={"job_id": job_id, "lane": priority, "mode": mode, "size_bytes": upload.size,
+                                     "job_role": jobRole})
+    
+    return {
+        "jobId": job_id,
+        "status": "queued",
+        "priority": priority,
+        "mode": mode,
+        "statusUrl": f"/jobs/{job_id}",
+        "resultUrl": f"/jobs/{job_id}/result"
+    }
+
+def get_job_or_404(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found or expired.")
+    return job
+
+@app.get("/queues")
+async def queue_stats():
+    """Depth, concurrency and wait times of each priority lane"""
+    return {
+        "scheduler": execution.scheduler.stats(),
+        "jobs": await asyncio.to_thread(job_queue.lane_stats)
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of a queued analysis"""
+    job = await asyncio.to_thread(get_job_or_404, job_id)
+    return {
+        "jobId": job.id,
+        "status": job.status,
+        "priority": job.lane,
+        "attempts": job.attempts,
+        "error": job.error,
+        "createdAt": job.created,
+        "updatedAt": job.updated,
+        "resultUrl": f"/jobs/{job.id}/result"
+    }
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str, compact: bool = Query(False)):
+    """Result of a finished analysis; 202 while it is still queued or running, 400 if the upload was rejected"""
+    job = await asyncio.to_thread(get_job_or_404, job_id)
+    if job.status == "done":
+        return FastJSONResponse(compact_response(job.result) if compact else job.result)
+    if job.status == "rejected":
+        # The upload could not be analyzed; the same answer /analyze-resume gives
+        raise HTTPException(status_code=400, detail=job.result if job.result is not None else job.error)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {job.error}")
+    return JSONResponse(status_code=202, content={"jobId": job.id, "status": job.status})
+
+async def enhance_sections(sections: dict) -> list:
+    with STAGE_SECONDS.time(stage="enhancements"), span("enhancements"):
+        return await enhancement_engine.enhance_content_async(sections)
+
+@app.get("/enhancements/{analysis_id}")
+async def get_enhancements(analysis_id: str):
+    """Enhanced bullets for an earlier analysis, computed on first request"""
+    enhancements = await analysis_store.get_enhancements(analysis_id, enhance_sections)
+    if enhancements is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Analysis {analysis_id} not found or expired. Upload the resume again."
+        )
+    
+    return {"analysisId": analysis_id, "enhancedBullets": enhancements}
+
+@app.post("/enhancements")
+async def enhance_posted_sections(sections: dict = Body(..., embed=True)):
+    """Enhanced bullets for sections the caller kept, such as an analysis the store no longer has"""
+    return {"enhancedBullets": await enhance_sections(sections)}
+
+@app.get("/profiles/continuous")
+async def get_continuous_profile(seconds: Optional[float] = Query(None), x_admin_token: Optional[str] = Header(None)):
+    """
+    Collapsed stacks sampled from every busy thread (admins only)
+    
+    Covers the last `seconds` of traffic, or every window the sampler keeps;
+    feed it to flamegraph.pl or speedscope.
+    """
+    require_admin(x_admin_token)
+    stats = stack_sampler.stats()
+    return PlainTextResponse(stack_sampler.collapsed(seconds), headers={
+        "X-Sampler-Samples": str(stats["samples"]),
+        "X-Sampler-Overhead": str(stats["overhead"]),
+    })
+
+@app.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: str = Query("pstats"),
+    sort: str = Query("cumulative"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    A stored analysis profile (admins only)
+    
+    format=pstats downloads the file for `python -m pstats` or snakeviz;
+    format=text returns the report sorted by cumulative, tottime or calls.
+    """
+    require_admin(x_admin_token)
+    if format not in ("pstats", "text"):
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}. Use pstats or text.")
+    if sort not in ("cumulative", "tottime", "calls"):
+        raise HTTPException(status_code=400, detail=f"Unknown sort: {sort}. Use cumulative, tottime or calls.")
+    
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found.")
+    if format == "text":
+        return PlainTextResponse(await asyncio.to_thread(profile_store.report, profile_id, sort))
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.pstats")
 
 @app.post("/generate-resume")
 async def generate_enhanced_resume(
@@ -144,10 +670,11 @@ async def generate_enhanced_resume(
 ):
     try:
         # Generate enhanced resume PDF
-        pdf_bytes = resume_generator.generate_enhanced_resume(
-            analysis_data, 
-            accepted_enhancements or []
-        )
+        with STAGE_SECONDS.time(stage="pdf"), span("pdf"):
+            pdf_bytes = resume_generator.generate_enhanced_resume(
+                analysis_data, 
+                accepted_enhancements or []
+            )
         
         # Save to temporary file
         filename = f"enhanced_resume_{analysis_data.get('uploadedFileName', 'resume')}.pdf"
@@ -0,0 +1,226 @@
+import os
+import json
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+import openai
+from dotenv import load_dotenv
+from modules.llm_cache import get_llm_cache
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+class AIAnalysisEngine:
+    """Overall LLM review of a resume: strengths, weaknesses, suggestions and an ATS score"""
+
+    MODEL = "gpt-3.5-turbo"
+    TEMPERATURE = 0.3
+    # Bump when the analysis prompt changes so cached analyses are not reused
+    PROMPT_VERSION = "1"
+    # Characters of resume text sent to the model
+    TEXT_LIMIT = 2000
+
+    def __init__(self):
+        self.async_client = None
+        if os.getenv('OPENAI_API_KEY'):
+            try:
+                # Retries are disabled: a failed call falls back to the rule-based review
+                self.async_client = openai.AsyncOpenAI(
+                    api_key=os.getenv('OPENAI_API_KEY'),
+                    base_url=os.getenv('OPENAI_BASE_URL') or None,
+                    max_retries=0
+                )
+            except Exception as e:
+                logger.warning("Could not initialize OpenAI client: %s", e)
+
+        self.call_timeout = float(os.getenv('AI_ANALYSIS_TIMEOUT', '20'))
+        self.cache = get_llm_cache()
+
+    def _cache_key(self, text: str, job_role: str) -> str:
+        return self.cache.make_key('resume_analysis', f"{job_role}\n{text[:self.TEXT_LIMIT]}", self.MODEL,
+                                   self.PROMPT_VERSION, self.TEMPERATURE)
+
+    def _cached_analysis(self, key: str) -> Optional[Dict[str, Any]]:
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        try:
+            return self._validate_analysis(json.loads(cached))
+        except ValueError:
+            return None
+
+    def _messages(self, text: str, job_role: str):
+        prompt = f"""
+            Analyze this resume for the role of {job_role}:
+
+            {text[:self.TEXT_LIMIT]}
+
+            Respond with only a JSON object with these keys:
+            1. strengths (list of 3-5 key strengths)
+            2. weaknesses (list of 3-5 areas for improvement)
+            3. suggestions (list of 3-5 specific suggestions)
+            4. overall_impression (brief summary)
+            5. ats_score (0-100 rating for ATS compatibility)
+            """
+        return [{"role": "user", "content": prompt}]
+
+    def _validate_analysis(self, analysis: Any) -> Optional[Dict[str, Any]]:
+        """The model's analysis if it has the expected shape, else None"""
+        if not isinstance(analysis, dict):
+            return None
+        if not all(isinstance(analysis.get(key), list) for key in ('strengths', 'weaknesses', 'suggestions')):
+            return None
+        try:
+            analysis['ats_score'] = max(0, min(100, int(analysis['ats_score'])))
+        except (KeyError, TypeError, ValueError):
+            return None
+        analysis['overall_impression'] = str(analysis.get('overall_impression', ''))
+        return analysis
+
+    def _parse_response(self, content: str) -> Optional[Dict[str, Any]]:
+        """Parse the model's JSON object, tolerating code fences and surrounding prose"""
+        start, end = (content or '').find('{'), (content or '').rfind('}')
+        if start == -1 or end <= start:
+            return None
+        try:
+            return self._validate_analysis(json.loads(content[start:end + 1]))
+        except ValueError:
+            return None
+
+    async def analyze_async(self, text: str, job_role: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Review a resume for a job role with the LLM
+
+        Reviews are cached by text and job role. Without an API key, in cache
+        replay mode, or when the call fails or returns something unusable, the
+        rule-based review is returned instead.
+
+        Args:
+            text: Resume text
+            job_role: Target job role
+            timeout: Seconds allowed for the AI call (defaults to AI_ANALYSIS_TIMEOUT)
+
+        Returns:
+            Dictionary with strengths, weaknesses, suggestions, overall_impression and ats_score
+        """
+        if not self.async_client:
+            return self.rule_based_analysis(text, job_role)
+
+        key = self._cache_key(text, job_role)
+        # The cache is SQLite; keep its I/O off the event loop
+        cached = await asyncio.to_thread(self._cached_analysis, key)
+        if cached is not None:
+            return cached
+        if self.cache.replay:
+            return self.rule_based_analysis(text, job_role)
+
+        timeout = timeout if timeout is not None else self.call_timeout
+        try:
+            response = await asyncio.wait_for(self.async_client.chat.completions.create(
+                model=self.MODEL,
+                messages=self._messages(text, job_role),
+                max_tokens=500,
+                temperature=self.TEMPERATURE,
+                timeout=timeout
+            ), timeout)
+            analysis = self._parse_response(response.choices[0].message.content)
+        except Exception as e:
+            logger.warning("AI resume analysis failed: %s", e)
+            analysis = None
+
+        if analysis is None:
+            return self.rule_based_analysis(text, job_role)
+        await asyncio.to_thread(self.cache.set, key, json.dumps(analysis))
+        return analysis
+
+    def rule_based_analysis(self, text: str, job_role: str) -> Dict[str, Any]:
+        """Review built from what the resume text mentions, for when the AI is not available"""
+        text_lower = text.lower()
+        text_length = len(text.strip())
+
+        has_experience = 'experience' in text_lower or 'work' in text_lower or 'job' in text_lower
+        has_education = 'education' in text_lower or 'degree' in text_lower or 'university' in text_lower
+        has_projects = 'project' in text_lower
+        has_skills = 'skill' in text_lower or 'python' in text_lower or 'javascript' in text_lower
+        has_contact = '@' in text or 'phone' in text_lower or 'email' in text_lower
+
+        strengths = []
+        if has_experience:
+            strengths.append("Demonstrates relevant work experience in the field")
+        if has_education:
+            strengths.append("Strong educational background that supports career goals")
+        if has_projects:
+            strengths.append("Shows practical application of skills through project work")
+        if has_skills:
+            strengths.append("Technical skills align well with industry requirements")
+        if text_length > 1000:
+            strengths.append("Comprehensive resume with detailed information")
+        if not strengths:
+            strengths = [
+                "Resume successfully uploaded and processed",
+                "Clear intent to pursue career in " + job_role,
+                "Demonstrates initiative in seeking career advancement"
+            ]
+
+        weaknesses = []
+        if not has_contact:
+            weaknesses.append("Missing or incomplete contact information")
+        if not has_experience:
+            weaknesses.append("Limited work experience details provided")
+        if not has_skills:
+            weaknesses.append("Technical skills section could be more comprehensive")
+        if text_length < 500:
+            weaknesses.append("Resume content could be more detailed and comprehensive")
+        if 'achievement' not in text_lower and 'accomplish' not in text_lower:
+            weaknesses.append("Could benefit from more quantified achievements and results")
+        if not weaknesses:
+            weaknesses = [
+                "Could include more specific metrics and quantified achievements",
+                "Consider adding more industry-specific keywords",
+                "Professional summary could be more compelling"
+            ]
+
+        if job_role.lower() in ['software engineer', 'developer', 'programmer']:
+            suggestions = [
+                "Add specific programming languages and frameworks you've used",
+                "Include links to GitHub repositories or portfolio projects",
+                "Mention experience with version control systems like Git"
+            ]
+        elif job_role.lower() in ['data analyst', 'data scientist']:
+            suggestions = [
+                "Highlight experience with data analysis tools like SQL, Python, or R",
+                "Include examples of data visualization and reporting projects",
+                "Mention statistical analysis and machine learning experience"
+            ]
+        else:
+            suggestions = [
+                "Tailor your resume specifically for " + job_role + " positions",
+                "Include industry-specific keywords and terminology",
+                "Highlight transferable skills relevant to the target role"
+            ]
+        suggestions.extend([
+            "Use action verbs to start bullet points (achieved, implemented, led)",
+            "Quantify your accomplishments with specific numbers and percentages"
+        ])
+
+        if text_length > 1000 and has_experience and has_skills:
+            impression = f"This is a solid resume for a {job_role} position. The candidate shows relevant experience and skills, with room for enhancement in presentation and quantified achievements."
+        elif text_length > 500:
+            impression = f"Good foundation for a {job_role} resume. With some improvements in detail and formatting, this could be very competitive."
+        else:
+            impression = f"This resume shows potential but needs significant development to be competitive for {job_role} positions. Focus on adding more detailed experience and skills."
+
+        ats_score = 60
+        if has_contact: ats_score += 10
+        if has_experience: ats_score += 10
+        if has_skills: ats_score += 10
+        if has_education: ats_score += 5
+        if text_length > 1000: ats_score += 5
+
+        return {
+            "strengths": strengths[:5],
+            "weaknesses": weaknesses[:5],
+            "suggestions": suggestions[:5],
+            "overall_impression": impression,
+            "ats_score": min(95, ats_score)
+        }
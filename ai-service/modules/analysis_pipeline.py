@@ -0,0 +1,326 @@
+"""
+Resume analysis pipeline definition.
+
+    text -> document (resume check)
+         -> sections -> score -----> recommendations
+                     -> keywords
+                     -> enhancements (optional, async)
+         -> ai_analysis (deep mode, async)
+
+Only recommendations depends on another analysis stage (the score), so
+scoring, keyword analysis and enhancement run concurrently once the sections
+are classified. OCR and classification can instead run as 'process' stages
+in worker processes (see modules.workers).
+
+Every analysis mode runs these stages; the mode decides how deep the text
+and sections stages go:
+
+    quick     text layer only, rule-based sections (no models); tens of ms
+    standard  OCR fallback for scanned PDFs, spaCy name detection, zero-shot
+              transformer for unmatched sections (as the service always did)
+    deep      standard plus LLM enhancements and an LLM review of the whole
+              resume (aiAnalysis; rule-based without an API key)
+
+A request can also name the response fields it needs (RESPONSE_FIELDS); its
+pipeline is then pruned to the stages those fields come from, so asking for
+parsedText alone never classifies sections and asking for keywordAnalysis
+never scores. The resume check always runs.
+
+A full response holds the resume text three times (parsedText, sections.raw
+and each section). ``compact_response`` turns the copies into offsets into
+parsedText instead.
+"""
+
+from functools import partial
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from modules.ocr_processor import OCRProcessor
+from modules.section_classifier import SectionClassifier
+from modules.scoring_engine import ScoringEngine
+from modules.enhancement_engine import EnhancementEngine
+from modules.ai_analysis_engine import AIAnalysisEngine
+from modules.recommendation_engine import RecommendationEngine
+from modules.keyword_analyzer import KeywordAnalyzer
+from modules.pipeline import Pipeline, PipelineResult, Stage
+from modules import workers
+from modules.resume_classifier import ATSResumeClassifier
+from modules.workers import MIN_TEXT_LENGTH, InsufficientTextError
+
+# Part of the result cache key: bump whenever a stage's output changes
+PIPELINE_VERSION = '4'
+
+QUICK = 'quick'
+STANDARD = 'standard'
+DEEP = 'deep'
+# What each mode adds, from fastest to most thorough
+ANALYSIS_MODES = {
+    QUICK: {'ocr': False, 'models': False, 'zero_shot': False, 'enhancements': False, 'ai_analysis': False},
+    STANDARD: {'ocr': True, 'models': True, 'zero_shot': True, 'enhancements': False, 'ai_analysis': False},
+    DEEP: {'ocr': True, 'models': True, 'zero_shot': True, 'enhancements': True, 'ai_analysis': True},
+}
+
+# Stage each response field comes from
+RESPONSE_FIELDS = {
+    'parsedText': 'text',
+    'sections': 'sections',
+    'overallScore': 'score',
+    'scoreBreakdown': 'score',
+    'issues': 'recommendations',
+    'missingComponents': 'recommendations',
+    'suggestedKeywords': 'keywords',
+    'keywordAnalysis': 'keywords',
+    'enhancedBullets': 'enhancements',
+    'aiAnalysis': 'ai_analysis',
+}
+# Stages run whatever fields were asked for
+REQUIRED_STAGES = ('document',)
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Response fields named in a comma-separated request parameter
+
+    Returns:
+        The fields in a canonical order, or None when none were named (the
+        whole response)
+
+    Raises:
+        ValueError: If a field is unknown
+    """
+    fields = {field.strip() for field in (value or '').split(',') if field.strip()}
+    if not fields:
+        return None
+    unknown = sorted(fields - set(RESPONSE_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Use any of: {', '.join(RESPONSE_FIELDS)}")
+    return tuple(field for field in RESPONSE_FIELDS if field in fields)
+
+
+class NotAResumeError(InsufficientTextError):
+    """The document reads as something other than a resume"""
+
+    def __init__(self, rejection: Dict):
+        super().__init__(rejection.get('message', 'The uploaded document is not a resume.'))
+        self.rejection = rejection
+
+
+class AnalysisEngines:
+    """One instance of each analysis engine"""
+
+    def __init__(self, load_models: bool = True):
+        """
+        Args:
+            load_models: Create the OCR processor and section classifier here;
+                leave False when those stages run in worker processes
+        """
+        self.ocr_processor = OCRProcessor() if load_models else None
+        self.section_classifier = SectionClassifier() if load_models else None
+        # Quick analyses classify in the service process even when the models live in workers
+        self.rules_classifier = self.section_classifier or SectionClassifier(load_models=False)
+        self.document_classifier = ATSResumeClassifier()
+        self.scoring_engine = ScoringEngine()
+        self.enhancement_engine = EnhancementEngine()
+        self.ai_analysis_engine = AIAnalysisEngine()
+        self.recommendation_engine = RecommendationEngine()
+        self.keyword_analyzer = KeywordAnalyzer()
+
+
+def check_document(classifier: ATSResumeClassifier, text: str) -> Dict:
+    """
+    Classify a document as resume or not
+
+    Raises:
+        NotAResumeError: If it should not be scored as a resume
+    """
+    classification = classifier.classify_document(text)
+    if not classifier.should_process_for_ats_scoring(classification):
+        raise NotAResumeError(classifier.get_rejection_message(classification))
+    return classification
+
+
+def build_analysis_pipeline(engines: AnalysisEngines,
+                            enhance: Optional[Callable[[Dict], Awaitable[List[Dict]]]] = None,
+                            use_processes: bool = False,
+                            read: Optional[Callable[[str], str]] = None,
+                            mode: str = STANDARD) -> Pipeline:
+    """
+    Wire the analysis stages of one mode to a set of engines
+
+    Args:
+        engines: Engines the stages call
+        enhance: Coroutine function producing enhancements from the sections;
+            the enhancements stage is left out when None
+        use_processes: Run OCR and classification as 'process' stages with the
+            worker processes' own engines instead of ``engines``
+        read: Function producing the text of the file at a path; defaults to
+            the text layer with OCR as fallback when the mode allows it
+        mode: quick, standard or deep (see ANALYSIS_MODES)
+
+    Returns:
+        Pipeline taking ``file_path`` and ``job_role`` inputs
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"Unknown analysis mode '{mode}'. Use one of: {', '.join(ANALYSIS_MODES)}")
+    options = ANALYSIS_MODES[mode]
+
+    if use_processes and options['models']:
+        stages = [
+            Stage('text', workers.extract_text, deps=['file_path'], kind='process'),
+            Stage('sections', partial(workers.classify_sections, zero_shot=options['zero_shot']),
+                  deps=['text'], kind='process'),
+        ]
+    else:
+        if read is None:
+            read = lambda file_path: workers.read_text(engines.ocr_processor, file_path, ocr=options['ocr'])
+        classifier = engines.section_classifier if options['models'] else engines.rules_classifier
+        stages = [
+            Stage('text', lambda results: read(results['file_path']), deps=['file_path']),
+            Stage('sections', lambda results: classifier.classify_sections(
+                results['text'], ner=options['models'], zero_shot=options['zero_shot']), deps=['text']),
+        ]
+
+    stages += [
+        Stage('document', lambda results: check_document(engines.document_classifier, results['text']),
+              deps=['text']),
+        Stage('score', lambda results: engines.scoring_engine.calculate_score(
+            results['sections'], results['job_role']), deps=['sections', 'job_role']),
+        Stage('keywords', lambda results: engines.keyword_analyzer.analyze_keywords(
+            results['sections'], results['job_role']), deps=['sections', 'job_role']),
+        Stage('recommendations', lambda results: engines.recommendation_engine.generate_recommendations(
+            results['sections'], results['score']), deps=['sections', 'score'], kind='inline'),
+    ]
+    if enhance is not None:
+        stages.append(Stage('enhancements', lambda results: enhance(results['sections']),
+                            deps=['sections'], kind='async'))
+    if options['ai_analysis']:
+        stages.append(Stage('ai_analysis', lambda results: engines.ai_analysis_engine.analyze_async(
+            results['text'], results['job_role']), deps=['text', 'job_role'], kind='async'))
+
+    return Pipeline(stages, inputs=['file_path', 'job_role'])
+
+
+class AnalysisPipelines:
+    """The analysis pipeline of every mode, with and without inline enhancements"""
+
+    def __init__(self, engines: AnalysisEngines,
+                 enhance: Optional[Callable[[Dict], Awaitable[List[Dict]]]] = None,
+                 use_processes: bool = False):
+        """
+        Args:
+            engines: Engines the stages call
+            enhance: Coroutine function producing enhancements; without it no
+                pipeline has an enhancements stage
+            use_processes: Run OCR and model stages in worker processes
+        """
+        self.can_enhance = enhance is not None
+        self._pipelines = {
+            (mode, enhanced): build_analysis_pipeline(engines, enhance if enhanced else None,
+                                                      use_processes=use_processes, mode=mode)
+            for mode in ANALYSIS_MODES for enhanced in (False, True)
+        }
+        # Pruned pipelines by (mode, enhanced, fields), built on first use
+        self._pruned: Dict[Tuple[str, bool, Tuple[str, ...]], Pipeline] = {}
+
+    def includes_enhancements(self, mode: str, requested: bool = False,
+                              fields: Optional[Iterable[str]] = None) -> bool:
+        """
+        Whether an analysis in ``mode`` enhances bullets inline
+
+        Deep mode always does unless fields were named, in which case only
+        asking for enhancedBullets does.
+        """
+        if fields is not None:
+            return self.can_enhance and 'enhancedBullets' in fields
+        return self.can_enhance and (requested or ANALYSIS_MODES[mode]['enhancements'])
+
+    def get(self, mode: str = STANDARD, include_enhancements: bool = False,
+            fields: Optional[Tuple[str, ...]] = None) -> Pipeline:
+        """
+        Pipeline for one mode
+
+        Args:
+            mode: quick, standard or deep
+            include_enhancements: Enhance bullets inline
+            fields: Response fields wanted (see parse_fields); None for all of them
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode '{mode}'. Use one of: {', '.join(ANALYSIS_MODES)}")
+        enhanced = self.includes_enhancements(mode, include_enhancements, fields)
+        pipeline = self._pipelines[(mode, enhanced)]
+        if fields is None:
+            return pipeline
+        key = (mode, enhanced, tuple(fields))
+        if key not in self._pruned:
+            targets = {RESPONSE_FIELDS[field] for field in fields} & set(pipeline.stages)
+            self._pruned[key] = pipeline.prune([*targets, *REQUIRED_STAGES])
+        return self._pruned[key]
+
+
+def select_fields(response: Dict, fields: Optional[Iterable[str]]) -> Dict:
+    """Only the named fields of an analysis response, plus its stage timings and mode"""
+    if fields is None:
+        return response
+    selected = {field: response[field] for field in fields}
+    selected["stageTimings"] = response["stageTimings"]
+    selected["mode"] = response["mode"]
+    return selected
+
+
+def analysis_response(result: PipelineResult, mode: str = STANDARD,
+                      fields: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Fields of an analysis response that come from a pipeline run
+
+    Args:
+        result: Run of a pipeline from AnalysisPipelines.get
+        mode: Mode the pipeline belongs to
+        fields: Response fields to keep (the run's pipeline must have been
+            pruned to no fewer); None for all of them
+    """
+    results = result.results
+    score_result = results.get('score', {})
+    recommendations = results.get('recommendations', {})
+    keyword_analysis = results.get('keywords', {})
+    return select_fields({
+        "parsedText": results.get('text'),
+        "sections": results.get('sections'),
+        "overallScore": score_result.get("overall_score"),
+        "scoreBreakdown": score_result.get("breakdown"),
+        "issues": recommendations.get("issues"),
+        "suggestedKeywords": keyword_analysis.get("missing_keywords"),
+        "missingComponents": recommendations.get("missing_components"),
+        "enhancedBullets": results.get('enhancements', []),
+        "keywordAnalysis": results.get('keywords'),
+        "aiAnalysis": results.get('ai_analysis'),
+        "stageTimings": result.stage_durations_ms(),
+        "mode": mode,
+    }, fields)
+
+
+def compact_response(response: Dict) -> Dict:
+    """
+    Compact form of an analysis response
+
+    Text sections that appear in parsedText (sections.raw always does) become
+    ``{"start": i, "end": j}`` offsets into it, counted in Unicode code points:
+    the section is ``parsedText[i:j]``. suggestedKeywords, a copy of
+    keywordAnalysis.missing_keywords, is left out. Responses without
+    parsedText keep their sections as text.
+    """
+    compact = dict(response)
+    text = response.get("parsedText")
+    if text is not None and isinstance(response.get("sections"), dict):
+        sections = {}
+        for name, value in response["sections"].items():
+            start = text.find(value) if isinstance(value, str) and value else -1
+            sections[name] = {"start": start, "end": start + len(value)} if start >= 0 else value
+        compact["sections"] = sections
+    if isinstance(response.get("keywordAnalysis"), dict) and "suggestedKeywords" in response:
+        del compact["suggestedKeywords"]
+    compact["schema"] = "compact"
+    return compact
@@ -0,0 +1,108 @@
+"""
+In-memory store of recent analyses.
+
+``/analyze-resume`` saves the classified sections under a new analysis ID so
+optional stages such as bullet enhancement can run later, when a client asks
+for them, instead of on every upload. Entries expire after a TTL and the
+least recently used ones are dropped once the store is full.
+
+The store lives in the memory of one service process. An analysis ID stops
+working after ANALYSIS_STORE_TTL (1 hour by default), on a restart and on
+any other process behind the same load balancer; clients then get a 404 and
+post the sections they kept to ``POST /enhancements`` or upload again. Result cache entries outlive it (RESULT_CACHE_TTL, 24 hours),
+so every response, a cache hit included, stores its sections under a fresh
+ID rather than reusing the one it was first served with.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class StoredAnalysis:
+    """Sections of one analysis plus results computed for it on demand"""
+
+    def __init__(self, analysis_id: str, sections: Dict, job_role: str):
+        self.analysis_id = analysis_id
+        self.sections = sections
+        self.job_role = job_role
+        self.created = time.time()
+        self.enhancements: Optional[List[Dict]] = None
+        # Serialises the first computation so concurrent requests share it
+        self.lock = asyncio.Lock()
+
+
+class AnalysisStore:
+    """Bounded, expiring map of analysis ID to StoredAnalysis"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('ANALYSIS_STORE_MAX_ENTRIES', '1000'))
+        self.ttl = ttl if ttl is not None else float(os.getenv('ANALYSIS_STORE_TTL', '3600'))
+        self._entries: 'OrderedDict[str, StoredAnalysis]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, sections: Dict, job_role: str, enhancements: Optional[List[Dict]] = None) -> str:
+        """
+        Store the sections of a new analysis
+
+        Args:
+            sections: Classified resume sections
+            job_role: Target job role of the analysis
+            enhancements: Enhancements already computed for it, if any
+
+        Returns:
+            The new analysis ID
+        """
+        analysis_id = uuid.uuid4().hex
+        entry = StoredAnalysis(analysis_id, sections, job_role)
+        entry.enhancements = enhancements
+        with self._lock:
+            self._entries[analysis_id] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return analysis_id
+
+    def get(self, analysis_id: str) -> Optional[StoredAnalysis]:
+        """Return a live analysis and mark it recently used, or None if unknown or expired"""
+        with self._lock:
+            entry = self._entries.get(analysis_id)
+            if entry is None:
+                return None
+            if self.ttl > 0 and time.time() - entry.created > self.ttl:
+                del self._entries[analysis_id]
+                return None
+            self._entries.move_to_end(analysis_id)
+            return entry
+
+    async def get_enhancements(self, analysis_id: str,
+                               compute: Callable[[Dict], Awaitable[List[Dict]]]) -> Optional[List[Dict]]:
+        """
+        Enhancements for an analysis, computed on first request and memoized
+
+        Args:
+            analysis_id: ID returned by create
+            compute: Coroutine function producing enhancements from the sections
+
+        Returns:
+            The enhancements, or None if the analysis is unknown or expired
+        """
+        entry = self.get(analysis_id)
+        if entry is None:
+            return None
+
+        if entry.enhancements is None:
+            async with entry.lock:
+                if entry.enhancements is None:
+                    entry.enhancements = await compute(entry.sections)
+        return entry.enhancements
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
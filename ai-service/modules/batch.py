@@ -0,0 +1,339 @@
+"""
+Offline batch analysis of stored resumes.
+
+Run from the ai-service directory:
+
+    python -m modules.batch resumes/ --job-role "Software Engineer" --output results.jsonl
+
+Inputs are PDFs, which go through OCR, and .txt files holding text that was
+already extracted, given as files or directories (searched recursively).
+Every worker process of a multiprocessing pool loads its own engines once
+and analyzes whole resumes with the analysis pipeline, so throughput scales
+with the number of cores. Worker processes keep their math libraries to one
+thread so they do not compete for the cores with each other.
+
+Each result is appended to the JSONL output as soon as it arrives. The
+output is also the checkpoint: after an interruption, rerun the same
+command with --resume and files already analyzed successfully are skipped,
+while failed ones are tried again. For a .parquet output the JSONL is kept
+next to it (``<output>.jsonl``) until the run completes and is then
+removed, so a finished Parquet file cannot be resumed; the run refuses to
+replace it without --overwrite. Parquet output needs pyarrow.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+INPUT_SUFFIXES = ('.pdf', '.txt')
+
+# Nested fields are stored as JSON strings in Parquet, so every file has the same columns
+PARQUET_SCALAR_COLUMNS = ('path', 'status', 'error', 'overallScore', 'durationMs')
+PARQUET_JSON_COLUMNS = ('parsedText', 'sections', 'scoreBreakdown', 'issues', 'suggestedKeywords',
+                        'missingComponents', 'enhancedBullets', 'keywordAnalysis', 'stageTimings')
+
+_THREAD_LIMITS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+# Pipeline of the current process, created on first use
+_pipeline = None
+
+
+def discover_inputs(paths: Iterable[str]) -> List[str]:
+    """
+    PDF and text files among ``paths``, searching directories recursively
+
+    Raises:
+        FileNotFoundError: If a path does not exist
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(
+                    os.path.join(root, name) for name in sorted(files)
+                    if name.lower().endswith(INPUT_SUFFIXES)
+                )
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            raise FileNotFoundError(f"No such file or directory: {path}")
+    return [os.path.normpath(path) for path in dict.fromkeys(found)]
+
+
+def read_input(ocr_processor, path: str) -> str:
+    """Text of a resume: OCR for PDFs, the file itself for .txt"""
+    from modules.workers import check_text, read_text
+    if path.lower().endswith('.txt'):
+        with open(path, encoding='utf-8', errors='replace') as text_file:
+            return check_text(text_file.read())
+    return read_text(ocr_processor, path)
+
+
+def init_worker():
+    """Pool initializer: one thread per process, set before any engine is imported"""
+    for name in _THREAD_LIMITS:
+        os.environ.setdefault(name, '1')
+    os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+
+def _get_pipeline():
+    global _pipeline
+    if _pipeline is None:
+        from modules.analysis_pipeline import AnalysisEngines, build_analysis_pipeline
+        engines = AnalysisEngines()
+        _pipeline = build_analysis_pipeline(engines, read=partial(read_input, engines.ocr_processor))
+    return _pipeline
+
+
+def analyze_file(path: str, job_role: str) -> Dict:
+    """
+    Analyze one resume; failures are returned as a record rather than raised
+
+    Returns:
+        ``{'path', 'status': 'ok', ...analysis, 'durationMs'}`` or
+        ``{'path', 'status': 'error', 'error', 'durationMs'}``
+    """
+    from modules.analysis_pipeline import analysis_response
+    start = time.perf_counter()
+    try:
+        result = _get_pipeline().run_inline({'file_path': path, 'job_role': job_role})
+        record = {'path': path, 'status': 'ok', **analysis_response(result)}
+    except Exception as e:
+        record = {'path': path, 'status': 'error', 'error': str(e)}
+    record['durationMs'] = round((time.perf_counter() - start) * 1000, 2)
+    return record
+
+
+def load_checkpoint(log_path: str) -> Set[str]:
+    """
+    Paths already analyzed successfully in a JSONL output
+
+    Records of failed files are dropped from the file so those files are
+    analyzed again and still end up with one record each. So are unreadable
+    lines and a line cut short by an interrupted run, so the next record
+    starts on a fresh line.
+    """
+    done = set()
+    if not os.path.exists(log_path):
+        return done
+    with open(log_path, 'rb') as log:
+        lines = log.read().splitlines(keepends=True)
+
+    kept = []
+    failed = 0
+    for line in lines:
+        if not line.endswith(b'\n'):
+            continue
+        try:
+            record = json.loads(line)
+            path, ok = record['path'], record.get('status') == 'ok'
+        except (ValueError, KeyError, TypeError, AttributeError):
+            logger.warning("Skipping unreadable checkpoint line in %s", log_path)
+            continue
+        if not ok:
+            failed += 1
+        elif path not in done:
+            done.add(path)
+            kept.append(line)
+
+    if len(kept) < len(lines):
+        if failed:
+            logger.info("Retrying %d failed files from %s", failed, log_path)
+        temp_path = f"{log_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as log:
+            log.writelines(kept)
+        os.replace(temp_path, log_path)
+    return done
+
+
+def parquet_row(record: Dict) -> Dict:
+    """Flatten a record to the fixed Parquet columns"""
+    row = {column: record.get(column) for column in PARQUET_SCALAR_COLUMNS}
+    for column in PARQUET_JSON_COLUMNS:
+        row[column] = json.dumps(record[column]) if column in record else None
+    return row
+
+
+def write_parquet(log_path: str, parquet_path: str, batch_size: int = 1000):
+    """Convert a JSONL output to Parquet, a batch of records at a time"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [('path', pa.string()), ('status', pa.string()), ('error', pa.string()),
+         ('overallScore', pa.float64()), ('durationMs', pa.float64())] +
+        [(column, pa.string()) for column in PARQUET_JSON_COLUMNS]
+    )
+
+    with pq.ParquetWriter(parquet_path, schema) as writer, open(log_path, encoding='utf-8') as log:
+        rows = []
+        for line in log:
+            rows.append(parquet_row(json.loads(line)))
+            if len(rows) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                rows = []
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+
+
+class Progress:
+    """Periodic progress line on stderr"""
+
+    def __init__(self, total: int, interval: float):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self.last_report = self.started
+
+    def update(self, record: Dict):
+        self.done += 1
+        self.failed += record['status'] != 'ok'
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval or self.done == self.total:
+            self.last_report = now
+            rate = self.done / max(now - self.started, 1e-9)
+            eta = (self.total - self.done) / rate if rate else 0
+            print(f"[{self.done}/{self.total}] {rate:.2f} files/s, {self.failed} failed, "
+                  f"ETA {eta / 60:.1f} min", file=sys.stderr, flush=True)
+
+
+def run_batch(inputs: List[str], output: str, job_role: str, workers: Optional[int] = None,
+              resume: bool = False, progress_interval: float = 5.0,
+              analyze: Optional[Callable[[str], Dict]] = None, overwrite: bool = False) -> Dict:
+    """
+    Analyze every input and write one record per file to ``output``
+
+    Args:
+        inputs: Files to analyze
+        output: .jsonl or .parquet file
+        job_role: Job role to score against
+        workers: Worker processes (defaults to every core; 0 runs in this process)
+        resume: Skip inputs already analyzed successfully in the output
+        progress_interval: Seconds between progress lines
+        analyze: Function from path to record (defaults to analyze_file);
+            must be picklable when workers are used
+        overwrite: Discard an existing output and start again
+
+    Returns:
+        Throughput report
+
+    Raises:
+        ValueError: If both ``resume`` and ``overwrite`` are set
+        FileExistsError: If the output exists and ``resume`` is False, or a
+            finished Parquet output exists, unless ``overwrite`` is set
+    """
+    if resume and overwrite:
+        raise ValueError("resume and overwrite cannot be combined")
+    parquet = output.lower().endswith('.parquet')
+    log_path = output + '.jsonl' if parquet else output
+    if overwrite:
+        for path in {output, log_path}:
+            if os.path.exists(path):
+                os.remove(path)
+    elif parquet and os.path.exists(output):
+        # Its checkpoint was removed when it finished, so resuming would redo every file
+        raise FileExistsError(f"{output} exists from a finished run; pass --overwrite to replace it")
+    if parquet:
+        # Fail before hours of work, not after
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+    if not resume and os.path.exists(log_path) and os.path.getsize(log_path):
+        raise FileExistsError(f"{log_path} exists; pass --resume to continue it or --overwrite to start again")
+
+    done = load_checkpoint(log_path) if resume else set()
+    pending = [path for path in inputs if path not in done]
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    analyze = analyze or partial(analyze_file, job_role=job_role)
+    progress = Progress(len(pending), progress_interval)
+    stage_totals: Dict[str, float] = {}
+    interrupted = False
+
+    pool = None
+    with open(log_path, 'a', encoding='utf-8') as log:
+        try:
+            if workers > 0 and pending:
+                pool = multiprocessing.get_context('spawn').Pool(min(workers, len(pending)), initializer=init_worker)
+                records = pool.imap_unordered(analyze, pending)
+            else:
+                records = map(analyze, pending)
+            for record in records:
+                log.write(json.dumps(record) + '\n')
+                log.flush()
+                for stage, duration in record.get('stageTimings', {}).items():
+                    stage_totals[stage] = stage_totals.get(stage, 0.0) + duration
+                progress.update(record)
+        except KeyboardInterrupt:
+            interrupted = True
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+    if parquet and not interrupted:
+        write_parquet(log_path, output)
+        os.remove(log_path)
+
+    seconds = time.perf_counter() - progress.started
+    succeeded = progress.done - progress.failed
+    return {
+        'files': len(inputs),
+        'skipped': len(inputs) - len(pending),
+        'processed': progress.done,
+        'succeeded': succeeded,
+        'failed': progress.failed,
+        'interrupted': interrupted,
+        'workers': workers,
+        'seconds': round(seconds, 2),
+        'filesPerSecond': round(progress.done / seconds, 2) if seconds else 0.0,
+        'stageMeanMs': {stage: round(total / succeeded, 2) for stage, total in stage_totals.items()}
+        if succeeded else {},
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog='python -m modules.batch', description=__doc__.split('\n\n')[0])
+    parser.add_argument('inputs', nargs='+', help="PDF or .txt files, or directories of them")
+    parser.add_argument('--job-role', required=True, help="Job role to score against")
+    parser.add_argument('--output', required=True, help="Output file, .jsonl or .parquet")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    start = parser.add_mutually_exclusive_group()
+    start.add_argument('--resume', action='store_true',
+                       help="Skip files already analyzed in the output and retry failed ones")
+    start.add_argument('--overwrite', action='store_true', help="Replace an existing output")
+    parser.add_argument('--progress-interval', type=float, default=5.0, help="Seconds between progress lines")
+    args = parser.parse_args(argv)
+
+    inputs = discover_inputs(args.inputs)
+    print(f"Found {len(inputs)} files to analyze")
+    try:
+        report = run_batch(inputs, args.output, args.job_role, args.workers, args.resume, args.progress_interval,
+                           overwrite=args.overwrite)
+    except (FileExistsError, ImportError) as e:
+        parser.exit(1, f"Error: {e}\n")
+
+    print(f"Processed {report['processed']} files ({report['skipped']} already done) in {report['seconds']}s "
+          f"with {report['workers']} workers: {report['filesPerSecond']} files/s, "
+          f"{report['succeeded']} succeeded, {report['failed']} failed")
+    for stage, mean in report['stageMeanMs'].items():
+        print(f"  {stage:<16} {mean:>10.2f} ms/file")
+    if report['interrupted']:
+        print("Interrupted; run again with --resume to continue")
+        sys.exit(130)
+
+
+if __name__ == '__main__':
+    main()
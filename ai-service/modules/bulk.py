@@ -0,0 +1,130 @@
+"""
+Bulk analysis of many resumes in one request.
+
+Files come from a multipart list or a ZIP archive. Each file is spooled to
+a temporary file a chunk at a time when a slot frees up (see
+modules.ingest), so at most ``concurrency`` files are on disk and a chunk of
+each in memory, whatever the size of the archive. Each file is analyzed on
+its own: a broken or unreadable PDF yields an error line for that file
+only. Lines are produced in completion order and carry the index and name
+of their file.
+"""
+
+import asyncio
+import os
+import zipfile
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, NamedTuple
+from modules.ingest import SpooledUpload, spool_upload
+
+
+class BulkFileError(ValueError):
+    """A file of a bulk request cannot be analyzed"""
+
+
+class BulkItem(NamedTuple):
+    """One file of a bulk request; ``read`` spools it when it is its turn"""
+    index: int
+    name: str
+    read: Callable[[], SpooledUpload]
+
+
+def _read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, max_size: int) -> SpooledUpload:
+    if info.file_size > max_size:
+        raise BulkFileError(f"{info.filename} is larger than the {max_size} byte limit")
+    # The declared size can lie, so the copy is bounded as well
+    with archive.open(info) as member:
+        return spool_upload(member, info.filename, max_size)
+
+
+def upload_items(files: List, max_size: int, start: int = 0) -> Iterator[BulkItem]:
+    """Items for uploaded files (objects with ``filename`` and a binary ``file``)"""
+    for offset, upload in enumerate(files):
+        name = upload.filename or f"file-{start + offset}"
+        yield BulkItem(start + offset, name, partial(spool_upload, upload.file, name, max_size))
+
+
+def archive_members(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Files in a ZIP archive, without directories and macOS metadata"""
+    return [
+        info for info in archive.infolist()
+        if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+    ]
+
+
+def archive_items(archive: zipfile.ZipFile, max_size: int, start: int = 0) -> Iterator[BulkItem]:
+    """Items for the members of a ZIP archive, read lazily"""
+    for offset, info in enumerate(archive_members(archive)):
+        yield BulkItem(start + offset, info.filename, partial(_read_member, archive, info, max_size))
+
+
+def _discard(upload: SpooledUpload):
+    try:
+        os.remove(upload.path)
+    except OSError:
+        pass
+
+
+def _discard_when_read(reading: asyncio.Future):
+    if not reading.cancelled() and reading.exception() is None:
+        _discard(reading.result())
+
+
+async def analyze_items(items: Iterable[BulkItem],
+                        analyze: Callable[[BulkItem, SpooledUpload], Awaitable[Dict]],
+                        concurrency: int) -> AsyncIterator[Dict]:
+    """
+    Analyze items concurrently and yield a result line for each as it finishes
+
+    Args:
+        items: Files to analyze
+        analyze: Coroutine function producing the analysis of one spooled
+            file; it takes over the file and removes it when done
+        concurrency: Files spooled and analyzed at once
+
+    Yields:
+        ``{'index', 'fileName', 'status': 'ok', ...analysis}`` or
+        ``{'index', 'fileName', 'status': 'error', 'error'}``
+    """
+    pending = iter(items)
+    running = set()
+
+    async def process(item: BulkItem) -> Dict:
+        line = {'index': item.index, 'fileName': item.name}
+        reading = asyncio.ensure_future(asyncio.to_thread(item.read))
+        try:
+            upload = await asyncio.shield(reading)
+        except asyncio.CancelledError:
+            # The copy finishes in its thread anyway; remove the file when it does
+            reading.add_done_callback(_discard_when_read)
+            raise
+        except Exception as e:
+            return {**line, 'status': 'error', 'error': str(e)}
+
+        try:
+            line.update(await analyze(item, upload))
+            line['status'] = 'ok'
+        except Exception as e:
+            line['status'] = 'error'
+            line['error'] = str(e)
+        return line
+
+    def launch():
+        while len(running) < concurrency:
+            item = next(pending, None)
+            if item is None:
+                return
+            running.add(asyncio.ensure_future(process(item)))
+
+    try:
+        launch()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                running.discard(task)
+                yield task.result()
+            launch()
+    finally:
+        # The client went away: stop the files still in progress
+        for task in running:
+            task.cancel()
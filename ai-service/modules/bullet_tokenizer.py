@@ -0,0 +1,101 @@
+"""
+Single-pass bullet point tokenizer.
+
+Walks the text once, line by line. A line starting with a bullet marker opens
+a new bullet; following lines (text wrapped by the PDF extractor) are joined
+onto it until the next marker, a section header or a blank line, as the old
+regex parser did. Outside a marked bullet every non-blank line stands on its
+own, so sections written without markers still yield one item per line.
+Each bullet is returned once, with the span of the source text it came from.
+"""
+
+from typing import List, NamedTuple, Optional
+
+BULLET_MARKERS = ('•', '◦', '▪', '‣', '●', '-', '–', '*')
+
+SECTION_HEADERS = ('Education', 'Experience', 'Skills', 'Projects')
+
+MIN_BULLET_LENGTH = 20
+
+
+class Bullet(NamedTuple):
+    """A bullet point and the ``text[start:end]`` span it was read from"""
+    text: str
+    start: int
+    end: int
+
+
+def _strip_marker(line: str) -> Optional[str]:
+    """Return the line without its bullet marker, or None if it has none"""
+    if line.startswith(BULLET_MARKERS):
+        # "-5% churn" or "*nix" are not bullets; a marker is followed by a space
+        if len(line) == 1 or line[1].isspace() or line[0] not in '-*':
+            return line[1:].lstrip()
+    return None
+
+
+def tokenize_bullets(text: str, min_length: int = MIN_BULLET_LENGTH) -> List[Bullet]:
+    """
+    Split a resume section into unique bullet points
+
+    Args:
+        text: Section text
+        min_length: Bullets this short or shorter are dropped
+
+    Returns:
+        Bullets in source order, duplicates removed
+    """
+    bullets: List[Bullet] = []
+    seen = set()
+
+    parts: List[str] = []
+    start = end = 0
+    is_marked = False
+
+    def flush():
+        if not parts:
+            return
+        bullet = ' '.join(parts)
+        if len(bullet) > min_length and not bullet.startswith(SECTION_HEADERS) and bullet not in seen:
+            seen.add(bullet)
+            bullets.append(Bullet(bullet, start, end))
+        parts.clear()
+
+    offset = 0
+    for raw_line in text.splitlines(keepends=True):
+        line_start = offset
+        offset += len(raw_line)
+
+        line = raw_line.strip()
+        if not line:
+            flush()
+            is_marked = False
+            continue
+
+        # Position of the stripped content within the source text
+        content_start = line_start + (len(raw_line) - len(raw_line.lstrip()))
+        content_end = content_start + len(line)
+
+        content = _strip_marker(line)
+        if content is not None:
+            flush()
+            if content:
+                parts.append(content)
+                start, end = content_end - len(content), content_end
+            is_marked = True
+        elif is_marked and not parts:
+            # Marker alone on its line; the bullet text follows on the next one
+            parts.append(line)
+            start, end = content_start, content_end
+        elif is_marked and not line.startswith(SECTION_HEADERS):
+            # Wrapped lines can start with anything: "Python", "2023", "(AWS)"
+            parts.append(line)
+            end = content_end
+        else:
+            flush()
+            parts.append(line)
+            start, end = content_start, content_end
+            is_marked = False
+
+    flush()
+    return bullets
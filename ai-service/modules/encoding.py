@@ -0,0 +1,170 @@
+"""
+Response encoding: fast JSON and compression.
+
+Analysis responses carry the resume text and several kilobytes of keyword
+analysis, and at bulk volumes both encoding them and sending them add up:
+
+    dumps / FastJSONResponse  JSON through orjson when it is installed (several
+                              times faster than the json module, compact
+                              output); the json module otherwise
+    Compression               ASGI middleware compressing JSON, NDJSON and
+                              text responses with brotli when the client
+                              accepts it and the brotli package is installed,
+                              gzip otherwise; streamed responses (bulk NDJSON)
+                              are compressed chunk by chunk, so every line
+                              still reaches the client as soon as it is ready
+
+Responses under COMPRESSION_MIN_SIZE bytes, responses that already have a
+Content-Encoding and other media types (PDFs, pstats files) are sent as they
+are.
+"""
+
+import json
+import logging
+import os
+import zlib
+from typing import Any, Optional, Tuple
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON of ``content``"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``dumps``"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def accepted_encodings(header: str) -> Tuple[str, ...]:
+    """Codings named in an Accept-Encoding header, except those refused with q=0"""
+    codings = []
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = params.strip().replace(' ', '')
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            codings.append(coding.strip().lower())
+    return tuple(codings)
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    """Content-Encoding to answer a request with: br, gzip or None"""
+    codings = accepted_encodings(header)
+    if brotli is not None and ('br' in codings or '*' in codings):
+        return 'br'
+    if 'gzip' in codings or '*' in codings:
+        return 'gzip'
+    return None
+
+
+class _Compressor:
+    """Incremental brotli or gzip stream"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=min(level, 11))
+        else:
+            self._gzip = zlib.compressobj(min(level, 9), zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compressed ``data``, flushed so the client can decode everything sent so far"""
+        if self.encoding == 'br':
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        out = self._gzip.compress(data)
+        return out + self._gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class Compression:
+    """ASGI middleware compressing responses the client accepts compressed"""
+
+    def __init__(self, app, minimum_size: Optional[int] = None, level: Optional[int] = None):
+        """
+        Args:
+            app: ASGI app to wrap
+            minimum_size: Bytes below which a complete response is sent as it is
+                (COMPRESSION_MIN_SIZE)
+            level: Compression level; brotli quality or gzip level (COMPRESSION_LEVEL)
+        """
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+        # Low levels compress JSON nearly as well for a fraction of the CPU
+        self.level = level if level is not None else int(os.getenv('COMPRESSION_LEVEL', '4'))
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message['type'] == 'http.response.start':
+                # Held back until the first body chunk shows whether to compress
+                start = message
+                return
+            if message['type'] != 'http.response.body' or passthrough:
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start['headers'])
+                media_type = headers.get('content-type', '')
+                if ('content-encoding' in headers or not media_type.startswith(COMPRESSIBLE_TYPES)
+                        or (not more_body and len(body) < self.minimum_size)):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.level)
+                body = compressor.compress(body, final=not more_body)
+                headers['Content-Encoding'] = encoding
+                headers.add_vary_header('Accept-Encoding')
+                if more_body:
+                    del headers['Content-Length']
+                else:
+                    headers['Content-Length'] = str(len(body))
+                await send(start)
+            else:
+                body = compressor.compress(body, final=not more_body)
+            await send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
+
+        await self.app(scope, receive, send_compressed)
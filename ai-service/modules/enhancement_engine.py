@@ -1,66 +1,167 @@
 import re
 import os
-from typing import Dict, List
+import json
+import asyncio
+import logging
+from typing import Dict, List, Optional
 import openai
 from dotenv import load_dotenv
+from modules.taxonomy import get_taxonomy
+from modules.llm_cache import get_llm_cache
+from modules.bullet_tokenizer import tokenize_bullets
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 class EnhancementEngine:
     """AI-powered content enhancement using generative AI"""
     
+    MODEL = "gpt-3.5-turbo"
+    TEMPERATURE = 0.7
+    # Bump when the rewrite prompts change so cached rewrites are not reused
+    PROMPT_VERSION = "1"
+    
     def __init__(self):
-        # Initialize OpenAI client
+        # Initialize OpenAI clients
         self.client = None
+        self.async_client = None
         if os.getenv('OPENAI_API_KEY'):
             try:
-                openai.api_key = os.getenv('OPENAI_API_KEY')
-                self.client = openai
+                # Retries are disabled: a bullet that fails falls back to rule-based enhancement
+                self.client = openai.OpenAI(
+                    api_key=os.getenv('OPENAI_API_KEY'),
+                    base_url=os.getenv('OPENAI_BASE_URL') or None,
+                    max_retries=0
+                )
+                self.async_client = openai.AsyncOpenAI(
+                    api_key=os.getenv('OPENAI_API_KEY'),
+                    base_url=os.getenv('OPENAI_BASE_URL') or None,
+                    max_retries=0
+                )
             except Exception as e:
-                print(f"Warning: Could not initialize OpenAI client: {e}")
-        
-        # Fallback enhancement patterns for when AI is not available
-        self.enhancement_patterns = {
-            'weak_verbs': {
-                'worked on': ['developed', 'built', 'created', 'implemented'],
-                'helped with': ['contributed to', 'collaborated on', 'supported'],
-                'was responsible for': ['managed', 'led', 'oversaw', 'coordinated'],
-                'did': ['executed', 'performed', 'completed', 'delivered'],
-                'made': ['created', 'developed', 'built', 'designed'],
-                'used': ['utilized', 'leveraged', 'employed', 'applied']
-            },
-            'action_verbs': [
-                'achieved', 'analyzed', 'built', 'collaborated', 'created', 'delivered',
-                'designed', 'developed', 'enhanced', 'established', 'executed',
-                'implemented', 'improved', 'increased', 'led', 'managed', 'optimized',
-                'organized', 'reduced', 'resolved', 'streamlined', 'transformed'
-            ]
-        }
+                logger.warning("Could not initialize OpenAI client: %s", e)
+        
+        # Limits for the concurrent enhancement path
+        self.concurrency = int(os.getenv('ENHANCEMENT_CONCURRENCY', '8'))
+        self.call_timeout = float(os.getenv('ENHANCEMENT_CALL_TIMEOUT', '10'))
+        self.deadline = float(os.getenv('ENHANCEMENT_DEADLINE', '20'))
+        # Bullets packed into one request; 1 sends each bullet on its own
+        self.batch_size = max(1, int(os.getenv('ENHANCEMENT_BATCH_SIZE', '10')))
+        
+        self.cache = get_llm_cache()
+    
+    @property
+    def enhancement_patterns(self) -> Dict:
+        """Fallback enhancement patterns for when AI is not available"""
+        return get_taxonomy().get('enhancement')
     
-    def enhance_content(self, sections: Dict) -> List[Dict]:
+    def enhance_content(self, sections: Dict, batch_size: Optional[int] = None) -> List[Dict]:
         """
         Enhance resume content using AI
         
         Args:
             sections: Classified resume sections
+            batch_size: Bullets per AI request (defaults to ENHANCEMENT_BATCH_SIZE)
             
         Returns:
             List of enhancement suggestions with original and improved versions
         """
-        enhancements = []
+        batch_size = batch_size or self.batch_size
         
         # Extract bullet points from projects and experience
-        bullet_points = self._extract_bullet_points(sections)
-        
-        for bullet_point in bullet_points:
-            if len(bullet_point.strip()) > 10:  # Only enhance substantial content
-                enhanced = self._enhance_bullet_point(bullet_point)
-                if enhanced and enhanced != bullet_point:
-                    enhancements.append({
-                        'original': bullet_point.strip(),
-                        'improved': enhanced.strip(),
-                        'section': self._identify_section(bullet_point, sections)
-                    })
+        bullet_points = self._substantial_bullets(sections)
+        
+        if self.client and batch_size > 1:
+            ai_results = []
+            for start in range(0, len(bullet_points), batch_size):
+                ai_results.extend(self._ai_enhance_batch(bullet_points[start:start + batch_size]))
+            enhanced_points = [
+                ai_enhanced or self._rule_based_enhance(bullet_point)
+                for bullet_point, ai_enhanced in zip(bullet_points, ai_results)
+            ]
+        else:
+            enhanced_points = [self._enhance_bullet_point(bullet_point) for bullet_point in bullet_points]
+        
+        return self._build_enhancements(bullet_points, enhanced_points, sections)
+    
+    async def enhance_content_async(self, sections: Dict, concurrency: Optional[int] = None,
+                                    call_timeout: Optional[float] = None,
+                                    deadline: Optional[float] = None,
+                                    batch_size: Optional[int] = None) -> List[Dict]:
+        """
+        Enhance resume content with concurrent AI calls
+        
+        Bullets are grouped into requests of ``batch_size`` and all requests
+        are sent at once, at most ``concurrency`` in flight. A bullet whose
+        call fails, exceeds ``call_timeout`` or is still running when
+        ``deadline`` expires gets the rule-based enhancement instead.
+        
+        Args:
+            sections: Classified resume sections
+            concurrency: Maximum simultaneous AI calls
+            call_timeout: Seconds allowed for each AI call
+            deadline: Seconds allowed for the whole enhancement pass
+            batch_size: Bullets per AI request (defaults to ENHANCEMENT_BATCH_SIZE)
+            
+        Returns:
+            List of enhancement suggestions with original and improved versions
+        """
+        concurrency = concurrency or self.concurrency
+        call_timeout = call_timeout if call_timeout is not None else self.call_timeout
+        deadline = deadline if deadline is not None else self.deadline
+        batch_size = batch_size or self.batch_size
+        
+        bullet_points = self._substantial_bullets(sections)
+        ai_results: List[Optional[str]] = [None] * len(bullet_points)
+        
+        if self.async_client and bullet_points:
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def enhance_batch(batch: List[str]) -> List[Optional[str]]:
+                async with semaphore:
+                    try:
+                        return await asyncio.wait_for(
+                            self._ai_enhance_bullets_async(batch, call_timeout), call_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        return [None] * len(batch)
+            
+            starts = range(0, len(bullet_points), batch_size)
+            tasks = [asyncio.ensure_future(enhance_batch(bullet_points[start:start + batch_size]))
+                     for start in starts]
+            done, pending = await asyncio.wait(tasks, timeout=deadline)
+            for task in pending:
+                task.cancel()
+            
+            for start, task in zip(starts, tasks):
+                if task in done and not task.cancelled() and task.exception() is None:
+                    results = task.result()
+                    ai_results[start:start + len(results)] = results
+        
+        enhanced_points = [
+            ai_enhanced or self._rule_based_enhance(bullet_point)
+            for bullet_point, ai_enhanced in zip(bullet_points, ai_results)
+        ]
+        
+        return self._build_enhancements(bullet_points, enhanced_points, sections)
+    
+    def _substantial_bullets(self, sections: Dict) -> List[str]:
+        """Bullet points long enough to be worth enhancing"""
+        return [bullet_point for bullet_point in self._extract_bullet_points(sections)
+                if len(bullet_point.strip()) > 10]
+    
+    def _build_enhancements(self, bullet_points: List[str], enhanced_points: List[Optional[str]],
+                            sections: Dict) -> List[Dict]:
+        """Pair each bullet with its enhanced version, skipping unchanged ones"""
+        enhancements = []
+        
+        for bullet_point, enhanced in zip(bullet_points, enhanced_points):
+            if enhanced and enhanced != bullet_point:
+                enhancements.append({
+                    'original': bullet_point.strip(),
+                    'improved': enhanced.strip(),
+                    'section': self._identify_section(bullet_point, sections)
+                })
         
         return enhancements
     
@@ -78,44 +179,27 @@ class EnhancementEngine:
             experience_bullets = self._parse_bullets(sections['experience'])
             bullet_points.extend(experience_bullets)
         
-        return bullet_points
+        # A bullet repeated across sections only needs enhancing once
+        return list(dict.fromkeys(bullet_points))
     
     def _parse_bullets(self, text: str) -> List[str]:
         """Parse bullet points from text"""
-        # Common bullet point patterns
-        bullet_patterns = [
-            r'•\s*(.+?)(?=\n•|\n[A-Z]|\n\n|$)',
-            r'-\s*(.+?)(?=\n-|\n[A-Z]|\n\n|$)',
-            r'\*\s*(.+?)(?=\n\*|\n[A-Z]|\n\n|$)',
-            r'◦\s*(.+?)(?=\n◦|\n[A-Z]|\n\n|$)',
-            r'(?:^|\n)\s*(.+?)(?=\n|$)'  # Fallback for lines
-        ]
-        
-        bullets = []
-        for pattern in bullet_patterns:
-            matches = re.findall(pattern, text, re.MULTILINE | re.DOTALL)
-            for match in matches:
-                cleaned = match.strip()
-                if len(cleaned) > 20 and not cleaned.startswith(('Education', 'Experience', 'Skills', 'Projects')):
-                    bullets.append(cleaned)
-        
-        return bullets
+        return [bullet.text for bullet in tokenize_bullets(text)]
     
     def _enhance_bullet_point(self, bullet_point: str) -> str:
         """Enhance a single bullet point"""
         # Try AI enhancement first
         if self.client:
-            ai_enhanced = self._ai_enhance_bullet(bullet_point)
+            ai_enhanced = self._ai_enhance_batch([bullet_point])[0]
             if ai_enhanced:
                 return ai_enhanced
         
         # Fallback to rule-based enhancement
         return self._rule_based_enhance(bullet_point)
     
-    def _ai_enhance_bullet(self, bullet_point: str) -> str:
-        """Enhance bullet point using OpenAI"""
-        try:
-            prompt = f"""
+    def _bullet_messages(self, bullet_point: str) -> List[Dict]:
+        """Chat messages asking the model to rewrite one bullet point"""
+        prompt = f"""
             Rewrite this resume bullet point to be more impactful and professional:
             
             Original: {bullet_point}
@@ -130,34 +214,235 @@ class EnhancementEngine:
             
             Enhanced version:
             """
+        
+        return [
+            {"role": "system", "content": "You are a professional resume writer helping improve bullet points."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _batch_messages(self, bullet_points: List[str]) -> List[Dict]:
+        """Chat messages asking the model to rewrite several bullet points at once"""
+        numbered = json.dumps(
+            [{"id": index + 1, "text": bullet_point} for index, bullet_point in enumerate(bullet_points)],
+            ensure_ascii=False, indent=0
+        )
+        prompt = f"""
+            Rewrite each of these resume bullet points to be more impactful and professional.
             
-            response = self.client.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a professional resume writer helping improve bullet points."},
-                    {"role": "user", "content": prompt}
-                ],
+            Guidelines:
+            - Use strong action verbs
+            - Include quantifiable metrics when possible (but don't make up numbers)
+            - Make it more specific and results-oriented
+            - Keep the factual content accurate
+            - Limit to 1-2 sentences
+            - Start with an action verb
+            
+            Respond with only a JSON array containing one object per bullet, in the same order,
+            shaped like {{"id": <id>, "improved": "<enhanced version>"}}.
+            
+            Bullets:
+            {numbered}
+            """
+        
+        return [
+            {"role": "system", "content": "You are a professional resume writer helping improve bullet points."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_batch_response(self, content: str, bullet_points: List[str]) -> List[Optional[str]]:
+        """
+        Parse a batched rewrite, tolerating code fences, prose and partial output
+        
+        Args:
+            content: Raw model output
+            bullet_points: Bullets that were sent, in request order
+            
+        Returns:
+            One validated rewrite per bullet, or None where the output is unusable
+        """
+        results: List[Optional[str]] = [None] * len(bullet_points)
+        if not content:
+            return results
+        
+        items = None
+        start, end = content.find('['), content.rfind(']')
+        if start != -1 and end > start:
+            try:
+                items = json.loads(content[start:end + 1])
+            except ValueError:
+                items = None
+        
+        by_id: Dict[int, str] = {}
+        if isinstance(items, list):
+            for position, item in enumerate(items):
+                if isinstance(item, str):
+                    by_id.setdefault(position + 1, item)
+                elif isinstance(item, dict):
+                    text = item.get('improved') or item.get('text')
+                    try:
+                        item_id = int(item.get('id', position + 1))
+                    except (TypeError, ValueError):
+                        item_id = position + 1
+                    if isinstance(text, str):
+                        by_id.setdefault(item_id, text)
+        else:
+            # Fall back to a numbered list such as "1. Led ..." or "2) Built ..."
+            for match in re.finditer(r'^\s*(\d+)[.):]\s+(.+?)\s*$', content, re.MULTILINE):
+                by_id.setdefault(int(match.group(1)), match.group(2))
+        
+        for index, bullet_point in enumerate(bullet_points):
+            results[index] = self._validate_ai_bullet(by_id.get(index + 1), bullet_point)
+        
+        return results
+    
+    def _validate_ai_bullet(self, enhanced: str, bullet_point: str) -> Optional[str]:
+        """Basic validation of a model rewrite"""
+        enhanced = (enhanced or '').strip()
+        if len(enhanced) > 20 and enhanced != bullet_point:
+            return enhanced
+        return None
+    
+    def _ai_enhance_bullet(self, bullet_point: str) -> str:
+        """Enhance bullet point using OpenAI"""
+        try:
+            response = self.client.chat.completions.create(
+                model=self.MODEL,
+                messages=self._bullet_messages(bullet_point),
                 max_tokens=150,
-                temperature=0.7
+                temperature=self.TEMPERATURE,
+                timeout=self.call_timeout
             )
             
-            enhanced = response.choices[0].message.content.strip()
-            
-            # Basic validation
-            if len(enhanced) > 20 and enhanced != bullet_point:
-                return enhanced
+            return self._validate_ai_bullet(response.choices[0].message.content, bullet_point)
                 
         except Exception as e:
-            print(f"AI enhancement failed: {e}")
+            logger.warning("AI enhancement failed: %s", e)
+        
+        return None
+    
+    async def _ai_enhance_bullet_async(self, bullet_point: str, timeout: float) -> Optional[str]:
+        """Enhance bullet point using the async OpenAI client"""
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.MODEL,
+                messages=self._bullet_messages(bullet_point),
+                max_tokens=150,
+                temperature=self.TEMPERATURE,
+                timeout=timeout
+            )
+            
+            return self._validate_ai_bullet(response.choices[0].message.content, bullet_point)
+            
+        except Exception as e:
+            logger.warning("AI enhancement failed: %s", e)
         
         return None
     
+    def _cache_key(self, bullet_point: str) -> str:
+        return self.cache.make_key('enhance_bullet', bullet_point, self.MODEL,
+                                   self.PROMPT_VERSION, self.TEMPERATURE)
+    
+    def _cached_enhancements(self, bullet_points: List[str]) -> List[Optional[str]]:
+        """Cached rewrites for each bullet, None where there is no usable entry"""
+        return [self._validate_ai_bullet(self.cache.get(self._cache_key(bullet_point)), bullet_point)
+                for bullet_point in bullet_points]
+    
+    def _store_enhancements(self, bullet_points: List[str], results: List[Optional[str]]):
+        for bullet_point, enhanced in zip(bullet_points, results):
+            if enhanced:
+                self.cache.set(self._cache_key(bullet_point), enhanced)
+    
+    def _ai_enhance_batch(self, bullet_points: List[str]) -> List[Optional[str]]:
+        """
+        Enhance bullet points with OpenAI, sending only cache misses
+        
+        Args:
+            bullet_points: Bullets to rewrite
+            
+        Returns:
+            One rewrite per bullet, or None where the AI gave nothing usable
+        """
+        results = self._cached_enhancements(bullet_points)
+        missing = [index for index, result in enumerate(results) if result is None]
+        if not missing or self.cache.replay:
+            return results
+        
+        misses = [bullet_points[index] for index in missing]
+        if len(misses) == 1:
+            fresh = [self._ai_enhance_bullet(misses[0])]
+        else:
+            fresh = self._request_batch(misses)
+        self._store_enhancements(misses, fresh)
+        
+        for index, enhanced in zip(missing, fresh):
+            results[index] = enhanced
+        return results
+    
+    async def _ai_enhance_bullets_async(self, bullet_points: List[str], timeout: float) -> List[Optional[str]]:
+        """Async counterpart of _ai_enhance_batch"""
+        # The cache is SQLite; keep its I/O off the event loop
+        results = await asyncio.to_thread(self._cached_enhancements, bullet_points)
+        missing = [index for index, result in enumerate(results) if result is None]
+        if not missing or self.cache.replay:
+            return results
+        
+        misses = [bullet_points[index] for index in missing]
+        if len(misses) == 1:
+            fresh = [await self._ai_enhance_bullet_async(misses[0], timeout)]
+        else:
+            fresh = await self._request_batch_async(misses, timeout)
+        await asyncio.to_thread(self._store_enhancements, misses, fresh)
+        
+        for index, enhanced in zip(missing, fresh):
+            results[index] = enhanced
+        return results
+    
+    def _batch_max_tokens(self, bullet_points: List[str]) -> int:
+        return min(4000, 150 * len(bullet_points) + 50)
+    
+    def _request_batch(self, bullet_points: List[str]) -> List[Optional[str]]:
+        """Enhance several bullet points with a single OpenAI request"""
+        try:
+            response = self.client.chat.completions.create(
+                model=self.MODEL,
+                messages=self._batch_messages(bullet_points),
+                max_tokens=self._batch_max_tokens(bullet_points),
+                temperature=self.TEMPERATURE,
+                timeout=self.call_timeout
+            )
+            
+            return self._parse_batch_response(response.choices[0].message.content, bullet_points)
+            
+        except Exception as e:
+            logger.warning("AI batch enhancement failed: %s", e)
+        
+        return [None] * len(bullet_points)
+    
+    async def _request_batch_async(self, bullet_points: List[str], timeout: float) -> List[Optional[str]]:
+        """Enhance several bullet points with a single async OpenAI request"""
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.MODEL,
+                messages=self._batch_messages(bullet_points),
+                max_tokens=self._batch_max_tokens(bullet_points),
+                temperature=self.TEMPERATURE,
+                timeout=timeout
+            )
+            
+            return self._parse_batch_response(response.choices[0].message.content, bullet_points)
+            
+        except Exception as e:
+            logger.warning("AI batch enhancement failed: %s", e)
+        
+        return [None] * len(bullet_points)
+    
     def _rule_based_enhance(self, bullet_point: str) -> str:
         """Enhance bullet point using rule-based approach"""
         enhanced = bullet_point
+        patterns = self.enhancement_patterns
         
         # Replace weak verbs with stronger alternatives
-        for weak_verb, strong_verbs in self.enhancement_patterns['weak_verbs'].items():
+        for weak_verb, strong_verbs in patterns['weak_verbs'].items():
             if weak_verb in enhanced.lower():
                 # Use the first strong verb as replacement
                 enhanced = re.sub(
@@ -174,7 +459,7 @@ class EnhancementEngine:
                 enhanced = enhanced[2:]  # Remove "I "
             
             # Add a generic action verb if none is present
-            if not any(verb in enhanced.lower()[:20] for verb in self.enhancement_patterns['action_verbs']):
+            if not any(verb in enhanced.lower()[:20] for verb in patterns['action_verbs']):
                 enhanced = f"Developed {enhanced.lower()}"
         
         # Capitalize first letter
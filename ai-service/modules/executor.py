@@ -0,0 +1,151 @@
+"""
+Execution layer for the analysis pipeline.
+
+Keeps blocking work off the asyncio event loop so one service worker can
+accept many uploads at once and still answer ``/health``:
+
+    process pool  OCR and model inference ('process' stages), sized by
+                  ANALYSIS_PROCESS_WORKERS; 0 runs them in the thread pool
+    thread pool   lightweight stages (scoring, keywords), PIPELINE_THREADS
+
+Admission is bounded. At most MAX_PENDING_ANALYSES analyses are in flight;
+beyond that ``admit`` raises QueueFullError so the client is told to retry
+instead of waiting behind an ever longer queue. Admitted runs then wait for a
+slot in their priority lane of the scheduler (see modules.scheduler).
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AsyncExitStack, contextmanager
+from typing import Callable, Dict, Optional
+from dotenv import load_dotenv
+from modules.pipeline import Pipeline, PipelineResult, get_stage_executor
+from modules.scheduler import LaneScheduler
+from modules.tracing import span
+from modules.workers import warm_up
+
+load_dotenv()
+
+
+class QueueFullError(RuntimeError):
+    """Too many analyses are already in flight"""
+
+
+class ExecutionLayer:
+    """Process and thread pools plus an admission limit for pipeline runs"""
+
+    def __init__(self, process_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 thread_executor: Optional[Executor] = None,
+                 initializer: Optional[Callable[[], None]] = warm_up,
+                 scheduler: Optional[LaneScheduler] = None):
+        """
+        Args:
+            process_workers: Size of the process pool; 0 disables it
+            max_pending: Analyses allowed in flight at once
+            thread_executor: Pool for 'thread' stages (defaults to the shared stage pool)
+            initializer: Called in each new worker process (defaults to loading the models)
+            scheduler: Priority lanes runs wait in (defaults to a LaneScheduler
+                configured from the environment)
+        """
+        self.process_workers = process_workers if process_workers is not None else \
+            int(os.getenv('ANALYSIS_PROCESS_WORKERS', '0'))
+        self.max_pending = max_pending if max_pending is not None else \
+            int(os.getenv('MAX_PENDING_ANALYSES', '32'))
+        self.thread_executor = thread_executor or get_stage_executor()
+        self.initializer = initializer
+        self.scheduler = scheduler or LaneScheduler()
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+
+    @property
+    def uses_processes(self) -> bool:
+        return self.process_workers > 0
+
+    @property
+    def process_executor(self) -> Optional[ProcessPoolExecutor]:
+        """The process pool, started on first use, or None when disabled"""
+        if not self.uses_processes:
+            return None
+        with self._lock:
+            if self._process_executor is None:
+                # Spawned rather than forked: the parent already runs threads
+                self._process_executor = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=self.initializer
+                )
+            return self._process_executor
+
+    @contextmanager
+    def admit(self):
+        """
+        Hold one of the in-flight slots for the duration of the block
+
+        Raises:
+            QueueFullError: If every slot is taken
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise QueueFullError(
+                    f"{self._pending} analyses already in progress. Please retry shortly."
+                )
+            self._pending += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def run(self, pipeline: Pipeline, inputs: Dict, admit: bool = True,
+                  lane: Optional[str] = None) -> PipelineResult:
+        """
+        Run a pipeline on this layer's pools
+
+        Args:
+            pipeline: Pipeline to run
+            inputs: Values for its inputs
+            admit: Hold an in-flight slot; job workers, which bound their
+                own concurrency, pass False
+            lane: Scheduler lane to wait in; None when the caller already
+                holds a scheduler slot
+
+        Raises:
+            QueueFullError: If every slot is taken
+        """
+        if not admit:
+            return await self._run(pipeline, inputs, lane)
+        with self.admit():
+            return await self._run(pipeline, inputs, lane)
+
+    async def _run(self, pipeline: Pipeline, inputs: Dict, lane: Optional[str]) -> PipelineResult:
+        if lane is None:
+            return await pipeline.run(inputs, executor=self.thread_executor,
+                                      process_executor=self.process_executor)
+        async with AsyncExitStack() as stack:
+            # Time spent waiting for a slot shows as its own span in traces
+            with span('scheduler.wait', lane=lane):
+                await stack.enter_async_context(self.scheduler.slot(lane))
+            return await pipeline.run(inputs, executor=self.thread_executor,
+                                      process_executor=self.process_executor)
+
+    def stats(self) -> Dict:
+        """Current load of the execution layer"""
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'rejected': self._rejected,
+                'process_workers': self.process_workers,
+            }
+
+    def shutdown(self):
+        """Stop the process pool, letting running stages finish"""
+        with self._lock:
+            executor, self._process_executor = self._process_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
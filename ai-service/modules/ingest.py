@@ -0,0 +1,156 @@
+"""
+Streaming ingest of uploaded resumes.
+
+Uploads are never read into memory whole. ``BodySizeLimit`` counts request
+body bytes as they arrive from the client and answers 413 once a request is
+over its limit, before the multipart parser has buffered the rest (a
+Content-Length over the limit is refused without reading anything).
+``spool_upload`` then copies the file a chunk at a time to its own
+temporary file, checking the PDF signature on the first bytes and hashing
+as it goes, so the hash for the result cache comes for free and memory per
+upload is bounded by the chunk size.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import BinaryIO, Dict, NamedTuple, Optional
+
+CHUNK_SIZE = 64 * 1024
+PDF_SIGNATURE = b'%PDF-'
+
+
+class UploadTooLargeError(ValueError):
+    """An upload is over the size limit"""
+
+
+class NotPDFError(ValueError):
+    """An upload does not start with the PDF signature"""
+
+
+class SpooledUpload(NamedTuple):
+    """An upload copied to a temporary file"""
+    path: str
+    size: int
+    sha256: str
+
+
+def spool_upload(source: BinaryIO, name: str, max_size: int, chunk_size: int = CHUNK_SIZE,
+                 directory: Optional[str] = None) -> SpooledUpload:
+    """
+    Copy a PDF upload to a temporary file, chunk by chunk
+
+    Args:
+        source: Binary stream of the upload
+        name: File name, for error messages
+        max_size: Largest allowed size in bytes
+        chunk_size: Bytes read at a time
+        directory: Where to create the temporary file
+
+    Returns:
+        The temporary file, which the caller removes when done with it
+
+    Raises:
+        UploadTooLargeError: As soon as more than ``max_size`` bytes have been read
+        NotPDFError: If the first bytes are not the PDF signature
+    """
+    digest = hashlib.sha256()
+    size = 0
+    head = b''
+    fd, path = tempfile.mkstemp(prefix='temp_', suffix='.pdf', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as target:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(
+                        f"File size too large: {name} is over {max_size} bytes. Maximum allowed: {max_size} bytes"
+                    )
+                if len(head) < len(PDF_SIGNATURE):
+                    head += chunk[:len(PDF_SIGNATURE) - len(head)]
+                    if not PDF_SIGNATURE.startswith(head):
+                        raise NotPDFError(f"{name} is not a PDF file. Only PDF files are allowed.")
+                digest.update(chunk)
+                target.write(chunk)
+        if head != PDF_SIGNATURE:
+            raise NotPDFError(f"{name} is not a PDF file. Only PDF files are allowed.")
+    except BaseException:
+        os.remove(path)
+        raise
+    return SpooledUpload(path, size, digest.hexdigest())
+
+
+class BodySizeLimit:
+    """ASGI middleware refusing request bodies over a per-path limit with 413"""
+
+    def __init__(self, app, default_limit: int, path_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            app: ASGI application to wrap
+            default_limit: Largest body in bytes for paths without their own limit
+            path_limits: Limits for particular paths, e.g. bulk uploads
+        """
+        self.app = app
+        self.default_limit = default_limit
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.path_limits.get(scope['path'], self.default_limit)
+        try:
+            declared = int(dict(scope['headers']).get(b'content-length', b'0'))
+        except ValueError:
+            declared = 0
+        if declared > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        started = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {'type': 'http.disconnect'}
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > limit and not started:
+                    # Answer now; the app sees a client that went away
+                    rejected = True
+                    await self._reject(send, limit)
+                    return {'type': 'http.disconnect'}
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if rejected:
+                return  # The 413 has been sent already
+            if message['type'] == 'http.response.start':
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+    @staticmethod
+    async def _reject(send, limit: int):
+        body = json.dumps({'detail': f"Request body too large. Maximum allowed: {limit} bytes"}).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': 413,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode()),
+                        (b'connection', b'close')],
+        })
+        await send({'type': 'http.response.body', 'body': body})
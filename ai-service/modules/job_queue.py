@@ -0,0 +1,372 @@
+"""
+Durable queue of analysis jobs.
+
+``POST /jobs`` stores the upload and its parameters here and returns at
+once; worker loops (in the service or in separate ``python -m
+modules.job_worker`` processes) claim jobs, run the pipeline and store the
+result. The queue is a SQLite file so every process on the host shares it.
+Its interface (enqueue / claim / extend_lease / complete / fail / reject /
+get / purge_expired) is all a Redis-backed queue would need to provide to
+replace it.
+
+Delivery is at-least-once:
+
+- A claimed job is leased for ``visibility_timeout`` seconds. If the worker
+  dies without reporting back, the job becomes claimable again. Workers
+  extend the lease with ``extend_lease`` while the job runs, so a long
+  analysis is not handed to a second worker.
+- A failed attempt is retried with exponential backoff until
+  ``max_attempts`` is reached, then the job is marked failed.
+- A job whose upload cannot be analyzed (too little text, not a resume) is
+  marked rejected without a retry; it failed because of the client's input.
+- Every claim gets a new lease ID. A worker whose lease has since passed to
+  another worker cannot complete or fail the job.
+- Finished jobs and their results are kept for ``result_ttl`` seconds.
+
+Each job belongs to a priority lane (see modules.scheduler); workers claim
+from one lane at a time, oldest job first.
+"""
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, NamedTuple, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_QUEUE_PATH = os.path.join(DATA_DIR, 'jobs.sqlite3')
+DEFAULT_SPOOL_DIR = os.path.join(DATA_DIR, 'job_files')
+
+STATUSES = ('queued', 'running', 'done', 'failed', 'rejected')
+FINISHED = ('done', 'failed', 'rejected')
+
+DEFAULT_LANE = 'interactive'
+
+_COLUMNS = 'id, status, payload, result, error, attempts, created, updated, lease, lane'
+
+
+class Job(NamedTuple):
+    """A job as stored in the queue"""
+    id: str
+    status: str
+    payload: Dict
+    result: Optional[Dict]
+    error: Optional[str]
+    attempts: int
+    created: float
+    updated: float
+    lease: Optional[str]
+    lane: str = DEFAULT_LANE
+
+
+class JobQueue:
+    """SQLite-backed job queue with leases, retries and result expiry"""
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, spool_dir: str = DEFAULT_SPOOL_DIR,
+                 visibility_timeout: Optional[float] = None, max_attempts: Optional[int] = None,
+                 retry_delay: Optional[float] = None, result_ttl: Optional[float] = None):
+        """
+        Args:
+            path: SQLite file holding the jobs
+            spool_dir: Directory for uploaded files waiting to be analyzed
+            visibility_timeout: Seconds a claimed job stays invisible to other workers
+            max_attempts: Attempts before a job is marked failed
+            retry_delay: Seconds before the first retry; doubled for each further one
+            result_ttl: Seconds finished jobs are kept
+        """
+        self.path = path
+        self.spool_dir = spool_dir
+        self.visibility_timeout = visibility_timeout if visibility_timeout is not None else \
+            float(os.getenv('JOB_VISIBILITY_TIMEOUT', '300'))
+        self.max_attempts = max_attempts if max_attempts is not None else int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+        self.retry_delay = retry_delay if retry_delay is not None else float(os.getenv('JOB_RETRY_DELAY', '5'))
+        self.result_ttl = result_ttl if result_ttl is not None else float(os.getenv('JOB_RESULT_TTL', '86400'))
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit; claims take an explicit write lock with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT NOT NULL, result TEXT, error TEXT, '
+                'attempts INTEGER NOT NULL DEFAULT 0, created REAL NOT NULL, updated REAL NOT NULL, '
+                'visible_at REAL NOT NULL, lease TEXT)'
+            )
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(jobs)')}
+            if 'lane' not in columns:
+                # Queue files created before priority lanes
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN lane TEXT NOT NULL DEFAULT '{DEFAULT_LANE}'")
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_lane_claimable ON jobs (lane, status, visible_at)')
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _row_to_job(row) -> Job:
+        job_id, status, payload, result, error, attempts, created, updated, lease, lane = row
+        return Job(job_id, status, json.loads(payload), json.loads(result) if result is not None else None,
+                   error, attempts, created, updated, lease, lane)
+
+    def enqueue(self, payload: Dict, upload: Optional[bytes] = None, suffix: str = '.pdf',
+                lane: str = DEFAULT_LANE, upload_path: Optional[str] = None) -> str:
+        """
+        Add a job
+
+        Args:
+            payload: JSON-serializable job parameters
+            upload: File contents to keep with the job; its path is stored
+                in the payload as ``file_path``
+            suffix: File extension for the stored upload
+            lane: Priority lane of the job
+            upload_path: File to move in as the upload instead of ``upload``
+
+        Returns:
+            The new job ID
+        """
+        job_id = uuid.uuid4().hex
+        payload = dict(payload)
+        if upload is not None or upload_path is not None:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            file_path = os.path.join(self.spool_dir, job_id + suffix)
+            if upload_path is not None:
+                shutil.move(upload_path, file_path)
+            else:
+                with open(file_path, 'wb') as buffer:
+                    buffer.write(upload)
+            payload['file_path'] = file_path
+
+        now = time.time()
+        with self._lock:
+            self._connect().execute(
+                'INSERT INTO jobs (id, status, payload, attempts, created, updated, visible_at, lane) '
+                'VALUES (?, ?, ?, 0, ?, ?, ?, ?)',
+                (job_id, 'queued', json.dumps(payload), now, now, now, lane)
+            )
+        return job_id
+
+    def claim(self, lane: Optional[str] = None) -> Optional[Job]:
+        """
+        Lease the oldest job that is ready to run
+
+        Args:
+            lane: Only claim from this lane; None claims from any
+
+        Returns:
+            The claimed job, with a fresh ``lease``, or None if nothing is ready
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                while True:
+                    # Queued jobs past their retry delay, or running jobs whose lease expired
+                    row = conn.execute(
+                        "SELECT id, attempts, payload FROM jobs WHERE status IN ('queued', 'running') "
+                        'AND visible_at <= ? AND (? IS NULL OR lane = ?) ORDER BY created LIMIT 1',
+                        (now, lane, lane)
+                    ).fetchone()
+                    if row is None:
+                        conn.execute('COMMIT')
+                        return None
+
+                    job_id, attempts, payload = row
+                    if attempts >= self.max_attempts:
+                        # Its last worker never reported back
+                        conn.execute(
+                            "UPDATE jobs SET status = 'failed', error = ?, updated = ?, lease = NULL WHERE id = ?",
+                            ('Worker did not finish the job in time', now, job_id)
+                        )
+                        self._remove_upload(json.loads(payload))
+                        continue
+
+                    lease = uuid.uuid4().hex
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated = ?, "
+                        'visible_at = ?, lease = ? WHERE id = ?',
+                        (now, now + self.visibility_timeout, lease, job_id)
+                    )
+                    job = self._row_to_job(conn.execute(
+                        f'SELECT {_COLUMNS} FROM jobs WHERE id = ?', (job_id,)
+                    ).fetchone())
+                    conn.execute('COMMIT')
+                    return job
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+
+    def extend_lease(self, job_id: str, lease: str) -> bool:
+        """
+        Keep a running job leased for another ``visibility_timeout`` seconds
+
+        Returns:
+            False if the lease has passed to another worker or the job has finished
+        """
+        with self._lock:
+            updated = self._connect().execute(
+                "UPDATE jobs SET visible_at = ? WHERE id = ? AND lease = ? AND status = 'running'",
+                (time.time() + self.visibility_timeout, job_id, lease)
+            ).rowcount
+        return bool(updated)
+
+    def complete(self, job: Job, result: Dict) -> bool:
+        """
+        Store the result of a claimed job
+
+        Returns:
+            False if the job's lease has passed to another worker
+        """
+        now = time.time()
+        with self._lock:
+            updated = self._connect().execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, updated = ?, lease = NULL "
+                "WHERE id = ? AND lease = ? AND status = 'running'",
+                (json.dumps(result), now, job.id, job.lease)
+            ).rowcount
+        if updated:
+            self._remove_upload(job.payload)
+        return bool(updated)
+
+    def fail(self, job: Job, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt of a claimed job
+
+        Args:
+            job: The claimed job
+            error: What went wrong
+            retry: Whether another attempt could succeed
+
+        Returns:
+            False if the job's lease has passed to another worker
+        """
+        now = time.time()
+        final = not retry or job.attempts >= self.max_attempts
+        with self._lock:
+            conn = self._connect()
+            if final:
+                updated = conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, updated = ?, lease = NULL "
+                    "WHERE id = ? AND lease = ? AND status = 'running'",
+                    (error, now, job.id, job.lease)
+                ).rowcount
+            else:
+                delay = self.retry_delay * 2 ** (job.attempts - 1)
+                updated = conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = ?, updated = ?, visible_at = ?, lease = NULL "
+                    "WHERE id = ? AND lease = ? AND status = 'running'",
+                    (error, now, now + delay, job.id, job.lease)
+                ).rowcount
+        if updated and final:
+            self._remove_upload(job.payload)
+        return bool(updated)
+
+    def reject(self, job: Job, error: str, detail: Optional[Dict] = None) -> bool:
+        """
+        Finish a claimed job whose input cannot be analyzed, without retrying
+
+        Args:
+            job: The claimed job
+            error: Why the input was rejected
+            detail: Details for the client, kept as the job's result
+
+        Returns:
+            False if the job's lease has passed to another worker
+        """
+        now = time.time()
+        with self._lock:
+            updated = self._connect().execute(
+                "UPDATE jobs SET status = 'rejected', result = ?, error = ?, updated = ?, lease = NULL "
+                "WHERE id = ? AND lease = ? AND status = 'running'",
+                (json.dumps(detail) if detail is not None else None, error, now, job.id, job.lease)
+            ).rowcount
+        if updated:
+            self._remove_upload(job.payload)
+        return bool(updated)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job, or None if it is unknown or its result has expired"""
+        with self._lock:
+            row = self._connect().execute(f'SELECT {_COLUMNS} FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = self._row_to_job(row)
+        if self._expired(job, time.time()):
+            return None
+        return job
+
+    def _expired(self, job: Job, now: float) -> bool:
+        return job.status in FINISHED and self.result_ttl > 0 and now - job.updated > self.result_ttl
+
+    def purge_expired(self) -> int:
+        """Delete finished jobs older than the result TTL; returns how many"""
+        if self.result_ttl <= 0:
+            return 0
+        with self._lock:
+            deleted = self._connect().execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed', 'rejected') AND updated < ?",
+                (time.time() - self.result_ttl,)
+            ).rowcount
+        return deleted
+
+    def _remove_upload(self, payload: Dict):
+        file_path = payload.get('file_path')
+        if file_path and os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                logger.warning("Failed to remove job file %s: %s", file_path, e)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of jobs in each status"""
+        with self._lock:
+            rows = self._connect().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(dict(rows))
+        return counts
+
+    def has_ready(self, lane: Optional[str] = None) -> bool:
+        """Whether a claim in ``lane`` would currently find a job"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM jobs WHERE status IN ('queued', 'running') AND visible_at <= ? "
+                'AND (? IS NULL OR lane = ?) LIMIT 1', (time.time(), lane, lane)
+            ).fetchone()
+        return row is not None
+
+    def lane_stats(self) -> Dict[str, Dict]:
+        """Queued and running jobs per lane, and how long the oldest queued job has waited"""
+        now = time.time()
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT lane, SUM(status = 'queued'), SUM(status = 'running'), "
+                "MIN(CASE WHEN status = 'queued' THEN created END) "
+                "FROM jobs WHERE status IN ('queued', 'running') GROUP BY lane"
+            ).fetchall()
+        return {
+            lane: {
+                'queued': queued,
+                'running': running,
+                'oldest_wait_s': round(now - oldest, 3) if oldest is not None else 0.0,
+            }
+            for lane, queued, running, oldest in rows
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,205 @@
+"""
+Workers that run queued analysis jobs.
+
+The service runs JOB_WORKERS worker loops of its own. To add capacity, start
+more worker processes on the same host; they share the queue file:
+
+    python -m modules.job_worker
+
+Each process has its own engines and execution layer, so OCR and model
+stages scale with the number of processes.
+
+While a job runs, its worker extends the job's lease every third of the
+queue's visibility timeout, so only a worker that stopped responding loses
+its job to another.
+
+Worker loops serve one priority lane each and take a slot from the
+execution layer's scheduler before claiming a job, so queued bulk work only
+runs on the capacity its lane is allowed.
+"""
+
+import asyncio
+import os
+import time
+import logging
+from typing import Optional, Tuple
+from dotenv import load_dotenv
+from modules.analysis_pipeline import (
+    STANDARD, AnalysisEngines, AnalysisPipelines, InsufficientTextError, NotAResumeError, analysis_response
+)
+from modules.analysis_store import AnalysisStore
+from modules.executor import ExecutionLayer
+from modules.job_queue import DEFAULT_QUEUE_PATH, DEFAULT_SPOOL_DIR, Job, JobQueue
+from modules.pipeline import Pipeline
+from modules.logs import configure_logging
+from modules.tracing import TRACER
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Claims jobs from a JobQueue and runs the analysis pipeline on them"""
+
+    def __init__(self, queue: JobQueue, execution: ExecutionLayer, pipeline: Optional[Pipeline] = None,
+                 enhancements_pipeline: Optional[Pipeline] = None, store: Optional[AnalysisStore] = None,
+                 poll_interval: Optional[float] = None, pipelines: Optional[AnalysisPipelines] = None):
+        """
+        Args:
+            queue: Queue to take jobs from
+            execution: Pools the pipeline runs on
+            pipeline: Analysis pipeline, when not picked by mode from ``pipelines``
+            enhancements_pipeline: Pipeline for jobs that ask for enhancements inline
+            store: Where to save sections for /enhancements/{id}; only
+                useful for workers inside the service process
+            poll_interval: Seconds to wait when the queue is empty
+            pipelines: Pipelines of every analysis mode; jobs then run in the
+                mode they were queued with
+        """
+        self.queue = queue
+        self.execution = execution
+        self.pipeline = pipeline
+        self.enhancements_pipeline = enhancements_pipeline or pipeline
+        self.pipelines = pipelines
+        self.store = store
+        self.poll_interval = poll_interval if poll_interval is not None else \
+            float(os.getenv('JOB_POLL_INTERVAL', '0.5'))
+        self.purge_interval = 60.0
+
+    async def run_once(self, lane: Optional[str] = None) -> bool:
+        """
+        Claim and process one job
+
+        Args:
+            lane: Lane to serve; None takes the oldest job of any lane
+
+        Returns:
+            False if no job was ready
+        """
+        if lane is None:
+            job = await asyncio.to_thread(self.queue.claim)
+            if job is None:
+                return False
+            await self._process(job, lane=job.lane)
+            return True
+
+        if not await asyncio.to_thread(self.queue.has_ready, lane):
+            return False
+        # Take the slot first so a claimed job's lease is not spent waiting
+        async with self.execution.scheduler.slot(lane):
+            job = await asyncio.to_thread(self.queue.claim, lane)
+            if job is None:
+                return False
+            await self._process(job, lane=None)
+        return True
+
+    async def _process(self, job: Job, lane: Optional[str]):
+        # Continue the trace of the request that queued the job, if it was traced
+        with TRACER.root('job', job.payload.get('traceparent'), job_id=job.id, lane=job.lane,
+                         attempt=job.attempts) as job_span:
+            heartbeat = asyncio.create_task(self._heartbeat(job))
+            try:
+                await self._run_job(job, lane, job_span)
+            finally:
+                heartbeat.cancel()
+
+    async def _heartbeat(self, job: Job):
+        """Extend the job's lease until cancelled or the lease is lost"""
+        interval = self.queue.visibility_timeout / 3
+        if interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            if not await asyncio.to_thread(self.queue.extend_lease, job.id, job.lease):
+                logger.warning("Job %s lease was lost while it ran", job.id,
+                               extra={"job_id": job.id, "lane": job.lane})
+                return
+
+    async def _run_job(self, job: Job, lane: Optional[str], job_span):
+        include_enhancements = bool(job.payload.get('include_enhancements'))
+        mode = job.payload.get('mode', STANDARD)
+        fields = tuple(job.payload['fields']) if job.payload.get('fields') else None
+        if self.pipelines is not None:
+            pipeline = self.pipelines.get(mode, include_enhancements, fields)
+            include_enhancements = self.pipelines.includes_enhancements(mode, include_enhancements, fields)
+        else:
+            pipeline = self.enhancements_pipeline if include_enhancements else self.pipeline
+        inputs = {'file_path': job.payload['file_path'], 'job_role': job.payload['job_role']}
+        try:
+            result = await self.execution.run(pipeline, inputs, admit=False, lane=lane)
+        except InsufficientTextError as e:
+            # The same file will not read any better on a retry
+            if job_span is not None:
+                job_span.set_error(str(e))
+            detail = e.rejection if isinstance(e, NotAResumeError) else None
+            await asyncio.to_thread(self.queue.reject, job, str(e), detail)
+            return
+        except Exception as e:
+            logger.warning("Job %s attempt %d failed: %s", job.id, job.attempts, e,
+                           extra={"job_id": job.id, "lane": job.lane})
+            if job_span is not None:
+                job_span.set_error(str(e))
+            await asyncio.to_thread(self.queue.fail, job, str(e))
+            return
+
+        await self._complete(job, result, include_enhancements, mode, fields)
+
+    async def _complete(self, job: Job, result, include_enhancements: bool, mode: str,
+                        fields: Optional[Tuple[str, ...]] = None):
+        response = analysis_response(result, mode, fields)
+        if self.store is not None and 'sections' in response:
+            analysis_id = self.store.create(
+                result['sections'], job.payload['job_role'],
+                enhancements=response['enhancedBullets'] if include_enhancements else None
+            )
+            response['analysisId'] = analysis_id
+            response['enhancementsUrl'] = f"/enhancements/{analysis_id}"
+        response['fileName'] = job.payload.get('file_name')
+
+        if not await asyncio.to_thread(self.queue.complete, job, response):
+            logger.warning("Job %s was taken over by another worker; result discarded", job.id)
+
+    async def run_forever(self, lane: Optional[str] = None):
+        """Process jobs from ``lane`` (or any lane) until cancelled"""
+        next_purge = time.monotonic()
+        while True:
+            try:
+                worked = await self.run_once(lane)
+                if time.monotonic() >= next_purge:
+                    await asyncio.to_thread(self.queue.purge_expired)
+                    next_purge = time.monotonic() + self.purge_interval
+            except Exception as e:
+                logger.exception("Job worker error: %s", e)
+                worked = False
+            if not worked:
+                await asyncio.sleep(self.poll_interval)
+
+    async def serve(self, loops: int):
+        """Run ``loops`` worker loops per scheduler lane until cancelled"""
+        await asyncio.gather(*(
+            self.run_forever(lane) for lane in self.execution.scheduler.lanes for _ in range(loops)
+        ))
+
+
+def main():
+    """Run a standalone worker process against the shared queue"""
+    configure_logging()
+    execution = ExecutionLayer()
+    engines = AnalysisEngines(load_models=not execution.uses_processes)
+    queue = JobQueue(os.getenv('JOB_QUEUE_PATH', DEFAULT_QUEUE_PATH), os.getenv('JOB_SPOOL_DIR', DEFAULT_SPOOL_DIR))
+    worker = JobWorker(queue, execution, pipelines=AnalysisPipelines(
+        engines, enhance=engines.enhancement_engine.enhance_content_async, use_processes=execution.uses_processes
+    ))
+    loops = int(os.getenv('JOB_WORKERS', '2'))
+    logger.info("Job worker started with %d loops per lane on %s", loops, queue.path)
+    try:
+        asyncio.run(worker.serve(loops))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        execution.shutdown()
+        queue.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,105 +1,32 @@
 import re
+from types import MappingProxyType
 from typing import Dict, List, Set, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from modules.taxonomy import get_taxonomy
+
+# TF-IDF settings for semantic similarity. A vectorizer is fitted per call, so
+# one shared instance would be refitted by concurrent requests.
+TFIDF_PARAMS = MappingProxyType({
+    'stop_words': 'english',
+    'lowercase': True,
+    'ngram_range': (1, 2),  # Include bigrams
+    'max_features': 1000,
+})
 
 class KeywordAnalyzer:
     """Advanced keyword analysis and job role matching"""
     
-    def __init__(self):
-        # Comprehensive job role keywords database
-        self.job_keywords = {
-            'software engineer': {
-                'core': ['programming', 'software development', 'coding', 'algorithms', 'data structures'],
-                'languages': ['python', 'java', 'javascript', 'c++', 'c#', 'go', 'rust', 'typescript'],
-                'frameworks': ['react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring'],
-                'tools': ['git', 'docker', 'kubernetes', 'jenkins', 'jira', 'vscode', 'intellij'],
-                'databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch'],
-                'cloud': ['aws', 'azure', 'gcp', 'cloud computing', 'microservices'],
-                'methodologies': ['agile', 'scrum', 'tdd', 'ci/cd', 'devops', 'code review']
-            },
-            'data scientist': {
-                'core': ['machine learning', 'data analysis', 'statistics', 'data mining', 'predictive modeling'],
-                'languages': ['python', 'r', 'sql', 'scala', 'julia'],
-                'libraries': ['pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras'],
-                'tools': ['jupyter', 'tableau', 'power bi', 'excel', 'spark', 'hadoop'],
-                'databases': ['sql', 'nosql', 'mongodb', 'cassandra', 'bigquery'],
-                'cloud': ['aws', 'azure', 'gcp', 'databricks', 'snowflake'],
-                'methods': ['regression', 'classification', 'clustering', 'deep learning', 'nlp', 'computer vision']
-            },
-            'product manager': {
-                'core': ['product strategy', 'product roadmap', 'user research', 'market analysis'],
-                'skills': ['stakeholder management', 'requirements gathering', 'prioritization', 'leadership'],
-                'tools': ['jira', 'confluence', 'figma', 'miro', 'slack', 'trello', 'asana'],
-                'analytics': ['google analytics', 'mixpanel', 'amplitude', 'a/b testing', 'metrics'],
-                'methodologies': ['agile', 'scrum', 'lean', 'design thinking', 'user stories'],
-                'business': ['market research', 'competitive analysis', 'go-to-market', 'pricing strategy']
-            },
-            'frontend developer': {
-                'core': ['frontend development', 'user interface', 'user experience', 'responsive design'],
-                'languages': ['javascript', 'typescript', 'html', 'css', 'sass', 'less'],
-                'frameworks': ['react', 'vue', 'angular', 'svelte', 'next.js', 'nuxt.js'],
-                'tools': ['webpack', 'vite', 'babel', 'npm', 'yarn', 'git'],
-                'styling': ['css3', 'flexbox', 'grid', 'bootstrap', 'tailwind', 'material-ui'],
-                'testing': ['jest', 'cypress', 'testing library', 'selenium', 'unit testing']
-            },
-            'backend developer': {
-                'core': ['backend development', 'server-side', 'api development', 'system architecture'],
-                'languages': ['python', 'java', 'node.js', 'go', 'c#', 'php', 'ruby'],
-                'frameworks': ['express', 'django', 'flask', 'spring', 'laravel', 'rails'],
-                'databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'cassandra'],
-                'tools': ['docker', 'kubernetes', 'jenkins', 'git', 'postman', 'swagger'],
-                'concepts': ['rest api', 'graphql', 'microservices', 'authentication', 'security', 'scalability']
-            },
-            'devops engineer': {
-                'core': ['devops', 'infrastructure', 'automation', 'deployment', 'monitoring'],
-                'cloud': ['aws', 'azure', 'gcp', 'cloud infrastructure', 'serverless'],
-                'tools': ['docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'puppet'],
-                'monitoring': ['prometheus', 'grafana', 'elk stack', 'datadog', 'new relic'],
-                'scripting': ['bash', 'python', 'powershell', 'yaml', 'json'],
-                'concepts': ['ci/cd', 'infrastructure as code', 'containerization', 'orchestration']
-            },
-            'ui/ux designer': {
-                'core': ['user experience', 'user interface', 'design thinking', 'user research'],
-                'tools': ['figma', 'sketch', 'adobe xd', 'photoshop', 'illustrator', 'invision'],
-                'skills': ['wireframing', 'prototyping', 'user testing', 'information architecture'],
-                'methods': ['design systems', 'accessibility', 'responsive design', 'interaction design'],
-                'research': ['user interviews', 'usability testing', 'personas', 'journey mapping']
-            },
-            'marketing manager': {
-                'core': ['digital marketing', 'marketing strategy', 'brand management', 'campaign management'],
-                'channels': ['social media', 'email marketing', 'content marketing', 'seo', 'sem', 'ppc'],
-                'tools': ['google analytics', 'hubspot', 'mailchimp', 'hootsuite', 'salesforce'],
-                'skills': ['market research', 'customer segmentation', 'lead generation', 'conversion optimization'],
-                'metrics': ['roi', 'ctr', 'conversion rate', 'customer acquisition cost', 'lifetime value']
-            }
-        }
-        
-        # ATS-friendly keywords
-        self.ats_keywords = {
-            'action_verbs': [
-                'achieved', 'analyzed', 'built', 'collaborated', 'created', 'delivered',
-                'designed', 'developed', 'enhanced', 'established', 'executed',
-                'implemented', 'improved', 'increased', 'led', 'managed', 'optimized',
-                'organized', 'reduced', 'resolved', 'streamlined', 'transformed'
-            ],
-            'soft_skills': [
-                'leadership', 'communication', 'teamwork', 'problem solving',
-                'critical thinking', 'adaptability', 'time management', 'collaboration'
-            ],
-            'certifications': [
-                'certified', 'certification', 'license', 'accredited', 'qualified'
-            ]
-        }
-        
-        # Initialize TF-IDF vectorizer
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            lowercase=True,
-            ngram_range=(1, 2),  # Include bigrams
-            max_features=1000
-        )
+    @property
+    def job_keywords(self) -> Dict[str, Dict[str, List[str]]]:
+        """Job role keywords database from the current taxonomy"""
+        return get_taxonomy().get('keyword_analysis', 'role_keywords')
+    
+    @property
+    def ats_keywords(self) -> Dict[str, List[str]]:
+        """ATS-friendly keywords from the current taxonomy"""
+        return get_taxonomy().get('keyword_analysis', 'ats_keywords')
     
     def analyze_keywords(self, sections: Dict, job_role: str) -> Dict:
         """
@@ -115,17 +42,19 @@ class KeywordAnalyzer:
         # Extract all text content
         resume_text = self._extract_resume_text(sections)
         
-        # Get job role keywords
-        role_keywords = self._get_job_role_keywords(job_role)
+        # Get job role keywords and find all of them in one pass
+        role = get_taxonomy().role_index('keyword_analysis').resolve(job_role, partial=True)
+        role_keywords = role.keywords
+        found = role.matcher.find(resume_text)
         
         # Perform keyword matching
-        keyword_matches = self._match_keywords(resume_text, role_keywords)
+        keyword_matches = self._match_keywords(resume_text, role_keywords, found)
         
         # Calculate keyword density
-        keyword_density = self._calculate_keyword_density(resume_text, role_keywords)
+        keyword_density = self._calculate_keyword_density(resume_text, role_keywords, found)
         
         # Identify missing keywords
-        missing_keywords = self._identify_missing_keywords(resume_text, role_keywords)
+        missing_keywords = self._identify_missing_keywords(resume_text, role_keywords, found)
         
         # Assess ATS compatibility
         ats_score = self._assess_ats_compatibility(resume_text, sections)
@@ -163,40 +92,29 @@ class KeywordAnalyzer:
     
     def _get_job_role_keywords(self, job_role: str) -> Dict[str, List[str]]:
         """Get keywords for the specified job role"""
-        job_role_lower = job_role.lower()
-        
-        # Find exact match first
-        for role, keywords in self.job_keywords.items():
-            if role in job_role_lower:
-                return keywords
-        
-        # Find partial matches
-        for role, keywords in self.job_keywords.items():
-            role_words = role.split()
-            if any(word in job_role_lower for word in role_words):
-                return keywords
-        
-        # Return generic keywords if no match found
-        return {
-            'core': ['experience', 'skills', 'knowledge', 'expertise'],
-            'tools': ['software', 'technology', 'systems'],
-            'skills': ['communication', 'teamwork', 'leadership', 'problem solving']
-        }
+        # Exact match first, then partial matches, then generic keywords
+        return get_taxonomy().role_index('keyword_analysis').resolve(job_role, partial=True).keywords
     
-    def _match_keywords(self, resume_text: str, role_keywords: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    def _find_keywords(self, resume_text: str, role_keywords: Dict[str, List[str]]) -> Set[str]:
+        """Find which of the given keywords occur in the resume text"""
+        return {keyword.lower() for keywords in role_keywords.values() for keyword in keywords
+                if keyword.lower() in resume_text}
+    
+    def _match_keywords(self, resume_text: str, role_keywords: Dict[str, List[str]],
+                        found: Set[str] = None) -> Dict[str, List[str]]:
         """Match keywords between resume and job role requirements"""
+        if found is None:
+            found = self._find_keywords(resume_text, role_keywords)
+        
         matches = {}
         
         for category, keywords in role_keywords.items():
-            category_matches = []
-            for keyword in keywords:
-                if keyword.lower() in resume_text:
-                    category_matches.append(keyword)
-            matches[category] = category_matches
+            matches[category] = [keyword for keyword in keywords if keyword.lower() in found]
         
         return matches
     
-    def _calculate_keyword_density(self, resume_text: str, role_keywords: Dict[str, List[str]]) -> Dict[str, float]:
+    def _calculate_keyword_density(self, resume_text: str, role_keywords: Dict[str, List[str]],
+                                   found: Set[str] = None) -> Dict[str, float]:
         """Calculate keyword density for each category"""
         density = {}
         word_count = len(resume_text.split())
@@ -204,22 +122,27 @@ class KeywordAnalyzer:
         if word_count == 0:
             return {category: 0.0 for category in role_keywords.keys()}
         
+        if found is None:
+            found = self._find_keywords(resume_text, role_keywords)
+        
         for category, keywords in role_keywords.items():
-            keyword_count = sum(resume_text.count(keyword.lower()) for keyword in keywords)
+            # Keywords that were not found contribute nothing, so skip counting them
+            keyword_count = sum(resume_text.count(keyword.lower()) for keyword in keywords
+                                if keyword.lower() in found)
             density[category] = round((keyword_count / word_count) * 100, 2)
         
         return density
     
-    def _identify_missing_keywords(self, resume_text: str, role_keywords: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    def _identify_missing_keywords(self, resume_text: str, role_keywords: Dict[str, List[str]],
+                                   found: Set[str] = None) -> Dict[str, List[str]]:
         """Identify missing keywords by category"""
+        if found is None:
+            found = self._find_keywords(resume_text, role_keywords)
+        
         missing = {}
         
         for category, keywords in role_keywords.items():
-            missing_in_category = []
-            for keyword in keywords:
-                if keyword.lower() not in resume_text:
-                    missing_in_category.append(keyword)
-            missing[category] = missing_in_category
+            missing[category] = [keyword for keyword in keywords if keyword.lower() not in found]
         
         return missing
     
@@ -227,15 +150,14 @@ class KeywordAnalyzer:
         """Assess ATS compatibility based on various factors"""
         score = 0
         max_score = 100
+        taxonomy = get_taxonomy()
         
         # Check for action verbs (20 points)
-        action_verb_count = sum(1 for verb in self.ats_keywords['action_verbs'] 
-                               if verb in resume_text)
+        action_verb_count = len(taxonomy.matcher('ats.action_verbs').find(resume_text))
         score += min(20, action_verb_count * 2)
         
         # Check for soft skills (15 points)
-        soft_skill_count = sum(1 for skill in self.ats_keywords['soft_skills'] 
-                              if skill in resume_text)
+        soft_skill_count = len(taxonomy.matcher('ats.soft_skills').find(resume_text))
         score += min(15, soft_skill_count * 3)
         
         # Check section structure (25 points)
@@ -318,7 +240,7 @@ class KeywordAnalyzer:
         """Calculate semantic similarity between resume and job description using TF-IDF"""
         try:
             documents = [resume_text, job_description]
-            tfidf_matrix = self.vectorizer.fit_transform(documents)
+            tfidf_matrix = TfidfVectorizer(**TFIDF_PARAMS).fit_transform(documents)
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
             return round(similarity * 100, 2)  # Convert to percentage
         except Exception:
@@ -0,0 +1,224 @@
+"""
+Persistent cache for LLM responses.
+
+Bullet rewrites and resume analyses are looked up by a key built from the
+normalized input, model, prompt version and temperature, so the same bullet
+("Worked on a team project...") is only sent to the API once. Entries live in
+a small SQLite file, expire after a TTL and are evicted least-recently-used
+once the cache holds more than ``max_entries``. A hit only records its access
+time when the stored one is older than ``touch_interval`` (a tenth of the TTL
+by default), so repeated hits are plain reads and eviction order is
+approximate within that interval. The entry count is kept in memory rather
+than counted on every write; a recount every ``RECOUNT_WRITES`` writes picks
+up entries added by other processes sharing the file.
+
+Modes (``LLM_CACHE_MODE``):
+    readwrite  look up, and store fresh responses (default)
+    replay     look up only; callers must not call the API on a miss, which
+               makes runs deterministic for tests
+    off        never look up or store
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'llm_cache.sqlite3'
+)
+
+MODES = ('readwrite', 'replay', 'off')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_input(text: str) -> str:
+    """Collapse runs of whitespace so trivially different copies share a key"""
+    return _WHITESPACE.sub(' ', text or '').strip()
+
+
+class LLMCache:
+    """Disk-backed, size-bounded cache of LLM responses with hit-rate stats"""
+
+    RECOUNT_WRITES = 1000
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None, mode: Optional[str] = None,
+                 touch_interval: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl if ttl is not None else float(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+        # Seconds a hit waits before refreshing an entry's access time again
+        self.touch_interval = touch_interval if touch_interval is not None else (
+            self.ttl / 10 if self.ttl > 0 else 3600.0
+        )
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('LLM_CACHE_MAX_ENTRIES', '10000'))
+        self.mode = (mode or os.getenv('LLM_CACHE_MODE', 'readwrite')).lower()
+        if self.mode not in MODES:
+            logger.warning("Unknown LLM_CACHE_MODE '%s', caching disabled", self.mode)
+            self.mode = 'off'
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # Entries in the file as of the last count, plus this process's inserts since
+        self._entries = 0
+        self._writes_since_count = 0
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'expired': 0, 'evicted': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    @property
+    def replay(self) -> bool:
+        """True when misses must not fall through to the API"""
+        return self.mode == 'replay'
+
+    @staticmethod
+    def make_key(kind: str, text: str, model: str, prompt_version: str, temperature: float) -> str:
+        """Cache key for one prompt input
+
+        Args:
+            kind: What is being cached, e.g. 'enhance_bullet' or 'resume_analysis'
+            text: Prompt input; whitespace is normalized before hashing
+            model: Model name
+            prompt_version: Version of the prompt template
+            temperature: Sampling temperature
+
+        Returns:
+            Hex sha256 digest
+        """
+        material = json.dumps([kind, normalize_input(text), model, str(prompt_version), float(temperature)])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+            conn.commit()
+            self._conn = conn
+            self._count(conn)
+        return self._conn
+
+    def _count(self, conn: sqlite3.Connection) -> int:
+        self._entries = conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        self._writes_since_count = 0
+        return self._entries
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key``, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute('SELECT value, created, accessed FROM responses WHERE key = ?',
+                                   (key,)).fetchone()
+                if row is not None and self.ttl > 0 and now - row[1] > self.ttl:
+                    self._entries -= conn.execute('DELETE FROM responses WHERE key = ?', (key,)).rowcount
+                    conn.commit()
+                    self._stats['expired'] += 1
+                    row = None
+
+                if row is None:
+                    self._stats['misses'] += 1
+                    return None
+
+                if now - row[2] >= self.touch_interval:
+                    conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+                    conn.commit()
+                self._stats['hits'] += 1
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning("LLM cache lookup failed: %s", e)
+            return None
+
+    def set(self, key: str, value: str):
+        """Store a response; a no-op outside readwrite mode"""
+        if self.mode != 'readwrite' or value is None:
+            return
+
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                inserted = conn.execute(
+                    'INSERT OR IGNORE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+                    (key, value, now, now)
+                ).rowcount
+                if not inserted:
+                    conn.execute('UPDATE responses SET value = ?, created = ?, accessed = ? WHERE key = ?',
+                                 (value, now, now, key))
+                self._entries += inserted
+                self._stats['writes'] += 1
+                self._writes_since_count += 1
+                if self._writes_since_count >= self.RECOUNT_WRITES:
+                    self._count(conn)
+
+                excess = self._entries - self.max_entries
+                if self.max_entries > 0 and excess > 0:
+                    evicted = conn.execute(
+                        'DELETE FROM responses WHERE key IN '
+                        '(SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)', (excess,)
+                    ).rowcount
+                    self._entries -= evicted
+                    self._stats['evicted'] += evicted
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("LLM cache write failed: %s", e)
+
+    def clear(self):
+        """Remove every entry and reset the statistics"""
+        with self._lock:
+            if self.enabled or os.path.exists(self.path):
+                conn = self._connect()
+                conn.execute('DELETE FROM responses')
+                conn.commit()
+            self._entries = 0
+            self._stats = dict.fromkeys(self._stats, 0)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters since start-up plus the current entry count"""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+            stats['mode'] = self.mode
+            try:
+                stats['entries'] = self._count(self._connect()) if self.enabled else 0
+            except sqlite3.Error:
+                stats['entries'] = None
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+llm_cache = LLMCache(os.getenv('LLM_CACHE_PATH', DEFAULT_CACHE_PATH))
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the shared LLM response cache"""
+    return llm_cache
@@ -0,0 +1,204 @@
+"""
+Structured, leveled logging for the AI service.
+
+Modules log through ``logging.getLogger(__name__)`` with fields passed as
+``extra``:
+
+    logger.info("Analysis completed", extra={"stage": "total", "duration_ms": 812.4})
+
+``configure_logging`` (called once by each entry point) routes every record
+through a ``QueueHandler``, so the request path only enqueues it; a
+listener thread formats and writes. Records come out as one JSON object per
+line (or plain text with LOG_FORMAT=text) carrying the request ID of the
+request that logged them, set by the ``RequestContext`` middleware.
+
+Debug records are sampled (LOG_DEBUG_SAMPLE_RATE) so debug logging can stay
+on under load. With LOG_LEVEL above DEBUG, a debug call costs one level
+check. Never log resume text or other personal data, only sizes and counts.
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from typing import Optional, TextIO
+from dotenv import load_dotenv
+from modules.tracing import current_span
+
+load_dotenv()
+
+# Request ID of the request being handled, for records logged on its behalf
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('request_id', default=None)
+
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{1,64}\Z')
+
+# Attributes every LogRecord has; anything else on a record came from ``extra``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id', 'trace_id'}
+
+# Libraries that log every parser callback at DEBUG
+QUIET_LOGGERS = ('multipart',)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+class ContextFilter(logging.Filter):
+    """Stamp records with the current request ID and trace ID"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        span = current_span.get()
+        record.trace_id = span.trace_id if span is not None else None
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Let through only a share of DEBUG records"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records with the message merged and the traceback as text, extra fields intact"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record with its extra fields at the top level"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'request_id', None):
+            entry['request_id'] = record.request_id
+        if getattr(record, 'trace_id', None):
+            entry['trace_id'] = record.trace_id
+        entry.update(_extra_fields(record))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with the extra fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if getattr(record, 'trace_id', None):
+            fields = {'trace_id': record.trace_id, **fields}
+        if getattr(record, 'request_id', None):
+            fields = {'request_id': record.request_id, **fields}
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None,
+                      debug_sample_rate: Optional[float] = None, stream: Optional[TextIO] = None):
+    """
+    Send all logging through a queue to a background writer (once per process)
+
+    Args:
+        level: Lowest level logged, e.g. INFO (LOG_LEVEL)
+        log_format: json or text (LOG_FORMAT)
+        debug_sample_rate: Share of DEBUG records kept (LOG_DEBUG_SAMPLE_RATE)
+        stream: Where records are written (defaults to stdout)
+    """
+    global _listener
+    if _listener is not None:
+        return
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    log_format = (log_format or os.getenv('LOG_FORMAT', 'json')).lower()
+    debug_sample_rate = debug_sample_rate if debug_sample_rate is not None else \
+        float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '0.1'))
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(TextFormatter() if log_format == 'text' else JsonFormatter())
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    enqueue = _QueueHandler(records)
+    enqueue.addFilter(ContextFilter())
+    enqueue.addFilter(DebugSampler(debug_sample_rate))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(enqueue)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(max(logging.INFO, root.level))
+
+    _listener = logging.handlers.QueueListener(records, writer)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def new_request_id(header: Optional[str] = None) -> str:
+    """The client's X-Request-ID if it is a sensible token, otherwise a fresh ID"""
+    if header and REQUEST_ID_PATTERN.match(header):
+        return header
+    return uuid.uuid4().hex[:16]
+
+
+class RequestContext:
+    """ASGI middleware giving each request an ID, echoed in the X-Request-ID response header"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        header = dict(scope['headers']).get(b'x-request-id', b'').decode('latin-1')
+        request_id = new_request_id(header)
+        token = request_id_var.set(request_id)
+
+        async def send_with_id(message):
+            if message['type'] == 'http.response.start':
+                message = {**message, 'headers': [*message.get('headers', []),
+                                                  (b'x-request-id', request_id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
+
+
+def elapsed_ms(start: float) -> float:
+    """Milliseconds since a ``time.perf_counter()`` reading, for duration_ms fields"""
+    return round((time.perf_counter() - start) * 1000, 2)
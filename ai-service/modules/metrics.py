@@ -0,0 +1,288 @@
+"""
+Prometheus metrics for the AI service.
+
+A small in-process registry rendered in the Prometheus text exposition
+format at ``/metrics``. Metrics updated where the work happens live at
+module level here:
+
+    STAGE_SECONDS        time per analysis stage (pipeline stages plus
+                         upload read, on-demand enhancement, PDF generation)
+    STAGE_SKIPPED        stages left out of runs that only needed part of
+                         the result
+    OCR_PAGE_SECONDS     OCR time per PDF page
+    MODEL_LOAD_SECONDS   how long each model took to load
+    REQUESTS_IN_FLIGHT   HTTP requests being handled (RequestsInFlight)
+
+Counters the service already keeps elsewhere (cache hits, queue depths,
+admission) are read at scrape time through collectors registered with
+``REGISTRY.add_collector`` rather than duplicated.
+
+Metrics are per process. With ANALYSIS_PROCESS_WORKERS > 0 the text and
+sections stages are still timed here (including the hop to the worker), but
+per-page OCR times and model loads happen in the workers and are not seen.
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The response class adds the charset
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+# Seconds; analysis stages range from milliseconds (scoring) to a minute (OCR of long PDFs)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value) -> str:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + '}'
+
+
+class Registry:
+    """Metrics and collectors rendered together at scrape time"""
+
+    def __init__(self):
+        self._metrics: Dict[str, '_Metric'] = {}
+        self._collectors: List[Callable[[], Iterable['_Metric']]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: '_Metric'):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], Iterable['_Metric']]):
+        """Call ``collector`` on every scrape; it returns freshly filled, unregistered metrics"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self) -> List['_Metric']:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                metrics.extend(collector())
+            except Exception as e:
+                # One broken source should not take the whole scrape down
+                logger.warning("Metrics collector %s failed: %s", getattr(collector, '__name__', collector), e)
+        return metrics
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    """A named metric with one value (or set of values) per combination of label values"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 registry: Optional[Registry] = REGISTRY):
+        """
+        Args:
+            name: Metric name, e.g. cv_analyzer_stage_seconds
+            documentation: HELP text
+            labels: Names of the labels every update must give
+            registry: Where to register; None for metrics built by a collector
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labels:
+            # Metrics without labels are exposed from the start
+            self._values[()] = self._zero()
+        if registry is not None:
+            registry.register(self)
+
+    def _zero(self):
+        return 0
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"Metric '{self.name}' takes labels {list(self.labels)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _label_dict(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labels, key))
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], object]]:
+        """(name suffix, labels, value) of each exposed sample"""
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield '', self._label_dict(key), value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, total: float, **labels):
+        """Expose a count kept elsewhere, for collectors"""
+        with self._lock:
+            self._values[self._key(labels)] = total
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class _HistogramValue:
+    def __init__(self, bucket_count: int):
+        self.buckets = [0] * bucket_count
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[Registry] = REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labels, registry)
+
+    def _zero(self):
+        return _HistogramValue(len(self.buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = self._zero()
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry.buckets[index] += 1
+                    break
+            entry.sum += value
+            entry.count += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block in seconds, also when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], object]]:
+        with self._lock:
+            values = [(key, list(entry.buckets), entry.sum, entry.count) for key, entry in self._values.items()]
+        for key, buckets, total, count in values:
+            labels = self._label_dict(key)
+            cumulative = 0
+            for bound, in_bucket in zip(self.buckets, buckets):
+                cumulative += in_bucket
+                yield '_bucket', {**labels, 'le': _format_value(float(bound))}, cumulative
+            yield '_bucket', {**labels, 'le': '+Inf'}, count
+            yield '_sum', labels, total
+            yield '_count', labels, count
+
+
+STAGE_SECONDS = Histogram(
+    'cv_analyzer_stage_seconds', 'Time spent in each analysis stage', ['stage']
+)
+STAGE_SKIPPED = Counter(
+    'cv_analyzer_stage_skipped_total', 'Analysis stages not run because the request did not need them', ['stage']
+)
+OCR_PAGE_SECONDS = Histogram(
+    'cv_analyzer_ocr_page_seconds', 'OCR time per PDF page',
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0)
+)
+MODEL_LOAD_SECONDS = Gauge(
+    'cv_analyzer_model_load_seconds', 'Seconds the last load of each model took', ['model']
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'cv_analyzer_http_requests_in_flight', 'HTTP requests currently being handled'
+)
+
+
+@contextmanager
+def timed_model_load(model: str):
+    """Record how long loading ``model`` takes in MODEL_LOAD_SECONDS, if it loads"""
+    start = time.perf_counter()
+    yield
+    MODEL_LOAD_SECONDS.set(time.perf_counter() - start, model=model)
+
+
+class RequestsInFlight:
+    """ASGI middleware counting HTTP requests until their response is fully sent"""
+
+    def __init__(self, app, gauge: Gauge = REQUESTS_IN_FLIGHT):
+        self.app = app
+        self.gauge = gauge
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        self.gauge.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.gauge.dec()
@@ -0,0 +1,271 @@
+"""
+Small stage-DAG executor for the analysis pipeline.
+
+A pipeline is a list of named stages with explicit dependencies. Each stage
+receives the results gathered so far (the pipeline inputs plus the output of
+every finished stage, keyed by stage name) and returns its own output. Stages
+whose dependencies are met run concurrently:
+
+    thread   blocking work, run in a thread pool
+    process  CPU-bound work, run in a process pool; the function must be
+             picklable and only receives the results it depends on
+    async    a coroutine function, awaited on the event loop (I/O-bound work)
+    inline   cheap work, run directly on the event loop
+
+End-to-end latency is the critical path through the DAG rather than the sum
+of all stages. Per-stage timings are recorded for every run and observed in
+the cv_analyzer_stage_seconds histogram, and each stage runs in a trace span
+when the request is traced.
+
+``Pipeline.prune`` keeps only the stages some outputs depend on, for callers
+that need part of the result; every run of a pruned pipeline counts the
+stages it left out in cv_analyzer_stage_skipped_total.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from dotenv import load_dotenv
+from modules.metrics import STAGE_SECONDS, STAGE_SKIPPED
+from modules.profiling import profiled_call
+from modules.tracing import span
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+STAGE_KINDS = ('thread', 'process', 'async', 'inline')
+
+_default_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_stage_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for 'thread' stages, sized by PIPELINE_THREADS"""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('PIPELINE_THREADS', '8')), thread_name_prefix='stage'
+        )
+    return _default_executor
+
+
+class Stage:
+    """One step of a pipeline"""
+
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Any],
+                 deps: Iterable[str] = (), kind: str = 'thread'):
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"Stage '{name}' has unknown kind '{kind}'")
+        self.name = name
+        self.fn = fn
+        self.deps: Tuple[str, ...] = tuple(deps)
+        self.kind = kind
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, deps={self.deps!r}, kind={self.kind!r})"
+
+
+def _stage_view(stage: Stage, results: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of the results a stage is called with"""
+    if stage.kind == 'process':
+        # Only what the stage needs is pickled to the worker process
+        return {dep: results[dep] for dep in stage.deps}
+    return dict(results)
+
+
+class PipelineResult:
+    """Outputs and timings of one pipeline run"""
+
+    def __init__(self, results: Dict[str, Any], timings: Dict[str, Dict[str, float]], total: float,
+                 skipped: Tuple[str, ...] = ()):
+        self.results = results
+        self.timings = timings
+        self.total = total
+        self.skipped = skipped
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+    def stage_durations_ms(self) -> Dict[str, float]:
+        """Wall-clock milliseconds spent in each stage"""
+        return {name: round(timing['duration'] * 1000, 2) for name, timing in self.timings.items()}
+
+
+class Pipeline:
+    """Dependency-ordered set of stages"""
+
+    def __init__(self, stages: Iterable[Stage], inputs: Iterable[str] = (), skipped: Iterable[str] = ()):
+        """
+        Args:
+            stages: Stages of the pipeline, in any order
+            inputs: Names supplied by the caller at run time; stages may depend on them
+            skipped: Stages pruned away from a larger pipeline, counted on every run
+        """
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage '{stage.name}'")
+            self.stages[stage.name] = stage
+        self.inputs = tuple(inputs)
+        self.skipped = tuple(skipped)
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        known = set(self.stages) | set(self.inputs)
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.deps if dep not in known]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown {missing}")
+
+        order: List[str] = []
+        done = set(self.inputs)
+        pending = list(self.stages)
+        while pending:
+            ready = [name for name in pending if all(dep in done for dep in self.stages[name].deps)]
+            if not ready:
+                raise ValueError(f"Dependency cycle among stages {pending}")
+            order.extend(ready)
+            done.update(ready)
+            pending = [name for name in pending if name not in done]
+        return order
+
+    def prune(self, targets: Iterable[str]) -> 'Pipeline':
+        """
+        Pipeline of only the stages needed to produce ``targets``
+
+        Args:
+            targets: Names of the stages whose outputs are wanted
+
+        Returns:
+            Pipeline with those stages and everything they depend on; the
+            other stages are never run and are counted as skipped
+
+        Raises:
+            ValueError: If a target is not a stage of this pipeline
+        """
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name in needed:
+                continue
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            needed.add(name)
+            pending.extend(dep for dep in self.stages[name].deps if dep in self.stages)
+        skipped = [name for name in self.order if name not in needed]
+        return Pipeline([self.stages[name] for name in self.order if name in needed], self.inputs,
+                        skipped=(*self.skipped, *skipped))
+
+    def _count_skipped(self):
+        for name in self.skipped:
+            STAGE_SKIPPED.inc(stage=name)
+
+    def _check_inputs(self, inputs: Dict[str, Any]):
+        missing = [name for name in self.inputs if name not in inputs]
+        if missing:
+            raise ValueError(f"Missing pipeline inputs {missing}")
+
+    async def run(self, inputs: Dict[str, Any], executor: Optional[Executor] = None,
+                  process_executor: Optional[Executor] = None) -> PipelineResult:
+        """
+        Run every stage as soon as its dependencies have finished
+
+        Args:
+            inputs: Values for the pipeline inputs
+            executor: Pool for 'thread' stages (defaults to the shared stage pool)
+            process_executor: Pool for 'process' stages (defaults to ``executor``)
+
+        Returns:
+            PipelineResult with each stage's output under its name
+
+        Raises:
+            The first exception raised by a stage; stages still running are cancelled
+        """
+        self._check_inputs(inputs)
+        self._count_skipped()
+        loop = asyncio.get_running_loop()
+        executor = executor or get_stage_executor()
+        process_executor = process_executor or executor
+        results: Dict[str, Any] = dict(inputs)
+        timings: Dict[str, Dict[str, float]] = {}
+        started_at = time.perf_counter()
+
+        async def run_stage(stage: Stage) -> Tuple[str, Any]:
+            # Snapshot so a stage never sees results that land while it runs
+            view = _stage_view(stage, results)
+            start = time.perf_counter()
+            with span(f'stage {stage.name}', stage=stage.name, kind=stage.kind):
+                if stage.kind == 'thread':
+                    # Carry the request's context (request ID, trace span) into the pool thread
+                    output = await loop.run_in_executor(executor, contextvars.copy_context().run,
+                                                        profiled_call, stage.fn, view)
+                elif stage.kind == 'process':
+                    output = await loop.run_in_executor(process_executor, stage.fn, view)
+                elif stage.kind == 'async':
+                    output = await stage.fn(view)
+                else:
+                    output = stage.fn(view)
+            end = time.perf_counter()
+            timings[stage.name] = {'start': start - started_at, 'duration': end - start}
+            STAGE_SECONDS.observe(end - start, stage=stage.name)
+            logger.debug("Stage finished", extra={"stage": stage.name, "duration_ms": round((end - start) * 1000, 2)})
+            return stage.name, output
+
+        remaining = {name: set(self.stages[name].deps) - set(inputs) for name in self.order}
+        running: Dict[asyncio.Task, str] = {}
+
+        def launch_ready():
+            for name in [name for name, deps in remaining.items() if not deps]:
+                del remaining[name]
+                running[asyncio.ensure_future(run_stage(self.stages[name]))] = name
+
+        launch_ready()
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    del running[task]
+                    name, output = task.result()
+                    results[name] = output
+                    for deps in remaining.values():
+                        deps.discard(name)
+                launch_ready()
+        finally:
+            for task in running:
+                task.cancel()
+
+        return PipelineResult(results, timings, time.perf_counter() - started_at, self.skipped)
+
+    def run_inline(self, inputs: Dict[str, Any]) -> PipelineResult:
+        """
+        Run every stage one after another in the calling thread
+
+        Useful for profiling and for callers without an event loop. 'async'
+        stages are run to completion with asyncio.run and 'process' stages
+        are called directly.
+        """
+        self._check_inputs(inputs)
+        self._count_skipped()
+        results: Dict[str, Any] = dict(inputs)
+        timings: Dict[str, Dict[str, float]] = {}
+        started_at = time.perf_counter()
+
+        for name in self.order:
+            stage = self.stages[name]
+            start = time.perf_counter()
+            view = _stage_view(stage, results)
+            with span(f'stage {name}', stage=name, kind=stage.kind):
+                if stage.kind == 'async':
+                    output = asyncio.run(stage.fn(view))
+                else:
+                    output = stage.fn(view)
+            end = time.perf_counter()
+            results[name] = output
+            timings[name] = {'start': start - started_at, 'duration': end - start}
+            STAGE_SECONDS.observe(end - start, stage=name)
+
+        return PipelineResult(results, timings, time.perf_counter() - started_at, self.skipped)
@@ -0,0 +1,175 @@
+"""
+On-demand profiling of single analyses.
+
+An admin can ask for one ``/analyze-resume`` request to be profiled. The
+request runs its pipeline the normal way (same scheduler lane, thread pool,
+worker processes and event loop) inside ``profile_run``, which profiles:
+
+    the event loop thread   for the whole run: inline and async stages,
+                            scheduling, and the LLM calls of enhancement
+    each 'thread' stage     with its own cProfile in the pool thread it ran in
+                            (``profiled_call``), merged into the same profile
+
+'process' stages run in the worker processes and are not profiled; they show
+as time the loop spent waiting, and their wall time is in stageTimings.
+Because the loop is shared, coroutines of other requests running at the same
+moment also appear in the profile. Only one request is profiled at a time.
+
+The profile is saved as a pstats file in a ``ProfileStore`` for download and
+summarized in the response. Unprofiled requests pay one context variable
+lookup per thread stage; profiled ones are slowed down by cProfile itself.
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'profiles'
+)
+PROFILE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+Profile = Union[cProfile.Profile, pstats.Stats]
+
+# Profiles of the thread stages run for the request being profiled, if any
+stage_profiles: contextvars.ContextVar[Optional[List[cProfile.Profile]]] = contextvars.ContextVar(
+    'stage_profiles', default=None
+)
+# cProfile replaces the thread's profile hook, so two requests cannot share the loop thread's
+_profile_lock: Optional[asyncio.Lock] = None
+
+
+def profile_call(fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, cProfile.Profile]:
+    """
+    Call ``fn`` under cProfile in the current thread
+
+    Returns:
+        Its result and the finished profile
+
+    Raises:
+        Whatever ``fn`` raised
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args, **kwargs)
+    return result, profiler
+
+
+def profiled_call(fn: Callable[..., Any], *args) -> Any:
+    """Call ``fn``, under its own cProfile if the calling request is being profiled"""
+    profiles = stage_profiles.get()
+    if profiles is None:
+        return fn(*args)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        profiles.append(profiler)
+
+
+async def profile_run(run: Callable[[], Awaitable[Any]]) -> Tuple[Any, pstats.Stats]:
+    """
+    Await ``run()`` with the event loop thread and its thread stages profiled
+
+    Returns:
+        Its result and the merged profile
+
+    Raises:
+        Whatever ``run()`` raised
+    """
+    global _profile_lock
+    if _profile_lock is None:
+        _profile_lock = asyncio.Lock()
+    async with _profile_lock:
+        profiles: List[cProfile.Profile] = []
+        token = stage_profiles.set(profiles)
+        loop_profiler = cProfile.Profile()
+        loop_profiler.enable()
+        try:
+            result = await run()
+        finally:
+            loop_profiler.disable()
+            stage_profiles.reset(token)
+    stats = pstats.Stats(loop_profiler)
+    for profiler in profiles:
+        stats.add(profiler)
+    return result, stats
+
+
+def _as_stats(profile: Profile) -> pstats.Stats:
+    return profile if isinstance(profile, pstats.Stats) else pstats.Stats(profile)
+
+
+def top_functions(profile: Profile, limit: int = 15) -> List[Dict]:
+    """The ``limit`` functions with the most cumulative time, for a response summary"""
+    stats = _as_stats(profile)
+    rows = []
+    for (filename, line, name), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({name})" if line else name,
+            "calls": calls,
+            "totalMs": round(total * 1000, 2),
+            "cumulativeMs": round(cumulative * 1000, 2),
+        })
+    rows.sort(key=lambda row: row["cumulativeMs"], reverse=True)
+    return rows[:limit]
+
+
+class ProfileStore:
+    """Directory of the most recent pstats files, by profile ID"""
+
+    def __init__(self, directory: str = DEFAULT_PROFILE_DIR, max_profiles: Optional[int] = None):
+        """
+        Args:
+            directory: Where profiles are written
+            max_profiles: Profiles kept; the oldest are removed beyond this
+        """
+        self.directory = directory
+        self.max_profiles = max_profiles if max_profiles is not None else int(os.getenv('PROFILE_MAX_FILES', '50'))
+        self._lock = threading.Lock()
+
+    def save(self, profile: Profile) -> str:
+        """Write a profile and return its ID"""
+        profile_id = uuid.uuid4().hex
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(os.path.join(self.directory, f'{profile_id}.pstats'))
+            self._prune()
+        return profile_id
+
+    def _prune(self):
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.endswith('.pstats')]
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:max(0, len(paths) - self.max_profiles)]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning("Could not remove old profile %s: %s", path, e)
+
+    def path(self, profile_id: str) -> Optional[str]:
+        """File of a stored profile, or None if the ID is unknown or malformed"""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f'{profile_id}.pstats')
+        return path if os.path.exists(path) else None
+
+    def report(self, profile_id: str, sort: str = 'cumulative', limit: int = 50) -> Optional[str]:
+        """pstats text report of a stored profile, or None if it is unknown"""
+        path = self.path(profile_id)
+        if path is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
@@ -1,17 +1,110 @@
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import re
+from modules.rule_scanner import Rule, RuleScanner
+
+
+class IssueType(NamedTuple):
+    """What to tell the user about an issue, and how urgent it is"""
+    message: str
+    priority: Optional[str] = None
+    category: Optional[str] = None
+    impact: Optional[str] = None
+
+
+_STRUCTURE_IMPACT = 'Essential for ATS parsing and recruiter contact'
+_SKILLS_IMPACT = 'Critical for keyword matching and skill assessment'
+_CONTENT_IMPACT = 'Improves resume impact and readability'
+_FORMATTING_IMPACT = 'Enhances professional appearance and ATS compatibility'
+
+# Every issue and missing component the engine can report, keyed by code
+ISSUE_TYPES: Dict[str, IssueType] = {
+    # Missing sections
+    'missing_contact': IssueType('Contact information (email required)', 'high', 'structure', _STRUCTURE_IMPACT),
+    'missing_education': IssueType('Education section'),
+    'missing_skills': IssueType('Technical skills section (minimum 3 skills)', 'high', 'content', _SKILLS_IMPACT),
+    'missing_experience': IssueType('Work experience or projects section'),
+    'missing_projects': IssueType('Projects section to showcase practical experience'),
+    'missing_certifications': IssueType('Certifications section (if applicable)'),
+    # Content
+    'few_skills': IssueType('Only {count} skills listed. Add more relevant technical skills.'),
+    'generic_skills': IssueType('Too many generic skills. Focus on technical and specialized skills.'),
+    'brief_projects': IssueType('Project descriptions are too brief. Add more detail about your contributions.',
+                                'medium', 'content', _CONTENT_IMPACT),
+    'weak_project_verbs': IssueType('Use stronger action verbs in project descriptions.',
+                                    'medium', 'content', _CONTENT_IMPACT),
+    'brief_experience': IssueType('Work experience descriptions need more detail about achievements.',
+                                  'medium', 'content', _CONTENT_IMPACT),
+    'no_metrics': IssueType('Add quantifiable achievements to demonstrate impact.',
+                            'medium', 'content', _CONTENT_IMPACT),
+    # Grammar and style
+    'first_person': IssueType('Use active voice instead of "I" statements'),
+    'passive_voice': IssueType('Replace passive voice with active verbs'),
+    'helped_to': IssueType('Use stronger action verbs than "helped"', 'medium', 'content', _CONTENT_IMPACT),
+    'worked_on': IssueType('Be more specific than "worked on"'),
+    'responsible_for': IssueType('Use action verbs instead of "responsible for"', 'medium', 'content', _CONTENT_IMPACT),
+    'mixed_tense': IssueType('Maintain consistent verb tense throughout resume.', 'low', 'formatting', _FORMATTING_IMPACT),
+    'mixed_bullets': IssueType('Use consistent bullet point formatting throughout resume.',
+                               'low', 'formatting', _FORMATTING_IMPACT),
+    # ATS formatting
+    'email_format': IssueType('Email format may not be ATS-friendly.', 'low', 'formatting', _FORMATTING_IMPACT),
+    'phone_format': IssueType('Use standard phone number format (e.g., (555) 123-4567).',
+                              'low', 'formatting', _FORMATTING_IMPACT),
+    'special_characters': IssueType('Remove special characters that may not be ATS-compatible.'),
+    'tables': IssueType('Avoid tables and complex formatting for better ATS compatibility.',
+                        'low', 'formatting', _FORMATTING_IMPACT),
+}
+
+# Checks over the experience, projects and education text; the grammar rules
+# map straight to issues, the rest are combined below
+STYLE_RULES = [
+    Rule('first_person', r'\bi\s', ignore_case=True),
+    Rule('passive_voice', r'\bwas\s+\w+ing\b', ignore_case=True),
+    Rule('helped_to', r'\bhelped\s+to\b', ignore_case=True),
+    Rule('worked_on', r'\bworked\s+on\b', ignore_case=True),
+    Rule('responsible_for', r'\bresponsible\s+for\b', ignore_case=True),
+    Rule('past_tense', r'\b\w+ed\b'),
+    Rule('present_tense', r'\b(?:manage|develop|create|build|lead|work)\b'),
+    Rule('bullet_dot', literals=('•',)),
+    Rule('bullet_dash', literals=('-',)),
+    Rule('bullet_star', literals=('*',)),
+    Rule('bullet_circle', literals=('◦',)),
+]
+GRAMMAR_CODES = ['first_person', 'passive_voice', 'helped_to', 'worked_on', 'responsible_for']
+BULLET_CODES = ['bullet_dot', 'bullet_dash', 'bullet_star', 'bullet_circle']
+
+# Checks over the raw extracted text
+LAYOUT_RULES = [
+    Rule('special_characters', literals=('©', '®', '™', '§', '¶')),
+    Rule('tables', literals=('|', '\t')),
+]
+
+# Weak phrases in project descriptions, matched on lowercased text
+WEAK_PHRASE_RULES = [
+    Rule(f'weak_{index}', literals=(phrase,))
+    for index, phrase in enumerate(['worked on', 'helped with', 'was involved in', 'participated in'])
+]
+
+GENERIC_SKILLS = ['microsoft office', 'word', 'excel', 'powerpoint', 'communication']
+
+METRICS_PATTERN = re.compile(r'\d+(?:%|\$|k|million|billion|users|customers)')
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_PATTERN = re.compile(r'^\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}$')
+
+Issue = Tuple[str, str]
+
+
+def _issue(code: str, **params) -> Issue:
+    """(code, message) pair for an issue type"""
+    return code, ISSUE_TYPES[code].message.format(**params)
+
 
 class RecommendationEngine:
     """Generate specific recommendations for resume improvement"""
     
     def __init__(self):
-        self.grammar_patterns = [
-            (r'\bi\s', 'Use active voice instead of "I" statements'),
-            (r'\bwas\s+\w+ing\b', 'Replace passive voice with active verbs'),
-            (r'\bhelped\s+to\b', 'Use stronger action verbs than "helped"'),
-            (r'\bworked\s+on\b', 'Be more specific than "worked on"'),
-            (r'\bresponsible\s+for\b', 'Use action verbs instead of "responsible for"')
-        ]
+        self.style_scanner = RuleScanner(STYLE_RULES)
+        self.layout_scanner = RuleScanner(LAYOUT_RULES)
+        self.weak_phrase_scanner = RuleScanner(WEAK_PHRASE_RULES)
     
     def generate_recommendations(self, sections: Dict, score_result: Dict) -> Dict:
         """
@@ -22,65 +115,52 @@ class RecommendationEngine:
             score_result: Scoring results with breakdown
             
         Returns:
-            Dictionary with issues, suggestions, and missing components
+            Dictionary with issues, suggestions, and missing components;
+            issue_codes lists the code of each entry in issues
         """
-        recommendations = {
-            'issues': [],
-            'suggested_keywords': [],
-            'missing_components': [],
-            'priority_suggestions': []
-        }
-        
-        # Analyze structure issues
-        recommendations['missing_components'] = self._identify_missing_sections(sections)
-        
-        # Analyze content issues
-        content_issues = self._analyze_content_issues(sections)
-        recommendations['issues'].extend(content_issues)
-        
-        # Generate grammar suggestions
-        grammar_issues = self._analyze_grammar_issues(sections)
-        recommendations['issues'].extend(grammar_issues)
-        
-        # Generate formatting suggestions
-        formatting_issues = self._analyze_formatting_issues(sections)
-        recommendations['issues'].extend(formatting_issues)
-        
-        # Prioritize recommendations
-        recommendations['priority_suggestions'] = self._prioritize_suggestions(
-            recommendations, score_result
+        missing = self._identify_missing_sections(sections)
+        issues = (
+            self._analyze_content_issues(sections) +
+            self._analyze_grammar_issues(sections) +
+            self._analyze_formatting_issues(sections)
         )
         
-        return recommendations
+        return {
+            'issues': [message for _, message in issues],
+            'issue_codes': [code for code, _ in issues],
+            'suggested_keywords': [],
+            'missing_components': [message for _, message in missing],
+            'priority_suggestions': self._prioritize_suggestions(missing, issues, score_result)
+        }
     
-    def _identify_missing_sections(self, sections: Dict) -> List[str]:
+    def _identify_missing_sections(self, sections: Dict) -> List[Issue]:
         """Identify missing essential resume sections"""
         missing = []
         
         # Check essential sections
         if not sections.get('contactInfo') or not sections['contactInfo'].get('email'):
-            missing.append('Contact information (email required)')
+            missing.append(_issue('missing_contact'))
         
         if not sections.get('education'):
-            missing.append('Education section')
+            missing.append(_issue('missing_education'))
         
         if not sections.get('skills') or len(sections['skills']) < 3:
-            missing.append('Technical skills section (minimum 3 skills)')
+            missing.append(_issue('missing_skills'))
         
         # Check important sections
         if not sections.get('experience') and not sections.get('projects'):
-            missing.append('Work experience or projects section')
+            missing.append(_issue('missing_experience'))
         
         if not sections.get('projects'):
-            missing.append('Projects section to showcase practical experience')
+            missing.append(_issue('missing_projects'))
         
         # Check optional but valuable sections
         if not sections.get('certifications'):
-            missing.append('Certifications section (if applicable)')
+            missing.append(_issue('missing_certifications'))
         
         return missing
     
-    def _analyze_content_issues(self, sections: Dict) -> List[str]:
+    def _analyze_content_issues(self, sections: Dict) -> List[Issue]:
         """Analyze content quality issues"""
         issues = []
         
@@ -88,41 +168,37 @@ class RecommendationEngine:
         if sections.get('skills'):
             skills = sections['skills']
             if len(skills) < 5:
-                issues.append(f"Only {len(skills)} skills listed. Add more relevant technical skills.")
+                issues.append(_issue('few_skills', count=len(skills)))
             
             # Check for generic skills
-            generic_skills = ['microsoft office', 'word', 'excel', 'powerpoint', 'communication']
-            generic_count = sum(1 for skill in skills if any(g in skill.lower() for g in generic_skills))
+            generic_count = sum(1 for skill in skills if any(g in skill.lower() for g in GENERIC_SKILLS))
             if generic_count > len(skills) * 0.3:
-                issues.append("Too many generic skills. Focus on technical and specialized skills.")
+                issues.append(_issue('generic_skills'))
         
         # Analyze project descriptions
         if sections.get('projects'):
             projects_text = sections['projects']
             if len(projects_text) < 200:
-                issues.append("Project descriptions are too brief. Add more detail about your contributions.")
+                issues.append(_issue('brief_projects'))
             
             # Check for weak language
-            weak_phrases = ['worked on', 'helped with', 'was involved in', 'participated in']
-            weak_count = sum(1 for phrase in weak_phrases if phrase in projects_text.lower())
-            if weak_count > 2:
-                issues.append("Use stronger action verbs in project descriptions.")
+            if len(self.weak_phrase_scanner.scan(projects_text.lower())) > 2:
+                issues.append(_issue('weak_project_verbs'))
         
         # Analyze experience section
         if sections.get('experience'):
             experience_text = sections['experience']
             if len(experience_text) < 150:
-                issues.append("Work experience descriptions need more detail about achievements.")
+                issues.append(_issue('brief_experience'))
             
             # Check for quantifiable achievements
-            has_numbers = bool(re.search(r'\d+(?:%|\$|k|million|billion|users|customers)', experience_text))
-            if not has_numbers:
-                issues.append("Add quantifiable achievements to demonstrate impact.")
+            if not METRICS_PATTERN.search(experience_text):
+                issues.append(_issue('no_metrics'))
         
         return issues
     
-    def _analyze_grammar_issues(self, sections: Dict) -> List[str]:
-        """Analyze grammar and style issues"""
+    def _analyze_grammar_issues(self, sections: Dict) -> List[Issue]:
+        """Analyze grammar and style issues in a single pass over the text"""
         issues = []
         
         # Combine all text content
@@ -135,97 +211,56 @@ class RecommendationEngine:
         if not all_text:
             return issues
         
-        # Check grammar patterns
-        for pattern, suggestion in self.grammar_patterns:
-            if re.search(pattern, all_text, re.IGNORECASE):
-                issues.append(suggestion)
+        found = self.style_scanner.scan(all_text)
         
-        # Check for inconsistent tense
-        past_tense_verbs = len(re.findall(r'\b\w+ed\b', all_text))
-        present_tense_verbs = len(re.findall(r'\b(?:manage|develop|create|build|lead|work)\b', all_text))
+        issues.extend(_issue(code) for code in GRAMMAR_CODES if code in found)
         
-        if past_tense_verbs > 0 and present_tense_verbs > 0:
-            issues.append("Maintain consistent verb tense throughout resume.")
+        # Check for inconsistent tense
+        if 'past_tense' in found and 'present_tense' in found:
+            issues.append(_issue('mixed_tense'))
         
         # Check for bullet point consistency
-        bullet_patterns = [r'•', r'-', r'\*', r'◦']
-        bullet_types = sum(1 for pattern in bullet_patterns if re.search(pattern, all_text))
-        if bullet_types > 1:
-            issues.append("Use consistent bullet point formatting throughout resume.")
+        if sum(1 for code in BULLET_CODES if code in found) > 1:
+            issues.append(_issue('mixed_bullets'))
         
         return issues
     
-    def _analyze_formatting_issues(self, sections: Dict) -> List[str]:
+    def _analyze_formatting_issues(self, sections: Dict) -> List[Issue]:
         """Analyze ATS-friendly formatting issues"""
         issues = []
         
         # Check contact information format
         contact = sections.get('contactInfo', {})
-        if contact.get('email'):
-            email = contact['email']
-            if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
-                issues.append("Email format may not be ATS-friendly.")
-        
-        if contact.get('phone'):
-            phone = contact['phone']
-            # Check for consistent phone formatting
-            if not re.match(r'^\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}$', phone):
-                issues.append("Use standard phone number format (e.g., (555) 123-4567).")
-        
-        # Check for special characters that might confuse ATS
-        all_text = sections.get('raw', '')
-        problematic_chars = ['©', '®', '™', '§', '¶']
-        if any(char in all_text for char in problematic_chars):
-            issues.append("Remove special characters that may not be ATS-compatible.")
-        
-        # Check for tables or complex formatting indicators
-        if '|' in all_text or '\t' in all_text:
-            issues.append("Avoid tables and complex formatting for better ATS compatibility.")
+        if contact.get('email') and not EMAIL_PATTERN.match(contact['email']):
+            issues.append(_issue('email_format'))
+        
+        # Check for consistent phone formatting
+        if contact.get('phone') and not PHONE_PATTERN.match(contact['phone']):
+            issues.append(_issue('phone_format'))
+        
+        # Check for special characters and tables that might confuse ATS
+        found = self.layout_scanner.scan(sections.get('raw', ''))
+        issues.extend(_issue(code) for code in ('special_characters', 'tables') if code in found)
         
         return issues
     
-    def _prioritize_suggestions(self, recommendations: Dict, score_result: Dict) -> List[Dict]:
+    def _prioritize_suggestions(self, missing: List[Issue], issues: List[Issue],
+                                score_result: Dict) -> List[Dict]:
         """Prioritize recommendations based on impact"""
         priority_suggestions = []
         
-        # High priority: Missing essential sections
-        for missing in recommendations['missing_components']:
-            if 'email' in missing.lower() or 'contact' in missing.lower():
-                priority_suggestions.append({
-                    'priority': 'high',
-                    'category': 'structure',
-                    'suggestion': missing,
-                    'impact': 'Essential for ATS parsing and recruiter contact'
-                })
-            elif 'skills' in missing.lower():
-                priority_suggestions.append({
-                    'priority': 'high',
-                    'category': 'content',
-                    'suggestion': missing,
-                    'impact': 'Critical for keyword matching and skill assessment'
-                })
-        
-        # Medium priority: Content improvements
-        content_issues = [issue for issue in recommendations['issues'] 
-                         if any(keyword in issue.lower() for keyword in ['action', 'quantifiable', 'detail'])]
-        for issue in content_issues:
-            priority_suggestions.append({
-                'priority': 'medium',
-                'category': 'content',
-                'suggestion': issue,
-                'impact': 'Improves resume impact and readability'
-            })
-        
-        # Low priority: Formatting and grammar
-        formatting_issues = [issue for issue in recommendations['issues'] 
-                           if any(keyword in issue.lower() for keyword in ['format', 'tense', 'bullet'])]
-        for issue in formatting_issues:
-            priority_suggestions.append({
-                'priority': 'low',
-                'category': 'formatting',
-                'suggestion': issue,
-                'impact': 'Enhances professional appearance and ATS compatibility'
-            })
+        # High priority: missing essential sections, then content, then formatting
+        for priority, candidates in (('high', missing), ('medium', issues), ('low', issues)):
+            for code, message in candidates:
+                issue_type = ISSUE_TYPES[code]
+                if issue_type.priority == priority:
+                    priority_suggestions.append({
+                        'priority': priority,
+                        'category': issue_type.category,
+                        'suggestion': message,
+                        'impact': issue_type.impact,
+                        'code': code
+                    })
         
         return priority_suggestions
     
@@ -0,0 +1,244 @@
+"""
+Cache of whole analysis responses.
+
+The backend retries slow uploads and users re-submit the same file, so an
+analysis is looked up by the SHA-256 of the uploaded bytes, the normalized
+job role, whether enhancements were included and the pipeline version
+before the pipeline runs. Bump PIPELINE_VERSION in modules.analysis_pipeline
+whenever a stage's output changes, so stale results are never served.
+
+Two tiers, both least-recently-used and expiring after a TTL:
+
+    memory  the most recent responses, served without touching the disk
+    disk    a SQLite file, shared by restarts and service processes on the host
+
+A disk hit is copied into the memory tier. The disk tier's entry count is
+kept in memory rather than counted on every write; a recount every
+``RECOUNT_WRITES`` writes picks up entries added by other processes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional
+from dotenv import load_dotenv
+from modules.llm_cache import normalize_input
+from modules.encoding import dumps
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'result_cache.sqlite3'
+)
+
+
+class CachedResult(NamedTuple):
+    """A cached response and when it was computed"""
+    value: Dict
+    created: float
+
+
+def normalize_job_role(job_role: str) -> str:
+    """Job role as used in cache keys: whitespace collapsed, case folded"""
+    return normalize_input(job_role).casefold()
+
+
+class ResultCache:
+    """Memory and disk tiers of analysis responses with hit-rate stats"""
+
+    RECOUNT_WRITES = 1000
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, memory_entries: Optional[int] = None,
+                 max_entries: Optional[int] = None, ttl: Optional[float] = None, enabled: Optional[bool] = None):
+        """
+        Args:
+            path: SQLite file of the disk tier
+            memory_entries: Responses kept in memory
+            max_entries: Responses kept on disk (0 disables the disk tier)
+            ttl: Seconds a response stays valid
+            enabled: Look up and store responses at all
+        """
+        self.path = path
+        self.memory_entries = memory_entries if memory_entries is not None else \
+            int(os.getenv('RESULT_CACHE_MEMORY_ENTRIES', '256'))
+        self.max_entries = max_entries if max_entries is not None else \
+            int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '10000'))
+        self.ttl = ttl if ttl is not None else float(os.getenv('RESULT_CACHE_TTL', str(24 * 3600)))
+        self.enabled = enabled if enabled is not None else \
+            os.getenv('RESULT_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no', 'off')
+
+        self._memory: 'OrderedDict[str, CachedResult]' = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # Disk entries as of the last count, plus this process's inserts since
+        self._disk_entries = 0
+        self._writes_since_count = 0
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0, 'expired': 0}
+
+    @staticmethod
+    def make_key(content_sha256: str, job_role: str, include_enhancements: bool, version: str,
+                 mode: str = 'standard', fields: Optional[Iterable[str]] = None) -> str:
+        """
+        Cache key for one analysis
+
+        Args:
+            content_sha256: Hex SHA-256 of the uploaded file
+            job_role: Target job role; normalized before hashing
+            include_enhancements: Whether the response carries enhanced bullets
+            version: Pipeline version
+            mode: Analysis mode
+            fields: Response fields the analysis was limited to; None for all
+
+        Returns:
+            Hex sha256 digest
+        """
+        parts = [content_sha256, normalize_job_role(job_role), bool(include_enhancements), str(version), str(mode)]
+        if fields is not None:
+            # Full responses keep the keys they were cached under before
+            parts.append(sorted(fields))
+        material = json.dumps(parts)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+            conn.commit()
+            self._conn = conn
+            self._count(conn)
+        return self._conn
+
+    def _count(self, conn: sqlite3.Connection) -> int:
+        self._disk_entries = conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        self._writes_since_count = 0
+        return self._disk_entries
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl > 0 and now - created > self.ttl
+
+    def _remember(self, key: str, entry: CachedResult):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """Return the cached response for ``key``, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry.created, now):
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return entry
+                del self._memory[key]
+
+            if self.max_entries > 0:
+                try:
+                    conn = self._connect()
+                    row = conn.execute('SELECT value, created FROM results WHERE key = ?', (key,)).fetchone()
+                    if row is not None and self._expired(row[1], now):
+                        self._disk_entries -= conn.execute('DELETE FROM results WHERE key = ?', (key,)).rowcount
+                        conn.commit()
+                        self._stats['expired'] += 1
+                        row = None
+                    if row is not None:
+                        conn.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+                        conn.commit()
+                        entry = CachedResult(json.loads(row[0]), row[1])
+                        self._remember(key, entry)
+                        self._stats['disk_hits'] += 1
+                        return entry
+                except (sqlite3.Error, ValueError) as e:
+                    logger.warning("Result cache lookup failed: %s", e)
+
+            self._stats['misses'] += 1
+            return None
+
+    def set(self, key: str, value: Dict):
+        """Store a response in both tiers"""
+        if not self.enabled:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._remember(key, CachedResult(value, now))
+            self._stats['writes'] += 1
+            if self.max_entries <= 0:
+                return
+            try:
+                conn = self._connect()
+                encoded = dumps(value).decode('utf-8')
+                inserted = conn.execute(
+                    'INSERT OR IGNORE INTO results (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+                    (key, encoded, now, now)
+                ).rowcount
+                if not inserted:
+                    conn.execute('UPDATE results SET value = ?, created = ?, accessed = ? WHERE key = ?',
+                                 (encoded, now, now, key))
+                self._disk_entries += inserted
+                self._writes_since_count += 1
+                if self._writes_since_count >= self.RECOUNT_WRITES:
+                    self._count(conn)
+
+                excess = self._disk_entries - self.max_entries
+                if excess > 0:
+                    self._disk_entries -= conn.execute(
+                        'DELETE FROM results WHERE key IN '
+                        '(SELECT key FROM results ORDER BY accessed ASC LIMIT ?)', (excess,)
+                    ).rowcount
+                conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning("Result cache write failed: %s", e)
+
+    def clear(self):
+        """Remove every entry and reset the statistics"""
+        with self._lock:
+            self._memory.clear()
+            if os.path.exists(self.path):
+                conn = self._connect()
+                conn.execute('DELETE FROM results')
+                conn.commit()
+            self._disk_entries = 0
+            self._stats = dict.fromkeys(self._stats, 0)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters since start-up plus the current entry counts"""
+        with self._lock:
+            stats = dict(self._stats)
+            hits = stats['memory_hits'] + stats['disk_hits']
+            lookups = hits + stats['misses']
+            stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+            stats['enabled'] = self.enabled
+            stats['memory_entries'] = len(self._memory)
+            try:
+                stats['disk_entries'] = (self._count(self._connect())
+                                         if self.enabled and self.max_entries > 0 else 0)
+            except sqlite3.Error:
+                stats['disk_entries'] = None
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
@@ -7,6 +7,8 @@ import re
 import json
 from typing import Dict, List, Tuple
 
+from modules.taxonomy import get_taxonomy
+
 
 class ATSResumeClassifier:
     """
@@ -14,111 +16,15 @@ class ATSResumeClassifier:
     before running ATS scoring using strict professional logic.
     """
     
-    def __init__(self):
-        # Define resume trigger categories with professional ATS keywords
-        self.resume_categories = {
-            'CORE_RESUME_IDENTITY': {
-                'keywords': [
-                    'resume', 'cv', 'curriculum vitae', 'bio-data', 'biodata',
-                    'professional profile', 'career summary', 'profile summary'
-                ],
-                'weight': 10,  # Very high weight for core identity
-                'category_bonus': 3
-            },
-            'EDUCATION_SIGNALS': {
-                'keywords': [
-                    'education', 'qualification', 'academic', 'degree',
-                    'b.e', 'b.tech', 'm.tech', 'b.sc', 'm.sc', 'diploma',
-                    'cgpa', 'gpa', 'percentage', 'university', 'college', 'school',
-                    'bachelor', 'master', 'phd', 'doctorate', 'graduate',
-                    'undergraduate', 'postgraduate', 'mba', 'bba'
-                ],
-                'weight': 1,
-                'category_bonus': 3
-            },
-            'EXPERIENCE_SIGNALS': {
-                'keywords': [
-                    'experience', 'work experience', 'employment', 'internship',
-                    'intern', 'job role', 'designation', 'company', 'organization',
-                    'responsibilities', 'worked at', 'position', 'role',
-                    'employment history', 'work history', 'professional experience',
-                    'career', 'tenure', 'duration'
-                ],
-                'weight': 1,
-                'category_bonus': 3
-            },
-            'SKILLS_SIGNALS': {
-                'keywords': [
-                    'skills', 'technical skills', 'soft skills', 'programming',
-                    'languages', 'frameworks', 'tools', 'technologies',
-                    'python', 'java', 'sql', 'html', 'css', 'javascript',
-                    'machine learning', 'data science', 'competencies',
-                    'expertise', 'proficiency', 'abilities', 'capabilities'
-                ],
-                'weight': 1,
-                'category_bonus': 3
-            },
-            'PROJECTS_ACHIEVEMENTS': {
-                'keywords': [
-                    'projects', 'mini project', 'major project', 'final year project',
-                    'achievements', 'awards', 'certifications', 'hackathon',
-                    'competition', 'portfolio', 'accomplishments', 'honors',
-                    'recognition', 'publications', 'research'
-                ],
-                'weight': 1,
-                'category_bonus': 3
-            },
-            'CONTACT_IDENTITY': {
-                'keywords': [
-                    'email', 'phone', 'mobile', 'contact', 'linkedin',
-                    'github', 'portfolio', 'address', 'location',
-                    'website', 'profile', 'social'
-                ],
-                'weight': 1,
-                'category_bonus': 3
-            },
-            'RESUME_SECTIONS': {
-                'keywords': [
-                    'objective', 'career objective', 'summary', 'profile',
-                    'strengths', 'hobbies', 'interests', 'declaration',
-                    'references', 'personal details', 'about me',
-                    'professional summary', 'career goals'
-                ],
-                'weight': 1,
-                'category_bonus': 3
-            }
-        }
-        
-        # Non-resume indicators (negative signals)
-        self.non_resume_indicators = [
-            'certificate of completion', 'certificate of achievement',
-            'course completion', 'training certificate', 'marksheet',
-            'transcript', 'offer letter', 'appointment letter',
-            'salary slip', 'pay stub', 'invoice', 'receipt',
-            'syllabus', 'curriculum', 'course outline', 'lesson plan',
-            'project report', 'thesis', 'dissertation', 'research paper',
-            'id card', 'identity card', 'passport', 'driving license',
-            'congratulations', 'celebration', 'party invitation',
-            'social media post', 'facebook post', 'twitter post',
-            'instagram post', 'blog post', 'article', 'news',
-            'meeting notes', 'agenda', 'minutes', 'memo',
-            'policy document', 'manual', 'handbook', 'guide',
-            # Company list indicators
-            'top companies', 'list of companies', 'mnc companies', 'company list',
-            'companies in india', 'best companies', 'fortune 500', 'company directory',
-            'company names', 'organization list', 'corporate directory', 'business directory',
-            'company profiles', 'company information', 'company details',
-            # Job listing indicators  
-            'job openings', 'career opportunities', 'job vacancies', 'hiring now',
-            'apply now', 'job description', 'job requirements', 'job posting',
-            # Permission/Authorization letters
-            'permission letter', 'authorization letter', 'approval letter',
-            'consent letter', 'clearance letter', 'recommendation letter',
-            'reference letter', 'verification letter', 'confirmation letter',
-            # Event/Competition documents
-            'hackathon', 'competition', 'event registration', 'participation',
-            'team registration', 'event details', 'competition guidelines'
-        ]
+    @property
+    def resume_categories(self) -> Dict:
+        """Resume trigger categories with professional ATS keywords"""
+        return get_taxonomy().get('resume_classification', 'categories')
+    
+    @property
+    def non_resume_indicators(self) -> List[str]:
+        """Non-resume indicators (negative signals)"""
+        return get_taxonomy().get('resume_classification', 'non_resume_indicators')
     
     def normalize_text(self, text: str) -> str:
         """
@@ -148,22 +54,24 @@ class ATSResumeClassifier:
         detected_sections = []
         found_keywords = []
         category_matches = {}
+        taxonomy = get_taxonomy()
+        
+        # Count whole-word occurrences of every category keyword in one pass
+        keyword_counts = taxonomy.matcher('resume_categories').count(normalized_text)
         
         # Check each category
-        for category_name, category_data in self.resume_categories.items():
+        for category_name, category_data in taxonomy.get('resume_classification', 'categories').items():
             keywords_found_in_category = []
             category_keyword_count = 0
             
-            # Search for each keyword in the category
+            # Look up each keyword in the category
             for keyword in category_data['keywords']:
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                matches = re.findall(pattern, normalized_text)
+                match_count = keyword_counts.get(keyword.lower(), 0)
                 
-                if matches:
+                if match_count:
                     keywords_found_in_category.append(keyword)
-                    category_keyword_count += len(matches)
-                    found_keywords.extend([keyword] * len(matches))
+                    category_keyword_count += match_count
+                    found_keywords.extend([keyword] * match_count)
             
             # If any keywords found in this category
             if keywords_found_in_category:
@@ -188,12 +96,12 @@ class ATSResumeClassifier:
         """
         Check for strong non-resume indicators that should immediately disqualify
         """
-        found_non_resume_indicators = []
-        
-        for indicator in self.non_resume_indicators:
-            pattern = r'\b' + re.escape(indicator.lower()) + r'\b'
-            if re.search(pattern, normalized_text):
-                found_non_resume_indicators.append(indicator)
+        taxonomy = get_taxonomy()
+        found = taxonomy.matcher('non_resume_indicators').find(normalized_text)
+        found_non_resume_indicators = [
+            indicator for indicator in taxonomy.get('resume_classification', 'non_resume_indicators')
+            if indicator.lower() in found
+        ]
         
         # Special pattern detection for company lists
         company_list_patterns = [
@@ -0,0 +1,88 @@
+"""
+Single-pass evaluation of a table of regex rules.
+
+Each rule is a named pattern; ``RuleScanner.scan`` reports which rules occur
+anywhere in a text. The pattern rules are compiled into one alternation of
+named groups, so the text is walked once instead of once per rule. A rule is
+dropped from the alternation as soon as it has been seen, which keeps frequent
+rules (every word ending in "ed") from producing a match per occurrence and
+lets rules that start at the same position as an earlier match still be found.
+
+Rules that are plain strings (bullet markers, phrases, special characters)
+are checked with ``in`` instead, as KeywordMatcher does for substring sets:
+CPython's string search is faster than any regex for those.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Pattern, Set, Tuple
+
+
+class Rule(NamedTuple):
+    """A named check for presence
+
+    Either ``pattern`` (a regex without capturing groups) or ``literals``
+    (matches if any of the strings occurs) is set.
+    """
+    code: str
+    pattern: str = ''
+    ignore_case: bool = False
+    literals: Tuple[str, ...] = ()
+
+
+class RuleScanner:
+    """Report which of a set of rules match a text, in one pass"""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = tuple(rules)
+        self.literal_rules = tuple(rule for rule in self.rules if rule.literals)
+        self.pattern_rules = tuple(rule for rule in self.rules if not rule.literals)
+        self.pattern_codes: FrozenSet[str] = frozenset(rule.code for rule in self.pattern_rules)
+        self._compiled: Dict[FrozenSet[str], Pattern] = {}
+
+        for rule in self.pattern_rules:
+            if re.compile(rule.pattern).groups:
+                raise ValueError(f"Rule '{rule.code}' must not use capturing groups")
+        if self.pattern_rules:
+            self._regex(self.pattern_codes)
+
+    def _regex(self, codes: FrozenSet[str]) -> Pattern:
+        """Combined regex for the pattern rules still being looked for"""
+        regex = self._compiled.get(codes)
+        if regex is None:
+            rules = [rule for rule in self.pattern_rules if rule.code in codes]
+            # A global flag (rather than scoped ones) keeps re's literal prefix scan
+            flags = re.IGNORECASE if all(rule.ignore_case for rule in rules) else 0
+
+            def body(rule: Rule) -> str:
+                return f'(?i:{rule.pattern})' if rule.ignore_case and not flags else rule.pattern
+
+            regex = re.compile('|'.join(f'(?P<{rule.code}>{body(rule)})' for rule in rules), flags)
+            self._compiled[codes] = regex
+        return regex
+
+    def scan(self, text: str) -> Set[str]:
+        """
+        Find the rules that match somewhere in the text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Codes of the matching rules, the same set a separate
+            ``re.search`` per rule would report
+        """
+        found = {rule.code for rule in self.literal_rules
+                 if any(literal in text for literal in rule.literals)}
+
+        remaining = self.pattern_codes
+        position = 0
+        while remaining:
+            # No rule in ``remaining`` matches before ``position``
+            match = self._regex(remaining).search(text, position)
+            if match is None:
+                break
+            found.add(match.lastgroup)
+            remaining = remaining - {match.lastgroup}
+            position = match.start()
+
+        return found
@@ -0,0 +1,161 @@
+"""
+Always-on sampling profiler.
+
+A daemon thread takes the Python stack of every other thread at a fixed
+interval (``sys._current_frames``) and counts identical stacks. Counts are
+kept per time window and only the most recent windows are kept, so
+``collapsed()`` gives a rolling profile of real traffic in the collapsed
+stack format read by flamegraph.pl and speedscope:
+
+    MainThread;main.py:<module>;...;keyword_analyzer.py:analyze_keywords 42
+
+Threads that are merely idle (pool workers waiting for work, the event loop
+waiting in select, the service's log writer, span exporter and taxonomy
+watcher between jobs) are left out unless ``include_idle`` is set, so the
+profile shows where busy threads spend their time, including waits on
+tesseract subprocesses.
+
+The sampler times itself and stretches the interval whenever a sample took
+longer than ``max_overhead`` of the time between samples, so its cost stays
+around that share of one core however many threads there are.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Leaf frames of threads waiting for work: (path suffix, function). Blocking
+# builtins (SimpleQueue.get, time.sleep) have no frame, so their caller is the leaf.
+IDLE_FRAMES = {
+    ('threading.py', 'wait'),  # Event.wait too, such as the taxonomy watcher's
+    ('queue.py', 'get'),
+    ('selectors.py', 'select'),
+    (os.path.join('concurrent', 'futures', 'thread.py'), '_worker'),
+    (os.path.join('logging', 'handlers.py'), 'dequeue'),  # log writer (QueueListener) on a SimpleQueue
+    (os.path.join('modules', 'tracing.py'), '_run'),  # span exporter asleep between flushes
+}
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _is_idle(frame) -> bool:
+    filename = frame.f_code.co_filename
+    return any(frame.f_code.co_name == name and filename.endswith(os.sep + suffix)
+               for suffix, name in IDLE_FRAMES)
+
+
+class StackSampler:
+    """Background thread aggregating sampled stacks into rolling time windows"""
+
+    def __init__(self, interval: Optional[float] = None, window: Optional[float] = None,
+                 windows: Optional[int] = None, max_overhead: Optional[float] = None,
+                 include_idle: bool = False):
+        """
+        Args:
+            interval: Seconds between samples at most
+            window: Seconds covered by one window of counts
+            windows: Windows kept; older counts are dropped
+            max_overhead: Share of wall time the sampler may spend sampling
+            include_idle: Also count threads waiting for work
+        """
+        self.interval = interval if interval is not None else float(os.getenv('SAMPLER_INTERVAL', '0.1'))
+        self.window = window if window is not None else float(os.getenv('SAMPLER_WINDOW', '60'))
+        windows = windows if windows is not None else int(os.getenv('SAMPLER_WINDOWS', '15'))
+        self.max_overhead = max_overhead if max_overhead is not None else \
+            float(os.getenv('SAMPLER_MAX_OVERHEAD', '0.01'))
+        self.include_idle = include_idle
+        self._windows: Deque[Tuple[float, Counter]] = deque(maxlen=windows)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {'samples': 0, 'stacks': 0}
+        self._busy = 0.0
+        self._started: Optional[float] = None
+        self._delay = self.interval
+
+    def start(self):
+        """Start sampling on a daemon thread, unless already started"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self._delay):
+            start = time.perf_counter()
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning("Stack sample failed: %s", e)
+            cost = time.perf_counter() - start
+            self._busy += cost
+            # Wait long enough that sampling stays within max_overhead of the time
+            self._delay = max(self.interval, cost / self.max_overhead - cost)
+
+    def sample(self, now: Optional[float] = None):
+        """Count the current stack of every other thread"""
+        now = time.time() if now is None else now
+        current = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == current or (not self.include_idle and _is_idle(frame)):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, f'thread-{ident}'))
+            stacks.append(';'.join(reversed(stack)))
+
+        with self._lock:
+            if not self._windows or now - self._windows[-1][0] >= self.window:
+                self._windows.append((now, Counter()))
+            self._windows[-1][1].update(stacks)
+            self._stats['samples'] += 1
+            self._stats['stacks'] += len(stacks)
+
+    def collapsed(self, seconds: Optional[float] = None, now: Optional[float] = None) -> str:
+        """
+        Stacks counted in the windows of the last ``seconds`` (all kept windows by default)
+
+        Returns:
+            One "frame;frame;... count" line per distinct stack, most frequent first
+        """
+        now = time.time() if now is None else now
+        totals: Counter = Counter()
+        with self._lock:
+            for start, counts in self._windows:
+                if seconds is None or start + self.window > now - seconds:
+                    totals.update(counts)
+        return ''.join(f'{stack} {count}\n' for stack, count in totals.most_common())
+
+    def stats(self) -> Dict:
+        """Samples taken, the sampler's share of wall time and its current interval"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['windows'] = len(self._windows)
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+        stats['overhead'] = round(self._busy / elapsed, 5) if elapsed else 0.0
+        stats['interval'] = round(self._delay, 4)
+        stats['running'] = self._thread is not None and self._thread.is_alive()
+        return stats
@@ -0,0 +1,181 @@
+"""
+Priority lanes in front of the analysis pipeline.
+
+Every pipeline run first takes a slot from the scheduler in its lane:
+
+    interactive  single uploads someone is waiting for
+    bulk         re-analysis and batch jobs
+
+At most ``capacity`` runs hold a slot at once, and each lane has its own
+concurrency cap, so a large batch can never take every slot. When a slot
+frees up and several lanes have runs waiting, the lanes are served in
+proportion to their weights (stride scheduling). Each lane advances its
+virtual time by 1/weight per run, and the waiting lane with the lowest
+virtual time goes next. A lane that has been idle restarts at the current
+virtual time, so it gets no burst from credit saved up while idle.
+
+The scheduler belongs to one event loop and is not thread-safe.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+
+
+class Lane(NamedTuple):
+    """A priority class"""
+    name: str
+    weight: float
+    max_concurrency: int
+
+
+def default_lanes(capacity: int) -> List[Lane]:
+    """Interactive and bulk lanes, configured from the environment"""
+    return [
+        Lane(INTERACTIVE, float(os.getenv('LANE_INTERACTIVE_WEIGHT', '8')),
+             int(os.getenv('LANE_INTERACTIVE_CONCURRENCY', str(capacity)))),
+        Lane(BULK, float(os.getenv('LANE_BULK_WEIGHT', '1')),
+             int(os.getenv('LANE_BULK_CONCURRENCY', str(max(1, capacity // 2))))),
+    ]
+
+
+class _LaneState:
+    """Waiters, usage and wait statistics of one lane"""
+
+    def __init__(self, lane: Lane):
+        self.lane = lane
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.running = 0
+        self.virtual_time = 0.0
+        self.admitted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def has_room(self) -> bool:
+        return self.running < self.lane.max_concurrency
+
+
+class LaneScheduler:
+    """Weighted fair admission of pipeline runs across priority lanes"""
+
+    def __init__(self, lanes: Optional[Iterable[Lane]] = None, capacity: Optional[int] = None):
+        """
+        Args:
+            lanes: Priority lanes (defaults to interactive and bulk)
+            capacity: Runs allowed at once across all lanes
+        """
+        self.capacity = capacity if capacity is not None else int(os.getenv('SCHEDULER_CAPACITY', '4'))
+        self._lanes: Dict[str, _LaneState] = {
+            lane.name: _LaneState(lane) for lane in (lanes if lanes is not None else default_lanes(self.capacity))
+        }
+        for state in self._lanes.values():
+            if state.lane.weight <= 0 or state.lane.max_concurrency < 1:
+                raise ValueError(f"Lane '{state.lane.name}' needs a positive weight and concurrency")
+        self._running = 0
+        self._virtual_time = 0.0
+
+    @property
+    def lanes(self) -> List[str]:
+        return list(self._lanes)
+
+    def _state(self, lane: str) -> _LaneState:
+        state = self._lanes.get(lane)
+        if state is None:
+            raise ValueError(f"Unknown lane '{lane}'. Use one of: {', '.join(self._lanes)}")
+        return state
+
+    def _start(self, state: _LaneState, waited: float):
+        """Account for a run entering its slot"""
+        self._running += 1
+        state.running += 1
+        state.admitted += 1
+        state.total_wait += waited
+        state.max_wait = max(state.max_wait, waited)
+        self._virtual_time = max(self._virtual_time, state.virtual_time)
+        state.virtual_time += 1.0 / state.lane.weight
+
+    def _eligible(self) -> List[_LaneState]:
+        return [state for state in self._lanes.values() if state.waiters and state.has_room]
+
+    def _dispatch(self):
+        """Hand free slots to waiting runs, lowest virtual time first"""
+        while self._running < self.capacity:
+            eligible = self._eligible()
+            if not eligible:
+                return
+            state = min(eligible, key=lambda lane_state: lane_state.virtual_time)
+            waiter = state.waiters.popleft()
+            # The slot is taken now; the waiter records its wait when it resumes
+            self._start(state, 0.0)
+            waiter.set_result(None)
+
+    def _release(self, state: _LaneState):
+        self._running -= 1
+        state.running -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, lane: str):
+        """
+        Hold a pipeline slot in ``lane`` for the duration of the block
+
+        Raises:
+            ValueError: If the lane is unknown
+        """
+        state = self._state(lane)
+        if not state.waiters and not state.running:
+            # Back from idle: no credit for the time it did not compete
+            state.virtual_time = max(state.virtual_time, self._virtual_time)
+
+        queued_at = time.perf_counter()
+        if self._running < self.capacity and state.has_room and not self._eligible():
+            self._start(state, 0.0)
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            state.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted a slot just as it was cancelled
+                    self._release(state)
+                else:
+                    state.waiters.remove(waiter)
+                raise
+            waited = time.perf_counter() - queued_at
+            state.total_wait += waited
+            state.max_wait = max(state.max_wait, waited)
+
+        try:
+            yield
+        finally:
+            self._release(state)
+
+    def stats(self) -> Dict:
+        """Queue depth, concurrency and wait times per lane"""
+        return {
+            'capacity': self.capacity,
+            'running': self._running,
+            'lanes': {
+                name: {
+                    'weight': state.lane.weight,
+                    'max_concurrency': state.lane.max_concurrency,
+                    'running': state.running,
+                    'waiting': len(state.waiters),
+                    'admitted': state.admitted,
+                    'avg_wait_ms': round(state.total_wait / state.admitted * 1000, 2) if state.admitted else 0.0,
+                    'max_wait_ms': round(state.max_wait * 1000, 2),
+                }
+                for name, state in self._lanes.items()
+            }
+        }
@@ -1,43 +1,16 @@
 import re
 from typing import Dict, List
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from modules.taxonomy import get_taxonomy
 
 class ScoringEngine:
     """ML-based resume scoring engine"""
     
-    def __init__(self):
-        # Job role keywords database
-        self.job_keywords = {
-            'software engineer': [
-                'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'git', 'api', 'database',
-                'algorithms', 'data structures', 'testing', 'debugging', 'agile', 'scrum'
-            ],
-            'data scientist': [
-                'python', 'r', 'machine learning', 'statistics', 'pandas', 'numpy', 'tensorflow',
-                'pytorch', 'sql', 'tableau', 'visualization', 'modeling', 'analysis', 'research'
-            ],
-            'product manager': [
-                'strategy', 'roadmap', 'stakeholder', 'requirements', 'analytics', 'user experience',
-                'market research', 'agile', 'scrum', 'leadership', 'communication', 'metrics'
-            ],
-            'frontend developer': [
-                'javascript', 'react', 'vue', 'angular', 'html', 'css', 'typescript', 'responsive',
-                'ui/ux', 'webpack', 'npm', 'git', 'testing', 'accessibility', 'performance'
-            ],
-            'backend developer': [
-                'python', 'java', 'node.js', 'api', 'database', 'sql', 'microservices', 'docker',
-                'kubernetes', 'aws', 'testing', 'security', 'performance', 'scalability'
-            ],
-            'devops engineer': [
-                'docker', 'kubernetes', 'aws', 'azure', 'jenkins', 'terraform', 'ansible', 'linux',
-                'monitoring', 'ci/cd', 'automation', 'infrastructure', 'security', 'scripting'
-            ]
-        }
-        
-        # Initialize TF-IDF vectorizer for keyword matching
-        self.vectorizer = TfidfVectorizer(stop_words='english', lowercase=True)
+    @property
+    def job_keywords(self) -> Dict[str, List[str]]:
+        """Job role keywords database from the current taxonomy"""
+        return get_taxonomy().get('scoring', 'role_keywords')
     
     def calculate_score(self, sections: Dict, job_role: str) -> Dict:
         """
@@ -125,19 +98,12 @@ class ScoringEngine:
             score += 10
         
         # Relevance score based on job role
-        job_role_lower = job_role.lower()
-        relevant_keywords = []
+        role = get_taxonomy().role_index('scoring').resolve(job_role)
         
-        # Find matching job role keywords
-        for role, keywords in self.job_keywords.items():
-            if role in job_role_lower:
-                relevant_keywords = keywords
-                break
-        
-        if relevant_keywords:
+        if role and role.keywords:
             skills_text = ' '.join(skills).lower()
-            matching_keywords = sum(1 for keyword in relevant_keywords if keyword in skills_text)
-            relevance_score = min(50, (matching_keywords / len(relevant_keywords)) * 50)
+            matching_keywords = len(role.matcher.find(skills_text))
+            relevance_score = min(50, (matching_keywords / len(role.keywords)) * 50)
             score += relevance_score
         else:
             # Generic relevance score
@@ -174,15 +140,10 @@ class ScoringEngine:
         
         score = 0
         text_lower = text.lower()
+        taxonomy = get_taxonomy()
         
         # Check for action verbs
-        action_verbs = [
-            'developed', 'created', 'built', 'designed', 'implemented', 'managed', 'led',
-            'improved', 'optimized', 'achieved', 'delivered', 'collaborated', 'analyzed',
-            'researched', 'established', 'maintained', 'coordinated', 'executed'
-        ]
-        
-        action_verb_count = sum(1 for verb in action_verbs if verb in text_lower)
+        action_verb_count = len(taxonomy.matcher('scoring.action_verbs').find(text_lower))
         if action_verb_count >= 5:
             score += 30
         elif action_verb_count >= 3:
@@ -209,13 +170,7 @@ class ScoringEngine:
             score += 10
         
         # Check for technical depth
-        technical_indicators = [
-            'architecture', 'framework', 'algorithm', 'optimization', 'scalability',
-            'performance', 'security', 'integration', 'deployment', 'testing'
-        ]
-        
-        technical_count = sum(1 for indicator in technical_indicators 
-                            if indicator in text_lower)
+        technical_count = len(taxonomy.matcher('scoring.technical_indicators').find(text_lower))
         if technical_count >= 3:
             score += 20
         elif technical_count >= 1:
@@ -248,17 +203,11 @@ class ScoringEngine:
     
     def get_keyword_suggestions(self, sections: Dict, job_role: str) -> List[str]:
         """Get keyword suggestions for the target job role"""
-        job_role_lower = job_role.lower()
-        relevant_keywords = []
-        
-        # Find matching job role keywords
-        for role, keywords in self.job_keywords.items():
-            if role in job_role_lower:
-                relevant_keywords = keywords
-                break
+        role = get_taxonomy().role_index('scoring').resolve(job_role)
         
-        if not relevant_keywords:
+        if not role or not role.keywords:
             return []
+        relevant_keywords = role.keywords
         
         # Check which keywords are missing
         resume_text = ' '.join([
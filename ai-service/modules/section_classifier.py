@@ -1,36 +1,68 @@
+import logging
 import re
+import threading
 from typing import Dict, List, Optional
 import spacy
 from transformers import pipeline
+from modules.taxonomy import get_taxonomy
+from modules.metrics import timed_model_load
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+SKILL_LINE_PATTERNS = [
+    re.compile(r'(?:skills?|technologies?|tools?)[:\s]*([^\n]+)', re.IGNORECASE),
+    re.compile(r'(?:proficient|experienced|familiar)\s+(?:in|with)[:\s]*([^\n]+)', re.IGNORECASE),
+    re.compile(r'(?:programming|coding)\s+(?:languages?|skills?)[:\s]*([^\n]+)', re.IGNORECASE),
+]
 
 class SectionClassifier:
     """Classifies resume sections using NLP techniques"""
     
-    def __init__(self):
+    def __init__(self, load_models: bool = True):
+        """
+        Args:
+            load_models: Load spaCy and the zero-shot model; without them only the
+                rules run (quick analyses)
+        """
+        # The models are shared by every request and neither documents calls
+        # from several threads at once as safe, so each is used under a lock
+        self._nlp_lock = threading.Lock()
+        self._classifier_lock = threading.Lock()
+        self.nlp = None
+        self.classifier = None
+        if not load_models:
+            return
+        
         # Load spaCy model for NER
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            with timed_model_load("en_core_web_sm"):
+                self.nlp = spacy.load("en_core_web_sm")
         except OSError:
-            print("Warning: spaCy model 'en_core_web_sm' not found. Install with: python -m spacy download en_core_web_sm")
+            logger.warning("spaCy model 'en_core_web_sm' not found. Install with: python -m spacy download en_core_web_sm")
             self.nlp = None
         
         # Initialize classification pipeline (using a lightweight model)
         try:
-            self.classifier = pipeline(
-                "zero-shot-classification",
-                model="facebook/bart-large-mnli",
-                device=-1  # Use CPU
-            )
+            with timed_model_load("bart-large-mnli"):
+                self.classifier = pipeline(
+                    "zero-shot-classification",
+                    model="facebook/bart-large-mnli",
+                    device=-1  # Use CPU
+                )
         except Exception as e:
-            print(f"Warning: Could not load classification model: {e}")
+            logger.warning("Could not load classification model: %s", e)
             self.classifier = None
     
-    def classify_sections(self, text: str) -> Dict[str, str]:
+    def classify_sections(self, text: str, ner: bool = True, zero_shot: bool = True) -> Dict[str, str]:
         """
         Classify resume text into different sections
         
         Args:
             text: Raw resume text
+            ner: Use spaCy to find the name when the rules do not
+            zero_shot: Ask the transformer model about sections no rule matched
             
         Returns:
             Dictionary with classified sections
@@ -46,14 +78,14 @@ class SectionClassifier:
         }
         
         # Extract contact information
-        sections['contactInfo'] = self.extract_contact_info(text)
+        sections['contactInfo'] = self.extract_contact_info(text, ner=ner)
         
         # Split text into sections using headers and keywords
         section_splits = self._split_by_headers(text)
         
         # Classify each section
         for section_text in section_splits:
-            section_type = self._classify_section_type(section_text)
+            section_type = self._classify_section_type(section_text, zero_shot=zero_shot)
             
             if section_type == 'education':
                 sections['education'] = section_text
@@ -68,7 +100,7 @@ class SectionClassifier:
         
         return sections
     
-    def extract_contact_info(self, text: str) -> Dict[str, str]:
+    def extract_contact_info(self, text: str, ner: bool = True) -> Dict[str, str]:
         """Extract contact information from resume text"""
         contact_info = {
             'name': '',
@@ -78,14 +110,12 @@ class SectionClassifier:
         }
         
         # Extract email using regex
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
+        email_match = EMAIL_PATTERN.search(text)
         if email_match:
             contact_info['email'] = email_match.group()
         
         # Extract phone number using regex
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phone_match = re.search(phone_pattern, text)
+        phone_match = PHONE_PATTERN.search(text)
         if phone_match:
             contact_info['phone'] = phone_match.group()
         
@@ -100,8 +130,9 @@ class SectionClassifier:
                     break
         
         # Use spaCy for better name extraction if available
-        if self.nlp:
-            doc = self.nlp(text[:500])  # First 500 chars
+        if ner and self.nlp and not contact_info['name']:
+            with self._nlp_lock:
+                doc = self.nlp(text[:500])  # First 500 chars
             for ent in doc.ents:
                 if ent.label_ == "PERSON" and not contact_info['name']:
                     contact_info['name'] = ent.text
@@ -111,59 +142,17 @@ class SectionClassifier:
     
     def extract_skills_list(self, text: str) -> List[str]:
         """Extract skills from text"""
-        # Common technical skills database
-        technical_skills = [
-            # Programming Languages
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-            'swift', 'kotlin', 'scala', 'r', 'matlab', 'sql', 'html', 'css', 'bash', 'powershell',
-            
-            # Frameworks & Libraries
-            'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring', 'laravel',
-            'rails', 'asp.net', 'jquery', 'bootstrap', 'tailwind', 'pandas', 'numpy', 'tensorflow',
-            'pytorch', 'scikit-learn', 'keras', 'opencv', 'matplotlib', 'seaborn',
-            
-            # Databases
-            'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'sqlite', 'oracle',
-            'cassandra', 'dynamodb', 'firebase',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab',
-            'terraform', 'ansible', 'vagrant', 'nginx', 'apache',
-            
-            # Tools & Technologies
-            'linux', 'windows', 'macos', 'vim', 'vscode', 'intellij', 'eclipse', 'postman',
-            'jira', 'confluence', 'slack', 'trello', 'figma', 'photoshop', 'illustrator',
-            
-            # Data & Analytics
-            'tableau', 'power bi', 'excel', 'google analytics', 'spark', 'hadoop', 'kafka',
-            'airflow', 'jupyter', 'rstudio',
-            
-            # Mobile Development
-            'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova',
-            
-            # Testing
-            'junit', 'pytest', 'jest', 'selenium', 'cypress', 'postman', 'swagger'
-        ]
-        
-        found_skills = []
         text_lower = text.lower()
+        taxonomy = get_taxonomy()
+        found = taxonomy.matcher('technical_skills').find(text_lower)
         
-        # Find skills mentioned in text
-        for skill in technical_skills:
-            if skill in text_lower:
-                # Add the skill with proper capitalization
-                found_skills.append(skill.title())
+        # Add skills mentioned in text with proper capitalization
+        found_skills = [skill.title() for skill in taxonomy.get('section_classification', 'technical_skills')
+                        if skill in found]
         
         # Also extract skills using common patterns
-        skill_patterns = [
-            r'(?:skills?|technologies?|tools?)[:\s]*([^\n]+)',
-            r'(?:proficient|experienced|familiar)\s+(?:in|with)[:\s]*([^\n]+)',
-            r'(?:programming|coding)\s+(?:languages?|skills?)[:\s]*([^\n]+)'
-        ]
-        
-        for pattern in skill_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
+        for pattern in SKILL_LINE_PATTERNS:
+            for match in pattern.finditer(text_lower):
                 skill_text = match.group(1)
                 # Split by common delimiters
                 skills_in_line = re.split(r'[,;|•\-\n]', skill_text)
@@ -207,27 +196,21 @@ class SectionClassifier:
         
         return sections
     
-    def _classify_section_type(self, section_text: str) -> str:
+    def _classify_section_type(self, section_text: str, zero_shot: bool = True) -> str:
         """Classify what type of section this text represents"""
         text_lower = section_text.lower()
         
-        # Rule-based classification
-        if any(keyword in text_lower for keyword in ['education', 'degree', 'university', 'college', 'school', 'bachelor', 'master', 'phd']):
-            return 'education'
-        elif any(keyword in text_lower for keyword in ['skills', 'technologies', 'programming', 'proficient', 'languages']):
-            return 'skills'
-        elif any(keyword in text_lower for keyword in ['experience', 'work', 'employment', 'job', 'position', 'role']):
-            return 'experience'
-        elif any(keyword in text_lower for keyword in ['projects', 'project', 'built', 'developed', 'created']):
-            return 'projects'
-        elif any(keyword in text_lower for keyword in ['certification', 'certificate', 'certified', 'license']):
-            return 'certifications'
+        # Rule-based classification, checked in taxonomy order
+        for section_type, matcher in get_taxonomy().section_matchers:
+            if matcher.search(text_lower):
+                return section_type
         
         # If using transformer model, use it for classification
-        if self.classifier:
+        if zero_shot and self.classifier:
             try:
                 candidate_labels = ['education', 'skills', 'experience', 'projects', 'certifications', 'other']
-                result = self.classifier(section_text[:512], candidate_labels)  # Limit text length
+                with self._classifier_lock:
+                    result = self.classifier(section_text[:512], candidate_labels)  # Limit text length
                 return result['labels'][0] if result['scores'][0] > 0.5 else 'other'
             except Exception:
                 pass
@@ -0,0 +1,79 @@
+"""
+Coalescing of identical concurrent computations.
+
+The backend retries an upload when the first attempt is slow, so two or
+three analyses of the same file often run at the same moment. With
+``SingleFlight`` the first caller for a key starts the computation and
+callers arriving while it runs wait for the same result instead of starting
+their own, so retries add no load exactly when the service is busiest.
+
+The computation runs as a task of its own. A caller that goes away (client
+disconnect) only stops waiting; the computation is cancelled once no caller
+is left waiting for it. Errors are shared the same way as results.
+
+A SingleFlight belongs to one event loop and is not thread-safe.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _Flight:
+    """A running computation and the number of callers waiting for it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """At most one computation per key at a time, shared by every caller"""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {'started': 0, 'coalesced': 0}
+
+    async def do(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Result of ``compute()``, shared with concurrent callers for ``key``
+
+        Args:
+            key: Identity of the computation
+            compute: Coroutine function, only called if no computation for key is running
+
+        Returns:
+            The result and whether it came from a computation another caller started
+
+        Raises:
+            Whatever the computation raised
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self._stats['coalesced'] += 1
+        else:
+            flight = _Flight(asyncio.ensure_future(compute()))
+            self._flights[key] = flight
+            self._stats['started'] += 1
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._finished(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller has gone away, so nobody needs the result
+                flight.task.cancel()
+                self._finished(key, flight)
+
+    def _finished(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if flight.task.done() and not flight.task.cancelled():
+            # Mark the exception as retrieved when every waiter has already left
+            flight.task.exception()
+
+    def stats(self) -> Dict:
+        """Computations started and callers that joined one already running"""
+        return {**self._stats, 'in_flight': len(self._flights)}
@@ -0,0 +1,477 @@
+"""
+Keyword taxonomy loader and compiler.
+
+Role keywords, skill lists, action verbs and ATS keywords live in
+``data/taxonomy.json``. At load time the file is compiled into keyword
+matchers (a trie-shaped regex per keyword set, so whole-word sets are matched
+in a single pass over the text) and role indexes. Building the matchers is the
+slow part, so their regex sources are cached on disk as plain JSON next to the
+taxonomy file and only recompiled with ``re`` on load. A TaxonomyStore can
+recompile a changed file in the background and swap it in without a restart.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'taxonomy.json'
+)
+
+# Bump when the compiled representation changes so stale disk caches are ignored
+COMPILED_FORMAT_VERSION = 2
+
+_WORD_BOUNDARY = re.compile(r'\b')
+
+
+def _build_trie(terms: Iterable[str]) -> Dict:
+    """Build a character trie; the empty-string key marks the end of a term"""
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+
+def _trie_to_regex(node: Dict) -> str:
+    """Render a trie as a regex that prefers the longest term at each position"""
+    terminal = '' in node
+    branches = [re.escape(char) + _trie_to_regex(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    body = '(?:' + '|'.join(branches) + ')'
+    # A term ending here is optional continuation; greedy '?' keeps longest-first
+    return body + '?' if terminal else body
+
+
+class KeywordMatcher:
+    """Single-pass matcher for a set of keywords
+
+    ``find`` returns the same keywords as testing ``keyword in text`` for
+    every keyword (or ``re.search(r'\\bkeyword\\b', text)`` when
+    ``whole_word`` is set). Whole-word sets scan the text once with the trie
+    regex instead of once per keyword; plain substring sets keep per-term
+    ``in`` checks, which CPython's string search already does faster than a
+    regex can. Keywords are matched case-sensitively; callers lowercase text.
+    """
+
+    def __init__(self, terms: Iterable[str], whole_word: bool = False):
+        self.terms: Tuple[str, ...] = tuple(dict.fromkeys(term.lower() for term in terms if term))
+        self.whole_word = whole_word
+
+        # For each term, the other terms that are prefixes of it. When the
+        # longest term at a position is found, those prefixes also occur there.
+        term_set = set(self.terms)
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            term: tuple(term[:i] for i in range(len(term) - 1, 0, -1) if term[:i] in term_set)
+            for term in self.terms
+        }
+
+        self._source = ''
+        if self.terms:
+            trie_regex = _trie_to_regex(_build_trie(self.terms))
+            if whole_word:
+                self._source = r'(?=\b(' + trie_regex + r')\b)'
+            else:
+                self._source = r'(?=(' + trie_regex + r'))'
+        self._compile()
+
+    def _compile(self):
+        self._pattern = re.compile(self._source) if self._source else None
+        # Whole-word prefixes are verified on their own when a longer term was found
+        self._prefix_patterns = {}
+        if self.whole_word:
+            for prefixes in self._prefixes.values():
+                for prefix in prefixes:
+                    self._prefix_patterns[prefix] = re.compile(r'\b' + re.escape(prefix) + r'\b')
+
+    def __getstate__(self):
+        # Compiled patterns are rebuilt from the stored source on unpickling
+        state = self.__dict__.copy()
+        del state['_pattern']
+        del state['_prefix_patterns']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    def to_cache(self) -> Dict:
+        """Plain-data form of the matcher for the JSON disk cache"""
+        return {
+            'terms': list(self.terms),
+            'whole_word': self.whole_word,
+            'prefixes': {term: list(prefixes) for term, prefixes in self._prefixes.items() if prefixes},
+            'source': self._source,
+        }
+
+    @classmethod
+    def from_cache(cls, cached: Dict) -> 'KeywordMatcher':
+        """Rebuild a matcher from ``to_cache`` output without building its trie again"""
+        matcher = cls.__new__(cls)
+        matcher.terms = tuple(cached['terms'])
+        matcher.whole_word = bool(cached['whole_word'])
+        matcher._prefixes = {term: tuple(cached['prefixes'].get(term, ())) for term in matcher.terms}
+        matcher._source = cached['source']
+        matcher._compile()
+        return matcher
+
+    def _iter_matches(self, text: str):
+        """Yield (position, term) for every term occurrence in text"""
+        if self._pattern is None or not text:
+            return
+        for match in self._pattern.finditer(text):
+            position = match.start()
+            longest = match.group(1)
+            yield position, longest
+            for prefix in self._prefixes[longest]:
+                if not self.whole_word or _WORD_BOUNDARY.match(text, position + len(prefix)):
+                    yield position, prefix
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords occurring in text"""
+        if self._pattern is None or not text:
+            return set()
+        if not self.whole_word:
+            return {term for term in self.terms if term in text}
+        found = set(self._pattern.findall(text))
+        for term in list(found):
+            for prefix in self._prefixes[term]:
+                if prefix not in found and self._prefix_patterns[prefix].search(text):
+                    found.add(prefix)
+        return found
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Return the number of occurrences of each keyword found in text"""
+        counts: Dict[str, int] = {}
+        for _, term in self._iter_matches(text):
+            counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    def search(self, text: str) -> bool:
+        """Return True if any keyword occurs in text"""
+        if not self.whole_word:
+            return any(term in text for term in self.terms)
+        return self._pattern is not None and self._pattern.search(text) is not None
+
+
+# (cache key, keywords, whole_word) -> matcher
+MatcherFactory = Callable[[str, Iterable[str], bool], KeywordMatcher]
+
+
+def _new_matcher(key: str, terms: Iterable[str], whole_word: bool) -> KeywordMatcher:
+    return KeywordMatcher(terms, whole_word=whole_word)
+
+
+def _flatten(keywords) -> List[str]:
+    """Role keywords as one list, whether given flat or by category"""
+    if isinstance(keywords, dict):
+        return [keyword for category in keywords.values() for keyword in category]
+    return list(keywords)
+
+
+class RoleEntry:
+    """Keywords for one job role plus a matcher over all of them"""
+
+    def __init__(self, name: str, keywords, whole_word: bool = False, matcher: Optional[KeywordMatcher] = None):
+        self.name = name
+        self.keywords = keywords
+        self.matcher = matcher if matcher is not None else KeywordMatcher(_flatten(keywords), whole_word=whole_word)
+
+
+class RoleIndex:
+    """Resolves free-text job roles to taxonomy roles, memoizing the result"""
+
+    MEMO_SIZE = 1024
+
+    def __init__(self, roles: Dict, generic=None, whole_word: bool = False,
+                 make_matcher: MatcherFactory = _new_matcher):
+        self.roles: Dict[str, RoleEntry] = {
+            name: RoleEntry(name, keywords, whole_word,
+                            make_matcher(f'role.{name}', _flatten(keywords), whole_word))
+            for name, keywords in roles.items()
+        }
+        self.generic = None
+        if generic is not None:
+            self.generic = RoleEntry('generic', generic, whole_word,
+                                     make_matcher('generic', _flatten(generic), whole_word))
+        self._role_words = [(name, name.split()) for name in self.roles]
+        self._memo: Dict[Tuple[str, bool], Optional[str]] = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_memo'] = {}
+        return state
+
+    def resolve(self, job_role: str, partial: bool = False) -> Optional[RoleEntry]:
+        """
+        Find the role whose name occurs in job_role
+
+        Args:
+            job_role: Free-text target job role
+            partial: Also accept roles sharing any single word with job_role
+
+        Returns:
+            Matching RoleEntry, the generic entry, or None
+        """
+        job_role_lower = job_role.lower()
+        key = (job_role_lower, partial)
+        if key in self._memo:
+            name = self._memo[key]
+        else:
+            name = self._resolve_name(job_role_lower, partial)
+            if len(self._memo) < self.MEMO_SIZE:
+                self._memo[key] = name
+        if name is None:
+            return self.generic
+        return self.roles[name]
+
+    def _resolve_name(self, job_role_lower: str, partial: bool) -> Optional[str]:
+        for name in self.roles:
+            if name in job_role_lower:
+                return name
+        if partial:
+            for name, words in self._role_words:
+                if any(word in job_role_lower for word in words):
+                    return name
+        return None
+
+
+class CompiledTaxonomy:
+    """Taxonomy data plus its precompiled matchers and role indexes"""
+
+    # name -> (path into the taxonomy data, whole_word)
+    MATCHER_SPECS = {
+        'scoring.action_verbs': (('scoring', 'action_verbs'), False),
+        'scoring.technical_indicators': (('scoring', 'technical_indicators'), False),
+        'ats.action_verbs': (('keyword_analysis', 'ats_keywords', 'action_verbs'), False),
+        'ats.soft_skills': (('keyword_analysis', 'ats_keywords', 'soft_skills'), False),
+        'technical_skills': (('section_classification', 'technical_skills'), False),
+        'non_resume_indicators': (('resume_classification', 'non_resume_indicators'), True),
+        'common_skills': (('skill_detection', 'common_skills'), True),
+    }
+
+    def __init__(self, data: Dict, version: str, cached_matchers: Optional[Dict[str, Dict]] = None):
+        """
+        Args:
+            data: Parsed taxonomy file
+            version: sha256 of the taxonomy file
+            cached_matchers: ``matcher_cache`` of an earlier compile of the same version
+        """
+        self.data = data
+        self.version = version
+        self._cached_matchers = cached_matchers or {}
+        # Every matcher in plain-data form, keyed by where it is used; written to the disk cache
+        self.matcher_cache: Dict[str, Dict] = {}
+
+        self.matchers: Dict[str, KeywordMatcher] = {
+            name: self._matcher(name, self.get(*path), whole_word)
+            for name, (path, whole_word) in self.MATCHER_SPECS.items()
+        }
+        self.matchers['resume_categories'] = self._matcher(
+            'resume_categories',
+            [keyword for category in self.get('resume_classification', 'categories').values()
+             for keyword in category['keywords']],
+            True
+        )
+        self.section_matchers: List[Tuple[str, KeywordMatcher]] = [
+            (section, self._matcher(f'section.{section}', keywords, False))
+            for section, keywords in self.get('section_classification', 'section_keywords').items()
+        ]
+
+        self.role_indexes: Dict[str, RoleIndex] = {
+            'scoring': RoleIndex(self.get('scoring', 'role_keywords'),
+                                 make_matcher=self._role_matchers('scoring')),
+            'keyword_analysis': RoleIndex(
+                self.get('keyword_analysis', 'role_keywords'),
+                generic=self.get('keyword_analysis', 'generic_role_keywords'),
+                make_matcher=self._role_matchers('keyword_analysis')
+            ),
+            'skill_detection': RoleIndex(self.get('skill_detection', 'role_skill_mapping'),
+                                         make_matcher=self._role_matchers('skill_detection')),
+        }
+        self._cached_matchers = {}
+
+    def _matcher(self, key: str, terms: Iterable[str], whole_word: bool) -> KeywordMatcher:
+        """Matcher for one keyword set, taken from the cached form when there is one"""
+        cached = self._cached_matchers.get(key)
+        if cached is not None and cached['whole_word'] == whole_word:
+            matcher = KeywordMatcher.from_cache(cached)
+        else:
+            matcher = KeywordMatcher(terms, whole_word=whole_word)
+        self.matcher_cache[key] = matcher.to_cache()
+        return matcher
+
+    def _role_matchers(self, index: str) -> MatcherFactory:
+        return lambda key, terms, whole_word: self._matcher(f'{index}.{key}', terms, whole_word)
+
+    def get(self, *path):
+        """Return the raw taxonomy value at the given key path"""
+        value = self.data
+        for key in path:
+            value = value[key]
+        return value
+
+    def matcher(self, name: str) -> KeywordMatcher:
+        return self.matchers[name]
+
+    def role_index(self, name: str) -> RoleIndex:
+        return self.role_indexes[name]
+
+
+def compile_taxonomy(raw: bytes) -> CompiledTaxonomy:
+    """Compile raw taxonomy file contents"""
+    data = json.loads(raw.decode('utf-8'))
+    return CompiledTaxonomy(data, hashlib.sha256(raw).hexdigest())
+
+
+class TaxonomyStore:
+    """
+    Holds the current compiled taxonomy and swaps in new versions atomically
+
+    Readers call ``get()`` once per operation and use that snapshot; a reload
+    compiles the new file on a background thread and only then replaces the
+    reference, so requests never wait on compilation.
+    """
+
+    def __init__(self, path: str = DEFAULT_TAXONOMY_PATH, cache_path: Optional[str] = None):
+        self.path = path
+        self.cache_path = cache_path if cache_path is not None else path + '.compiled'
+        self._current: Optional[CompiledTaxonomy] = None
+        self._load_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._loaded_mtime = None
+        # mtime of a file that failed to load; not retried until the file changes again
+        self._failed_mtime = None
+        self._watcher = None
+
+    def get(self) -> CompiledTaxonomy:
+        """Return the current compiled taxonomy, loading it on first use"""
+        current = self._current
+        if current is None:
+            with self._load_lock:
+                if self._current is None:
+                    self._current = self._load()
+                current = self._current
+        return current
+
+    def _load(self, mtime: Optional[float] = None) -> CompiledTaxonomy:
+        """Load using the disk cache when it matches the source, else compile"""
+        if mtime is None:
+            mtime = os.path.getmtime(self.path)
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        version = hashlib.sha256(raw).hexdigest()
+
+        compiled = self._read_cache(raw, version)
+        if compiled is None:
+            compiled = compile_taxonomy(raw)
+            self._write_cache(compiled)
+
+        self._loaded_mtime = mtime
+        return compiled
+
+    def _read_cache(self, raw: bytes, version: str) -> Optional[CompiledTaxonomy]:
+        # Plain JSON, so a tampered cache can at worst hold bad regexes, never run code
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache = json.load(f)
+            if cache['format'] != COMPILED_FORMAT_VERSION or cache['version'] != version:
+                return None
+            return CompiledTaxonomy(json.loads(raw.decode('utf-8')), version, cache['matchers'])
+        except Exception:
+            return None
+
+    def _write_cache(self, compiled: CompiledTaxonomy):
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        cache = {'format': COMPILED_FORMAT_VERSION, 'version': compiled.version,
+                 'matchers': compiled.matcher_cache}
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Could not write compiled taxonomy cache: %s", e)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def reload(self, wait: bool = False) -> threading.Thread:
+        """
+        Recompile the taxonomy file in the background and swap it in
+
+        Args:
+            wait: Block until the new version is live
+
+        Returns:
+            The background reload thread
+        """
+        thread = threading.Thread(target=self._reload, name='taxonomy-reload', daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return thread
+
+    def _reload(self):
+        with self._reload_lock:
+            mtime = None
+            try:
+                mtime = os.path.getmtime(self.path)
+                compiled = self._load(mtime)
+            except Exception as e:
+                # Keep serving the previous version if the new file is broken
+                logger.warning("Taxonomy reload failed, keeping current version: %s", e)
+                self._failed_mtime = mtime
+                return
+            self._failed_mtime = None
+            self._current = compiled
+
+    def check_for_changes(self) -> bool:
+        """Trigger a background reload if the taxonomy file changed on disk"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime != self._loaded_mtime and mtime != self._failed_mtime:
+            self.reload()
+            return True
+        return False
+
+    def watch(self, interval: float = 30.0):
+        """Poll the taxonomy file for changes on a daemon thread"""
+        if self._watcher is not None or interval <= 0:
+            return
+
+        stop = threading.Event()
+
+        def poll():
+            while not stop.wait(interval):
+                self.check_for_changes()
+
+        self._watcher = (threading.Thread(target=poll, name='taxonomy-watch', daemon=True), stop)
+        self._watcher[0].start()
+
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._watcher[1].set()
+            self._watcher = None
+
+
+taxonomy_store = TaxonomyStore(os.getenv('TAXONOMY_PATH', DEFAULT_TAXONOMY_PATH))
+
+
+def get_taxonomy() -> CompiledTaxonomy:
+    """Return the current compiled taxonomy from the default store"""
+    return taxonomy_store.get()
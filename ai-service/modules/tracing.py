@@ -0,0 +1,352 @@
+"""
+Trace spans for requests, pipeline stages and OCR pages.
+
+A request that carries a W3C ``traceparent`` header (the backend sends one
+per attempt of its retry loop) continues that trace; other requests start a
+new one, sampled at TRACE_SAMPLE_RATE. The ``TraceContext`` middleware opens
+a server span per request and code below it opens child spans:
+
+    with span('ocr.page', page=3):
+        ...
+
+``span`` is a no-op unless a sampled span is already current, so stages and
+OCR pages cost one context variable lookup when tracing is off or the
+request was not sampled. Spans follow the request into pipeline threads
+(the context is copied) but not into worker processes; with
+ANALYSIS_PROCESS_WORKERS set, a process stage shows as one span without its
+OCR pages.
+
+Finished spans are batched on a background thread and exported as OTLP/JSON
+(the format an OpenTelemetry collector accepts on /v1/traces):
+
+    TRACE_EXPORTER=file   one ExportTraceServiceRequest per line in TRACE_FILE
+    TRACE_EXPORTER=otlp   POSTed to TRACE_OTLP_ENDPOINT
+    TRACE_EXPORTER=off    no spans are recorded (the default)
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'traces', 'spans.jsonl'
+)
+TRACEPARENT = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+SERVICE_NAME = 'cv-analyzer-ai-service'
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+STATUS_ERROR = 2
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    Trace ID, parent span ID and sampled flag of a traceparent header
+
+    Returns:
+        None if the header is missing or malformed
+    """
+    match = TRACEPARENT.match((header or '').strip().lower())
+    if not match:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == '0' * 32 or parent_id == '0' * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def _new_id(nbytes: int) -> str:
+    return f'{random.getrandbits(nbytes * 8):0{nbytes * 2}x}'
+
+
+def _attribute(key: str, value: Any) -> Dict:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class Span:
+    """One timed operation of a trace"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        self.error = message
+
+    @property
+    def traceparent(self) -> str:
+        """traceparent header value naming this span as the parent"""
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    def to_otlp(self) -> Dict:
+        entry = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or time.time_ns()),
+            'attributes': [_attribute(key, value) for key, value in self.attributes.items()],
+        }
+        if self.parent_id:
+            entry['parentSpanId'] = self.parent_id
+        if self.error is not None:
+            entry['status'] = {'code': STATUS_ERROR, 'message': self.error}
+        return entry
+
+
+# Sampled span the current request or task is in, the parent of new spans
+current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('current_span', default=None)
+
+
+def export_request(spans: List[Span]) -> Dict:
+    """OTLP/JSON ExportTraceServiceRequest holding ``spans``"""
+    return {'resourceSpans': [{
+        'resource': {'attributes': [_attribute('service.name', SERVICE_NAME)]},
+        'scopeSpans': [{'scope': {'name': __name__}, 'spans': [span.to_otlp() for span in spans]}],
+    }]}
+
+
+class SpanExporter:
+    """Background thread writing finished spans in batches"""
+
+    def __init__(self, exporter: Optional[str] = None, path: Optional[str] = None,
+                 endpoint: Optional[str] = None, batch_size: int = 256, flush_interval: float = 1.0):
+        """
+        Args:
+            exporter: file, otlp or off (TRACE_EXPORTER)
+            path: JSON lines file for the file exporter (TRACE_FILE)
+            endpoint: OTLP/HTTP traces URL for the otlp exporter (TRACE_OTLP_ENDPOINT)
+            batch_size: Spans written together at most
+            flush_interval: Seconds a finished span may wait for its batch
+        """
+        self.exporter = (exporter or os.getenv('TRACE_EXPORTER', 'off')).lower()
+        self.path = path or os.getenv('TRACE_FILE', DEFAULT_TRACE_FILE)
+        self.endpoint = endpoint or os.getenv('TRACE_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {'exported': 0, 'failed': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter in ('file', 'otlp')
+
+    def submit(self, span: Span):
+        """Queue a finished span for export"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='span-exporter', daemon=True)
+                    self._thread.start()
+                    atexit.register(self.flush)
+        self._queue.put(span)
+
+    def _drain(self) -> List[Span]:
+        batch: List[Span] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Write every queued span now"""
+        batch = self._drain()
+        while batch:
+            self.write(batch)
+            batch = self._drain()
+
+    def write(self, spans: List[Span]):
+        payload = json.dumps(export_request(spans), separators=(',', ':'))
+        try:
+            if self.exporter == 'otlp':
+                request = urllib.request.Request(self.endpoint, data=payload.encode(), method='POST',
+                                                 headers={'Content-Type': 'application/json'})
+                with urllib.request.urlopen(request, timeout=5):
+                    pass
+            else:
+                with self._lock:
+                    os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                    with open(self.path, 'a', encoding='utf-8') as out:
+                        out.write(payload + '\n')
+            self._stats['exported'] += len(spans)
+        except Exception as e:
+            self._stats['failed'] += len(spans)
+            logger.warning("Could not export %d spans: %s", len(spans), e)
+
+    def stats(self) -> Dict:
+        return {'exporter': self.exporter, **self._stats}
+
+
+class Tracer:
+    """Starts spans and hands finished ones to an exporter"""
+
+    def __init__(self, exporter: Optional[SpanExporter] = None, sample_rate: Optional[float] = None):
+        """
+        Args:
+            exporter: Where finished spans go (defaults to one configured from the environment)
+            sample_rate: Share of new traces recorded when no sampled traceparent came in
+                (TRACE_SAMPLE_RATE)
+        """
+        self.exporter = exporter or SpanExporter()
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv('TRACE_SAMPLE_RATE', '1.0'))
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter.enabled
+
+    def start_root(self, name: str, traceparent: Optional[str] = None, kind: int = KIND_SERVER,
+                   attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+        """
+        First span of this service in a trace, continuing ``traceparent`` if valid
+
+        Returns:
+            None when tracing is off or the trace is not sampled
+        """
+        if not self.enabled:
+            return None
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+            if not sampled:
+                return None
+        else:
+            if random.random() >= self.sample_rate:
+                return None
+            trace_id, parent_id = _new_id(16), None
+        return Span(name, trace_id, parent_id, kind=kind, attributes=attributes)
+
+    def finish(self, span: Span):
+        span.end_ns = time.time_ns()
+        self.exporter.submit(span)
+
+    @contextmanager
+    def root(self, name: str, traceparent: Optional[str] = None,
+             **attributes) -> Iterator[Optional[Span]]:
+        """Run the block in a new root span (see ``start_root``)"""
+        root = self.start_root(name, traceparent, kind=KIND_INTERNAL, attributes=attributes)
+        if root is None:
+            yield None
+            return
+        with self.activate(root):
+            yield root
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Run the block in a child of the current span; a no-op outside a sampled trace"""
+        parent = current_span.get()
+        if parent is None:
+            yield None
+            return
+        with self.activate(Span(name, parent.trace_id, parent.span_id, attributes=attributes)) as child:
+            yield child
+
+    @contextmanager
+    def activate(self, span: Span) -> Iterator[Span]:
+        """Make ``span`` current for the block and finish it afterwards"""
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f'{type(e).__name__}: {e}')
+            raise
+        finally:
+            current_span.reset(token)
+            self.finish(span)
+
+
+TRACER = Tracer()
+
+
+def span(name: str, **attributes):
+    """Child span of the current span on the default tracer"""
+    return TRACER.span(name, **attributes)
+
+
+def current_traceparent() -> Optional[str]:
+    """traceparent to hand to work continuing the current trace elsewhere, if it is traced"""
+    active = current_span.get()
+    return active.traceparent if active is not None else None
+
+
+class TraceContext:
+    """ASGI middleware running each request in a server span"""
+
+    def __init__(self, app, tracer: Optional[Tracer] = None, exclude_paths: Tuple[str, ...] = ('/health', '/metrics')):
+        """
+        Args:
+            app: ASGI app to wrap
+            tracer: Tracer the spans are started on (defaults to TRACER)
+            exclude_paths: Paths never traced, such as probes and scrapes
+        """
+        self.app = app
+        self.tracer = tracer or TRACER
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self.tracer.enabled or scope['path'] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope['headers'])
+        attributes = {'http.method': scope['method'], 'http.target': scope['path']}
+        attempt = headers.get(b'x-retry-attempt', b'').decode('latin-1')
+        if attempt.isdigit():
+            attributes['retry.attempt'] = int(attempt)
+        server = self.tracer.start_root(
+            f"{scope['method']} {scope['path']}", headers.get(b'traceparent', b'').decode('latin-1'),
+            attributes=attributes
+        )
+        if server is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                server.set_attribute('http.status_code', message['status'])
+                if message['status'] >= 500:
+                    server.set_error(f"HTTP {message['status']}")
+            await send(message)
+
+        with self.tracer.activate(server):
+            await self.app(scope, receive, send_with_status)
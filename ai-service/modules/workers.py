@@ -0,0 +1,106 @@
+"""
+Pipeline stages that can run in worker processes.
+
+OCR and section classification are the CPU-heavy stages. Run in a process
+pool, they no longer hold the service's GIL and several resumes can be
+worked on in parallel. Each worker process builds its own OCR processor and
+section classifier the first time it needs them (or up front through
+``warm_up``, the pool initializer) and keeps them for its lifetime.
+
+Stage functions live at module level so they can be pickled to the pool.
+"""
+
+import logging
+import time
+from typing import Dict
+from modules.logs import elapsed_ms
+from modules.ocr_processor import extract_text_layer
+
+logger = logging.getLogger(__name__)
+
+MIN_TEXT_LENGTH = 50
+
+
+class InsufficientTextError(ValueError):
+    """OCR did not recover enough text to analyze"""
+
+
+# Engines of the current process, created on first use
+_engines: Dict[str, object] = {}
+
+
+def _engine(name: str):
+    engine = _engines.get(name)
+    if engine is None:
+        if name == 'ocr_processor':
+            from modules.ocr_processor import OCRProcessor
+            engine = OCRProcessor()
+        elif name == 'section_classifier':
+            from modules.section_classifier import SectionClassifier
+            engine = SectionClassifier()
+        else:
+            raise KeyError(name)
+        _engines[name] = engine
+    return engine
+
+
+def warm_up():
+    """Load the models of this worker process before the first resume arrives"""
+    _engine('ocr_processor')
+    _engine('section_classifier')
+
+
+def read_text(ocr_processor, file_path: str, ocr: bool = True) -> str:
+    """
+    Read a resume's text layer, falling back to OCR for scanned PDFs
+
+    Args:
+        ocr_processor: OCRProcessor to fall back to; unused when ``ocr`` is False
+        file_path: Path to the uploaded file
+        ocr: OCR the file when its text layer is missing or too short
+
+    Returns:
+        Extracted text
+
+    Raises:
+        InsufficientTextError: If the file yields too little text to analyze
+    """
+    start = time.perf_counter()
+    text = extract_text_layer(file_path)
+    source = "text_layer"
+    if len(text.strip()) < MIN_TEXT_LENGTH:
+        if not ocr:
+            raise InsufficientTextError(
+                "The PDF has no text layer to read. Scanned resumes need mode=standard, which falls back to OCR."
+            )
+        text = ocr_processor.extract_text(file_path)
+        source = "ocr"
+    text = check_text(text)
+    logger.debug("Text extracted", extra={"stage": "text", "source": source, "characters": len(text),
+                                          "duration_ms": elapsed_ms(start)})
+    return text
+
+
+def check_text(text: str) -> str:
+    """
+    Return ``text`` if there is enough of it to analyze
+
+    Raises:
+        InsufficientTextError: If the text is empty or too short
+    """
+    if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+        raise InsufficientTextError(
+            "Could not extract sufficient text from the file. "
+            "Please ensure the file is readable and contains text."
+        )
+    return text
+
+
+def extract_text(results: Dict) -> str:
+    """'text' stage: read the file at ``results['file_path']``, with OCR if needed"""
+    return read_text(_engine('ocr_processor'), results['file_path'])
+
+
+def classify_sections(results: Dict, zero_shot: bool = True) -> Dict:
+    """'sections' stage: classify ``results['text']`` into resume sections"""
+    return _engine('section_classifier').classify_sections(results['text'], zero_shot=zero_shot)
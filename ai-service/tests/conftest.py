@@ -0,0 +1,119 @@
+"""
+Shared fixtures for the AI service tests
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import modules.llm_cache as llm_cache_module
+from modules.llm_cache import LLMCache
+
+LLM_DELAY = 0.3
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat completions endpoint
+
+    Single-bullet prompts rewrite the bullet found after "Original:". Batched
+    prompts answer with a fenced JSON array, one item per bullet. Bullets that
+    contain "slow" never answer within the test timeouts, bullets that contain
+    "malformed" come back unchanged, and a batch containing "gibberish" gets a
+    reply that is not a list at all. Whole-resume analysis prompts get a fixed
+    review with an ats_score of 77, or prose when the resume contains "gibberish".
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['messages'][-1]['content']
+        self.server.request_count += 1
+
+        if prompt.lstrip().startswith('Analyze this resume'):
+            content = self.review(prompt)
+        else:
+            content = self.rewrite(prompt)
+
+        payload = json.dumps({
+            'id': 'chatcmpl-test',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body['model'],
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2}
+        }).encode()
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client gave up on a slow bullet
+
+    def review(self, prompt):
+        time.sleep(LLM_DELAY)
+        if 'gibberish' in prompt:
+            return "I could not read that resume."
+        review = {'strengths': ['Clear project descriptions'], 'weaknesses': ['Few metrics'],
+                  'suggestions': ['Quantify results'], 'overall_impression': 'Promising', 'ats_score': 77}
+        return f"```json\n{json.dumps(review)}\n```"
+
+    def rewrite(self, prompt):
+        single = re.search(r'Original: (.*)', prompt)
+        if single:
+            bullets = [single.group(1).strip()]
+        else:
+            batch = json.loads(prompt[prompt.index('['):prompt.rindex(']') + 1])
+            bullets = [item['text'] for item in batch]
+
+        time.sleep(5 if any('slow' in bullet for bullet in bullets) else LLM_DELAY)
+
+        if single:
+            return f"Spearheaded work: {bullets[0]}"
+        if any('gibberish' in bullet for bullet in bullets):
+            return "Sure! Here are some stronger versions of your bullets."
+        items = [{'id': index + 1,
+                  'improved': bullet if 'malformed' in bullet else f"Spearheaded work: {bullet}"}
+                 for index, bullet in enumerate(bullets)]
+        return f"```json\n{json.dumps(items)}\n```"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops bursts of concurrent connects, adding ~1s SYN retries
+    request_queue_size = 128
+    daemon_threads = True
+
+
+@pytest.fixture(scope='session', autouse=True)
+def disable_shared_llm_cache():
+    """Keep tests from reading or writing the real LLM response cache"""
+    shared = llm_cache_module.llm_cache
+    llm_cache_module.llm_cache = LLMCache(mode='off')
+    yield
+    llm_cache_module.llm_cache = shared
+
+
+@pytest.fixture(scope='session')
+def mock_llm():
+    """Running mock LLM server; ``request_count`` tallies completions served"""
+    server = MockLLMServer(('127.0.0.1', 0), MockLLMHandler)
+    server.request_count = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def mock_llm_url(mock_llm):
+    return mock_llm.url
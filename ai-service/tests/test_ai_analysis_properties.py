@@ -0,0 +1,85 @@
+"""
+Property-based tests for the deep mode AI resume review
+**Feature: smart-cv-analyzer, Property 34: AI Review Shape**
+"""
+
+import asyncio
+import os
+import tempfile
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.ai_analysis_engine import AIAnalysisEngine
+from modules.analysis_pipeline import DEEP, STANDARD, AnalysisEngines, AnalysisPipelines
+from modules.llm_cache import LLMCache
+
+RESUME = ("Jane Doe jane.doe@example.com\nEXPERIENCE\nSoftware Engineer at Acme, built Python services\n"
+          "EDUCATION\nB.S. Computer Science, State University\nSKILLS\nPython, SQL")
+
+
+@pytest.fixture
+def cache_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield os.path.join(temp_dir, 'llm_cache.sqlite3')
+
+
+@pytest.fixture
+def engine(mock_llm_url, cache_path, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_BASE_URL', mock_llm_url)
+    engine = AIAnalysisEngine()
+    engine.cache = LLMCache(cache_path, mode='readwrite')
+    return engine
+
+
+def assert_review_shape(review):
+    assert all(isinstance(review[key], list) and review[key] for key in ('strengths', 'weaknesses', 'suggestions'))
+    assert isinstance(review['overall_impression'], str)
+    assert 0 <= review['ats_score'] <= 100
+
+
+class TestAIAnalysisProperties:
+    """Property-based tests for the LLM resume review and its fallback"""
+
+    @given(text=st.text(max_size=1500), job_role=st.text(min_size=1, max_size=30))
+    @settings(max_examples=100)
+    def test_rule_based_review_always_has_the_review_shape(self, text, job_role):
+        """
+        **Feature: smart-cv-analyzer, Property 34: AI Review Shape**
+        For any text and job role, the rule-based review should have non-empty lists of
+        strengths, weaknesses and suggestions and an ATS score between 0 and 100
+        """
+        assert_review_shape(AIAnalysisEngine().rule_based_analysis(text, job_role))
+
+    @given(content=st.text(max_size=200))
+    @settings(max_examples=100)
+    def test_unusable_model_output_is_rejected(self, content):
+        """
+        **Feature: smart-cv-analyzer, Property 34: AI Review Shape**
+        For any model output, the parsed review should be None or have the review shape
+        """
+        review = AIAnalysisEngine()._parse_response(content)
+        assert review is None or (0 <= review['ats_score'] <= 100)
+
+    def test_reviews_come_from_the_model_and_are_cached(self, engine, mock_llm):
+        """The model's review is used, and the same resume is not sent twice"""
+        first = asyncio.run(engine.analyze_async(RESUME, 'Software Engineer'))
+        before = mock_llm.request_count
+        second = asyncio.run(engine.analyze_async(RESUME, 'Software Engineer'))
+
+        assert first['ats_score'] == 77
+        assert second == first
+        assert mock_llm.request_count == before
+
+    def test_unreadable_review_falls_back_to_rules(self, engine):
+        """Prose instead of JSON gives the rule-based review, which is not cached"""
+        review = asyncio.run(engine.analyze_async(RESUME + '\ngibberish', 'Software Engineer'))
+
+        assert review == engine.rule_based_analysis(RESUME + '\ngibberish', 'Software Engineer')
+        assert engine.cache.stats()['writes'] == 0
+
+    def test_only_deep_mode_reviews(self):
+        """The ai_analysis stage belongs to deep mode alone"""
+        pipelines = AnalysisPipelines(AnalysisEngines(load_models=False))
+        assert 'ai_analysis' in pipelines.get(DEEP).stages
+        assert 'ai_analysis' not in pipelines.get(STANDARD).stages
+        assert 'ai_analysis' not in pipelines.get(DEEP, fields=('overallScore',)).stages
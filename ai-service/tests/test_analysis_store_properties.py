@@ -0,0 +1,73 @@
+"""
+Property-based tests for on-demand enhancement storage
+**Feature: smart-cv-analyzer, Property 14: Enhancement Memoization**
+"""
+
+import asyncio
+import time
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.analysis_store import AnalysisStore
+
+SECTIONS = {'experience': '• worked on the reporting pipeline for the finance team', 'projects': ''}
+
+
+class TestAnalysisStoreProperties:
+    """Property-based tests for the analysis store"""
+
+    @given(requests=st.integers(min_value=1, max_value=20))
+    @settings(max_examples=20, deadline=None)
+    def test_enhancements_computed_once(self, requests):
+        """
+        **Feature: smart-cv-analyzer, Property 14: Enhancement Memoization**
+        For any number of concurrent requests for the same analysis, enhancements should be
+        computed exactly once and every request should get the same result
+        """
+        store = AnalysisStore()
+        analysis_id = store.create(SECTIONS, 'Software Engineer')
+        calls = []
+
+        async def compute(sections):
+            calls.append(sections)
+            await asyncio.sleep(0.01)
+            return [{'original': 'a', 'improved': 'b', 'section': 'experience'}]
+
+        async def run():
+            return await asyncio.gather(*(store.get_enhancements(analysis_id, compute)
+                                          for _ in range(requests)))
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert calls[0] is SECTIONS
+        assert all(result == results[0] for result in results)
+
+    def test_unknown_id_returns_none(self):
+        """Unknown IDs should not trigger computation"""
+        store = AnalysisStore()
+
+        async def compute(sections):
+            raise AssertionError("compute should not run")
+
+        assert asyncio.run(store.get_enhancements('missing', compute)) is None
+
+    def test_expired_analyses_are_dropped(self):
+        """Analyses older than the TTL should no longer be served"""
+        store = AnalysisStore(ttl=0.1)
+        analysis_id = store.create(SECTIONS, 'Software Engineer')
+        assert store.get(analysis_id) is not None
+
+        time.sleep(0.2)
+        assert store.get(analysis_id) is None
+
+    def test_store_is_bounded(self):
+        """Past max_entries the least recently used analysis should be evicted"""
+        store = AnalysisStore(max_entries=2)
+        first = store.create(SECTIONS, 'A')
+        second = store.create(SECTIONS, 'B')
+        store.get(first)
+        third = store.create(SECTIONS, 'C')
+
+        assert len(store) == 2
+        assert store.get(second) is None
+        assert store.get(first) is not None and store.get(third) is not None
@@ -0,0 +1,138 @@
+"""
+Property-based tests for the offline batch CLI
+**Feature: smart-cv-analyzer, Property 22: Batch Checkpoint Resume**
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.batch import discover_inputs, parquet_row, run_batch, PARQUET_JSON_COLUMNS, PARQUET_SCALAR_COLUMNS
+
+RESUME_TEXT = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           'Mahendra-Reddy-Resume.txt')
+
+
+@pytest.fixture
+def work_dir():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as log:
+        return [json.loads(line) for line in log]
+
+
+class TestBatchProperties:
+    """Property-based tests for checkpointed batch analysis"""
+
+    @given(
+        file_count=st.integers(min_value=1, max_value=20),
+        interruptions=st.lists(st.integers(min_value=0, max_value=20), max_size=3),
+        torn_line=st.booleans()
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_resumed_runs_record_each_file_once(self, file_count, interruptions, torn_line):
+        """
+        **Feature: smart-cv-analyzer, Property 22: Batch Checkpoint Resume**
+        For any points at which runs are interrupted, resuming until done should record
+        every input exactly once, even if an interrupted run left half a line behind
+        """
+        inputs = [f'resume_{index}.pdf' for index in range(file_count)]
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.jsonl')
+
+            for stop_after in interruptions:
+                calls = []
+
+                def analyze(path):
+                    if len(calls) == stop_after:
+                        raise KeyboardInterrupt
+                    calls.append(path)
+                    return {'path': path, 'status': 'ok' if len(path) % 2 else 'error'}
+
+                report = run_batch(inputs, output, 'Engineer', workers=0, resume=True, analyze=analyze)
+                assert report['processed'] == len(calls)
+                if torn_line:
+                    with open(output, 'a', encoding='utf-8') as log:
+                        log.write('{"path": "resume_')
+
+            report = run_batch(inputs, output, 'Engineer', workers=0, resume=True,
+                               analyze=lambda path: {'path': path, 'status': 'ok'})
+            assert not report['interrupted']
+            assert report['skipped'] + report['processed'] == file_count
+            assert sorted(record['path'] for record in read_records(output)) == sorted(inputs)
+
+    def test_existing_output_needs_resume(self, work_dir):
+        """A finished run should not be overwritten by accident"""
+        output = os.path.join(work_dir, 'results.jsonl')
+        run_batch(['a.pdf'], output, 'Engineer', workers=0, analyze=lambda path: {'path': path, 'status': 'ok'})
+        with pytest.raises(FileExistsError):
+            run_batch(['a.pdf'], output, 'Engineer', workers=0, analyze=lambda path: {'path': path, 'status': 'ok'})
+
+    def test_resume_retries_failed_files(self, work_dir):
+        """Failed files are analyzed again on resume and replace their error records"""
+        output = os.path.join(work_dir, 'results.jsonl')
+        run_batch(['a.pdf', 'b.pdf'], output, 'Engineer', workers=0,
+                  analyze=lambda path: {'path': path, 'status': 'ok' if path == 'a.pdf' else 'error'})
+
+        report = run_batch(['a.pdf', 'b.pdf'], output, 'Engineer', workers=0, resume=True,
+                           analyze=lambda path: {'path': path, 'status': 'ok'})
+
+        assert (report['skipped'], report['processed']) == (1, 1)
+        assert [(record['path'], record['status']) for record in read_records(output)] == [
+            ('a.pdf', 'ok'), ('b.pdf', 'ok')]
+
+    def test_finished_parquet_needs_overwrite(self, work_dir):
+        """A finished Parquet output has no checkpoint left, so resuming it is refused too"""
+        output = os.path.join(work_dir, 'results.parquet')
+        open(output, 'wb').close()
+        for resume in (False, True):
+            with pytest.raises(FileExistsError):
+                run_batch(['a.pdf'], output, 'Engineer', workers=0, resume=resume,
+                          analyze=lambda path: {'path': path, 'status': 'ok'})
+
+        jsonl = os.path.join(work_dir, 'results.jsonl')
+        run_batch(['a.pdf'], jsonl, 'Engineer', workers=0, analyze=lambda path: {'path': path, 'status': 'ok'})
+        run_batch(['b.pdf'], jsonl, 'Engineer', workers=0, overwrite=True,
+                  analyze=lambda path: {'path': path, 'status': 'ok'})
+        assert [record['path'] for record in read_records(jsonl)] == ['b.pdf']
+
+    def test_discover_inputs(self, work_dir):
+        """Directories are searched recursively for PDFs and texts, in a stable order"""
+        for name in ('b.pdf', 'a.TXT', 'notes.md', os.path.join('nested', 'c.pdf')):
+            path = os.path.join(work_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'w').close()
+
+        found = discover_inputs([work_dir, os.path.join(work_dir, 'b.pdf')])
+        assert [os.path.relpath(path, work_dir) for path in found] == ['a.TXT', 'b.pdf', os.path.join('nested', 'c.pdf')]
+        with pytest.raises(FileNotFoundError):
+            discover_inputs([os.path.join(work_dir, 'missing')])
+
+    def test_parquet_rows_have_fixed_columns(self):
+        """Successful and failed records flatten to the same columns"""
+        ok = parquet_row({'path': 'a.pdf', 'status': 'ok', 'overallScore': 70, 'durationMs': 1.0,
+                          'sections': {'skills': 'Python'}, 'issues': []})
+        failed = parquet_row({'path': 'b.pdf', 'status': 'error', 'error': 'unreadable', 'durationMs': 1.0})
+        assert list(ok) == list(failed) == list(PARQUET_SCALAR_COLUMNS + PARQUET_JSON_COLUMNS)
+        assert json.loads(ok['sections']) == {'skills': 'Python'}
+        assert failed['sections'] is None
+
+    def test_worker_pool_analyzes_text_files(self, work_dir):
+        """Worker processes should run the real pipeline and isolate per-file failures"""
+        shutil.copy(RESUME_TEXT, os.path.join(work_dir, 'resume.txt'))
+        with open(os.path.join(work_dir, 'short.txt'), 'w') as short:
+            short.write('Too short')
+        output = os.path.join(work_dir, 'results.jsonl')
+
+        report = run_batch(discover_inputs([work_dir]), output, 'Software Engineer', workers=1)
+
+        assert (report['succeeded'], report['failed']) == (1, 1)
+        records = {os.path.basename(record['path']): record for record in read_records(output)}
+        assert 0 <= records['resume.txt']['overallScore'] <= 100
+        assert 'sufficient text' in records['short.txt']['error']
+        assert 'sections' in report['stageMeanMs']
@@ -0,0 +1,140 @@
+"""
+Property-based tests for bulk resume analysis
+**Feature: smart-cv-analyzer, Property 21: Bulk Failure Isolation**
+"""
+
+import asyncio
+import io
+import os
+import zipfile
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.bulk import BulkFileError, BulkItem, analyze_items, archive_items
+from modules.ingest import NotPDFError
+
+
+def make_archive(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, content in members:
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return zipfile.ZipFile(buffer)
+
+
+async def collect(items, analyze, concurrency):
+    return [line async for line in analyze_items(items, analyze, concurrency)]
+
+
+class TestBulkProperties:
+    """Property-based tests for bulk analysis fan-out"""
+
+    @given(
+        kinds=st.lists(st.sampled_from(['ok', 'not_pdf', 'unreadable', 'analysis_error']), min_size=1, max_size=30),
+        concurrency=st.integers(min_value=1, max_value=6)
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_each_file_gets_its_own_line(self, kinds, concurrency):
+        """
+        **Feature: smart-cv-analyzer, Property 21: Bulk Failure Isolation**
+        For any mix of good and broken files, each file should get exactly one line, failures
+        should only affect their own file, and no more than ``concurrency`` files should be in flight
+        """
+        in_flight = [0, 0]
+
+        def reader(kind):
+            def read():
+                if kind == 'unreadable':
+                    raise BulkFileError("unreadable")
+                return b'hello' if kind == 'not_pdf' else b'%PDF-1.4 ' + kind.encode()
+            return read
+
+        async def analyze(item, content):
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            try:
+                if not content.startswith(b'%PDF-'):
+                    raise NotPDFError(f"{item.name} is not a PDF file")
+                await asyncio.sleep(0.001 * (item.index % 3))
+                if content.endswith(b'analysis_error'):
+                    raise RuntimeError("model crashed")
+                return {'overallScore': item.index}
+            finally:
+                in_flight[0] -= 1
+
+        items = [BulkItem(index, f'{index}.pdf', reader(kind)) for index, kind in enumerate(kinds)]
+        lines = asyncio.run(collect(items, analyze, concurrency))
+
+        assert sorted(line['index'] for line in lines) == list(range(len(kinds)))
+        assert in_flight[1] <= concurrency
+        for line in lines:
+            expected = kinds[line['index']]
+            assert line['fileName'] == f"{line['index']}.pdf"
+            if expected == 'ok':
+                assert line['status'] == 'ok' and line['overallScore'] == line['index']
+            else:
+                assert line['status'] == 'error' and line['error']
+
+    def test_archive_members_are_read_lazily(self):
+        """Members should only be read when their turn comes, at most ``concurrency`` at a time"""
+        archive = make_archive([(f'{index}.pdf', b'%PDF-1.4') for index in range(10)])
+        reads = []
+        finished = [0]
+
+        def track(item):
+            def read():
+                reads.append(item.index)
+                return item.read()
+            return item._replace(read=read)
+
+        async def analyze(item, content):
+            # Two files are running, so at most two have been spooled
+            assert len(reads) - finished[0] <= 2
+            await asyncio.sleep(0.001)
+            os.remove(content.path)
+            finished[0] += 1
+            return {}
+
+        lines = asyncio.run(collect((track(item) for item in archive_items(archive, 1024)), analyze, 2))
+        assert len(lines) == 10 and all(line['status'] == 'ok' for line in lines)
+
+    def test_oversized_and_skipped_members(self):
+        """Oversized members should fail on their own; directories and macOS metadata are skipped"""
+        archive = make_archive([
+            ('big.pdf', b'%PDF-1.4' + b'x' * 100),
+            ('folder/', b''),
+            ('__MACOSX/._small.pdf', b'meta'),
+            ('folder/small.pdf', b'%PDF-1.4'),
+        ])
+        items = list(archive_items(archive, 50, start=2))
+        assert [(item.index, item.name) for item in items] == [(2, 'big.pdf'), (3, 'folder/small.pdf')]
+
+        with pytest.raises(BulkFileError, match="larger than"):
+            items[0].read()
+        upload = items[1].read()
+        with open(upload.path, 'rb') as spooled:
+            assert spooled.read() == b'%PDF-1.4'
+        os.remove(upload.path)
+
+    def test_cancelled_stream_stops_pending_files(self):
+        """Closing the stream early should cancel files still being analyzed"""
+        cancelled = []
+
+        async def analyze(item, content):
+            try:
+                await asyncio.sleep(0 if item.index == 0 else 10)
+            except asyncio.CancelledError:
+                cancelled.append(item.index)
+                raise
+            return {}
+
+        async def scenario():
+            items = [BulkItem(index, f'{index}.pdf', lambda: b'%PDF-1.4') for index in range(3)]
+            stream = analyze_items(items, analyze, 3)
+            first = await stream.__anext__()
+            await stream.aclose()
+            await asyncio.sleep(0)
+            return first
+
+        assert asyncio.run(scenario())['index'] == 0
+        assert sorted(cancelled) == [1, 2]
@@ -0,0 +1,104 @@
+"""
+Property-based tests for bullet point tokenization
+**Feature: smart-cv-analyzer, Property 13: Bullet Tokenization Uniqueness**
+"""
+
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.bullet_tokenizer import tokenize_bullets
+from modules.enhancement_engine import EnhancementEngine
+
+# Lowercase words so every generated bullet reads as one sentence
+sentence = st.lists(st.text(alphabet='abcdefghijklmnop', min_size=2, max_size=9),
+                    min_size=4, max_size=10).map(' '.join)
+markers = st.sampled_from(['•', '-', '*', '◦'])
+
+
+class TestBulletTokenizerProperties:
+    """Property-based tests for the single-pass bullet tokenizer"""
+
+    @given(
+        bullets=st.lists(sentence, min_size=1, max_size=15),
+        marker=markers,
+        repeat=st.booleans()
+    )
+    @settings(max_examples=100)
+    def test_each_bullet_returned_once(self, bullets, marker, repeat):
+        """
+        **Feature: smart-cv-analyzer, Property 13: Bullet Tokenization Uniqueness**
+        For any marked list, every bullet long enough to keep should come back exactly once,
+        in source order, without its marker
+        """
+        lines = [f"{marker} {bullet}" for bullet in bullets]
+        if repeat:
+            lines += lines
+        text = 'Experience\n' + '\n'.join(lines)
+
+        expected = list(dict.fromkeys(bullet for bullet in bullets if len(bullet) > 20))
+        assert [bullet.text for bullet in tokenize_bullets(text)] == expected
+
+    @given(
+        bullets=st.lists(st.tuples(sentence, st.lists(sentence, max_size=2)), min_size=1, max_size=8),
+        indent=st.sampled_from(['', '  ', '\t'])
+    )
+    @settings(max_examples=100)
+    def test_continuation_lines_join_their_bullet(self, bullets, indent):
+        """Wrapped lines should be joined onto their bullet, and the span should cover all of them"""
+        text = '\n'.join(
+            '\n'.join([f"• {first}"] + [f"{indent}{line}" for line in wrapped])
+            for first, wrapped in bullets
+        )
+
+        for bullet in tokenize_bullets(text):
+            assert ' '.join(text[bullet.start:bullet.end].split()) == bullet.text
+
+        expected = list(dict.fromkeys(
+            joined for joined in (' '.join([first] + wrapped) for first, wrapped in bullets)
+            if len(joined) > 20
+        ))
+        assert [bullet.text for bullet in tokenize_bullets(text)] == expected
+
+    def test_lines_without_markers_stand_alone(self):
+        """Lines outside a marked bullet should not merge with each other"""
+        text = (
+            "Software Engineer, Acme Corp 2020-2022\n"
+            "Built the deployment scripts for every staging service\n"
+            "-5% churn after redesigning the onboarding flow\n"
+            "\n"
+            "• developed a full-stack dashboard for the analytics team\n"
+            "\n"
+            "Maintained the release calendar for four product teams"
+        )
+
+        assert [bullet.text for bullet in tokenize_bullets(text)] == [
+            "Software Engineer, Acme Corp 2020-2022",
+            "Built the deployment scripts for every staging service",
+            "-5% churn after redesigning the onboarding flow",
+            "developed a full-stack dashboard for the analytics team",
+            "Maintained the release calendar for four product teams"
+        ]
+
+    def test_wrapped_lines_join_whatever_they_start_with(self):
+        """A wrapped line starting with a digit, capital or punctuation still belongs to its bullet"""
+        text = (
+            "• Used Python to \n000000000000000000000\n"
+            "• Migrated the billing service to\nAWS Lambda and DynamoDB\n"
+            "• Cut build times\n(40%) with remote caching\n"
+            "Projects\n"
+            "• Resume analyzer for recruiting teams"
+        )
+
+        assert [bullet.text for bullet in tokenize_bullets(text)] == [
+            "Used Python to 000000000000000000000",
+            "Migrated the billing service to AWS Lambda and DynamoDB",
+            "Cut build times (40%) with remote caching",
+            "Resume analyzer for recruiting teams"
+        ]
+
+    def test_engine_enhances_each_bullet_once(self):
+        """Bullets repeated within and across sections should reach the enhancer once"""
+        engine = EnhancementEngine()
+        bullet = "worked on the reporting pipeline for the finance team"
+        sections = {'projects': f"• {bullet}", 'experience': f"• {bullet}\n- {bullet}"}
+
+        assert engine._extract_bullet_points(sections) == [bullet]
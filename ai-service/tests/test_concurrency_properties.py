@@ -0,0 +1,126 @@
+"""
+Property-based tests for calling the analysis engines from many threads
+**Feature: smart-cv-analyzer, Property 17: Concurrent Engine Determinism**
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.section_classifier import SectionClassifier
+from modules.scoring_engine import ScoringEngine
+from modules.keyword_analyzer import KeywordAnalyzer
+from modules.recommendation_engine import RecommendationEngine
+from modules.enhancement_engine import EnhancementEngine
+from modules.resume_generator import ResumeGenerator
+
+THREADS = 8
+CALLS = 32
+
+WORDS = ['python', 'react', 'docker', 'aws', 'sql', 'led', 'team', 'built', 'api', 'users',
+         'managed', 'developed', 'improved', 'data', 'machine', 'learning', '40%', 'was', 'responsible']
+
+JOB_ROLES = ['Software Engineer', 'Data Scientist', 'Frontend Developer', 'Product Manager', 'Chef']
+
+
+@st.composite
+def resume_texts(draw):
+    """Resume-like text with contact details, headers and bullet points"""
+    def line():
+        return ' '.join(draw(st.lists(st.sampled_from(WORDS), min_size=4, max_size=12)))
+
+    experience = '\n'.join(f"• {line().capitalize()}" for _ in range(draw(st.integers(1, 4))))
+    projects = '\n'.join(f"- {line().capitalize()}" for _ in range(draw(st.integers(1, 3))))
+    skills = ', '.join(draw(st.lists(st.sampled_from(WORDS[:5]), min_size=1, max_size=5, unique=True)))
+    return (
+        "Jane Doe\njane.doe@example.com\n(555) 123-4567\n\n"
+        f"EDUCATION\nBachelor of Science in Computer Science, State University\n\n"
+        f"SKILLS\n{skills}\n\n"
+        f"EXPERIENCE\n{experience}\n\n"
+        f"PROJECTS\n{projects}\n"
+    )
+
+
+def hammer(fn, *args):
+    """Results of calling fn(*args) CALLS times from THREADS threads at once"""
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        futures = [pool.submit(fn, *args) for _ in range(CALLS)]
+        return [future.result() for future in futures]
+
+
+class TestConcurrencyProperties:
+    """Property-based tests for engines shared between requests"""
+
+    @classmethod
+    def setup_class(cls):
+        """Set up engines once, as main.py shares one instance of each"""
+        cls.section_classifier = SectionClassifier()
+        cls.scoring_engine = ScoringEngine()
+        cls.keyword_analyzer = KeywordAnalyzer()
+        cls.recommendation_engine = RecommendationEngine()
+        cls.enhancement_engine = EnhancementEngine()
+        # Rule-based rewrites only; the outcome of API calls is not deterministic
+        cls.enhancement_engine.client = None
+        cls.enhancement_engine.async_client = None
+        cls.resume_generator = ResumeGenerator()
+
+    @given(text=resume_texts(), job_role=st.sampled_from(JOB_ROLES))
+    @settings(max_examples=15, deadline=None)
+    def test_concurrent_calls_match_sequential(self, text, job_role):
+        """
+        **Feature: smart-cv-analyzer, Property 17: Concurrent Engine Determinism**
+        For any resume, calling each shared engine from many threads at once should give
+        exactly the result of a single sequential call
+        """
+        sections = self.section_classifier.classify_sections(text)
+        assert hammer(self.section_classifier.classify_sections, text) == [sections] * CALLS
+
+        score = self.scoring_engine.calculate_score(sections, job_role)
+        assert hammer(self.scoring_engine.calculate_score, sections, job_role) == [score] * CALLS
+
+        keywords = self.keyword_analyzer.analyze_keywords(sections, job_role)
+        assert hammer(self.keyword_analyzer.analyze_keywords, sections, job_role) == [keywords] * CALLS
+
+        recommendations = self.recommendation_engine.generate_recommendations(sections, score)
+        assert hammer(self.recommendation_engine.generate_recommendations, sections, score) == \
+            [recommendations] * CALLS
+
+        enhancements = self.enhancement_engine.enhance_content(sections)
+        assert hammer(self.enhancement_engine.enhance_content, sections) == [enhancements] * CALLS
+
+    @given(
+        first=st.lists(st.sampled_from(WORDS), min_size=3, max_size=30).map(' '.join),
+        second=st.lists(st.sampled_from(WORDS), min_size=3, max_size=30).map(' '.join)
+    )
+    @settings(max_examples=20, deadline=None)
+    def test_semantic_similarity_is_per_call(self, first, second):
+        """
+        **Feature: smart-cv-analyzer, Property 17: Concurrent Engine Determinism**
+        For any pairs of documents compared at the same time, each similarity should only
+        depend on its own pair
+        """
+        pairs = [(first, second), (second, first), (first, first), (second, WORDS[0])]
+        expected = [self.keyword_analyzer.calculate_semantic_similarity(*pair) for pair in pairs]
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            futures = [(index, pool.submit(self.keyword_analyzer.calculate_semantic_similarity, *pairs[index]))
+                       for index in range(len(pairs)) for _ in range(CALLS // len(pairs))]
+            for index, future in futures:
+                assert future.result() == expected[index]
+
+    def test_concurrent_resume_generation(self):
+        """
+        **Feature: smart-cv-analyzer, Property 17: Concurrent Engine Determinism**
+        Generating PDFs from many threads with the shared styles should produce a valid
+        document every time
+        """
+        text = (
+            "Jane Doe\njane.doe@example.com\n\nSKILLS\npython, sql\n\n"
+            "EXPERIENCE\n• Developed data api used by 2000 users\n• Led team of five engineers\n"
+        )
+        sections = self.section_classifier.classify_sections(text)
+        analysis = {
+            'sections': sections,
+            'enhancements': self.enhancement_engine.enhance_content(sections),
+        }
+        pdfs = hammer(self.resume_generator.generate_ats_optimized_resume, analysis)
+        assert all(pdf.startswith(b'%PDF') for pdf in pdfs)
@@ -0,0 +1,131 @@
+"""
+Property-based tests for response encoding and the compact schema
+**Feature: smart-cv-analyzer, Property 33: Compact Response Round Trip**
+"""
+
+import asyncio
+import gzip
+import json
+import zlib
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from hypothesis import given, strategies as st, settings
+from modules.analysis_pipeline import compact_response
+from modules.encoding import Compression, FastJSONResponse, accepted_encodings, choose_encoding, dumps
+
+json_values = st.recursive(
+    st.one_of(st.none(), st.booleans(), st.integers(min_value=-2 ** 63, max_value=2 ** 63 - 1),
+              st.floats(allow_nan=False, allow_infinity=False), st.text()),
+    lambda children: st.lists(children, max_size=4) | st.dictionaries(st.text(max_size=8), children, max_size=4),
+    max_leaves=20
+)
+
+
+def compressed_app():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(Compression, minimum_size=100)
+
+    @app.get('/big')
+    async def big():
+        return {'text': 'resume text ' * 200}
+
+    @app.get('/small')
+    async def small():
+        return {'ok': True}
+
+    return app
+
+
+class TestEncodingProperties:
+    """Property-based tests for JSON encoding, compression and compact responses"""
+
+    @given(text=st.text(min_size=1, max_size=200), data=st.data(),
+           other=st.text(alphabet='é中', min_size=1, max_size=5))
+    @settings(max_examples=100)
+    def test_compact_sections_slice_back_to_the_text(self, text, data, other):
+        """
+        **Feature: smart-cv-analyzer, Property 33: Compact Response Round Trip**
+        For any text and sections, every section turned into offsets should slice back
+        out of parsedText unchanged, and sections not in the text should stay as text
+        """
+        start = data.draw(st.integers(min_value=0, max_value=len(text) - 1))
+        end = data.draw(st.integers(min_value=start + 1, max_value=len(text)))
+        missing = other + '\x00'
+        response = {
+            'parsedText': text,
+            'sections': {'raw': text, 'education': text[start:end], 'projects': missing, 'experience': '',
+                         'skills': ['Python'], 'contactInfo': {'email': 'a@b.co'}},
+            'suggestedKeywords': ['sql'],
+            'keywordAnalysis': {'missing_keywords': ['sql']},
+        }
+
+        compact = compact_response(response)
+
+        assert compact['schema'] == 'compact'
+        assert 'suggestedKeywords' not in compact
+        for name in ('raw', 'education'):
+            offsets = compact['sections'][name]
+            assert text[offsets['start']:offsets['end']] == response['sections'][name]
+        for name in ('projects', 'experience', 'skills', 'contactInfo'):
+            assert compact['sections'][name] == response['sections'][name]
+        assert response['sections']['raw'] == text
+
+    @given(value=st.dictionaries(st.text(max_size=8), json_values, max_size=5))
+    @settings(max_examples=100)
+    def test_dumps_is_json(self, value):
+        """
+        **Feature: smart-cv-analyzer, Property 33: Compact Response Round Trip**
+        For any JSON value, the fast encoder should give compact UTF-8 JSON of the same value
+        """
+        assert json.loads(dumps(value)) == value
+
+    @given(header=st.lists(st.sampled_from(['gzip', 'br', 'deflate', 'identity', '*', 'gzip;q=0', 'br;q=0']),
+                           max_size=4))
+    @settings(max_examples=100)
+    def test_refused_encodings_are_never_chosen(self, header):
+        """
+        **Feature: smart-cv-analyzer, Property 33: Compact Response Round Trip**
+        For any Accept-Encoding header, the chosen coding should be one the client accepts
+        """
+        value = ', '.join(header)
+        chosen = choose_encoding(value)
+        codings = accepted_encodings(value)
+        assert chosen is None or chosen in codings or '*' in codings
+        if chosen is None:
+            assert 'gzip' not in codings and '*' not in codings
+
+    def test_large_json_is_gzipped_and_small_is_not(self):
+        """Responses over the minimum size are compressed for clients accepting gzip"""
+        client = TestClient(compressed_app())
+        response = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['content-encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['vary']
+        assert response.json() == {'text': 'resume text ' * 200}
+
+        assert 'content-encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+        assert 'content-encoding' not in client.get('/big', headers={'Accept-Encoding': 'identity'}).headers
+
+    def test_streamed_lines_can_be_decoded_as_they_arrive(self):
+        """Each NDJSON chunk is flushed, so a client can decode it before the stream ends"""
+        async def stream(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 200,
+                        'headers': [(b'content-type', b'application/x-ndjson')]})
+            for index in range(3):
+                await send({'type': 'http.response.body', 'body': dumps({'index': index}) + b'\n',
+                            'more_body': True})
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {'type': 'http', 'headers': [(b'accept-encoding', b'gzip')]}
+        asyncio.run(Compression(stream, minimum_size=100)(scope, None, send))
+
+        start, *bodies = messages
+        assert dict(start['headers'])[b'content-encoding'] == b'gzip'
+        decoder = zlib.decompressobj(31)
+        decoded = [decoder.decompress(message['body']) for message in bodies]
+        assert [json.loads(chunk)['index'] for chunk in decoded[:3]] == [0, 1, 2]
+        assert gzip.decompress(b''.join(message['body'] for message in bodies)).count(b'\n') == 3
@@ -0,0 +1,133 @@
+"""
+Property-based tests for batched content enhancement
+**Feature: smart-cv-analyzer, Property 11: Batch Response Parsing Robustness**
+"""
+
+import asyncio
+import json
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.enhancement_engine import EnhancementEngine
+
+
+@pytest.fixture
+def engine(mock_llm_url, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_BASE_URL', mock_llm_url)
+    return EnhancementEngine()
+
+
+def make_sections(bullets):
+    return {
+        'contactInfo': {'name': 'Test User', 'email': 'test@example.com'},
+        'education': 'Bachelor of Science',
+        'skills': ['Python', 'SQL', 'Docker'],
+        'experience': '\n'.join(f"• {bullet}" for bullet in bullets),
+        'projects': '',
+        'certifications': '',
+        'raw': '\n'.join(bullets)
+    }
+
+
+class TestEnhancementBatchingProperties:
+    """Property-based tests for multi-bullet enhancement prompts"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.parser = EnhancementEngine()
+        self.bullets = [
+            "worked on the reporting pipeline for the finance team",
+            "helped with the migration of legacy billing services",
+            "responsible for code reviews across three repositories"
+        ]
+
+    def test_batching_reduces_request_count(self, engine, mock_llm):
+        """Twelve bullets with a batch size of five should need three requests, not twelve"""
+        bullets = [f"worked on the reporting pipeline for team number {i}" for i in range(12)]
+        before = mock_llm.request_count
+
+        enhancements = asyncio.run(engine.enhance_content_async(make_sections(bullets), batch_size=5))
+
+        assert mock_llm.request_count - before == 3
+        improved = {e['original']: e['improved'] for e in enhancements}
+        assert all(improved[bullet] == f"Spearheaded work: {bullet}" for bullet in bullets)
+
+    def test_sync_batches_use_the_model_output(self, engine, mock_llm):
+        """The synchronous path should batch through the OpenAI client and keep its rewrites"""
+        bullets = [f"worked on the invoice export for customer region {i}" for i in range(7)]
+        before = mock_llm.request_count
+
+        enhancements = engine.enhance_content(make_sections(bullets), batch_size=5)
+
+        assert mock_llm.request_count - before == 2
+        improved = {e['original']: e['improved'] for e in enhancements}
+        assert all(improved[bullet] == f"Spearheaded work: {bullet}" for bullet in bullets)
+
+        single = engine.enhance_content(make_sections(["worked on the audit log retention policy"]), batch_size=1)
+        assert single[0]['improved'] == "Spearheaded work: worked on the audit log retention policy"
+
+    def test_malformed_items_fall_back_individually(self, engine):
+        """An unusable item should only cost that bullet its AI rewrite"""
+        good = "worked on the search indexing job for every shard"
+        bad = "worked on a malformed export for the data warehouse"
+
+        enhancements = asyncio.run(engine.enhance_content_async(make_sections([good, bad]), batch_size=5))
+
+        improved = {e['original']: e['improved'] for e in enhancements}
+        assert improved[good] == f"Spearheaded work: {good}"
+        assert improved[bad] == engine._rule_based_enhance(bad)
+
+    def test_unparseable_batch_falls_back_to_rules(self, engine):
+        """A reply with no list in it should give every bullet in the batch the rule-based rewrite"""
+        bullets = ["worked on gibberish detection for the support inbox",
+                   "worked on the onboarding checklist for new hires"]
+
+        enhancements = asyncio.run(engine.enhance_content_async(make_sections(bullets), batch_size=5))
+
+        improved = {e['original']: e['improved'] for e in enhancements}
+        assert all(improved[bullet] == engine._rule_based_enhance(bullet) for bullet in bullets)
+
+    @given(
+        shape=st.sampled_from(['strings', 'objects', 'wrapped', 'numbered']),
+        fenced=st.booleans(),
+        drop=st.sets(st.integers(min_value=0, max_value=2), max_size=2)
+    )
+    @settings(max_examples=100)
+    def test_parse_batch_response_shapes(self, shape, fenced, drop):
+        """
+        **Feature: smart-cv-analyzer, Property 11: Batch Response Parsing Robustness**
+        For any common reply shape, with or without code fences and with items missing,
+        parsing should return one slot per bullet: the rewrite where present, None elsewhere
+        """
+        rewrites = {index: f"Delivered stronger work: {bullet}" for index, bullet in enumerate(self.bullets)
+                    if index not in drop}
+
+        if shape == 'strings':
+            # Missing items become blanks so positions still line up
+            content = json.dumps([rewrites.get(index, '') for index in range(len(self.bullets))])
+        elif shape == 'objects':
+            content = json.dumps([{'id': index + 1, 'improved': text} for index, text in rewrites.items()])
+        elif shape == 'wrapped':
+            content = json.dumps({'bullets': [{'id': index + 1, 'improved': text}
+                                              for index, text in rewrites.items()]})
+        else:
+            content = '\n'.join(f"{index + 1}. {text}" for index, text in rewrites.items())
+
+        if fenced:
+            content = f"Here you go:\n```json\n{content}\n```"
+
+        results = self.parser._parse_batch_response(content, self.bullets)
+
+        assert len(results) == len(self.bullets)
+        for index in range(len(self.bullets)):
+            assert results[index] == rewrites.get(index)
+
+    @given(content=st.text(max_size=200))
+    @settings(max_examples=100)
+    def test_parse_batch_response_never_raises(self, content):
+        """Arbitrary model output should parse to one slot per bullet without raising"""
+        results = self.parser._parse_batch_response(content, self.bullets)
+
+        assert len(results) == len(self.bullets)
+        for result, bullet in zip(results, self.bullets):
+            assert result is None or (len(result) > 20 and result != bullet)
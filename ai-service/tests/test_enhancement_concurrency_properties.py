@@ -0,0 +1,107 @@
+"""
+Property-based tests for concurrent content enhancement
+**Feature: smart-cv-analyzer, Property 10: Concurrent Enhancement Fallback**
+"""
+
+import asyncio
+import time
+import pytest
+from hypothesis import given, strategies as st, settings, HealthCheck
+from modules.enhancement_engine import EnhancementEngine
+
+LLM_DELAY = 0.3  # Response delay of the mock server in conftest.py
+
+
+@pytest.fixture
+def engine(mock_llm_url, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_BASE_URL', mock_llm_url)
+    monkeypatch.setenv('ENHANCEMENT_BATCH_SIZE', '1')
+    return EnhancementEngine()
+
+
+def make_sections(bullets):
+    return {
+        'contactInfo': {'name': 'Test User', 'email': 'test@example.com'},
+        'education': 'Bachelor of Science',
+        'skills': ['Python', 'SQL', 'Docker'],
+        'experience': '\n'.join(f"• {bullet}" for bullet in bullets),
+        'projects': '',
+        'certifications': '',
+        'raw': '\n'.join(bullets)
+    }
+
+
+class TestEnhancementConcurrencyProperties:
+    """Property-based tests for the async enhancement path"""
+
+    def test_latency_is_one_round_trip(self, engine):
+        """Enhancing many bullets concurrently should take about one LLM round trip"""
+        bullets = [f"worked on the reporting pipeline for team number {i}" for i in range(8)]
+
+        start = time.perf_counter()
+        enhancements = asyncio.run(engine.enhance_content_async(make_sections(bullets), concurrency=32))
+        elapsed = time.perf_counter() - start
+
+        improved = {e['original']: e['improved'] for e in enhancements}
+        assert all(improved[bullet] == f"Spearheaded work: {bullet}" for bullet in bullets)
+        assert elapsed < LLM_DELAY * 3, f"Expected ~one round trip ({LLM_DELAY}s), took {elapsed:.2f}s"
+
+    def test_concurrency_limit_is_respected(self, engine):
+        """With a concurrency of one the calls should run back to back"""
+        bullets = [f"maintained the billing service for region number {i}" for i in range(3)]
+
+        start = time.perf_counter()
+        asyncio.run(engine.enhance_content_async(make_sections(bullets), concurrency=1))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed >= LLM_DELAY * len(bullets) * 0.9
+
+    @given(
+        fast_count=st.integers(min_value=0, max_value=4),
+        slow_count=st.integers(min_value=1, max_value=3)
+    )
+    @settings(max_examples=5, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_timed_out_bullets_fall_back_to_rules(self, engine, fast_count, slow_count):
+        """
+        **Feature: smart-cv-analyzer, Property 10: Concurrent Enhancement Fallback**
+        For any mix of responsive and stalled LLM calls, every bullet should still be enhanced:
+        stalled bullets get the rule-based rewrite and the pass finishes within the call timeout
+        """
+        fast = [f"worked on the search indexing job for shard {i}" for i in range(fast_count)]
+        slow = [f"worked on a slow migration for database {i}" for i in range(slow_count)]
+
+        start = time.perf_counter()
+        enhancements = asyncio.run(engine.enhance_content_async(
+            make_sections(fast + slow), call_timeout=1.0, deadline=3.0
+        ))
+        elapsed = time.perf_counter() - start
+
+        improved = {e['original']: e['improved'] for e in enhancements}
+        for bullet in fast:
+            assert improved[bullet] == f"Spearheaded work: {bullet}"
+        for bullet in slow:
+            assert improved[bullet] == engine._rule_based_enhance(bullet)
+        assert elapsed < 2.0, f"Timed-out calls should not hold the pass open ({elapsed:.2f}s)"
+
+    def test_overall_deadline_bounds_latency(self, engine):
+        """The overall deadline should cut the pass short even if per-call timeouts are generous"""
+        bullets = [f"worked on a slow batch export for client {i}" for i in range(3)]
+
+        start = time.perf_counter()
+        enhancements = asyncio.run(engine.enhance_content_async(
+            make_sections(bullets), call_timeout=10.0, deadline=0.5
+        ))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.5
+        improved = {e['original']: e['improved'] for e in enhancements}
+        assert all(improved[bullet] == engine._rule_based_enhance(bullet) for bullet in bullets)
+
+    def test_without_client_uses_rule_based_enhancement(self, monkeypatch):
+        """Without an API key the async path should match the synchronous rule-based output"""
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+        engine = EnhancementEngine()
+        sections = make_sections(["worked on the internal dashboard for the sales team"])
+
+        assert asyncio.run(engine.enhance_content_async(sections)) == engine.enhance_content(sections)
@@ -0,0 +1,122 @@
+"""
+Property-based tests for the pipeline execution layer
+**Feature: smart-cv-analyzer, Property 18: Bounded Admission**
+"""
+
+import asyncio
+import os
+import time
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.executor import ExecutionLayer, QueueFullError
+from modules.pipeline import Pipeline, Stage
+
+
+def worker_pid(results):
+    """Process stage reporting where it ran; module level so it can be pickled"""
+    return os.getpid()
+
+
+def busy(results):
+    """Process stage that holds the CPU for a while"""
+    deadline = time.perf_counter() + 0.5
+    while time.perf_counter() < deadline:
+        pass
+    return results['x'] + 1
+
+
+class TestExecutorProperties:
+    """Property-based tests for admission control and process offload"""
+
+    @given(
+        max_pending=st.integers(min_value=1, max_value=8),
+        arrivals=st.integers(min_value=0, max_value=20)
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_in_flight_runs_are_bounded(self, max_pending, arrivals):
+        """
+        **Feature: smart-cv-analyzer, Property 18: Bounded Admission**
+        For any burst of simultaneous analyses, at most max_pending should be admitted,
+        the rest rejected with QueueFullError, and every slot released afterwards
+        """
+        execution = ExecutionLayer(process_workers=0, max_pending=max_pending)
+        in_flight = []
+
+        async def stage(results):
+            in_flight.append(1)
+            peak = len(in_flight)
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return peak
+
+        pipeline = Pipeline([Stage('peak', stage, deps=['x'], kind='async')], inputs=['x'])
+
+        async def burst():
+            return await asyncio.gather(
+                *(execution.run(pipeline, {'x': 0}) for _ in range(arrivals)), return_exceptions=True
+            )
+
+        outcomes = asyncio.run(burst())
+
+        admitted = [outcome for outcome in outcomes if not isinstance(outcome, Exception)]
+        rejected = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+        assert len(admitted) == min(arrivals, max_pending)
+        assert all(isinstance(error, QueueFullError) for error in rejected)
+        assert max((result['peak'] for result in admitted), default=0) <= max_pending
+        assert execution.stats()['pending'] == 0
+        assert execution.stats()['rejected'] == len(rejected)
+
+    def test_process_stages_leave_the_event_loop_free(self):
+        """Process stages should run in another process while the event loop keeps ticking"""
+        execution = ExecutionLayer(process_workers=1, initializer=None)
+        pipeline = Pipeline([
+            Stage('pid', worker_pid, deps=['x'], kind='process'),
+            Stage('busy', busy, deps=['x', 'pid'], kind='process'),
+        ], inputs=['x'])
+
+        async def run_with_ticker():
+            gaps = []
+
+            async def ticker():
+                last = time.perf_counter()
+                while True:
+                    await asyncio.sleep(0.01)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+
+            # Start the pool first so process startup does not count as a stall
+            await asyncio.get_running_loop().run_in_executor(execution.process_executor, worker_pid, {})
+            task = asyncio.ensure_future(ticker())
+            try:
+                result = await execution.run(pipeline, {'x': 1})
+            finally:
+                task.cancel()
+            return result, gaps
+
+        try:
+            result, gaps = asyncio.run(run_with_ticker())
+        finally:
+            execution.shutdown()
+
+        assert result['pid'] != os.getpid()
+        assert result['busy'] == 2
+        assert max(gaps) < 0.2, f"Event loop stalled for {max(gaps):.2f}s"
+
+    def test_process_stages_only_receive_their_dependencies(self):
+        """Without a process pool, process stages run in threads with the same narrowed input"""
+        seen = []
+
+        def record(results):
+            seen.append(sorted(results))
+            return 1
+
+        pipeline = Pipeline([
+            Stage('a', lambda results: 1, deps=['x']),
+            Stage('b', record, deps=['a'], kind='process'),
+        ], inputs=['x', 'y'])
+
+        asyncio.run(ExecutionLayer(process_workers=0).run(pipeline, {'x': 0, 'y': 0}))
+        pipeline.run_inline({'x': 0, 'y': 0})
+
+        assert seen == [['a'], ['a']]
@@ -0,0 +1,132 @@
+"""
+Property-based tests for streaming upload ingest
+**Feature: smart-cv-analyzer, Property 25: Bounded Streaming Ingest**
+"""
+
+import asyncio
+import glob
+import hashlib
+import io
+import os
+import tempfile
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.ingest import BodySizeLimit, NotPDFError, UploadTooLargeError, spool_upload
+
+
+class CountingReader(io.BytesIO):
+    """BytesIO that records how many bytes were read from it"""
+
+    def __init__(self, content):
+        super().__init__(content)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def run_asgi(app, chunks, headers=()):
+    """Send a POST body in ``chunks`` through ``app``; return the response messages"""
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': index < len(chunks) - 1}
+                for index, chunk in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': 'POST', 'path': '/analyze-resume', 'headers': list(headers)}
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+class TestIngestProperties:
+    """Property-based tests for chunked, size-limited ingest"""
+
+    @given(
+        body=st.binary(max_size=300),
+        pdf=st.booleans(),
+        max_size=st.integers(min_value=5, max_value=200),
+        chunk_size=st.integers(min_value=1, max_value=64)
+    )
+    @settings(max_examples=200, deadline=None)
+    def test_spool_reads_at_most_a_chunk_past_the_limit(self, body, pdf, max_size, chunk_size):
+        """
+        **Feature: smart-cv-analyzer, Property 25: Bounded Streaming Ingest**
+        For any upload, spooling should stop within one chunk of the size limit or of a bad
+        signature, hash exactly the bytes kept, and leave no file behind on rejection
+        """
+        content = (b'%PDF-' + body) if pdf else body
+        source = CountingReader(content)
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                upload = spool_upload(source, 'resume.pdf', max_size, chunk_size=chunk_size, directory=directory)
+            except UploadTooLargeError:
+                assert len(content) > max_size
+                assert source.bytes_read <= max_size + chunk_size
+                assert os.listdir(directory) == []
+                return
+            except NotPDFError:
+                assert not content.startswith(b'%PDF-')
+                assert source.bytes_read <= len(b'%PDF-') + chunk_size
+                assert os.listdir(directory) == []
+                return
+
+            assert content.startswith(b'%PDF-') and len(content) <= max_size
+            assert upload.size == len(content)
+            assert upload.sha256 == hashlib.sha256(content).hexdigest()
+            with open(upload.path, 'rb') as spooled:
+                assert spooled.read() == content
+
+    @given(
+        chunk_sizes=st.lists(st.integers(min_value=0, max_value=40), min_size=1, max_size=20),
+        limit=st.integers(min_value=1, max_value=200)
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_middleware_stops_the_body_at_the_limit(self, chunk_sizes, limit):
+        """
+        **Feature: smart-cv-analyzer, Property 25: Bounded Streaming Ingest**
+        For any chunking of a request body, the app should never be handed more than the
+        limit, and an oversized body should get exactly one 413 response
+        """
+        handed = []
+
+        async def app(scope, receive, send):
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    # What a framework does when the body is cut short
+                    await send({'type': 'http.response.start', 'status': 400, 'headers': []})
+                    await send({'type': 'http.response.body', 'body': b''})
+                    return
+                handed.append(message['body'])
+                if not message.get('more_body'):
+                    break
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b'ok'})
+
+        chunks = [b'x' * size for size in chunk_sizes]
+        sent = run_asgi(BodySizeLimit(app, default_limit=limit), chunks)
+
+        statuses = [message['status'] for message in sent if message['type'] == 'http.response.start']
+        assert sum(len(chunk) for chunk in handed) <= limit
+        assert statuses == ([413] if sum(chunk_sizes) > limit else [200])
+
+    def test_declared_length_rejected_before_reading(self):
+        """A Content-Length over the limit should be refused without reading the body"""
+        async def app(scope, receive, send):
+            raise AssertionError("the app should not be called")
+
+        sent = run_asgi(BodySizeLimit(app, default_limit=10), [b'x' * 100], headers=[(b'content-length', b'100')])
+        assert sent[0]['status'] == 413
+
+    def test_failed_spool_leaves_no_temp_file(self):
+        """Rejected uploads should not leak temporary files in the default temp directory"""
+        before = set(glob.glob(os.path.join(tempfile.gettempdir(), 'temp_*.pdf')))
+        with pytest.raises(NotPDFError):
+            spool_upload(io.BytesIO(b'not a pdf'), 'resume.pdf', 100)
+        assert set(glob.glob(os.path.join(tempfile.gettempdir(), 'temp_*.pdf'))) == before
@@ -0,0 +1,229 @@
+"""
+Property-based tests for the analysis job queue
+**Feature: smart-cv-analyzer, Property 19: Job Queue Delivery**
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.job_queue import JobQueue
+from modules.job_worker import JobWorker
+from modules.executor import ExecutionLayer
+from modules.pipeline import Pipeline, Stage
+from modules.analysis_pipeline import NotAResumeError
+from modules.workers import InsufficientTextError
+
+
+@pytest.fixture
+def queue_dir():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+def make_queue(directory, **kwargs):
+    return JobQueue(os.path.join(directory, 'jobs.sqlite3'), os.path.join(directory, 'files'), **kwargs)
+
+
+def fake_pipeline(read):
+    """Pipeline with the stage names analysis_response expects"""
+    return Pipeline([
+        Stage('text', lambda results: read(results['file_path']), deps=['file_path']),
+        Stage('sections', lambda results: {'raw': results['text']}, deps=['text']),
+        Stage('score', lambda results: {'overall_score': 70, 'breakdown': {}}, deps=['sections']),
+        Stage('keywords', lambda results: {'missing_keywords': []}, deps=['sections']),
+        Stage('recommendations', lambda results: {'issues': [], 'missing_components': []}, deps=['sections']),
+    ], inputs=['file_path', 'job_role'])
+
+
+class TestJobQueueProperties:
+    """Property-based tests for durable job delivery"""
+
+    @given(
+        job_count=st.integers(min_value=1, max_value=10),
+        outcomes=st.lists(st.sampled_from(['complete', 'retry', 'give_up', 'abandon']), min_size=1, max_size=40)
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_every_job_ends_done_or_failed(self, job_count, outcomes):
+        """
+        **Feature: smart-cv-analyzer, Property 19: Job Queue Delivery**
+        For any sequence of worker outcomes, each job should be claimed by one worker at a time,
+        never run more than max_attempts times, and end either done or failed
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            queue = make_queue(directory, visibility_timeout=0, max_attempts=3, retry_delay=0)
+            job_ids = [queue.enqueue({'job_role': 'Engineer'}, upload=b'%PDF-1.4') for _ in range(job_count)]
+            runs = dict.fromkeys(job_ids, 0)
+
+            outcome_iter = iter(outcomes)
+            while True:
+                job = queue.claim()
+                if job is None:
+                    break
+                runs[job.id] += 1
+                assert job.attempts == runs[job.id] <= 3
+                outcome = next(outcome_iter, 'complete')
+                if outcome == 'complete':
+                    assert queue.complete(job, {'ok': True})
+                elif outcome == 'retry':
+                    assert queue.fail(job, 'transient')
+                elif outcome == 'give_up':
+                    assert queue.fail(job, 'permanent', retry=False)
+                # 'abandon': the worker died; the zero visibility timeout expires at once
+
+            for job_id in job_ids:
+                job = queue.get(job_id)
+                assert job.status in ('done', 'failed')
+                assert (job.result == {'ok': True}) == (job.status == 'done')
+                assert not os.path.exists(job.payload['file_path'])
+            assert queue.stats()['queued'] == queue.stats()['running'] == 0
+            queue.close()
+
+    def test_leased_jobs_are_invisible_until_timeout(self, queue_dir):
+        """A claimed job should not be handed out again until its lease expires"""
+        queue = make_queue(queue_dir, visibility_timeout=0.2)
+        job_id = queue.enqueue({'job_role': 'Engineer'})
+
+        first = queue.claim()
+        assert first.id == job_id
+        assert queue.claim() is None
+
+        time.sleep(0.3)
+        second = queue.claim()
+        assert second.id == job_id and second.attempts == 2
+
+        # The first worker's lease is gone, so its late result is discarded
+        assert not queue.complete(first, {'stale': True})
+        assert queue.complete(second, {'fresh': True})
+        assert queue.get(job_id).result == {'fresh': True}
+
+    def test_retries_back_off(self, queue_dir):
+        """A failed attempt should only become claimable after the retry delay"""
+        queue = make_queue(queue_dir, retry_delay=0.2)
+        queue.enqueue({'job_role': 'Engineer'})
+
+        queue.fail(queue.claim(), 'transient')
+        assert queue.claim() is None
+        time.sleep(0.3)
+        assert queue.claim() is not None
+
+    def test_results_expire(self, queue_dir):
+        """Finished jobs should disappear after the result TTL"""
+        queue = make_queue(queue_dir, result_ttl=0.2)
+        job_id = queue.enqueue({'job_role': 'Engineer'})
+        queue.complete(queue.claim(), {'ok': True})
+        assert queue.get(job_id) is not None
+
+        time.sleep(0.3)
+        assert queue.get(job_id) is None
+        assert queue.purge_expired() == 1
+
+    def test_queue_is_shared_between_instances(self, queue_dir):
+        """Jobs enqueued by the service should be claimable by a separate worker"""
+        job_id = make_queue(queue_dir).enqueue({'job_role': 'Engineer'})
+        assert make_queue(queue_dir).claim().id == job_id
+
+    def test_claims_stay_in_their_lane(self, queue_dir):
+        """Workers of one lane should only see that lane's jobs, and depth is reported per lane"""
+        queue = make_queue(queue_dir)
+        bulk = [queue.enqueue({'job_role': 'Engineer'}, lane='bulk') for _ in range(3)]
+        interactive = queue.enqueue({'job_role': 'Engineer'})
+
+        assert queue.lane_stats()['bulk']['queued'] == 3
+        assert queue.has_ready('interactive')
+        assert queue.claim('interactive').id == interactive
+        assert not queue.has_ready('interactive')
+        assert queue.claim('interactive') is None
+        assert queue.claim('bulk').id == bulk[0]
+
+        stats = queue.lane_stats()
+        assert stats['bulk'] == {'queued': 2, 'running': 1, 'oldest_wait_s': stats['bulk']['oldest_wait_s']}
+        assert stats['interactive']['running'] == 1
+
+    def test_worker_runs_jobs_to_completion(self, queue_dir):
+        """The worker should store results, and reject files that yield no text without retrying"""
+        def read(file_path):
+            with open(file_path, 'rb') as upload:
+                content = upload.read().decode()
+            if content == 'blank':
+                raise InsufficientTextError("Could not extract sufficient text from the file.")
+            return content
+
+        queue = make_queue(queue_dir)
+        worker = JobWorker(queue, ExecutionLayer(process_workers=0), fake_pipeline(read))
+        good = queue.enqueue({'job_role': 'Engineer', 'file_name': 'cv.pdf'}, upload=b'resume text')
+        blank = queue.enqueue({'job_role': 'Engineer', 'file_name': 'blank.pdf'}, upload=b'blank')
+
+        async def drain():
+            while await worker.run_once():
+                pass
+
+        asyncio.run(drain())
+
+        result = queue.get(good).result
+        assert result['parsedText'] == 'resume text'
+        assert result['overallScore'] == 70
+        assert result['fileName'] == 'cv.pdf'
+        rejected = queue.get(blank)
+        assert rejected.status == 'rejected' and rejected.attempts == 1
+        assert 'sufficient text' in rejected.error
+        assert rejected.result is None
+        assert not os.path.exists(rejected.payload['file_path'])
+
+    def test_documents_that_are_not_resumes_keep_the_rejection(self, queue_dir):
+        """A NotAResumeError rejection should be kept for the client as the job's result"""
+        rejection = {'status': 'rejected', 'message': 'This uploaded file is not a resume.'}
+
+        def read(file_path):
+            raise NotAResumeError(rejection)
+
+        queue = make_queue(queue_dir)
+        worker = JobWorker(queue, ExecutionLayer(process_workers=0), fake_pipeline(read))
+        job_id = queue.enqueue({'job_role': 'Engineer', 'file_name': 'invoice.pdf'}, upload=b'invoice')
+        asyncio.run(worker.run_once())
+
+        job = queue.get(job_id)
+        assert job.status == 'rejected'
+        assert job.result == rejection
+        assert queue.claim() is None
+
+    def test_running_jobs_keep_their_lease(self, queue_dir):
+        """A job that runs longer than the visibility timeout should not be claimed by another worker"""
+        def read(file_path):
+            time.sleep(0.5)
+            with open(file_path) as f:
+                return f.read()
+
+        queue = make_queue(queue_dir, visibility_timeout=0.2)
+        other = make_queue(queue_dir, visibility_timeout=0.2)
+        worker = JobWorker(queue, ExecutionLayer(process_workers=0), fake_pipeline(read))
+        job_id = queue.enqueue({'job_role': 'Engineer', 'file_name': 'cv.pdf'}, upload=b'resume text')
+
+        async def run_and_poach():
+            running = asyncio.create_task(worker.run_once())
+            claims = []
+            for _ in range(5):
+                await asyncio.sleep(0.1)
+                claims.append(await asyncio.to_thread(other.claim))
+            await running
+            return claims
+
+        assert asyncio.run(run_and_poach()) == [None] * 5
+        job = queue.get(job_id)
+        assert job.status == 'done' and job.attempts == 1
+
+    def test_leases_are_only_extended_by_their_holder(self, queue_dir):
+        """extend_lease should fail once the lease has passed to another worker or the job finished"""
+        queue = make_queue(queue_dir, visibility_timeout=0.2)
+        queue.enqueue({'job_role': 'Engineer'})
+        first = queue.claim()
+        assert queue.extend_lease(first.id, first.lease)
+
+        time.sleep(0.3)
+        second = queue.claim()
+        assert not queue.extend_lease(first.id, first.lease)
+        assert queue.extend_lease(second.id, second.lease)
+        queue.complete(second, {'ok': True})
+        assert not queue.extend_lease(second.id, second.lease)
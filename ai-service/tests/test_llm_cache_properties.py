@@ -0,0 +1,189 @@
+"""
+Property-based tests for the LLM response cache
+**Feature: smart-cv-analyzer, Property 12: LLM Cache Key Normalization**
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.enhancement_engine import EnhancementEngine
+from modules.llm_cache import LLMCache
+
+words = st.lists(st.text(alphabet='abcdefghij', min_size=1, max_size=8), min_size=1, max_size=8)
+separators = st.lists(st.sampled_from([' ', '  ', '\t', '\n', ' \n ']), min_size=8, max_size=8)
+
+
+@pytest.fixture
+def cache_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield os.path.join(temp_dir, 'llm_cache.sqlite3')
+
+
+@pytest.fixture
+def engine(mock_llm_url, cache_path, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_BASE_URL', mock_llm_url)
+    engine = EnhancementEngine()
+    engine.cache = LLMCache(cache_path, mode='readwrite')
+    return engine
+
+
+def make_sections(bullets):
+    return {
+        'contactInfo': {'name': 'Test User', 'email': 'test@example.com'},
+        'education': 'Bachelor of Science',
+        'skills': ['Python', 'SQL', 'Docker'],
+        'experience': '\n'.join(f"• {bullet}" for bullet in bullets),
+        'projects': '',
+        'certifications': '',
+        'raw': '\n'.join(bullets)
+    }
+
+
+class TestLLMCacheProperties:
+    """Property-based tests for LLM response caching"""
+
+    @given(words=words, first=separators, second=separators)
+    @settings(max_examples=100)
+    def test_key_ignores_whitespace_differences(self, words, first, second):
+        """
+        **Feature: smart-cv-analyzer, Property 12: LLM Cache Key Normalization**
+        For any text, copies that differ only in whitespace should share a cache key,
+        while a different model, prompt version or temperature should not
+        """
+        text_a = ''.join(word + sep for word, sep in zip(words, first))
+        text_b = ' ' + ''.join(word + sep for word, sep in zip(words, second))
+
+        key = LLMCache.make_key('enhance_bullet', text_a, 'gpt-3.5-turbo', '1', 0.7)
+        assert key == LLMCache.make_key('enhance_bullet', text_b, 'gpt-3.5-turbo', '1', 0.7)
+        assert key != LLMCache.make_key('enhance_bullet', text_a, 'gpt-4', '1', 0.7)
+        assert key != LLMCache.make_key('enhance_bullet', text_a, 'gpt-3.5-turbo', '2', 0.7)
+        assert key != LLMCache.make_key('enhance_bullet', text_a, 'gpt-3.5-turbo', '1', 0.3)
+        assert key != LLMCache.make_key('resume_analysis', text_a, 'gpt-3.5-turbo', '1', 0.7)
+
+    def test_entries_persist_across_instances(self, cache_path):
+        """A response stored by one process should be served to the next"""
+        LLMCache(cache_path).set('key', 'Led the migration')
+        assert LLMCache(cache_path).get('key') == 'Led the migration'
+
+    def test_expired_entries_are_misses(self, cache_path):
+        """Entries older than the TTL should not be served"""
+        cache = LLMCache(cache_path, ttl=0.2)
+        cache.set('key', 'Led the migration')
+        assert cache.get('key') == 'Led the migration'
+
+        time.sleep(0.3)
+        assert cache.get('key') is None
+        assert cache.stats()['expired'] == 1
+
+    def test_least_recently_used_entries_are_evicted(self, cache_path):
+        """Past max_entries the entry unused the longest should go first"""
+        cache = LLMCache(cache_path, max_entries=3, touch_interval=0)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key.upper())
+            time.sleep(0.01)
+        cache.get('a')
+        cache.set('d', 'D')
+
+        assert cache.get('b') is None
+        assert [cache.get(key) for key in ('a', 'c', 'd')] == ['A', 'C', 'D']
+        assert cache.stats()['entries'] == 3
+
+    @given(keys=st.lists(st.sampled_from('abcdefgh'), min_size=1, max_size=40),
+           max_entries=st.integers(min_value=1, max_value=5))
+    @settings(max_examples=50, deadline=None)
+    def test_running_count_matches_the_table(self, keys, max_entries):
+        """
+        **Feature: smart-cv-analyzer, Property 12: LLM Cache Key Normalization**
+        For any sequence of new and repeated writes, the kept entry count should match the
+        table and never exceed max_entries
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'llm_cache.sqlite3')
+            cache = LLMCache(path, max_entries=max_entries, touch_interval=0)
+            for i, key in enumerate(keys):
+                cache.set(key, key.upper())
+                table = sqlite3.connect(path).execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+                assert cache._entries == table == min(len(set(keys[:i + 1])), max_entries)
+            assert cache.get(keys[-1]) == keys[-1].upper()
+            cache.close()
+
+    def test_writes_do_not_count_the_table(self, cache_path):
+        """Stores should not scan the table to decide on eviction"""
+        cache = LLMCache(cache_path, max_entries=2)
+        cache.set('a', 'A')
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        for key in ('b', 'c', 'c', 'd'):
+            cache.set(key, key.upper())
+
+        assert not [statement for statement in statements if 'COUNT' in statement.upper()]
+        assert cache.stats()['entries'] == 2
+
+    def test_recount_sees_other_processes(self, cache_path):
+        """Entries written through another instance should count towards max_entries after a recount"""
+        cache = LLMCache(cache_path, max_entries=3)
+        cache.RECOUNT_WRITES = 2
+        cache.set('a', 'A')
+        other = LLMCache(cache_path, max_entries=3)
+        for key in ('b', 'c', 'd'):
+            other.set(key, key.upper())
+        cache.set('e', 'E')
+
+        assert sqlite3.connect(cache_path).execute('SELECT COUNT(*) FROM responses').fetchone()[0] == 3
+
+    def test_hits_only_write_once_per_touch_interval(self, cache_path):
+        """Repeated hits should not rewrite the access time until the interval has passed"""
+        cache = LLMCache(cache_path, touch_interval=0.2)
+        cache.set('key', 'value')
+        accessed = lambda: sqlite3.connect(cache_path).execute(
+            'SELECT accessed FROM responses WHERE key = ?', ('key',)).fetchone()[0]
+        stored = accessed()
+
+        assert [cache.get('key') for _ in range(5)] == ['value'] * 5
+        assert accessed() == stored
+        time.sleep(0.25)
+        cache.get('key')
+        assert accessed() > stored
+
+    def test_hit_rate_statistics(self, cache_path):
+        """Stats should count hits and misses and report their ratio"""
+        cache = LLMCache(cache_path)
+        cache.set('key', 'value')
+        cache.get('key')
+        cache.get('key')
+        cache.get('other')
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['writes']) == (2, 1, 1)
+        assert stats['hit_rate'] == pytest.approx(2 / 3, abs=1e-3)
+
+    def test_repeated_bullets_are_served_from_cache(self, engine, mock_llm):
+        """Enhancing the same bullets twice should only call the API the first time"""
+        bullets = [f"worked on the quarterly forecasting model for unit {i}" for i in range(4)]
+
+        first = asyncio.run(engine.enhance_content_async(make_sections(bullets)))
+        before = mock_llm.request_count
+        second = asyncio.run(engine.enhance_content_async(make_sections(bullets)))
+
+        assert mock_llm.request_count == before
+        assert second == first
+
+    def test_replay_mode_never_calls_the_api(self, engine, mock_llm, cache_path):
+        """In replay mode misses fall back to rules instead of reaching the API"""
+        bullets = ["worked on the customer churn dashboard for support",
+                   "worked on the release checklist for mobile apps"]
+        engine.cache.set(engine._cache_key(bullets[0]), "Built the customer churn dashboard for support")
+        engine.cache = LLMCache(cache_path, mode='replay')
+        before = mock_llm.request_count
+
+        enhancements = asyncio.run(engine.enhance_content_async(make_sections(bullets)))
+
+        assert mock_llm.request_count == before
+        improved = {e['original']: e['improved'] for e in enhancements}
+        assert improved[bullets[0]] == "Built the customer churn dashboard for support"
+        assert improved[bullets[1]] == engine._rule_based_enhance(bullets[1])
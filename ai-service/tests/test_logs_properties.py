@@ -0,0 +1,128 @@
+"""
+Property-based tests for structured logging
+**Feature: smart-cv-analyzer, Property 29: Structured Log Records**
+"""
+
+import io
+import json
+import logging
+import queue
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from hypothesis import given, strategies as st, settings
+from modules.logs import (
+    REQUEST_ID_PATTERN, ContextFilter, DebugSampler, JsonFormatter, RequestContext, _QueueHandler,
+    new_request_id, request_id_var
+)
+
+field_names = st.from_regex(r'\A[a-z][a-z_]{0,15}\Z').filter(
+    lambda name: name not in vars(logging.makeLogRecord({})) and name not in ('message', 'asctime', 'request_id')
+)
+field_values = st.one_of(st.integers(), st.floats(allow_nan=False, allow_infinity=False), st.text(max_size=20),
+                         st.booleans(), st.none())
+
+
+def queued_json_lines(log, request_id):
+    """Run ``log(logger)`` through the queue handler and formatter the service uses"""
+    records = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(ContextFilter())
+    logger = logging.getLogger('tests.logs')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    token = request_id_var.set(request_id)
+    try:
+        log(logger)
+    finally:
+        request_id_var.reset(token)
+        logger.removeHandler(handler)
+
+    out = io.StringIO()
+    writer = logging.StreamHandler(out)
+    writer.setFormatter(JsonFormatter())
+    while not records.empty():
+        writer.handle(records.get())
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestLogsProperties:
+    """Property-based tests for log records, sampling and request IDs"""
+
+    @given(fields=st.dictionaries(field_names, field_values, max_size=5),
+           request_id=st.one_of(st.none(), st.from_regex(r'\A[a-z0-9]{1,16}\Z')),
+           arg=st.integers())
+    @settings(max_examples=100, deadline=None)
+    def test_records_are_json_lines_with_their_fields(self, fields, request_id, arg):
+        """
+        **Feature: smart-cv-analyzer, Property 29: Structured Log Records**
+        For any extra fields and request ID, a queued record should come out as one JSON
+        line with the merged message, the request ID and every field at the top level
+        """
+        entries = queued_json_lines(lambda logger: logger.info("Analyzed %d", arg, extra=fields), request_id)
+
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry['message'] == f"Analyzed {arg}"
+        assert entry['level'] == 'INFO'
+        assert entry.get('request_id') == request_id
+        for key, value in fields.items():
+            assert entry[key] == value
+
+    def test_exceptions_survive_the_queue(self):
+        """A logged exception's traceback should reach the formatted line"""
+        def log(logger):
+            try:
+                raise ValueError("bad page")
+            except ValueError:
+                logger.exception("OCR failed")
+
+        entry = queued_json_lines(log, 'req-1')[0]
+        assert entry['level'] == 'ERROR'
+        assert 'ValueError: bad page' in entry['exc']
+
+    @given(rate=st.floats(min_value=0, max_value=1), level=st.sampled_from([logging.INFO, logging.WARNING]))
+    @settings(max_examples=50)
+    def test_sampler_only_drops_debug(self, rate, level):
+        """
+        **Feature: smart-cv-analyzer, Property 29: Structured Log Records**
+        For any sample rate, records above DEBUG are always kept and DEBUG records are
+        kept roughly at that rate
+        """
+        sampler = DebugSampler(rate)
+        assert sampler.filter(logging.makeLogRecord({'levelno': level}))
+
+        debug = logging.makeLogRecord({'levelno': logging.DEBUG})
+        kept = sum(sampler.filter(debug) for _ in range(2000))
+        assert abs(kept / 2000 - rate) < 0.06
+
+    @given(header=st.one_of(st.none(), st.text(max_size=80)))
+    @settings(max_examples=100)
+    def test_request_ids_are_safe_tokens(self, header):
+        """
+        **Feature: smart-cv-analyzer, Property 29: Structured Log Records**
+        For any X-Request-ID header, the request ID should be that header if it is a
+        short token and a fresh token otherwise
+        """
+        request_id = new_request_id(header)
+        assert REQUEST_ID_PATTERN.match(request_id)
+        if header and REQUEST_ID_PATTERN.match(header):
+            assert request_id == header
+
+    def test_middleware_sets_and_echoes_request_id(self):
+        """Handlers should see the request's ID and the response should carry it"""
+        app = FastAPI()
+        app.add_middleware(RequestContext)
+
+        @app.get('/id')
+        async def current_id():
+            return {'id': request_id_var.get()}
+
+        client = TestClient(app)
+        response = client.get('/id', headers={'X-Request-ID': 'upload-42'})
+        assert response.json()['id'] == 'upload-42'
+        assert response.headers['x-request-id'] == 'upload-42'
+
+        generated = client.get('/id', headers={'X-Request-ID': 'not a token!'})
+        assert generated.json()['id'] == generated.headers['x-request-id'] != 'not a token!'
+        assert request_id_var.get() is None
@@ -0,0 +1,113 @@
+"""
+Property-based tests for the Prometheus metrics registry
+**Feature: smart-cv-analyzer, Property 26: Metrics Exposition Consistency**
+"""
+
+import asyncio
+import math
+import re
+from hypothesis import given, strategies as st, settings
+from modules.metrics import Counter, Gauge, Histogram, Registry, STAGE_SECONDS
+from modules.pipeline import Pipeline, Stage
+
+SAMPLE_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\.)*",?)*\})? (\S+)$')
+
+
+def parse_samples(text):
+    """(name, label text, value) of each sample line, checking every line is well formed"""
+    samples = []
+    for line in text.rstrip('\n').split('\n'):
+        if line.startswith('# HELP ') or line.startswith('# TYPE '):
+            continue
+        match = SAMPLE_LINE.match(line)
+        assert match, f"malformed line: {line!r}"
+        samples.append((match.group(1), match.group(2) or '', float(match.group(3))))
+    return samples
+
+
+class TestMetricsProperties:
+    """Property-based tests for metrics exposition"""
+
+    @given(observations=st.lists(st.floats(min_value=0, max_value=100, allow_nan=False), max_size=50))
+    @settings(max_examples=100)
+    def test_histogram_buckets_are_cumulative(self, observations):
+        """
+        **Feature: smart-cv-analyzer, Property 26: Metrics Exposition Consistency**
+        For any observations, bucket counts should be cumulative and match the values
+        at or below each bound, with the +Inf bucket, count and sum covering them all
+        """
+        registry = Registry()
+        histogram = Histogram('test_seconds', 'Test histogram', ['stage'], buckets=(0.1, 1, 10),
+                              registry=registry)
+        for value in observations:
+            histogram.observe(value, stage='text')
+
+        samples = parse_samples(registry.render())
+        buckets = [(labels, value) for name, labels, value in samples if name == 'test_seconds_bucket']
+        if not observations:
+            assert buckets == []
+            return
+        assert [value for _, value in buckets] == [
+            sum(1 for value in observations if value <= bound) for bound in (0.1, 1, 10)
+        ] + [len(observations)]
+        assert buckets[-1][0] == '{stage="text",le="+Inf"}'
+
+        totals = {name: value for name, _, value in samples if not name.endswith('_bucket')}
+        assert totals['test_seconds_count'] == len(observations)
+        assert math.isclose(totals['test_seconds_sum'], sum(observations), rel_tol=1e-9, abs_tol=1e-9)
+
+    @given(values=st.lists(st.text(max_size=12), min_size=1, max_size=10))
+    @settings(max_examples=100)
+    def test_label_values_are_escaped(self, values):
+        """
+        **Feature: smart-cv-analyzer, Property 26: Metrics Exposition Consistency**
+        For any label values, every sample should stay on one well-formed line and
+        each distinct value should get its own series
+        """
+        registry = Registry()
+        counter = Counter('test_total', 'Test "counter"\nwith a \\ in its help', ['name'], registry=registry)
+        for value in values:
+            counter.inc(name=value)
+
+        samples = parse_samples(registry.render())
+        assert len(samples) == len(set(values))
+        assert sum(value for _, _, value in samples) == len(values)
+
+    def test_failing_collector_does_not_break_the_scrape(self):
+        """A collector that raises is skipped; the other metrics are still rendered"""
+        registry = Registry()
+        gauge = Gauge('test_in_flight', 'Test gauge', registry=registry)
+        gauge.inc()
+
+        def broken():
+            raise RuntimeError("queue database unavailable")
+
+        def depth():
+            collected = Gauge('test_depth', 'Collected gauge', ['lane'], registry=None)
+            collected.set(3, lane='bulk')
+            return [collected]
+
+        registry.add_collector(broken)
+        registry.add_collector(depth)
+        samples = parse_samples(registry.render())
+        assert ('test_in_flight', '', 1.0) in samples
+        assert ('test_depth', '{lane="bulk"}', 3.0) in samples
+
+    def test_pipeline_observes_every_stage(self):
+        """Each stage of a pipeline run should be observed once in the stage histogram"""
+        pipeline = Pipeline([
+            Stage('metrics_test_a', lambda results: results['x'] + 1, deps=['x']),
+            Stage('metrics_test_b', lambda results: results['metrics_test_a'] * 2, deps=['metrics_test_a'],
+                  kind='inline'),
+        ], inputs=['x'])
+
+        def count(stage):
+            return sum(value for suffix, labels, value in STAGE_SECONDS.samples()
+                       if suffix == '_count' and labels == {'stage': stage})
+
+        before = {stage: count(stage) for stage in ('metrics_test_a', 'metrics_test_b')}
+        result = asyncio.run(pipeline.run({'x': 1}))
+
+        assert result['metrics_test_b'] == 4
+        for stage, observed in before.items():
+            assert count(stage) == observed + 1
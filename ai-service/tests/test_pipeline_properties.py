@@ -0,0 +1,148 @@
+"""
+Property-based tests for the stage-DAG executor
+**Feature: smart-cv-analyzer, Property 16: Pipeline Dependency Ordering**
+**Feature: smart-cv-analyzer, Property 32: Pipeline Pruning**
+"""
+
+import asyncio
+import time
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.metrics import STAGE_SKIPPED
+from modules.pipeline import Pipeline, Stage
+
+
+@st.composite
+def dags(draw):
+    """Random DAGs: each stage may depend on any earlier stage or the input"""
+    count = draw(st.integers(min_value=1, max_value=8))
+    deps = []
+    for index in range(count):
+        earlier = ['x'] + [f's{i}' for i in range(index)]
+        deps.append(draw(st.lists(st.sampled_from(earlier), unique=True, max_size=3)))
+    kinds = draw(st.lists(st.sampled_from(['thread', 'async', 'inline']), min_size=count, max_size=count))
+    return deps, kinds
+
+
+def make_stage(name, deps, kind):
+    def compute(results):
+        time.sleep(0.001)
+        return 1 + sum(results[dep] for dep in deps)
+
+    async def compute_async(results):
+        await asyncio.sleep(0.001)
+        return 1 + sum(results[dep] for dep in deps)
+
+    return Stage(name, compute_async if kind == 'async' else compute, deps=deps, kind=kind)
+
+
+class TestPipelineProperties:
+    """Property-based tests for concurrent stage execution"""
+
+    @given(dag=dags())
+    @settings(max_examples=50, deadline=None)
+    def test_stages_run_after_their_dependencies(self, dag):
+        """
+        **Feature: smart-cv-analyzer, Property 16: Pipeline Dependency Ordering**
+        For any DAG of stages, every stage should start only after all its dependencies finished,
+        and concurrent and inline runs should produce the same results
+        """
+        deps, kinds = dag
+        stages = [make_stage(f's{i}', stage_deps, kind) for i, (stage_deps, kind) in enumerate(zip(deps, kinds))]
+        # Declared in reverse to show order comes from dependencies, not the list
+        pipeline = Pipeline(reversed(stages), inputs=['x'])
+
+        result = asyncio.run(pipeline.run({'x': 0}))
+
+        for stage in stages:
+            timing = result.timings[stage.name]
+            for dep in stage.deps:
+                if dep != 'x':
+                    finished = result.timings[dep]['start'] + result.timings[dep]['duration']
+                    assert timing['start'] >= finished
+        assert pipeline.run_inline({'x': 0}).results == result.results
+
+    @given(dag=dags(), data=st.data())
+    @settings(max_examples=50, deadline=None)
+    def test_pruned_pipelines_run_only_what_targets_need(self, dag, data):
+        """
+        **Feature: smart-cv-analyzer, Property 32: Pipeline Pruning**
+        For any DAG and set of target stages, the pruned pipeline should run exactly the
+        targets and their transitive dependencies, give them the same outputs as the full
+        pipeline, and count every other stage as skipped
+        """
+        deps, kinds = dag
+        stages = [make_stage(f's{i}', stage_deps, kind) for i, (stage_deps, kind) in enumerate(zip(deps, kinds))]
+        pipeline = Pipeline(stages, inputs=['x'])
+        targets = data.draw(st.lists(st.sampled_from(list(pipeline.stages)), min_size=1, unique=True))
+
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(dep for dep in pipeline.stages[name].deps if dep != 'x')
+        pruned = pipeline.prune(targets)
+        skipped_before = {name: STAGE_SKIPPED._values.get((name,), 0) for name in pipeline.stages}
+
+        result = asyncio.run(pruned.run({'x': 0}))
+
+        assert set(result.timings) == needed
+        assert set(result.skipped) == set(pipeline.stages) - needed
+        full = pipeline.run_inline({'x': 0})
+        assert all(result[name] == full[name] for name in needed)
+        for name in pipeline.stages:
+            assert STAGE_SKIPPED._values.get((name,), 0) - skipped_before[name] == (name not in needed)
+
+    def test_pruning_to_an_unknown_stage_fails(self):
+        """Targets must be stages of the pipeline"""
+        with pytest.raises(ValueError, match="Unknown stage"):
+            Pipeline([Stage('a', lambda results: 1)]).prune(['b'])
+
+    def test_latency_is_the_critical_path(self):
+        """Independent stages should overlap, so latency is the longest path rather than the sum"""
+        def slow(results):
+            time.sleep(0.2)
+            return True
+
+        async def slow_async(results):
+            await asyncio.sleep(0.2)
+            return True
+
+        pipeline = Pipeline([
+            Stage('sections', lambda results: results['text'].split(), deps=['text']),
+            Stage('score', slow, deps=['sections']),
+            Stage('keywords', slow, deps=['sections']),
+            Stage('enhancements', slow_async, deps=['sections'], kind='async'),
+            Stage('recommendations', lambda results: results['score'], deps=['score'], kind='inline'),
+        ], inputs=['text'])
+
+        result = asyncio.run(pipeline.run({'text': 'a b c'}))
+
+        assert result.total < 0.35, f"Expected ~0.2s critical path, took {result.total:.2f}s"
+        assert result['recommendations'] is True
+        assert set(result.stage_durations_ms()) == {'sections', 'score', 'keywords', 'enhancements', 'recommendations'}
+
+    def test_stage_errors_propagate(self):
+        """A failing stage should fail the run and skip its dependents"""
+        ran = []
+
+        def fail(results):
+            raise ValueError("unreadable")
+
+        pipeline = Pipeline([
+            Stage('text', fail, deps=['file_path']),
+            Stage('sections', lambda results: ran.append('sections'), deps=['text']),
+        ], inputs=['file_path'])
+
+        with pytest.raises(ValueError, match="unreadable"):
+            asyncio.run(pipeline.run({'file_path': 'resume.pdf'}))
+        assert ran == []
+
+    def test_invalid_graphs_rejected(self):
+        """Unknown dependencies and cycles should be caught when the pipeline is built"""
+        with pytest.raises(ValueError, match="unknown"):
+            Pipeline([Stage('a', lambda results: 1, deps=['missing'])])
+        with pytest.raises(ValueError, match="cycle"):
+            Pipeline([Stage('a', lambda results: 1, deps=['b']), Stage('b', lambda results: 1, deps=['a'])])
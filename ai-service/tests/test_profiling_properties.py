@@ -0,0 +1,77 @@
+"""
+Property-based tests for on-demand analysis profiling
+**Feature: smart-cv-analyzer, Property 27: Profile Store Retention**
+"""
+
+import asyncio
+import os
+import tempfile
+from hypothesis import given, strategies as st, settings
+from modules.pipeline import Pipeline, Stage
+from modules.profiling import ProfileStore, profile_call, profile_run, top_functions
+
+
+def busy(results):
+    return sum(i * i for i in range(results['n']))
+
+
+class TestProfilingProperties:
+    """Property-based tests for profiling and the profile store"""
+
+    @given(saves=st.integers(min_value=1, max_value=8), max_profiles=st.integers(min_value=1, max_value=5))
+    @settings(max_examples=30, deadline=None)
+    def test_store_keeps_the_newest_profiles(self, saves, max_profiles):
+        """
+        **Feature: smart-cv-analyzer, Property 27: Profile Store Retention**
+        For any number of saved profiles, the store should keep at most max_profiles
+        files, always including the latest, each readable as a pstats report
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            store = ProfileStore(directory, max_profiles=max_profiles)
+            ids = [store.save(profile_call(sum, range(10))[1]) for _ in range(saves)]
+
+            assert len(os.listdir(directory)) == min(saves, max_profiles)
+            assert store.path(ids[-1]) is not None
+            assert 'function calls' in store.report(ids[-1])
+
+    @given(profile_id=st.text(max_size=40))
+    @settings(max_examples=100)
+    def test_malformed_ids_are_never_paths(self, profile_id):
+        """
+        **Feature: smart-cv-analyzer, Property 27: Profile Store Retention**
+        For any string that is not a profile ID, the store should not resolve it to a file
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            store = ProfileStore(directory, max_profiles=5)
+            assert store.path(profile_id) is None
+
+    def test_inline_run_profiles_every_stage(self):
+        """A pipeline run under the profiler should show each stage's function"""
+        pipeline = Pipeline([
+            Stage('square', busy, deps=['n']),
+            Stage('double', lambda results: results['square'] * 2, deps=['square'], kind='inline'),
+        ], inputs=['n'])
+
+        result, profiler = profile_call(pipeline.run_inline, {'n': 1000})
+
+        assert result['double'] == 2 * sum(i * i for i in range(1000))
+        functions = [row['function'] for row in top_functions(profiler, limit=100)]
+        assert any('(busy)' in function for function in functions)
+        assert len(top_functions(profiler, limit=3)) == 3
+
+    def test_profiled_run_includes_thread_stages(self):
+        """A normal pipeline run under profile_run should show the functions of its thread stages"""
+        pipeline = Pipeline([
+            Stage('square', busy, deps=['n']),
+            Stage('double', lambda results: results['square'] * 2, deps=['square'], kind='inline'),
+        ], inputs=['n'])
+
+        result, stats = asyncio.run(profile_run(lambda: pipeline.run({'n': 1000})))
+
+        assert result['double'] == 2 * sum(i * i for i in range(1000))
+        functions = [row['function'] for row in top_functions(stats, limit=200)]
+        assert any('(busy)' in function for function in functions)
+        assert any('(<lambda>)' in function for function in functions)
+        with tempfile.TemporaryDirectory() as directory:
+            store = ProfileStore(directory, max_profiles=5)
+            assert 'function calls' in store.report(store.save(stats))
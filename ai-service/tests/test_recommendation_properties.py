@@ -0,0 +1,80 @@
+"""
+Property-based tests for the recommendation rule table
+**Feature: smart-cv-analyzer, Property 15: Rule Scanner Equivalence**
+"""
+
+import re
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.recommendation_engine import RecommendationEngine, ISSUE_TYPES, STYLE_RULES
+from modules.rule_scanner import Rule, RuleScanner
+
+fragments = st.sampled_from([
+    'I ', 'i\t', 'was managing ', 'WAS running ', 'helped to ', 'worked on ', 'Worked On ', 'responsible for ',
+    'developed ', 'DEVELOPED ', 'manage ', 'lead ', 'worked ', '• ', '- ', '* ', '◦ ', 'full-stack ',
+    '50% ', 'hi ', '\n', 'working on ', 'ed ', 'x'
+])
+resume_text = st.lists(fragments, max_size=30).map(''.join)
+
+
+class TestRecommendationProperties:
+    """Property-based tests for single-pass recommendation rules"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.engine = RecommendationEngine()
+        self.scanner = RuleScanner(STYLE_RULES)
+
+    @given(text=resume_text)
+    @settings(max_examples=300)
+    def test_scanner_matches_per_rule_search(self, text):
+        """
+        **Feature: smart-cv-analyzer, Property 15: Rule Scanner Equivalence**
+        For any text, the single-pass scanner should report exactly the rules that a separate
+        search per rule finds, including rules whose matches overlap
+        """
+        expected = set()
+        for rule in STYLE_RULES:
+            if rule.literals:
+                hit = any(literal in text for literal in rule.literals)
+            else:
+                hit = re.search(rule.pattern, text, re.IGNORECASE if rule.ignore_case else 0)
+            if hit:
+                expected.add(rule.code)
+
+        assert self.scanner.scan(text) == expected
+
+    def test_overlapping_rules_are_all_found(self):
+        """A match should not hide another rule starting at the same position"""
+        scanner = RuleScanner([Rule('phrase', r'\bworked\s+on\b'), Rule('past', r'\b\w+ed\b')])
+        assert scanner.scan('worked on it') == {'phrase', 'past'}
+
+    def test_capturing_groups_rejected(self):
+        """Rule patterns with capturing groups would break group-name lookup"""
+        with pytest.raises(ValueError):
+            RuleScanner([Rule('bad', r'(a|b)c')])
+
+    @given(experience=resume_text, projects=resume_text)
+    @settings(max_examples=100)
+    def test_issue_codes_describe_issues(self, experience, projects):
+        """Every issue should carry the code of its type, and priorities should follow the codes"""
+        sections = {
+            'contactInfo': {'email': 'jane@example.com'},
+            'education': 'B.Sc.',
+            'skills': ['Python', 'SQL'],
+            'experience': experience,
+            'projects': projects,
+            'raw': experience + projects
+        }
+        result = self.engine.generate_recommendations(sections, {})
+
+        assert len(result['issue_codes']) == len(result['issues'])
+        for code, message in zip(result['issue_codes'], result['issues']):
+            assert code in ISSUE_TYPES
+            if code != 'few_skills':
+                assert message == ISSUE_TYPES[code].message
+
+        for suggestion in result['priority_suggestions']:
+            issue_type = ISSUE_TYPES[suggestion['code']]
+            assert suggestion['priority'] == issue_type.priority
+            assert suggestion['category'] == issue_type.category
@@ -0,0 +1,123 @@
+"""
+Property-based tests for the analysis response cache
+**Feature: smart-cv-analyzer, Property 23: Result Cache Consistency**
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.result_cache import ResultCache
+
+words = st.lists(st.text(alphabet='abcdefgXYZ', min_size=1, max_size=8), min_size=1, max_size=4)
+separators = st.lists(st.sampled_from([' ', '  ', '\t', ' \n ']), min_size=4, max_size=4)
+
+
+@pytest.fixture
+def cache_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield os.path.join(temp_dir, 'result_cache.sqlite3')
+
+
+class TestResultCacheProperties:
+    """Property-based tests for whole-response caching"""
+
+    @given(words=words, first=separators, second=separators, content=st.binary(max_size=64))
+    @settings(max_examples=100)
+    def test_key_normalizes_job_role_only(self, words, first, second, content):
+        """
+        **Feature: smart-cv-analyzer, Property 23: Result Cache Consistency**
+        For any upload, job roles differing only in whitespace or case should share a key,
+        while different bytes, enhancement choice, pipeline version, mode or selected fields should not
+        """
+        role_a = ''.join(word + sep for word, sep in zip(words, first))
+        role_b = ' ' + ''.join(word.upper() + sep for word, sep in zip(words, second))
+
+        digest = hashlib.sha256(content).hexdigest()
+        other = hashlib.sha256(content + b'x').hexdigest()
+
+        key = ResultCache.make_key(digest, role_a, False, '1')
+        assert ResultCache.make_key(digest, role_b, False, '1') == key
+        assert ResultCache.make_key(other, role_a, False, '1') != key
+        assert ResultCache.make_key(digest, role_a, True, '1') != key
+        assert ResultCache.make_key(digest, role_a, False, '2') != key
+        assert ResultCache.make_key(digest, role_a, False, '1', 'quick') != key
+        assert ResultCache.make_key(digest, role_a, False, '1', fields=['overallScore']) != key
+        assert ResultCache.make_key(digest, role_a, False, '1', fields=[]) != key
+
+    @given(operations=st.lists(
+        st.tuples(st.sampled_from(['set', 'get']), st.integers(min_value=0, max_value=6), st.integers()),
+        min_size=1, max_size=40
+    ))
+    @settings(max_examples=50, deadline=None)
+    def test_tiers_agree_with_last_write(self, operations):
+        """
+        **Feature: smart-cv-analyzer, Property 23: Result Cache Consistency**
+        For any sequence of writes and reads, a hit should return the last value written for
+        the key, and the memory tier should stay within its bound
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(os.path.join(directory, 'cache.sqlite3'), memory_entries=2, max_entries=4,
+                                ttl=0, enabled=True)
+            written = {}
+            for operation, key_index, value in operations:
+                key = f'key{key_index}'
+                if operation == 'set':
+                    cache.set(key, {'value': value})
+                    written[key] = {'value': value}
+                else:
+                    entry = cache.get(key)
+                    if entry is not None:
+                        assert entry.value == written[key]
+                assert len(cache._memory) <= 2
+                if cache._conn is not None:
+                    table = cache._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+                    assert cache._disk_entries == table <= 4
+            stats = cache.stats()
+            assert stats['disk_entries'] <= 4
+            cache.close()
+
+    def test_writes_do_not_count_the_table(self, cache_path):
+        """Stores should track the disk entry count instead of scanning the table"""
+        cache = ResultCache(cache_path, memory_entries=1, max_entries=2, ttl=60, enabled=True)
+        cache.set('a', {'overallScore': 1})
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        for key in ('b', 'c', 'c', 'd'):
+            cache.set(key, {'overallScore': 2})
+
+        assert not [statement for statement in statements if 'COUNT' in statement.upper()]
+        assert sqlite3.connect(cache_path).execute('SELECT COUNT(*) FROM results').fetchone()[0] == 2
+        assert cache.get('a') is None and cache.get('d') is not None
+
+    def test_disk_tier_survives_restart(self, cache_path):
+        """A new cache on the same file should serve earlier results from disk"""
+        cache = ResultCache(cache_path, memory_entries=8, max_entries=8, ttl=60, enabled=True)
+        cache.set('key', {'overallScore': 70})
+        cache.close()
+
+        restarted = ResultCache(cache_path, memory_entries=8, max_entries=8, ttl=60, enabled=True)
+        assert restarted.get('key').value == {'overallScore': 70}
+        assert restarted.get('key') is not None
+        stats = restarted.stats()
+        assert (stats['disk_hits'], stats['memory_hits']) == (1, 1)
+
+    def test_entries_expire(self, cache_path):
+        """Results older than the TTL should not be served from either tier"""
+        cache = ResultCache(cache_path, memory_entries=8, max_entries=8, ttl=0.2, enabled=True)
+        cache.set('key', {'overallScore': 70})
+        assert cache.get('key') is not None
+
+        time.sleep(0.3)
+        assert cache.get('key') is None
+        assert cache.stats()['disk_entries'] == 0
+
+    def test_disabled_cache_stores_nothing(self, cache_path):
+        """With the cache off, every lookup misses and nothing is written"""
+        cache = ResultCache(cache_path, enabled=False)
+        cache.set('key', {'overallScore': 70})
+        assert cache.get('key') is None
+        assert not os.path.exists(cache_path)
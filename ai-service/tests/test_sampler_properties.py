@@ -0,0 +1,107 @@
+"""
+Property-based tests for the continuous sampling profiler
+**Feature: smart-cv-analyzer, Property 28: Rolling Stack Profile**
+"""
+
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.sampler import StackSampler
+from modules.tracing import SpanExporter
+
+
+@pytest.fixture(scope='module')
+def parked_thread():
+    """A named thread blocked on an event for the duration of the tests"""
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait, name='parked-worker', daemon=True)
+    thread.start()
+    yield thread
+    release.set()
+    thread.join()
+
+
+def parked_count(collapsed):
+    return sum(int(line.rsplit(' ', 1)[1]) for line in collapsed.splitlines() if line.startswith('parked-worker;'))
+
+
+class TestSamplerProperties:
+    """Property-based tests for rolling collapsed-stack profiles"""
+
+    @given(gaps=st.lists(st.floats(min_value=0, max_value=30), min_size=1, max_size=30),
+           seconds=st.floats(min_value=1, max_value=200))
+    @settings(max_examples=100, deadline=None)
+    def test_windows_roll_over(self, parked_thread, gaps, seconds):
+        """
+        **Feature: smart-cv-analyzer, Property 28: Rolling Stack Profile**
+        For any sampling times, a thread's count should equal the samples taken in the
+        windows that are kept and overlap the requested span
+        """
+        sampler = StackSampler(interval=1, window=10, windows=3, max_overhead=0.01, include_idle=True)
+        now = 1000.0
+        window_starts = []
+        per_window = []
+        for gap in gaps:
+            now += gap
+            if not window_starts or now - window_starts[-1] >= 10:
+                window_starts.append(now)
+                per_window.append(0)
+            per_window[-1] += 1
+            sampler.sample(now=now)
+
+        kept = list(zip(window_starts, per_window))[-3:]
+        assert parked_count(sampler.collapsed(now=now)) == sum(count for _, count in kept)
+        assert parked_count(sampler.collapsed(seconds, now=now)) == sum(
+            count for start, count in kept if start + 10 > now - seconds
+        )
+
+    def test_idle_threads_are_skipped(self, parked_thread):
+        """A thread waiting on an event is idle and left out by default"""
+        sampler = StackSampler(interval=1, window=10, windows=3, max_overhead=0.01)
+        sampler.sample()
+        assert parked_count(sampler.collapsed()) == 0
+        assert 'stack-sampler' not in sampler.collapsed()
+
+    def test_service_background_threads_are_idle(self, tmp_path):
+        """The log writer and span exporter waiting for work are left out by default"""
+        listener = logging.handlers.QueueListener(queue.SimpleQueue(), logging.NullHandler())
+        listener.start()
+        exporter = SpanExporter(exporter='file', path=str(tmp_path / 'spans.jsonl'), flush_interval=60)
+        exporter_thread = threading.Thread(target=exporter._run, name='span-exporter', daemon=True)
+        exporter_thread.start()
+        time.sleep(0.05)
+        try:
+            sampler = StackSampler(interval=1, window=10, windows=3, max_overhead=0.01)
+            sampler.sample()
+            collapsed = sampler.collapsed()
+        finally:
+            listener.stop()
+
+        assert '_monitor' not in collapsed
+        assert 'span-exporter' not in collapsed
+
+    def test_busy_thread_is_sampled_at_its_hot_frame(self):
+        """A background sampler should attribute a busy thread's samples to the busy function"""
+        stop = threading.Event()
+
+        def spin_hot_loop():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=spin_hot_loop, name='busy-worker', daemon=True)
+        worker.start()
+        sampler = StackSampler(interval=0.002, window=60, windows=2, max_overhead=0.05)
+        sampler.start()
+        time.sleep(0.3)
+        sampler.stop()
+        stop.set()
+        worker.join()
+
+        lines = [line for line in sampler.collapsed().splitlines() if line.startswith('busy-worker;')]
+        assert lines and all('spin_hot_loop' in line for line in lines)
+        stats = sampler.stats()
+        assert stats['samples'] > 0 and not stats['running']
@@ -0,0 +1,145 @@
+"""
+Property-based tests for the priority lane scheduler
+**Feature: smart-cv-analyzer, Property 20: Weighted Fair Lanes**
+"""
+
+import asyncio
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.scheduler import Lane, LaneScheduler
+
+
+async def saturate(scheduler, arrivals, hold=0.0):
+    """Queue every (lane) in arrivals at once; return the lanes in the order they got a slot"""
+    order = []
+    running = {lane: 0 for lane in scheduler.lanes}
+    peaks = {lane: 0 for lane in scheduler.lanes}
+    total_peak = [0]
+
+    async def run(lane):
+        async with scheduler.slot(lane):
+            order.append(lane)
+            running[lane] += 1
+            peaks[lane] = max(peaks[lane], running[lane])
+            total_peak[0] = max(total_peak[0], sum(running.values()))
+            await asyncio.sleep(hold)
+            running[lane] -= 1
+
+    await asyncio.gather(*(run(lane) for lane in arrivals))
+    return order, peaks, total_peak[0]
+
+
+class TestSchedulerProperties:
+    """Property-based tests for weighted fair dequeuing"""
+
+    @given(weights=st.lists(st.integers(min_value=1, max_value=10), min_size=2, max_size=4))
+    @settings(max_examples=50, deadline=None)
+    def test_backlogged_lanes_share_by_weight(self, weights):
+        """
+        **Feature: smart-cv-analyzer, Property 20: Weighted Fair Lanes**
+        For any lane weights, while every lane has work waiting, each lane should get
+        slots in proportion to its weight
+        """
+        lanes = [Lane(f'lane{i}', weight, 1) for i, weight in enumerate(weights)]
+        scheduler = LaneScheduler(lanes, capacity=1)
+        per_lane = 40
+        arrivals = [lane.name for lane in lanes for _ in range(per_lane)]
+
+        order, _, _ = asyncio.run(saturate(scheduler, arrivals))
+
+        # Judge the window in which every lane still had work queued
+        first_drained = min(len(order) - order[::-1].index(lane.name) for lane in lanes)
+        window = order[:first_drained]
+        total = sum(weights)
+        for lane in lanes:
+            expected = len(window) * lane.weight / total
+            assert abs(window.count(lane.name) - expected) <= 2, (weights, lane, window.count(lane.name), expected)
+
+    @given(
+        caps=st.lists(st.integers(min_value=1, max_value=4), min_size=2, max_size=3),
+        capacity=st.integers(min_value=1, max_value=6),
+        arrivals=st.lists(st.integers(min_value=0, max_value=2), min_size=1, max_size=30)
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_concurrency_caps_hold(self, caps, capacity, arrivals):
+        """
+        **Feature: smart-cv-analyzer, Property 20: Weighted Fair Lanes**
+        For any mix of arrivals, no lane should exceed its cap, the total should not exceed
+        the capacity, and every run should eventually get a slot
+        """
+        lanes = [Lane(f'lane{i}', 1, cap) for i, cap in enumerate(caps)]
+        scheduler = LaneScheduler(lanes, capacity=capacity)
+        names = [lanes[index % len(lanes)].name for index in arrivals]
+
+        order, peaks, total_peak = asyncio.run(saturate(scheduler, names, hold=0.001))
+
+        assert sorted(order) == sorted(names)
+        assert total_peak <= capacity
+        for lane in lanes:
+            assert peaks[lane.name] <= lane.max_concurrency
+        stats = scheduler.stats()
+        assert stats['running'] == 0
+        assert all(lane['waiting'] == 0 for lane in stats['lanes'].values())
+
+    def test_interactive_latency_during_bulk_backlog(self):
+        """An interactive run should wait about one bulk run at most, not behind the whole batch"""
+        scheduler = LaneScheduler([Lane('interactive', 8, 4), Lane('bulk', 1, 2)], capacity=4)
+
+        async def scenario():
+            async def bulk():
+                async with scheduler.slot('bulk'):
+                    await asyncio.sleep(0.05)
+
+            batch = [asyncio.ensure_future(bulk()) for _ in range(40)]
+            await asyncio.sleep(0.12)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            async with scheduler.slot('interactive'):
+                waited = loop.time() - started
+            for task in batch:
+                task.cancel()
+            await asyncio.gather(*batch, return_exceptions=True)
+            return waited
+
+        waited = asyncio.run(scenario())
+        assert waited < 0.02, f"Interactive run waited {waited:.3f}s behind the batch"
+        assert scheduler.stats()['lanes']['bulk']['max_concurrency'] == 2
+
+    def test_cancelled_waiters_give_up_their_place(self):
+        """A run cancelled while waiting should neither hold nor leak a slot"""
+        scheduler = LaneScheduler([Lane('interactive', 1, 1)], capacity=1)
+
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def holder():
+                async with scheduler.slot('interactive'):
+                    await gate.wait()
+
+            async def waiter():
+                async with scheduler.slot('interactive'):
+                    return True
+
+            first = asyncio.ensure_future(holder())
+            await asyncio.sleep(0)
+            cancelled = asyncio.ensure_future(waiter())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.gather(cancelled, return_exceptions=True)
+            gate.set()
+            await first
+            return await waiter()
+
+        assert asyncio.run(scenario()) is True
+        assert scheduler.stats()['running'] == 0
+
+    def test_unknown_lane_rejected(self):
+        """Asking for a lane that does not exist should fail clearly"""
+        scheduler = LaneScheduler([Lane('interactive', 1, 1)], capacity=1)
+
+        async def scenario():
+            async with scheduler.slot('urgent'):
+                pass
+
+        with pytest.raises(ValueError, match="Unknown lane"):
+            asyncio.run(scenario())
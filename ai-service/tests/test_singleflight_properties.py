@@ -0,0 +1,106 @@
+"""
+Property-based tests for coalescing identical concurrent analyses
+**Feature: smart-cv-analyzer, Property 24: Single-Flight Coalescing**
+"""
+
+import asyncio
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.singleflight import SingleFlight
+
+
+class TestSingleFlightProperties:
+    """Property-based tests for single-flight computations"""
+
+    @given(keys=st.lists(st.sampled_from(['a', 'b', 'c', 'd']), min_size=1, max_size=30))
+    @settings(max_examples=50, deadline=None)
+    def test_one_computation_per_key(self, keys):
+        """
+        **Feature: smart-cv-analyzer, Property 24: Single-Flight Coalescing**
+        For any burst of concurrent callers, each distinct key should be computed once
+        and every caller should get the result of its own key
+        """
+        flights = SingleFlight()
+        computed = []
+
+        def computation(key):
+            async def compute():
+                computed.append(key)
+                await asyncio.sleep(0.01)
+                return {'key': key}
+            return compute
+
+        async def burst():
+            return await asyncio.gather(*(flights.do(key, computation(key)) for key in keys))
+
+        results = asyncio.run(burst())
+
+        assert sorted(computed) == sorted(set(keys))
+        assert [value['key'] for value, _ in results] == keys
+        assert sum(not shared for _, shared in results) == len(set(keys))
+        assert flights.stats() == {'started': len(set(keys)), 'coalesced': len(keys) - len(set(keys)),
+                                   'in_flight': 0}
+
+    def test_errors_are_shared(self):
+        """Every caller of a failing computation should see its error"""
+        flights = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("unreadable")
+
+        async def burst():
+            return await asyncio.gather(*(flights.do('a', compute) for _ in range(3)), return_exceptions=True)
+
+        errors = asyncio.run(burst())
+        assert all(isinstance(error, ValueError) for error in errors)
+
+    def test_leaving_caller_does_not_cancel_others(self):
+        """A caller that disconnects should not take the shared computation down with it"""
+        flights = SingleFlight()
+        runs = []
+
+        async def compute():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        async def scenario():
+            first = asyncio.ensure_future(flights.do('a', compute))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(flights.do('a', compute))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(scenario()) == ('done', True)
+        assert len(runs) == 1
+
+    def test_abandoned_computation_is_cancelled(self):
+        """Once every caller has left, the computation stops and the next caller starts afresh"""
+        flights = SingleFlight()
+        cancelled = []
+
+        async def compute():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        async def quick():
+            return 'fresh'
+
+        async def scenario():
+            caller = asyncio.ensure_future(flights.do('a', compute))
+            await asyncio.sleep(0.01)
+            caller.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await caller
+            result = await flights.do('a', quick)
+            await asyncio.sleep(0)
+            return result
+
+        assert asyncio.run(scenario()) == ('fresh', False)
+        assert cancelled == [1]
+        assert flights.stats()['in_flight'] == 0
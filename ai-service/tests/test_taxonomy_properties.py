@@ -0,0 +1,165 @@
+"""
+Property-based tests for the compiled keyword taxonomy
+**Feature: smart-cv-analyzer, Property 9: Keyword Matcher Equivalence**
+"""
+
+import json
+import os
+import re
+import tempfile
+import pytest
+from hypothesis import given, strategies as st, settings
+from modules.taxonomy import KeywordMatcher, TaxonomyStore, DEFAULT_TAXONOMY_PATH
+
+# Small alphabet so generated keywords overlap and share prefixes often
+keyword_text = st.text(alphabet='ab c.+#/', min_size=1, max_size=5)
+
+class TestTaxonomyProperties:
+    """Property-based tests for taxonomy compilation and matching"""
+
+    @given(
+        keywords=st.lists(keyword_text, min_size=1, max_size=10),
+        text=st.text(alphabet='ab c.+#/', max_size=60)
+    )
+    @settings(max_examples=200)
+    def test_substring_matcher_equivalence(self, keywords, text):
+        """
+        **Feature: smart-cv-analyzer, Property 9: Keyword Matcher Equivalence**
+        For any keyword set and text, the compiled matcher should find exactly the keywords
+        that a per-keyword substring check finds
+        """
+        matcher = KeywordMatcher(keywords)
+
+        expected = {keyword for keyword in keywords if keyword in text}
+        assert matcher.find(text) == expected
+        assert matcher.search(text) == bool(expected)
+
+    @given(
+        keywords=st.lists(keyword_text, min_size=1, max_size=10),
+        text=st.text(alphabet='ab c.+#/', max_size=60)
+    )
+    @settings(max_examples=200)
+    def test_whole_word_matcher_equivalence(self, keywords, text):
+        """
+        **Feature: smart-cv-analyzer, Property 9: Keyword Matcher Equivalence**
+        For any keyword set and text, whole-word matching should agree with a per-keyword
+        word-boundary regex search, including keywords that are prefixes of other keywords
+        """
+        matcher = KeywordMatcher(keywords, whole_word=True)
+
+        expected = {keyword for keyword in keywords
+                    if re.search(r'\b' + re.escape(keyword) + r'\b', text)}
+        assert matcher.find(text) == expected
+        assert set(matcher.count(text)) == expected
+
+    def test_whole_word_counts_match_regex(self):
+        """Occurrence counts should match re.findall for ordinary keywords"""
+        keywords = ['java', 'javascript', 'machine learning', 'learning', 'c++']
+        text = 'java and javascript; machine learning, deep learning. java c++'
+        matcher = KeywordMatcher(keywords, whole_word=True)
+
+        counts = matcher.count(text)
+        for keyword in keywords:
+            expected = len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
+            assert counts.get(keyword, 0) == expected, f"Count mismatch for '{keyword}'"
+
+    def test_compiled_cache_round_trip(self):
+        """The compiled form written to disk should be reused on the next load"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'taxonomy.json')
+            with open(DEFAULT_TAXONOMY_PATH, 'rb') as src, open(path, 'wb') as dst:
+                dst.write(src.read())
+
+            first = TaxonomyStore(path).get()
+            assert os.path.exists(path + '.compiled'), "Compiled taxonomy should be cached on disk"
+
+            with open(path + '.compiled', encoding='utf-8') as f:
+                cache = json.load(f)
+            assert cache['version'] == first.version
+
+            second = TaxonomyStore(path).get()
+            assert second.version == first.version
+            assert second.matcher_cache == first.matcher_cache
+            assert second.matcher('common_skills').find('python and java') == {'python', 'java'}
+            assert (second.role_index('scoring').resolve('Data Scientist').matcher.find('python sql')
+                    == first.role_index('scoring').resolve('Data Scientist').matcher.find('python sql'))
+
+    def test_unreadable_cache_is_recompiled(self):
+        """A cache that is not valid JSON (such as an old pickle) should be replaced, not loaded"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'taxonomy.json')
+            with open(DEFAULT_TAXONOMY_PATH, 'rb') as src, open(path, 'wb') as dst:
+                dst.write(src.read())
+            with open(path + '.compiled', 'wb') as f:
+                f.write(b'\x80\x05not json')
+
+            compiled = TaxonomyStore(path).get()
+
+            assert compiled.matcher('common_skills').find('python and java') == {'python', 'java'}
+            with open(path + '.compiled', encoding='utf-8') as f:
+                assert json.load(f)['version'] == compiled.version
+
+    def test_hot_reload_swaps_atomically(self):
+        """Reloading should swap in the new version while the old snapshot stays usable"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'taxonomy.json')
+            with open(DEFAULT_TAXONOMY_PATH) as f:
+                data = json.load(f)
+            with open(path, 'w') as f:
+                json.dump(data, f)
+
+            store = TaxonomyStore(path)
+            old = store.get()
+
+            data['scoring']['action_verbs'].append('spearheaded')
+            with open(path, 'w') as f:
+                json.dump(data, f)
+            store.reload(wait=True)
+
+            new = store.get()
+            assert new is not old
+            assert new.version != old.version
+            assert 'spearheaded' in new.matcher('scoring.action_verbs').find('spearheaded the launch')
+            assert 'spearheaded' not in old.matcher('scoring.action_verbs').find('spearheaded the launch')
+
+    def test_broken_reload_keeps_current_version(self):
+        """A taxonomy file that fails to compile should not replace the live version"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'taxonomy.json')
+            with open(DEFAULT_TAXONOMY_PATH, 'rb') as src, open(path, 'wb') as dst:
+                dst.write(src.read())
+
+            store = TaxonomyStore(path)
+            current = store.get()
+
+            with open(path, 'w') as f:
+                f.write('{not valid json')
+            store.reload(wait=True)
+
+            assert store.get() is current
+
+    def test_broken_file_is_not_retried_until_it_changes(self):
+        """The watcher should reload a broken file once, then again only after it is edited"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'taxonomy.json')
+            with open(DEFAULT_TAXONOMY_PATH, 'rb') as src:
+                good = src.read()
+            with open(path, 'wb') as f:
+                f.write(good)
+
+            store = TaxonomyStore(path)
+            current = store.get()
+            with open(path, 'w') as f:
+                f.write('{not valid json')
+            os.utime(path, (1, 1))
+            store.reload(wait=True)
+
+            assert store.check_for_changes() is False
+
+            with open(path, 'wb') as f:
+                f.write(good)
+            os.utime(path, (2, 2))
+            assert store.check_for_changes() is True
+            store.reload(wait=True)
+            assert store.get() is not current
+            assert store.check_for_changes() is False
@@ -0,0 +1,160 @@
+"""
+Property-based tests for trace spans
+**Feature: smart-cv-analyzer, Property 30: Trace Span Nesting**
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from hypothesis import given, strategies as st, settings
+from modules import tracing
+from modules.pipeline import Pipeline, Stage
+from modules.tracing import TRACER, SpanExporter, TraceContext, Tracer, parse_traceparent, span
+
+hex_ids = lambda size: st.text(alphabet='0123456789abcdef', min_size=size, max_size=size)
+
+
+class CollectingExporter(SpanExporter):
+    """Keeps finished spans in memory instead of writing them"""
+
+    def __init__(self):
+        super().__init__(exporter='file')
+        self.spans = []
+
+    def submit(self, finished):
+        self.spans.append(finished)
+
+
+@contextmanager
+def collected_spans():
+    exporter = CollectingExporter()
+    previous = TRACER.exporter
+    TRACER.exporter = exporter
+    try:
+        yield exporter.spans
+    finally:
+        TRACER.exporter = previous
+
+
+def page_work(results):
+    for page in range(results['pages']):
+        with span('ocr.page', page=page + 1):
+            pass
+    return results['pages']
+
+
+class TestTracingProperties:
+    """Property-based tests for span propagation and export"""
+
+    @given(pages=st.integers(min_value=0, max_value=5), kind=st.sampled_from(['thread', 'inline']))
+    @settings(max_examples=30, deadline=None)
+    def test_stage_spans_nest_under_the_request(self, pages, kind):
+        """
+        **Feature: smart-cv-analyzer, Property 30: Trace Span Nesting**
+        For any pipeline run inside a traced request, every stage should get a span
+        under the request span and work inside a stage should nest under that stage,
+        even when it runs in a pool thread
+        """
+        pipeline = Pipeline([
+            Stage('text', page_work, deps=['pages'], kind=kind),
+            Stage('score', lambda results: results['text'] * 2, deps=['text'], kind='inline'),
+        ], inputs=['pages'])
+
+        with collected_spans() as spans:
+            async def traced_run():
+                with TRACER.root('request') as root:
+                    await pipeline.run({'pages': pages})
+                return root
+            root = asyncio.run(traced_run())
+
+        by_name = {}
+        for finished in spans:
+            by_name.setdefault(finished.name, []).append(finished)
+        assert {finished.trace_id for finished in spans} == {root.trace_id}
+        assert by_name['stage text'][0].parent_id == root.span_id
+        assert by_name['stage score'][0].parent_id == root.span_id
+        page_spans = by_name.get('ocr.page', [])
+        assert [finished.attributes['page'] for finished in page_spans] == list(range(1, pages + 1))
+        assert all(finished.parent_id == by_name['stage text'][0].span_id for finished in page_spans)
+
+    @given(trace_id=hex_ids(32), parent_id=hex_ids(16), flags=hex_ids(2))
+    @settings(max_examples=100)
+    def test_traceparent_round_trip(self, trace_id, parent_id, flags):
+        """
+        **Feature: smart-cv-analyzer, Property 30: Trace Span Nesting**
+        For any well-formed traceparent, parsing should give back its IDs and sampled
+        flag, and all-zero IDs should be rejected
+        """
+        parsed = parse_traceparent(f'00-{trace_id}-{parent_id}-{flags}')
+        if set(trace_id) == {'0'} or set(parent_id) == {'0'}:
+            assert parsed is None
+        else:
+            assert parsed == (trace_id, parent_id, bool(int(flags, 16) & 1))
+
+    @given(header=st.text(max_size=60))
+    @settings(max_examples=100)
+    def test_malformed_traceparent_is_ignored(self, header):
+        """
+        **Feature: smart-cv-analyzer, Property 30: Trace Span Nesting**
+        For any string that is not a traceparent, parsing should give None
+        """
+        if not tracing.TRACEPARENT.match(header.strip().lower()):
+            assert parse_traceparent(header) is None
+
+    def test_spans_are_noops_outside_a_trace(self):
+        """Without a current span nothing is recorded"""
+        with collected_spans() as spans:
+            with span('ocr.page', page=1) as child:
+                assert child is None
+        assert spans == []
+
+    def test_middleware_continues_the_callers_trace(self):
+        """A request's server span should join the incoming trace and record the retry attempt"""
+        app = FastAPI()
+        app.add_middleware(TraceContext)
+
+        @app.get('/work')
+        async def work():
+            with span('inner'):
+                return {'traceparent': tracing.current_traceparent()}
+
+        @app.get('/health')
+        async def health():
+            return {'traceparent': tracing.current_traceparent()}
+
+        client = TestClient(app)
+        trace_id, parent_id = 'a' * 32, 'b' * 16
+        with collected_spans() as spans:
+            response = client.get('/work', headers={'traceparent': f'00-{trace_id}-{parent_id}-01',
+                                                    'X-Retry-Attempt': '2'})
+            assert client.get('/health').json()['traceparent'] is None
+            client.get('/work', headers={'traceparent': f'00-{trace_id}-{parent_id}-00'})
+
+        inner, server = spans
+        assert response.json()['traceparent'] == inner.traceparent
+        assert (server.trace_id, server.parent_id) == (trace_id, parent_id)
+        assert server.attributes['retry.attempt'] == 2
+        assert server.attributes['http.status_code'] == 200
+        assert inner.parent_id == server.span_id
+
+    def test_file_exporter_writes_otlp_json(self):
+        """Exported batches should be OTLP/JSON lines carrying every span"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'spans.jsonl')
+            tracer = Tracer(SpanExporter(exporter='file', path=path, flush_interval=60), sample_rate=1)
+            with tracer.root('job', job_id='j1'):
+                with tracer.span('stage text'):
+                    pass
+            tracer.exporter.flush()
+
+            with open(path) as lines:
+                exported = [entry for line in lines
+                            for entry in json.loads(line)['resourceSpans'][0]['scopeSpans'][0]['spans']]
+        assert sorted(entry['name'] for entry in exported) == ['job', 'stage text']
+        job = next(entry for entry in exported if entry['name'] == 'job')
+        assert job['attributes'] == [{'key': 'job_id', 'value': {'stringValue': 'j1'}}]
+        assert int(job['endTimeUnixNano']) >= int(job['startTimeUnixNano'])
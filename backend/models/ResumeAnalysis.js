@@ -63,6 +63,9 @@ const resumeAnalysisSchema = new mongoose.Schema({
     improved: String,
     section: String
   }],
+  // AI service analysis ID and where to fetch its enhancements; cleared once they are stored
+  analysisId: String,
+  enhancementsUrl: String,
   
   // Processing metadata
   processingTime: Number,
@@ -1,6 +1,7 @@
 import express from 'express';
 import axios from 'axios';
 import fs from 'fs';
+import crypto from 'crypto';
 import { body, validationResult } from 'express-validator';
 import upload from '../middleware/upload.js';
 import ResumeAnalysis from '../models/ResumeAnalysis.js';
@@ -12,6 +13,27 @@ if (!fs.existsSync('uploads')) {
   fs.mkdirSync('uploads');
 }
 
+// Enhanced bullets from the AI service. Its analysis IDs only live in the process that
+// answered the upload, for ANALYSIS_STORE_TTL; when the ID is gone, the stored sections are sent instead.
+async function fetchEnhancements(aiServiceUrl, analysis) {
+  try {
+    const response = await axios.get(`${aiServiceUrl}${analysis.enhancementsUrl}`, {
+      timeout: 60000 // LLM enhancement of every bullet
+    });
+    return response.data.enhancedBullets || [];
+  } catch (error) {
+    if (!error.response || error.response.status !== 404) {
+      throw error;
+    }
+  }
+  const response = await axios.post(`${aiServiceUrl}/enhancements`, {
+    sections: analysis.sections
+  }, {
+    timeout: 60000
+  });
+  return response.data.enhancedBullets || [];
+}
+
 // Upload and analyze resume
 router.post('/upload', 
   upload.single('file'),
@@ -65,12 +87,16 @@ router.post('/upload',
       let aiResponse;
       let retryCount = 0;
       const maxRetries = 3;
+      // One trace per upload; each attempt is a new parent span so retries show up in the AI service's traces
+      const traceId = crypto.randomBytes(16).toString('hex');
 
       while (retryCount < maxRetries) {
         try {
           aiResponse = await axios.post(`${aiServiceUrl}/analyze-resume`, formData, {
             headers: {
               ...formData.getHeaders(),
+              traceparent: `00-${traceId}-${crypto.randomBytes(8).toString('hex')}-01`,
+              'X-Retry-Attempt': String(retryCount + 1),
             },
             timeout: 90000, // 90 second timeout for AI processing
             onUploadProgress: (progressEvent) => {
@@ -167,6 +193,39 @@ router.get('/analysis/:id', async (req, res) => {
   }
 });
 
+// Enhanced bullets of an analysis, fetched from the AI service on first request and then stored.
+// The upload only gets an enhancementsUrl, so the slow LLM stage stays off the upload path.
+router.get('/analysis/:id/enhancements', async (req, res) => {
+  try {
+    const analysis = await ResumeAnalysis.findById(req.params.id);
+
+    if (!analysis) {
+      return res.status(404).json({
+        success: false,
+        message: 'Analysis not found'
+      });
+    }
+
+    if (analysis.enhancementsUrl) {
+      const aiServiceUrl = process.env.AI_SERVICE_URL || 'http://localhost:8001';
+      analysis.enhancedBullets = await fetchEnhancements(aiServiceUrl, analysis.toObject());
+      analysis.enhancementsUrl = undefined;
+      await analysis.save();
+    }
+
+    res.json({
+      success: true,
+      enhancedBullets: analysis.enhancedBullets
+    });
+  } catch (error) {
+    console.error('Get enhancements error:', error);
+    res.status(502).json({
+      success: false,
+      message: 'Error generating enhanced bullets'
+    });
+  }
+});
+
 // Get user's analysis history
 router.get('/user/:userId', async (req, res) => {
   try {
@@ -171,6 +171,27 @@ let analyses = [];
 let analysisCounter = 1;
 
 // Function to ensure analysis has complete data structure WITHOUT overriding existing data
+// Enhanced bullets from the AI service. Its analysis IDs only live in the process that
+// answered the upload, for ANALYSIS_STORE_TTL; when the ID is gone, the stored sections are sent instead.
+async function fetchEnhancements(aiServiceUrl, analysis) {
+  try {
+    const response = await axios.get(`${aiServiceUrl}${analysis.enhancementsUrl}`, {
+      timeout: 60000 // LLM enhancement of every bullet
+    });
+    return response.data.enhancedBullets || [];
+  } catch (error) {
+    if (!error.response || error.response.status !== 404) {
+      throw error;
+    }
+  }
+  const response = await axios.post(`${aiServiceUrl}/enhancements`, {
+    sections: analysis.sections
+  }, {
+    timeout: 60000
+  });
+  return response.data.enhancedBullets || [];
+}
+
 function ensureCompleteAnalysisData(analysis) {
   // Add job market data if missing
   if (!analysis.jobMarketData) {
@@ -292,8 +313,8 @@ function ensureCompleteAnalysisData(analysis) {
     ];
   }
 
-  // Ensure enhanced bullets exist
-  if (!analysis.enhancedBullets || analysis.enhancedBullets.length === 0) {
+  // Ensure enhanced bullets exist, unless the real ones have not been fetched yet
+  if ((!analysis.enhancedBullets || analysis.enhancedBullets.length === 0) && !analysis.enhancementsUrl) {
     analysis.enhancedBullets = [
       {
         original: "worked on projects",
@@ -839,6 +860,38 @@ app.get('/api/resume/analysis/:id', (req, res) => {
   }
 });
 
+// Enhanced bullets of an analysis, fetched from the AI service on first request and then stored.
+// The upload only gets an enhancementsUrl, so the slow LLM stage stays off the upload path.
+app.get('/api/resume/analysis/:id/enhancements', async (req, res) => {
+  try {
+    const analysis = analyses.find(a => a._id == req.params.id);
+
+    if (!analysis) {
+      return res.status(404).json({
+        success: false,
+        message: 'Analysis not found'
+      });
+    }
+
+    if (analysis.enhancementsUrl) {
+      const aiServiceUrl = process.env.AI_SERVICE_URL || 'http://localhost:8002';
+      analysis.enhancedBullets = await fetchEnhancements(aiServiceUrl, analysis);
+      delete analysis.enhancementsUrl;
+    }
+
+    res.json({
+      success: true,
+      enhancedBullets: analysis.enhancedBullets
+    });
+  } catch (error) {
+    console.error('Get enhancements error:', error);
+    res.status(502).json({
+      success: false,
+      message: 'Error generating enhanced bullets'
+    });
+  }
+});
+
 // Get user's analysis history
 app.get('/api/resume/user/:userId', (req, res) => {
   try {
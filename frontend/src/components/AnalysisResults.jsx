@@ -25,6 +25,22 @@ const AnalysisResults = () => {
     fetchAnalysis()
   }, [id])
 
+  // Enhancements are generated after the upload, when the results page first asks for them
+  const fetchEnhancements = async (analysisId) => {
+    try {
+      const response = await resumeAPI.getEnhancements(analysisId)
+      setAnalysis(current => current && current._id === analysisId
+        ? { ...current, enhancedBullets: response.data.enhancedBullets || [], enhancementsUrl: undefined }
+        : current)
+    } catch (err) {
+      // The rest of the analysis is still useful without them
+      console.error('Error fetching enhancements:', err)
+      setAnalysis(current => current && current._id === analysisId
+        ? { ...current, enhancementsUrl: undefined }
+        : current)
+    }
+  }
+
   const fetchAnalysis = async (isRetry = false) => {
     if (!isRetry) {
       setLoading(true)
@@ -38,6 +54,9 @@ const AnalysisResults = () => {
       if (response.data && response.data._id) {
         setAnalysis(response.data)
         setRetryCount(0) // Reset retry count on success
+        if (response.data.enhancementsUrl) {
+          fetchEnhancements(response.data._id)
+        }
       } else {
         setError(response.data?.message || 'Failed to load analysis results')
       }
@@ -946,8 +965,14 @@ const AnalysisResults = () => {
                 </div>
               ) : (
                 <div className="text-center py-8 bg-gray-50 dark:bg-gray-800 rounded-lg border border-gray-200 dark:border-gray-600">
-                  <p className="font-bold text-black dark:text-white">No content enhancements available.</p>
-                  <p className="text-sm mt-2 font-medium text-gray-700 dark:text-gray-300">This could be because your content is already well-written or the AI service is unavailable.</p>
+                  {analysis.enhancementsUrl ? (
+                    <p className="font-bold text-black dark:text-white">Generating content enhancements...</p>
+                  ) : (
+                    <>
+                      <p className="font-bold text-black dark:text-white">No content enhancements available.</p>
+                      <p className="text-sm mt-2 font-medium text-gray-700 dark:text-gray-300">This could be because your content is already well-written or the AI service is unavailable.</p>
+                    </>
+                  )}
                 </div>
               )}
             </div>
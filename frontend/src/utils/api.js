@@ -99,6 +99,13 @@ export const resumeAPI = {
     return api.get(`/resume/analysis/${id}`)
   },
 
+  // Enhanced bullets of an analysis, generated on first request
+  getEnhancements: (id) => {
+    return api.get(`/resume/analysis/${id}/enhancements`, {
+      timeout: 90000 // LLM enhancement of every bullet
+    })
+  },
+
   // Get user's analysis history
   getUserAnalyses: (userId, page = 1, limit = 10) => {
     return api.get(`/resume/user/${userId}`, {